@@ -1398,6 +1398,16 @@ def _ensure_schema(con: sqlite3.Connection) -> None:
         );
         """
     )
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS term_df (
+          term TEXT NOT NULL,
+          feed TEXT NOT NULL,
+          segments INTEGER NOT NULL,
+          PRIMARY KEY (term, feed)
+        ) WITHOUT ROWID;
+        """
+    )
     con.execute("CREATE INDEX IF NOT EXISTS idx_segments_feed_ep ON segments(feed, episode_slug);")
     con.execute("CREATE INDEX IF NOT EXISTS idx_segments_file ON segments(file_path);")
     # Prefer a non-contentless FTS table so we can DELETE by rowid during incremental rebuilds.
@@ -1478,6 +1488,71 @@ def _load_segments_for_file(con: sqlite3.Connection, file_path: str) -> list[Seg
     return [_segment_from_row(r) for r in rows]
 
 
+# Document frequency of unigrams/adjacent bigrams over content segments, per feed, kept in step with
+# `segments` by analyze so motif popularity is an indexed lookup instead of a LIKE scan.
+_TERM_DF_VERSION = 1
+_TERM_DF_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_TERM_DF_MIN_LEN = 4
+
+
+def segment_df_terms(text: str) -> set[str]:
+    toks = _TERM_DF_TOKEN_RE.findall((text or "").lower())
+    terms = {t for t in toks if len(t) >= _TERM_DF_MIN_LEN}
+    for left, right in zip(toks, toks[1:]):
+        if len(left) >= _TERM_DF_MIN_LEN and len(right) >= _TERM_DF_MIN_LEN:
+            terms.add(f"{left} {right}")
+    return terms
+
+
+def _term_df_counts(texts: Iterable[str]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for text in texts:
+        for term in segment_df_terms(text):
+            counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def _apply_term_df(con: sqlite3.Connection, feed: str, counts: dict[str, int], sign: int) -> None:
+    if not counts:
+        return
+    con.executemany(
+        """
+        INSERT INTO term_df(term, feed, segments) VALUES(?, ?, ?)
+        ON CONFLICT(term, feed) DO UPDATE SET segments = segments + excluded.segments
+        """,
+        [(term, feed, sign * n) for term, n in counts.items()],
+    )
+    if sign < 0:
+        con.executemany("DELETE FROM term_df WHERE term=? AND feed=? AND segments<=0", [(term, feed) for term in counts])
+
+
+def rebuild_term_df(con: sqlite3.Connection) -> int:
+    """Recount term_df from the stored content segments (one pass, one feed in memory at a time)."""
+    with con:
+        con.execute("DELETE FROM term_df")
+        feed = None
+        texts: list[str] = []
+        for row in con.execute("SELECT feed, text FROM segments WHERE kind='content' ORDER BY feed"):
+            if row[0] != feed:
+                if feed is not None:
+                    _apply_term_df(con, feed, _term_df_counts(texts), 1)
+                feed, texts = row[0], []
+            texts.append(str(row[1] or ""))
+        if feed is not None:
+            _apply_term_df(con, feed, _term_df_counts(texts), 1)
+        # Inside the transaction: analyze may close the connection without another commit.
+        _meta_set(con, "term_df_version", _TERM_DF_VERSION)
+    return int(con.execute("SELECT COUNT(DISTINCT term) FROM term_df").fetchone()[0] or 0)
+
+
+def term_df_lookup(con: sqlite3.Connection, term: str) -> tuple[int, int] | None:
+    """(content segments, feeds) containing `term`; None when the DF table has not been built by analyze."""
+    if _meta_get(con, "term_df_version", None) != _TERM_DF_VERSION:
+        return None
+    row = con.execute("SELECT COALESCE(SUM(segments), 0), COUNT(*) FROM term_df WHERE term=?", (" ".join(_TERM_DF_TOKEN_RE.findall((term or "").lower())),)).fetchone()
+    return int(row[0] or 0), int(row[1] or 0)
+
+
 def analyze_transcripts(
     *,
     db_path: Path,
@@ -1532,6 +1607,10 @@ def analyze_transcripts(
     log(f"[answer-engine] analyzing transcripts: {transcripts_root} (files={len(files)})")
     log(f"[answer-engine] db: {db_path}")
     log(f"[answer-engine] mode: incremental={bool(incremental)} force={bool(force)}")
+    if _meta_get(con, "term_df_version", None) != _TERM_DF_VERSION:
+        df_started = time.time()
+        n_terms = rebuild_term_df(con)
+        log(f"[answer-engine] term DF table rebuilt: terms={n_terms} elapsed={time.time() - df_started:.1f}s")
 
     touched = 0
     skipped = 0
@@ -1586,6 +1665,10 @@ def analyze_transcripts(
                 for s in segs
             ]
             with con:
+                old_rows = con.execute("SELECT feed, text FROM segments WHERE file_path=? AND kind='content'", (rel,)).fetchall()
+                if old_rows:
+                    _apply_term_df(con, str(old_rows[0][0]), _term_df_counts(str(r[1] or "") for r in old_rows), -1)
+                _apply_term_df(con, feed, _term_df_counts(s.text for s in segs if str(s.kind) == "content"), 1)
                 con.execute("DELETE FROM segments WHERE file_path=?", (rel,))
                 con.executemany(
                     """
@@ -1897,6 +1980,40 @@ def search_segments(
 ) -> dict[str, Any]:
     con = sqlite3.connect(str(db_path))
     con.row_factory = sqlite3.Row
+    try:
+        return _search_segments_con(con, q=q, limit=limit, candidates=candidates, include_noncontent=include_noncontent)
+    finally:
+        con.close()
+
+
+def search_segments_many(
+    *,
+    db_path: Path,
+    queries: list[str],
+    limit: int = 12,
+    candidates: int = 160,
+    include_noncontent: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """search_segments for several queries over one connection (shared page cache). Keyed by query."""
+    con = sqlite3.connect(str(db_path))
+    con.row_factory = sqlite3.Row
+    try:
+        return {
+            q: _search_segments_con(con, q=q, limit=limit, candidates=candidates, include_noncontent=include_noncontent)
+            for q in dict.fromkeys(queries)
+        }
+    finally:
+        con.close()
+
+
+def _search_segments_con(
+    con: sqlite3.Connection,
+    *,
+    q: str,
+    limit: int,
+    candidates: int,
+    include_noncontent: bool,
+) -> dict[str, Any]:
     if bool(_meta_get(con, "fts_dirty", False)):
         return {"query": q, "fts": "", "results": [], "episodes": [], "error": "index-stale-run-analyze-then-index"}
     fts_variants, expanded_terms = _build_fts_query_variants(q)
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+"""
+Small asyncio HTTP/1.1 client for crawlers and probes (stdlib only).
+
+- Keep-alive connections are pooled per (scheme, host, port) and reused when a response body was
+  fully read. A body truncated at `max_bytes` closes its connection, which also makes ranged
+  probes safe against servers that ignore `Range`.
+- Redirects are followed. `Content-Length`, chunked and read-to-close bodies are handled.
+- `stream()` hands the body out chunk by chunk, so a caller can stop early; stopping before the
+  end closes the connection instead of draining it.
+- An optional `DomainRateLimiter` paces requests per host without blocking the event loop, and
+  throttling responses (429 / Retry-After) back that host off.
+
+No proxy, HTTP/2 or compression support; callers that need those should keep using curl.
+"""
+
+import asyncio
+import contextlib
+import ssl
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+from urllib.parse import urljoin, urlsplit
+
+from scripts.rate_limit import DomainRateLimiter
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_MAX_HEADER_BYTES = 128 * 1024
+
+
+@dataclass
+class AsyncResponse:
+    status: int
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    truncated: bool = False
+
+    def header(self, name: str) -> str:
+        return self.headers.get(name.lower(), "")
+
+
+class AsyncStreamResponse:
+    """Status and headers of a `stream()` response; the body is read with `iter_body()`."""
+
+    def __init__(self, status: int, url: str, headers: dict[str, str], reader: asyncio.StreamReader, *, bodyless: bool, timeout: float) -> None:
+        self.status = status
+        self.url = url
+        self.headers = headers
+        self._reader = reader
+        self._timeout = timeout
+        # Set once the whole body has been consumed, which makes the connection reusable.
+        self.complete = bodyless
+        if bodyless:
+            self._mode, self._length = "none", 0
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            self._mode, self._length = "chunked", 0
+        elif headers.get("content-length", "").strip().isdigit():
+            self._mode, self._length = "length", int(headers["content-length"])
+        else:
+            self._mode, self._length = "close", 0
+
+    def header(self, name: str) -> str:
+        return self.headers.get(name.lower(), "")
+
+    async def _read(self, coro):
+        return await asyncio.wait_for(coro, self._timeout)
+
+    async def iter_body(self, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Body chunks of at most `chunk_size` bytes; the read timeout applies per chunk."""
+        n = max(1, int(chunk_size))
+        reader = self._reader
+        if self._mode == "length":
+            left = self._length
+            while left > 0:
+                block = await self._read(reader.readexactly(min(n, left)))
+                left -= len(block)
+                yield block
+        elif self._mode == "chunked":
+            while True:
+                size_line = await self._read(reader.readuntil(b"\r\n"))
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self._read(reader.readuntil(b"\r\n"))) != b"\r\n":
+                        pass
+                    break
+                while size > 0:
+                    block = await self._read(reader.readexactly(min(n, size)))
+                    size -= len(block)
+                    yield block
+                await self._read(reader.readexactly(2))
+        elif self._mode == "close":
+            while True:
+                block = await self._read(reader.read(n))
+                if not block:
+                    break
+                yield block
+        self.complete = True
+
+
+class _Conn:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class AsyncHttpClient:
+    def __init__(
+        self,
+        *,
+        user_agent: str,
+        timeout_seconds: float = 20.0,
+        limiter: DomainRateLimiter | None = None,
+        max_per_host: int = 4,
+        max_redirects: int = 5,
+        max_idle_per_host: int = 4,
+    ) -> None:
+        self.user_agent = user_agent
+        self.timeout_seconds = float(timeout_seconds)
+        self.limiter = limiter
+        self.max_per_host = max(1, int(max_per_host))
+        self.max_redirects = max(0, int(max_redirects))
+        self.max_idle_per_host = max(0, int(max_idle_per_host))
+        self._idle: dict[tuple[str, str, int], list[_Conn]] = {}
+        self._host_sems: dict[tuple[str, str, int], asyncio.Semaphore] = {}
+        self._ssl = ssl.create_default_context()
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+        self._idle.clear()
+
+    async def get(self, url: str, **kw) -> AsyncResponse:
+        return await self.request("GET", url, **kw)
+
+    async def _pace(self, url: str) -> None:
+        if self.limiter is not None:
+            delay = self.limiter.reserve(url)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        max_bytes: int = 1 << 20,
+        timeout_seconds: float | None = None,
+    ) -> AsyncResponse:
+        """
+        Send one request (following redirects). The body is capped at `max_bytes`. Raises on network
+        errors; the timeout applies to each hop's exchange, not to time spent waiting on the limiter.
+        """
+        timeout = self.timeout_seconds if timeout_seconds is None else float(timeout_seconds)
+        method = method.upper()
+        headers = headers or {}
+        for _hop in range(self.max_redirects + 1):
+            await self._pace(url)
+            resp = await asyncio.wait_for(self._send(method, url, headers, int(max_bytes)), timeout)
+            if self.limiter is not None:
+                self.limiter.note_response(url, resp.status, resp.header("retry-after") or None)
+            location = resp.header("location")
+            if resp.status not in _REDIRECT_STATUSES or not location:
+                return resp
+            url = urljoin(url, location)
+            if resp.status == 303 and method != "HEAD":
+                method = "GET"
+        return resp
+
+    @contextlib.asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        timeout_seconds: float | None = None,
+    ) -> AsyncIterator[AsyncStreamResponse]:
+        """
+        Like `request`, but yields the final response before its body is read:
+
+            async with client.stream("GET", url) as resp:
+                async for chunk in resp.iter_body():
+                    ...
+
+        The connection goes back to the pool only if the body was read to the end.
+        """
+        timeout = self.timeout_seconds if timeout_seconds is None else float(timeout_seconds)
+        method = method.upper()
+        headers = headers or {}
+        for _hop in range(self.max_redirects + 1):
+            await self._pace(url)
+            key, target = self._key(url)
+            sem = self._host_sems.setdefault(key, asyncio.Semaphore(self.max_per_host))
+            async with sem:
+                idle = self._idle.get(key) or []
+                conn = idle.pop() if idle else None
+                reused = conn is not None
+                if conn is None:
+                    conn = await asyncio.wait_for(self._open(key), timeout)
+                try:
+                    try:
+                        status, resp_headers, keep = await asyncio.wait_for(self._send_head(conn, method, key, target, headers), timeout)
+                    except (ConnectionError, asyncio.IncompleteReadError):
+                        if not reused:
+                            raise
+                        conn.close()
+                        conn = await asyncio.wait_for(self._open(key), timeout)
+                        status, resp_headers, keep = await asyncio.wait_for(self._send_head(conn, method, key, target, headers), timeout)
+                    else:
+                        if reused:
+                            self.connections_reused += 1
+                    bodyless = method == "HEAD" or status in (204, 304) or 100 <= status < 200
+                    resp = AsyncStreamResponse(status, url, resp_headers, conn.reader, bodyless=bodyless, timeout=timeout)
+                    if self.limiter is not None:
+                        self.limiter.note_response(url, status, resp.header("retry-after") or None)
+                    location = resp.header("location")
+                    redirect = status in _REDIRECT_STATUSES and bool(location) and _hop < self.max_redirects
+                    if not redirect:
+                        yield resp
+                except BaseException:
+                    conn.close()
+                    raise
+                # Redirect bodies are tiny; anything else the caller did not finish costs the connection.
+                keep = keep and resp._mode != "close" and (resp.complete or redirect and resp._length <= 64 * 1024)
+                if keep and not resp.complete:
+                    try:
+                        async for _chunk in resp.iter_body():
+                            pass
+                    except Exception:
+                        keep = False
+                pool = self._idle.setdefault(key, [])
+                if keep and len(pool) < self.max_idle_per_host:
+                    pool.append(conn)
+                else:
+                    conn.close()
+            if not redirect:
+                return
+            url = urljoin(url, location)
+            if status == 303 and method != "HEAD":
+                method = "GET"
+
+    def _key(self, url: str) -> tuple[tuple[str, str, int], str]:
+        parts = urlsplit(url)
+        scheme = (parts.scheme or "http").lower()
+        if scheme not in ("http", "https"):
+            raise ValueError(f"unsupported url scheme: {scheme}")
+        host = parts.hostname or ""
+        if not host:
+            raise ValueError(f"missing host in url: {url}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        return (scheme, host, port), target
+
+    async def _open(self, key: tuple[str, str, int]) -> _Conn:
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host,
+            port,
+            ssl=self._ssl if scheme == "https" else None,
+            server_hostname=host if scheme == "https" else None,
+            limit=_MAX_HEADER_BYTES,
+        )
+        self.connections_opened += 1
+        return _Conn(reader, writer)
+
+    async def _send(self, method: str, url: str, headers: dict[str, str], max_bytes: int) -> AsyncResponse:
+        key, target = self._key(url)
+        sem = self._host_sems.setdefault(key, asyncio.Semaphore(self.max_per_host))
+        async with sem:
+            idle = self._idle.get(key) or []
+            conn = idle.pop() if idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = await self._open(key)
+            try:
+                try:
+                    resp, keep = await self._exchange(conn, method, url, key, target, headers, max_bytes)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                    conn.close()
+                    conn = await self._open(key)
+                    resp, keep = await self._exchange(conn, method, url, key, target, headers, max_bytes)
+                else:
+                    if reused:
+                        self.connections_reused += 1
+            except BaseException:
+                conn.close()
+                raise
+            pool = self._idle.setdefault(key, [])
+            if keep and len(pool) < self.max_idle_per_host:
+                pool.append(conn)
+            else:
+                conn.close()
+            return resp
+
+    async def _send_head(
+        self,
+        conn: _Conn,
+        method: str,
+        key: tuple[str, str, int],
+        target: str,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str], bool]:
+        """Write the request and read the response head: (status, lowercased headers, keep-alive)."""
+        scheme, host, port = key
+        default_port = 443 if scheme == "https" else 80
+        fields = {
+            "host": ("Host", host + ("" if port == default_port else f":{port}")),
+            "user-agent": ("User-Agent", self.user_agent),
+            "accept": ("Accept", "*/*"),
+            "accept-encoding": ("Accept-Encoding", "identity"),
+            "connection": ("Connection", "keep-alive"),
+        }
+        for k, v in headers.items():
+            fields[k.lower()] = (k, v)
+        lines = [f"{method} {target} HTTP/1.1"] + [f"{k}: {v}" for k, v in fields.values()]
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", errors="replace"))
+        await conn.writer.drain()
+
+        head = await conn.reader.readuntil(b"\r\n\r\n")
+        head_lines = head.decode("latin-1", errors="replace").split("\r\n")
+        status_parts = head_lines[0].split(" ", 2)
+        if len(status_parts) < 2 or not status_parts[0].startswith("HTTP/"):
+            raise ConnectionError(f"bad status line: {head_lines[0][:80]!r}")
+        status = int(status_parts[1])
+        resp_headers: dict[str, str] = {}
+        for line in head_lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                resp_headers[k.strip().lower()] = v.strip()
+        keep = resp_headers.get("connection", "").lower() != "close" and status_parts[0] != "HTTP/1.0"
+        return status, resp_headers, keep
+
+    async def _exchange(
+        self,
+        conn: _Conn,
+        method: str,
+        url: str,
+        key: tuple[str, str, int],
+        target: str,
+        headers: dict[str, str],
+        max_bytes: int,
+    ) -> tuple[AsyncResponse, bool]:
+        status, resp_headers, keep = await self._send_head(conn, method, key, target, headers)
+        body = b""
+        truncated = False
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif "chunked" in resp_headers.get("transfer-encoding", "").lower():
+            body, truncated = await self._read_chunked(conn.reader, max_bytes)
+        elif resp_headers.get("content-length", "").strip().isdigit():
+            length = int(resp_headers["content-length"])
+            body = await conn.reader.readexactly(min(length, max_bytes))
+            truncated = length > max_bytes
+        else:
+            body = await conn.reader.read(max_bytes)
+            while len(body) < max_bytes:
+                more = await conn.reader.read(max_bytes - len(body))
+                if not more:
+                    break
+                body += more
+            truncated = not conn.reader.at_eof()
+            keep = False
+        return AsyncResponse(status=status, url=url, headers=resp_headers, body=body, truncated=truncated), keep and not truncated
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader, max_bytes: int) -> tuple[bytes, bool]:
+        parts: list[bytes] = []
+        total = 0
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Trailer section ends with an empty line.
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return b"".join(parts), False
+            if total + size > max_bytes:
+                parts.append(await reader.readexactly(max_bytes - total))
+                return b"".join(parts), True
+            parts.append(await reader.readexactly(size))
+            total += size
+            await reader.readexactly(2)
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
-"""Benchmark transcript backends on a short clip from a cached episode."""
+"""Benchmark transcript backends on a short clip from a cached episode, or a fixture suite (--suite).
+
+For CPU backends the `core_rtf` column (runtime * cores / audio seconds) is the number to
+compare against the targets in transcription_backends/cpu_profile.py.
+"""
 from __future__ import annotations
 
 import argparse
 import json
 import os
 import re
+import socket
 import subprocess
 import sys
 import time
@@ -175,6 +180,17 @@ def _make_backend(name: str, args: argparse.Namespace) -> Any:
             compute_type=str(args.whisperx_compute_type),
             extra_args=str(args.whisperx_extra_args or "--vad_method silero"),
         )
+    if name == "whisperx-cpu":
+        return get_backend(
+            "whisperx-cpu",
+            model=str(args.whisperx_model),
+            language=str(args.language),
+            instances=1,
+            threads=int(args.cpu_threads or 0),
+            batch_size=int(args.cpu_batch_size or 0),
+            compute_type=str(args.cpu_compute_type or "int8"),
+            extra_args=str(args.whisperx_extra_args or "--vad_method silero"),
+        )
     if name == "parakeet":
         return get_backend("parakeet", device=str(args.device), config=str(args.parakeet_config), model_name=str(args.parakeet_model))
     if name == "moonshine":
@@ -190,6 +206,8 @@ class BackendMetrics:
     realtime_factor: float
     transcript_words: int
     transcript_chars: int
+    cores_used: int | None = None
+    core_rtf: float | None = None
     wer_vs_whisperx: float | None = None
     cer_vs_whisperx: float | None = None
     wer_vs_reference: float | None = None
@@ -197,10 +215,343 @@ class BackendMetrics:
     samples: list[dict[str, str]] | None = None
 
 
+# ---- Suite mode: fixture manifest x config sweep, offline on CPU, history for regressions ----
+
+_SUITE_HISTORY_PATH = VODCASTS_ROOT / "out" / "transcription-backend-benchmarks" / "history.jsonl"
+# Which sweep knobs each backend actually honors; others collapse to a single None.
+_SUITE_KNOBS: dict[str, tuple[str, ...]] = {
+    "whisperx-cpu": ("threads", "batch_size", "compute_type"),
+    "whisperx": ("batch_size", "compute_type"),
+    "parakeet": ("threads",),
+    "moonshine": ("threads",),
+}
+
+
+@dataclass(frozen=True)
+class SuiteClip:
+    id: str
+    audio: Path
+    reference_vtt: Path | None = None
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class SuiteConfig:
+    backend: str
+    threads: int | None = None
+    batch_size: int | None = None
+    compute_type: str | None = None
+
+    def key(self) -> str:
+        parts = [self.backend]
+        if self.threads is not None:
+            parts.append(f"t{self.threads}")
+        if self.batch_size is not None:
+            parts.append(f"b{self.batch_size}")
+        if self.compute_type:
+            parts.append(self.compute_type)
+        return "-".join(parts)
+
+
+def _load_suite_manifest(path: Path) -> list[SuiteClip]:
+    """Manifest JSON: {"clips": [{"id", "audio", "reference_vtt"?, "tags"?}]}; paths relative to the manifest."""
+    obj = json.loads(path.read_text(encoding="utf-8"))
+    raw_clips = obj.get("clips") if isinstance(obj, dict) else obj
+    base = path.resolve().parent
+    clips: list[SuiteClip] = []
+    seen: set[str] = set()
+    for raw in raw_clips or []:
+        if not isinstance(raw, dict):
+            continue
+        audio = Path(str(raw.get("audio") or "").strip())
+        if not str(audio):
+            continue
+        audio = audio if audio.is_absolute() else (base / audio)
+        clip_id = str(raw.get("id") or audio.stem).strip()
+        if clip_id in seen:
+            raise SystemExit(f"duplicate clip id in manifest: {clip_id}")
+        seen.add(clip_id)
+        ref_raw = str(raw.get("reference_vtt") or "").strip()
+        ref = None
+        if ref_raw:
+            ref = Path(ref_raw) if Path(ref_raw).is_absolute() else (base / ref_raw)
+        tags = tuple(str(t) for t in (raw.get("tags") or []) if str(t).strip())
+        clips.append(SuiteClip(id=clip_id, audio=audio, reference_vtt=ref, tags=tags))
+    if not clips:
+        raise SystemExit(f"no clips in suite manifest: {path}")
+    for clip in clips:
+        if not clip.audio.exists():
+            raise SystemExit(f"suite clip audio not found: {clip.audio}")
+    return clips
+
+
+def _expand_suite_configs(args: argparse.Namespace) -> list[SuiteConfig]:
+    configs: list[SuiteConfig] = []
+    for backend in args.backends:
+        knobs = _SUITE_KNOBS.get(backend, ())
+        threads_opts: list[int | None] = list(args.sweep_threads) if "threads" in knobs else [None]
+        batch_opts: list[int | None] = list(args.sweep_batch_sizes) if "batch_size" in knobs else [None]
+        compute_opts: list[str | None] = list(args.sweep_compute_types) if "compute_type" in knobs else [None]
+        for t in threads_opts or [None]:
+            for b in batch_opts or [None]:
+                for c in compute_opts or [None]:
+                    configs.append(SuiteConfig(backend=backend, threads=t, batch_size=b, compute_type=c))
+    return configs
+
+
+def _prepare_suite_clip(clip: SuiteClip, *, ffmpeg: str, clips_dir: Path) -> Path:
+    wav = clips_dir / f"{clip.id}.wav"
+    if wav.exists() and wav.stat().st_mtime >= clip.audio.stat().st_mtime:
+        return wav
+    wav.parent.mkdir(parents=True, exist_ok=True)
+    _run([ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", str(clip.audio), "-vn", "-ac", "1", "-ar", "16000", str(wav)])
+    return wav
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak RSS of this process and its waited-for children (backend workers), in MiB."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def _suite_backend_args(args: argparse.Namespace, config: SuiteConfig) -> argparse.Namespace:
+    ns = argparse.Namespace(**vars(args))
+    ns.device = "cpu"
+    if config.threads is not None:
+        ns.cpu_threads = int(config.threads)
+    if config.batch_size is not None:
+        ns.cpu_batch_size = int(config.batch_size)
+        ns.whisperx_extra_args = f"{args.whisperx_extra_args or '--vad_method silero'} --batch_size {int(config.batch_size)}"
+    if config.compute_type:
+        ns.cpu_compute_type = config.compute_type
+        ns.whisperx_compute_type = config.compute_type
+    return ns
+
+
+def _suite_worker(args: argparse.Namespace) -> None:
+    """Child-process entry: run one config over every clip so peak RSS is per config."""
+    config_dir = Path(args.suite_worker)
+    job = json.loads((config_dir / "job.json").read_text(encoding="utf-8"))
+    config = SuiteConfig(**job["config"])
+    backend = _make_backend(config.backend, _suite_backend_args(args, config))
+    rows: list[dict[str, Any]] = []
+    warmup_seconds = 0.0
+    try:
+        started = time.perf_counter()
+        if hasattr(backend, "warmup"):
+            backend.warmup()
+        warmup_seconds = time.perf_counter() - started
+        cores_used = int(getattr(backend, "cores_per_job", 0) or 0) or int(config.threads or 0) or int(os.cpu_count() or 1)
+        for clip in job["clips"]:
+            wav = Path(clip["wav"])
+            audio_seconds = estimate_audio_duration_seconds(wav)
+            row: dict[str, Any] = {"clip_id": clip["id"], "audio_seconds": audio_seconds, "cores_used": cores_used}
+            started = time.perf_counter()
+            try:
+                srt_text, vtt_text = backend.transcribe(wav, args.language)
+            except Exception as exc:
+                row["error"] = f"{type(exc).__name__}: {exc}"
+                rows.append(row)
+                continue
+            runtime_seconds = time.perf_counter() - started
+            vtt_text = vtt_text or srt_to_vtt(srt_text)
+            _write_text(config_dir / f"{clip['id']}.vtt", vtt_text)
+            hyp = _normalize_metric_text(_extract_text_from_vtt(vtt_text))
+            row.update(
+                {
+                    "runtime_seconds": runtime_seconds,
+                    "realtime_factor": (runtime_seconds / audio_seconds) if audio_seconds > 0 else None,
+                    "core_rtf": (runtime_seconds * cores_used / audio_seconds) if audio_seconds > 0 else None,
+                    "transcript_words": len(hyp.split()),
+                }
+            )
+            ref_path = str(clip.get("reference_vtt") or "")
+            if ref_path:
+                ref = _normalize_metric_text(_extract_text_from_vtt(Path(ref_path).read_text(encoding="utf-8", errors="replace")))
+                if ref:
+                    row["wer"] = float(wer(ref, hyp))
+                    row["cer"] = float(cer(ref, hyp))
+            rows.append(row)
+    finally:
+        if hasattr(backend, "close"):
+            backend.close()
+    result = {"warmup_seconds": warmup_seconds, "peak_rss_mb": _peak_rss_mb(), "clips": rows}
+    _write_text(config_dir / "result.json", json.dumps(result, indent=2))
+
+
+def _git_commit() -> str:
+    try:
+        res = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(VODCASTS_ROOT), capture_output=True, text=True, timeout=10)
+        return (res.stdout or "").strip()
+    except Exception:
+        return ""
+
+
+def _load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    rows: list[dict[str, Any]] = []
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(obj, dict):
+            rows.append(obj)
+    return rows
+
+
+def _find_regressions(history: list[dict[str, Any]], rows: list[dict[str, Any]], args: argparse.Namespace) -> list[str]:
+    """Compare each new row against the latest earlier row for the same host/config/clip."""
+    latest: dict[tuple[str, str, str], dict[str, Any]] = {}
+    for row in history:
+        if row.get("error"):
+            continue
+        latest[(str(row.get("host")), str(row.get("config")), str(row.get("clip_id")))] = row
+    found: list[str] = []
+    for row in rows:
+        prev = latest.get((str(row.get("host")), str(row.get("config")), str(row.get("clip_id"))))
+        if prev is None or row.get("error"):
+            continue
+        label = f"{row['config']} / {row['clip_id']} (vs {prev.get('run_id')})"
+        for metric, limit in (("realtime_factor", float(args.regress_rtf)), ("peak_rss_mb", float(args.regress_rss))):
+            old, new = prev.get(metric), row.get(metric)
+            if old and new is not None and float(new) > float(old) * (1.0 + limit):
+                found.append(f"{label}: {metric} {float(old):.3f} -> {float(new):.3f}")
+        old_wer, new_wer = prev.get("wer"), row.get("wer")
+        if old_wer is not None and new_wer is not None and float(new_wer) > float(old_wer) + float(args.regress_wer):
+            found.append(f"{label}: wer {float(old_wer):.4f} -> {float(new_wer):.4f}")
+    return found
+
+
+def _run_suite(args: argparse.Namespace) -> None:
+    manifest_path = Path(args.suite)
+    clips = _load_suite_manifest(manifest_path)
+    configs = _expand_suite_configs(args)
+    run_id = time.strftime("%Y%m%dT%H%M%S")
+    out_root = Path(args.out_dir) if args.out_dir else (VODCASTS_ROOT / "out" / "transcription-backend-benchmarks" / "suite")
+    run_dir = out_root / run_id
+    clips_dir = out_root / "clips"
+    history_path = Path(args.history) if args.history else _SUITE_HISTORY_PATH
+
+    prepared = [
+        {
+            "id": clip.id,
+            "wav": str(_prepare_suite_clip(clip, ffmpeg=args.ffmpeg, clips_dir=clips_dir)),
+            "reference_vtt": str(clip.reference_vtt) if clip.reference_vtt else "",
+            "tags": list(clip.tags),
+        }
+        for clip in clips
+    ]
+    print(f"[suite] run={run_id} clips={len(prepared)} configs={len(configs)} history={history_path}")
+
+    env = dict(os.environ)
+    # Suite runs must never reach the network; models have to be cached already.
+    env.setdefault("HF_HUB_OFFLINE", "1")
+    env.setdefault("TRANSFORMERS_OFFLINE", "1")
+    env["CUDA_VISIBLE_DEVICES"] = ""
+
+    base = {
+        "run_id": run_id,
+        "commit": _git_commit(),
+        "host": socket.gethostname(),
+        "cpu_count": int(os.cpu_count() or 1),
+        "manifest": str(manifest_path),
+    }
+    rows: list[dict[str, Any]] = []
+    for config in configs:
+        config_dir = run_dir / config.key()
+        _write_text(config_dir / "job.json", json.dumps({"config": asdict(config), "clips": prepared}, indent=2))
+        child_env = dict(env)
+        if config.threads is not None:
+            child_env["OMP_NUM_THREADS"] = str(int(config.threads))
+            child_env["MKL_NUM_THREADS"] = str(int(config.threads))
+        cmd = [sys.executable, str(Path(__file__).resolve()), *sys.argv[1:], "--suite-worker", str(config_dir)]
+        print(f"[suite] {config.key()}")
+        proc = subprocess.run(cmd, env=child_env)
+        result_path = config_dir / "result.json"
+        if proc.returncode != 0 or not result_path.exists():
+            rows.append({**base, "config": config.key(), **asdict(config), "clip_id": "*", "error": f"worker exit {proc.returncode}"})
+            continue
+        result = json.loads(result_path.read_text(encoding="utf-8"))
+        for clip_row in result.get("clips") or []:
+            rows.append(
+                {
+                    **base,
+                    "config": config.key(),
+                    **asdict(config),
+                    "warmup_seconds": result.get("warmup_seconds"),
+                    "peak_rss_mb": result.get("peak_rss_mb"),
+                    **clip_row,
+                }
+            )
+
+    history = _load_history(history_path)
+    regressions = _find_regressions(history, rows, args)
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with history_path.open("a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=True) + "\n")
+
+    lines = [
+        f"# Transcription Backend Suite: {run_id}",
+        "",
+        f"- Manifest: `{manifest_path}`",
+        f"- Commit: {base['commit'] or 'unknown'}  Host: {base['host']}  CPUs: {base['cpu_count']}",
+        "",
+        "## Per config",
+        "",
+        "| Config | Clips | Audio (s) | Runtime (s) | RT factor | Core RTF | Mean WER | Peak RSS (MiB) | Errors |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for config in configs:
+        cr = [r for r in rows if r.get("config") == config.key()]
+        ok = [r for r in cr if not r.get("error")]
+        audio = sum(float(r.get("audio_seconds") or 0.0) for r in ok)
+        runtime = sum(float(r.get("runtime_seconds") or 0.0) for r in ok)
+        cores = max((int(r.get("cores_used") or 0) for r in ok), default=0)
+        wers = [float(r["wer"]) for r in ok if r.get("wer") is not None]
+        rss = max((float(r.get("peak_rss_mb") or 0.0) for r in cr), default=0.0)
+        lines.append(
+            "| "
+            + " | ".join(
+                [
+                    config.key(),
+                    str(len(ok)),
+                    f"{audio:.1f}",
+                    f"{runtime:.2f}",
+                    f"{runtime / audio:.3f}" if audio > 0 else "",
+                    f"{runtime * cores / audio:.3f}" if audio > 0 and cores else "",
+                    f"{sum(wers) / len(wers):.4f}" if wers else "",
+                    f"{rss:.0f}" if rss else "",
+                    str(len(cr) - len(ok)),
+                ]
+            )
+            + " |"
+        )
+    lines.extend(["", "## Regressions", ""])
+    lines.extend([f"- {r}" for r in regressions] or ["_None vs previous history._"])
+    _write_text(run_dir / "README.md", "\n".join(lines).rstrip() + "\n")
+
+    for r in regressions:
+        print(f"[regress] {r}")
+    print(str(run_dir))
+    if regressions and args.fail_on_regression:
+        raise SystemExit(1)
+
+
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Benchmark whisperx/parakeet/moonshine on a short cached episode clip.")
-    parser.add_argument("--source-id", required=True, help="Feed/source id from feeds/*.md")
-    parser.add_argument("--episode-slug", required=True, help="Episode slug from cached feed manifest")
+    parser = argparse.ArgumentParser(description="Benchmark whisperx/whisperx-cpu/parakeet/moonshine on a short cached episode clip.")
+    parser.add_argument("--source-id", default="", help="Feed/source id from feeds/*.md (single-clip mode).")
+    parser.add_argument("--episode-slug", default="", help="Episode slug from cached feed manifest (single-clip mode).")
     parser.add_argument("--env", default="", help="Feed/cache env name. Defaults to active env.")
     parser.add_argument("--feeds", default="", help="Path to feeds md file.")
     parser.add_argument("--cache", default="", help="Path to cache dir.")
@@ -218,8 +569,33 @@ def main() -> None:
     parser.add_argument("--whisperx-extra-args", default="--vad_method silero", help="Extra whisperx args.")
     parser.add_argument("--parakeet-model", default="nvidia/parakeet-tdt-0.6b-v3", help="Parakeet model name.")
     parser.add_argument("--parakeet-config", default="balanced", help="Parakeet audio config preset.")
+    parser.add_argument("--cpu-threads", type=int, default=0, help="whisperx-cpu threads for the single benchmark instance (0 = autotune).")
+    parser.add_argument("--cpu-batch-size", type=int, default=0, help="whisperx-cpu batch size (0 = autotune).")
+    parser.add_argument("--cpu-compute-type", default="int8", help="whisperx-cpu compute type.")
+    parser.add_argument("--suite", default="", help="Suite mode: fixture manifest JSON of local clips (runs offline on CPU).")
+    parser.add_argument("--sweep-threads", nargs="+", type=int, default=[4], help="Suite: thread counts to sweep.")
+    parser.add_argument("--sweep-batch-sizes", nargs="+", type=int, default=[1, 4], help="Suite: batch sizes to sweep (whisperx backends).")
+    parser.add_argument("--sweep-compute-types", nargs="+", default=["int8"], help="Suite: compute types to sweep (whisperx backends).")
+    parser.add_argument("--history", default="", help="Suite: JSONL history file (default: out/transcription-backend-benchmarks/history.jsonl).")
+    parser.add_argument("--regress-rtf", type=float, default=0.10, help="Suite: flag RT factor increases above this fraction (default: 0.10).")
+    parser.add_argument("--regress-rss", type=float, default=0.15, help="Suite: flag peak RSS increases above this fraction (default: 0.15).")
+    parser.add_argument("--regress-wer", type=float, default=0.02, help="Suite: flag absolute WER increases above this (default: 0.02).")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Suite: exit 1 when any regression is flagged.")
+    parser.add_argument("--suite-worker", default="", help=argparse.SUPPRESS)
     args = parser.parse_args()
 
+    if args.suite_worker:
+        _suite_worker(args)
+        return
+    if args.suite:
+        if args.backends == list_backends():
+            # GPU-only backends make no sense in an offline CPU suite unless asked for explicitly.
+            args.backends = ["whisperx-cpu", "moonshine"]
+        _run_suite(args)
+        return
+    if not args.source_id or not args.episode_slug:
+        parser.error("--source-id and --episode-slug are required unless --suite is given")
+
     env_name = _canon_env(args.env or _active_env())
     feeds_path = Path(args.feeds) if args.feeds else (VODCASTS_ROOT / "feeds" / f"{env_name}.md")
     cache_dir = Path(args.cache) if args.cache else (VODCASTS_ROOT / "cache" / env_name)
@@ -282,9 +658,17 @@ def main() -> None:
 
     for backend_name in args.backends:
         backend = _make_backend(backend_name, args)
+        if hasattr(backend, "warmup"):
+            # Keep worker/model startup out of the measured runtime.
+            backend.warmup()
         started = time.perf_counter()
-        srt_text, vtt_text = backend.transcribe(clip_wav, args.language)
-        runtime_seconds = time.perf_counter() - started
+        try:
+            srt_text, vtt_text = backend.transcribe(clip_wav, args.language)
+            runtime_seconds = time.perf_counter() - started
+        finally:
+            if hasattr(backend, "close"):
+                backend.close()
+        cores_used = int(getattr(backend, "cores_per_job", 0) or 0) or None
         vtt_text = vtt_text or srt_to_vtt(srt_text)
 
         backend_dir = out_dir / backend_name
@@ -304,6 +688,8 @@ def main() -> None:
             realtime_factor=(runtime_seconds / audio_seconds) if audio_seconds > 0 else 0.0,
             transcript_words=len(plain_text.split()),
             transcript_chars=len(plain_text),
+            cores_used=cores_used,
+            core_rtf=((runtime_seconds * cores_used) / audio_seconds) if (cores_used and audio_seconds > 0) else None,
             samples=_extract_sample_cues(vtt_text),
         )
         metrics.append(metric)
@@ -343,8 +729,8 @@ def main() -> None:
         "",
         "## Metrics",
         "",
-        "| Backend | Runtime (s) | RT factor | Words | WER vs WhisperX | CER vs WhisperX | WER vs reference | CER vs reference |",
-        "|---|---:|---:|---:|---:|---:|---:|---:|",
+        "| Backend | Runtime (s) | RT factor | Cores | Core RTF | Words | WER vs WhisperX | CER vs WhisperX | WER vs reference | CER vs reference |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|",
     ]
     for metric in metrics:
         lines.append(
@@ -354,6 +740,8 @@ def main() -> None:
                     metric.backend,
                     f"{metric.runtime_seconds:.2f}",
                     f"{metric.realtime_factor:.3f}",
+                    str(metric.cores_used) if metric.cores_used else "",
+                    f"{metric.core_rtf:.3f}" if metric.core_rtf is not None else "",
                     str(metric.transcript_words),
                     f"{metric.wer_vs_whisperx:.4f}" if metric.wer_vs_whisperx is not None else "",
                     f"{metric.cer_vs_whisperx:.4f}" if metric.cer_vs_whisperx is not None else "",
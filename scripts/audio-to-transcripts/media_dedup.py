@@ -0,0 +1,213 @@
+"""Media fingerprint index: detect the same sermon syndicated under different feeds/slugs/URLs.
+
+Two layers, cheapest first:
+- range key: Content-Length + SHA-1 of the first/last 64 KiB (media_probe.range_fingerprint),
+  cached per URL so re-runs do not re-probe.
+- audio envelope: rising/falling log-energy bits over 0.5 s windows of the decoded 16 kHz WAV,
+  for HLS/resolved URLs and re-encodes where the bytes differ but the audio does not.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from scripts.media_probe import range_fingerprint
+
+_INDEX_VERSION = 1
+_URL_KEY_MAX_AGE_SECONDS = 30 * 86400
+_AUDIO_WINDOW_SECONDS = 0.5
+_AUDIO_MIN_WINDOWS = 240  # 2 minutes; shorter clips are too easy to confuse
+_AUDIO_MAX_DURATION_DIFF_SECONDS = 3.0
+_AUDIO_MAX_SHIFT_WINDOWS = 6
+_AUDIO_MATCH_THRESHOLD = 0.9
+
+Owner = tuple[str, str]  # (feed_id, ep_slug)
+
+
+@dataclass(frozen=True)
+class AudioFingerprint:
+    duration_sec: float
+    bits: str  # hex, one bit per window (1 = energy rose vs previous window)
+    windows: int
+
+
+@dataclass
+class DedupProbe:
+    """Fingerprints gathered for one episode while generating; recorded once its VTT is written."""
+
+    media_url: str
+    range_key: str = ""
+    audio: AudioFingerprint | None = None
+    reused_from: Owner | None = None
+
+
+def audio_fingerprint(wav_path: Path) -> AudioFingerprint | None:
+    """Envelope fingerprint of a 16-bit PCM WAV. Needs numpy (present in the transcription venv)."""
+    try:
+        import wave
+
+        import numpy as np
+    except ImportError:
+        return None
+    energies: list[Any] = []
+    total = 0
+    try:
+        with wave.open(str(wav_path), "rb") as wav:
+            rate = int(wav.getframerate() or 0)
+            channels = int(wav.getnchannels() or 1)
+            if rate <= 0 or int(wav.getsampwidth() or 0) != 2:
+                return None
+            hop = max(1, int(rate * _AUDIO_WINDOW_SECONDS))
+            # Stream ~60 s at a time so hour-long services never sit fully in memory.
+            chunk_frames = hop * 120
+            while True:
+                frames = wav.readframes(chunk_frames)
+                if not frames:
+                    break
+                samples = np.frombuffer(frames, dtype="<i2").astype(np.float32)
+                if channels > 1:
+                    samples = samples[: (len(samples) // channels) * channels].reshape(-1, channels).mean(axis=1)
+                total += len(samples)
+                n = len(samples) // hop
+                if n > 0:
+                    energies.append(np.log1p((samples[: n * hop].reshape(n, hop) ** 2).mean(axis=1)))
+    except Exception:
+        return None
+    if not energies:
+        return None
+    energy = np.concatenate(energies)
+    if len(energy) < 2:
+        return None
+    rising = (np.diff(energy) > 0).astype(np.uint8)
+    return AudioFingerprint(
+        duration_sec=round(total / float(rate), 2),
+        bits=np.packbits(rising).tobytes().hex(),
+        windows=int(len(rising)),
+    )
+
+
+def _audio_similarity(a: AudioFingerprint, b: AudioFingerprint) -> float:
+    import numpy as np
+
+    av = np.unpackbits(np.frombuffer(bytes.fromhex(a.bits), dtype=np.uint8))[: a.windows]
+    bv = np.unpackbits(np.frombuffer(bytes.fromhex(b.bits), dtype=np.uint8))[: b.windows]
+    best = 0.0
+    for shift in range(-_AUDIO_MAX_SHIFT_WINDOWS, _AUDIO_MAX_SHIFT_WINDOWS + 1):
+        x = av[shift:] if shift >= 0 else av
+        y = bv if shift >= 0 else bv[-shift:]
+        m = min(len(x), len(y))
+        if m < _AUDIO_MIN_WINDOWS:
+            continue
+        best = max(best, float((x[:m] == y[:m]).mean()))
+    return best
+
+
+class MediaDedupIndex:
+    """JSON-backed fingerprint -> (feed_id, ep_slug) index, shared by concurrent work items."""
+
+    def __init__(self, path: Path, *, out_dir: Path, is_complete: Callable[[Path], bool]) -> None:
+        self.path = Path(path)
+        self.out_dir = Path(out_dir)
+        self._is_complete = is_complete
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._doc = self._load()
+
+    def _load(self) -> dict[str, Any]:
+        empty: dict[str, Any] = {"version": _INDEX_VERSION, "by_key": {}, "by_url": {}, "audio": []}
+        if not self.path.exists():
+            return empty
+        try:
+            doc = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return empty
+        if not isinstance(doc, dict) or int(doc.get("version") or 0) != _INDEX_VERSION:
+            return empty
+        for k, default in (("by_key", {}), ("by_url", {}), ("audio", [])):
+            if not isinstance(doc.get(k), type(default)):
+                doc[k] = default
+        return doc
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(self._doc, ensure_ascii=False) + "\n", encoding="utf-8")
+            tmp.replace(self.path)
+            self._dirty = False
+
+    def vtt_path(self, owner: Owner) -> Path:
+        return self.out_dir / owner[0] / f"{owner[1]}.vtt"
+
+    def _usable(self, owner: Owner | None, exclude: Owner) -> Owner | None:
+        if owner is None or owner == exclude:
+            return None
+        return owner if self._is_complete(self.vtt_path(owner)) else None
+
+    def match_remote(self, probe: DedupProbe, url: str, *, exclude: Owner, timeout_seconds: int, user_agent: str) -> Owner | None:
+        """Range-key lookup. Probes the URL at most once per 30 days; fills probe.range_key."""
+        now = int(time.time())
+        with self._lock:
+            cached = self._doc["by_url"].get(url)
+        key = ""
+        if isinstance(cached, dict) and (now - int(cached.get("checked_at_unix") or 0)) < _URL_KEY_MAX_AGE_SECONDS:
+            key = str(cached.get("key") or "")
+        else:
+            fp = range_fingerprint(url, timeout_seconds=timeout_seconds, user_agent=user_agent)
+            key = fp.key() if fp is not None else ""
+            with self._lock:
+                self._doc["by_url"][url] = {"key": key, "checked_at_unix": now}
+                if fp is not None and fp.final_url != url:
+                    self._doc["by_url"][fp.final_url] = {"key": key, "checked_at_unix": now}
+                self._dirty = True
+        probe.range_key = key
+        if not key:
+            return None
+        with self._lock:
+            raw = self._doc["by_key"].get(key)
+        owner = (str(raw[0]), str(raw[1])) if isinstance(raw, list) and len(raw) == 2 else None
+        return self._usable(owner, exclude)
+
+    def match_audio(self, probe: DedupProbe, wav_path: Path, *, exclude: Owner) -> Owner | None:
+        """Envelope lookup against entries of similar duration; fills probe.audio."""
+        fp = audio_fingerprint(wav_path)
+        probe.audio = fp
+        if fp is None or fp.windows < _AUDIO_MIN_WINDOWS:
+            return None
+        with self._lock:
+            entries = list(self._doc["audio"])
+        for ent in entries:
+            if not isinstance(ent, dict):
+                continue
+            if abs(float(ent.get("duration_sec") or 0.0) - fp.duration_sec) > _AUDIO_MAX_DURATION_DIFF_SECONDS:
+                continue
+            owner = (str(ent.get("feed_id") or ""), str(ent.get("ep_slug") or ""))
+            other = AudioFingerprint(
+                duration_sec=float(ent.get("duration_sec") or 0.0),
+                bits=str(ent.get("bits") or ""),
+                windows=int(ent.get("windows") or 0),
+            )
+            if _audio_similarity(fp, other) >= _AUDIO_MATCH_THRESHOLD and self._usable(owner, exclude):
+                return owner
+        return None
+
+    def record(self, owner: Owner, probe: DedupProbe) -> None:
+        with self._lock:
+            if probe.range_key:
+                raw = self._doc["by_key"].get(probe.range_key)
+                prev = (str(raw[0]), str(raw[1])) if isinstance(raw, list) and len(raw) == 2 else None
+                # First owner wins while its VTT is still good; otherwise this episode takes over.
+                if prev is None or prev == owner or not self._is_complete(self.vtt_path(prev)):
+                    self._doc["by_key"][probe.range_key] = [owner[0], owner[1]]
+                    self._dirty = True
+            if probe.audio is not None and probe.audio.windows >= _AUDIO_MIN_WINDOWS:
+                audio = [e for e in self._doc["audio"] if not (isinstance(e, dict) and (e.get("feed_id"), e.get("ep_slug")) == owner)]
+                audio.append({"feed_id": owner[0], "ep_slug": owner[1], **asdict(probe.audio)})
+                self._doc["audio"] = audio
+                self._dirty = True
@@ -9,6 +9,8 @@ Param(
   [int]$MaxEpisodesPerFeed = 10,
   [int]$Concurrency = 0,
   [switch]$PreferShorter,
+  [switch]$Plan,
+  [double]$BudgetHours = 0,
   [switch]$NoDownloadProvided,
   [switch]$GenerateMissing,
   [int]$SpotCheckEvery = 0,
@@ -25,6 +27,9 @@ Param(
   [string]$WhisperxExtraArgs = "",
   [string]$WhisperxWorkerUrl = "",
   [string]$Backend = "whisperx",
+  [int]$CpuInstances = 0,
+  [int]$CpuThreads = 0,
+  [int]$CpuBatchSize = 0,
   [switch]$NoWorker,
   [switch]$ServeWorker,
   [string]$WorkerHost = "127.0.0.1",
@@ -109,6 +114,8 @@ if ($SourceId -ne "") { $argsList += @("--source-id", $SourceId) }
 if ($EpisodeSlug -ne "") { $argsList += @("--episode-slug", $EpisodeSlug) }
 if ($Concurrency -gt 0) { $argsList += @("--concurrency", "$Concurrency") }
 if ($PreferShorter) { $argsList += @("--prefer-shorter") }
+if ($Plan) { $argsList += @("--plan") }
+if ($BudgetHours -gt 0) { $argsList += @("--budget-hours", "$BudgetHours") }
 if ($NoDownloadProvided) { $argsList += @("--no-download-provided") }
 if ($GenerateMissing) { $argsList += @("--generate-missing") }
 if ($SpotCheckEvery -gt 0) {
@@ -123,7 +130,7 @@ if ($WhisperxDevice -ne "") { $argsList += @("--whisperx-device", $WhisperxDevic
 if ($WhisperxComputeType -ne "") { $argsList += @("--whisperx-compute-type", $WhisperxComputeType) }
 $workerProc = $null
 
-# Parakeet and Moonshine run in-process; no worker needed.
+# Parakeet and Moonshine run in-process; whisperx-cpu starts its own pinned workers.
 $useWorker = -not $NoWorker -and ($Backend -eq "whisperx")
 
 try {
@@ -168,6 +175,9 @@ try {
 
   if ($WhisperxWorkerUrl -ne "") { $argsList += @("--whisperx-worker-url", $WhisperxWorkerUrl) }
 if ($Backend -ne "") { $argsList += @("--backend", $Backend) }
+if ($CpuInstances -gt 0) { $argsList += @("--cpu-instances", "$CpuInstances") }
+if ($CpuThreads -gt 0) { $argsList += @("--cpu-threads", "$CpuThreads") }
+if ($CpuBatchSize -gt 0) { $argsList += @("--cpu-batch-size", "$CpuBatchSize") }
 
   & $python @argsList
   exit $LASTEXITCODE
@@ -0,0 +1,203 @@
+"""Speech-region pre-pass: cut long music/silence stretches out of the 16 kHz WAV before ASR.
+
+Energy-based and deliberately conservative (cutting a sentence costs more than transcribing a
+song): each 1 s block is classed by loudness and low-energy ratio (LER, the share of 25 ms frames
+quieter than half the block mean). Speech has syllable gaps, so its LER is high; sustained worship
+music and silence are not. Only non-speech runs of at least `min_cut_seconds` are removed, with
+padding kept on both sides. Cue timestamps from the trimmed audio are mapped back with
+`remap_subtitle_timestamps`.
+"""
+from __future__ import annotations
+
+import re
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+_BLOCK_SECONDS = 1.0
+_FRAME_SECONDS = 0.025
+_SILENCE_DB_BELOW_PEAK = 35.0
+_SPEECH_MIN_LER = 0.3
+_SMOOTH_BLOCKS = 5
+_JOIN_GAP_SECONDS = 0.3  # short silence between kept regions so words do not run together
+
+
+@dataclass(frozen=True)
+class SpeechSegment:
+    """One kept region: [orig_start, orig_start + duration) placed at trimmed_start in the trimmed WAV."""
+
+    orig_start: float
+    trimmed_start: float
+    duration: float
+
+
+@dataclass(frozen=True)
+class SpeechMap:
+    total_seconds: float
+    segments: tuple[SpeechSegment, ...]
+
+    @property
+    def kept_seconds(self) -> float:
+        return sum(s.duration for s in self.segments)
+
+    def to_original(self, t: float) -> float:
+        """Map a trimmed-audio time back to the original timeline."""
+        if not self.segments:
+            return t
+        seg = self.segments[0]
+        for s in self.segments:
+            if s.trimmed_start > t:
+                break
+            seg = s
+        return seg.orig_start + min(max(0.0, t - seg.trimmed_start), seg.duration)
+
+
+def wav_seconds(wav_path: Path) -> float:
+    with wave.open(str(wav_path), "rb") as wav:
+        return wav.getnframes() / float(wav.getframerate() or 1)
+
+
+def detect_speech_regions(
+    wav_path: Path,
+    *,
+    min_cut_seconds: float = 20.0,
+    pad_seconds: float = 1.5,
+) -> list[tuple[float, float]] | None:
+    """
+    Return [(start, end), ...] seconds worth sending to ASR, or None when analysis is not possible
+    (numpy missing, unexpected WAV format). An empty list means no speech was found.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    try:
+        with wave.open(str(wav_path), "rb") as wav:
+            rate = int(wav.getframerate() or 0)
+            if rate <= 0 or int(wav.getsampwidth() or 0) != 2 or int(wav.getnchannels() or 0) != 1:
+                return None
+            frame = max(1, int(rate * _FRAME_SECONDS))
+            per_block = max(1, int(round(_BLOCK_SECONDS / _FRAME_SECONDS)))
+            block_energy: list[float] = []
+            block_ler: list[float] = []
+            while True:
+                raw = wav.readframes(frame * per_block * 60)
+                if not raw:
+                    break
+                x = np.frombuffer(raw, dtype="<i2").astype(np.float32)
+                n_frames = len(x) // frame
+                if n_frames <= 0:
+                    break
+                e = (x[: n_frames * frame].reshape(n_frames, frame) ** 2).mean(axis=1)
+                n_blocks = n_frames // per_block
+                if n_blocks <= 0:
+                    block_energy.append(float(e.mean()))
+                    block_ler.append(float((e < 0.5 * e.mean()).mean()) if e.mean() > 0 else 0.0)
+                    continue
+                eb = e[: n_blocks * per_block].reshape(n_blocks, per_block)
+                means = eb.mean(axis=1)
+                block_energy.extend(means.tolist())
+                block_ler.extend((eb < 0.5 * means[:, None]).mean(axis=1).tolist())
+    except Exception:
+        return None
+
+    if not block_energy:
+        return []
+    energy_db = 10.0 * np.log10(np.asarray(block_energy, dtype=np.float64) + 1e-9)
+    ler = np.asarray(block_ler, dtype=np.float64)
+    loud = energy_db > (np.percentile(energy_db, 95) - _SILENCE_DB_BELOW_PEAK)
+    speechy = (loud & (ler >= _SPEECH_MIN_LER)).astype(np.float64)
+    # Majority vote over neighbouring blocks: one speech-like bar of music is not speech.
+    k = _SMOOTH_BLOCKS
+    smoothed = np.convolve(np.pad(speechy, (k // 2, k // 2), mode="edge"), np.ones(k) / k, mode="valid") >= 0.4
+
+    total = len(block_energy) * _BLOCK_SECONDS
+    regions: list[tuple[float, float]] = []
+    start: float | None = None
+    for i, is_speech in enumerate(smoothed.tolist()):
+        t = i * _BLOCK_SECONDS
+        if is_speech and start is None:
+            start = t
+        elif not is_speech and start is not None:
+            regions.append((start, t))
+            start = None
+    if start is not None:
+        regions.append((start, total))
+    if not regions:
+        return []
+
+    # Pad, then merge anything separated by less than a worthwhile cut.
+    padded = [(max(0.0, a - pad_seconds), min(total, b + pad_seconds)) for a, b in regions]
+    merged: list[tuple[float, float]] = [padded[0]]
+    for a, b in padded[1:]:
+        pa, pb = merged[-1]
+        if a - pb < min_cut_seconds:
+            merged[-1] = (pa, max(pb, b))
+        else:
+            merged.append((a, b))
+    if merged[0][0] < min_cut_seconds:
+        merged[0] = (0.0, merged[0][1])
+    if total - merged[-1][1] < min_cut_seconds:
+        merged[-1] = (merged[-1][0], total)
+    return merged
+
+
+def write_trimmed_wav(wav_path: Path, out_path: Path, regions: list[tuple[float, float]]) -> SpeechMap:
+    """Concatenate `regions` of a PCM WAV (with a short silence between them) and return the time map."""
+    segments: list[SpeechSegment] = []
+    with wave.open(str(wav_path), "rb") as src, wave.open(str(out_path), "wb") as dst:
+        rate = src.getframerate()
+        width = src.getsampwidth()
+        channels = src.getnchannels()
+        total_frames = src.getnframes()
+        dst.setnchannels(channels)
+        dst.setsampwidth(width)
+        dst.setframerate(rate)
+        gap_frames = int(rate * _JOIN_GAP_SECONDS)
+        gap = b"\x00" * (gap_frames * width * channels)
+        out_frames = 0
+        for i, (a, b) in enumerate(regions):
+            first = max(0, min(total_frames, int(a * rate)))
+            last = max(first, min(total_frames, int(b * rate)))
+            if last <= first:
+                continue
+            if i > 0 and segments:
+                dst.writeframes(gap)
+                out_frames += gap_frames
+            segments.append(SpeechSegment(orig_start=first / rate, trimmed_start=out_frames / rate, duration=(last - first) / rate))
+            src.setpos(first)
+            remaining = last - first
+            while remaining > 0:
+                n = min(remaining, rate * 60)
+                dst.writeframes(src.readframes(n))
+                remaining -= n
+            out_frames += last - first
+    return SpeechMap(total_seconds=total_frames / float(rate or 1), segments=tuple(segments))
+
+
+_TS_RE = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{2})([.,])(\d{3})")
+
+
+def _fmt_ts(seconds: float, sep: str) -> str:
+    ms = int(round(max(0.0, seconds) * 1000.0))
+    h, rem = divmod(ms, 3_600_000)
+    m, rem = divmod(rem, 60_000)
+    s, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d}{sep}{ms:03d}"
+
+
+def remap_subtitle_timestamps(text: str, speech_map: SpeechMap) -> str:
+    """Rewrite SRT/VTT cue timings (and inline <hh:mm:ss.mmm> word times) from trimmed to original time."""
+    if not text or not speech_map.segments:
+        return text
+
+    def _sub(m: re.Match[str]) -> str:
+        h = int(m.group(1) or 0)
+        t = h * 3600 + int(m.group(2)) * 60 + int(m.group(3)) + int(m.group(5)) / 1000.0
+        return _fmt_ts(speech_map.to_original(t), m.group(4))
+
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        if "-->" in line or "<0" in line:
+            lines[i] = _TS_RE.sub(_sub, line)
+    return "\n".join(lines)
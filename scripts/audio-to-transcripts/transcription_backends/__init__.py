@@ -1,4 +1,4 @@
-"""Transcription backends: WhisperX, Parakeet, Moonshine.
+"""Transcription backends: WhisperX (GPU or CPU int8), Parakeet, Moonshine.
 Unified interface: transcribe(audio_path, language) -> (srt_text, vtt_text).
 """
 from __future__ import annotations
@@ -14,14 +14,17 @@ def get_backend(name: str, **kwargs: Any) -> TranscriberBackend:
     if name == "whisperx":
         from .whisperx import WhisperXBackend
         return WhisperXBackend(**kwargs)
+    if name == "whisperx-cpu":
+        from .whisperx_cpu import WhisperXCpuBackend
+        return WhisperXCpuBackend(**kwargs)
     if name == "parakeet":
         from .parakeet import ParakeetBackend
         return ParakeetBackend(**kwargs)
     if name == "moonshine":
         from .moonshine import MoonshineBackend
         return MoonshineBackend(**kwargs)
-    raise ValueError(f"unknown backend: {name!r}. Choose: whisperx, parakeet, moonshine")
+    raise ValueError(f"unknown backend: {name!r}. Choose: whisperx, whisperx-cpu, parakeet, moonshine")
 
 
 def list_backends() -> list[str]:
-    return ["whisperx", "parakeet", "moonshine"]
+    return ["whisperx", "whisperx-cpu", "parakeet", "moonshine"]
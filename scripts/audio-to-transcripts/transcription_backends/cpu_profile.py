@@ -0,0 +1,121 @@
+"""CPU sizing for transcription: int8 models, thread/batch autotune, core-group pinning.
+
+Throughput target (measured with benchmark_backends.py, `core_rtf` column):
+core_rtf = runtime_seconds * cores_used / audio_seconds, i.e. core-seconds of compute
+per second of audio. Lower is better; a box with N cores transcribes roughly
+N / core_rtf hours of audio per wall-clock hour.
+
+- whisperx-cpu small int8:  core_rtf <= 0.5
+- whisperx-cpu medium int8: core_rtf <= 1.5
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+# CTranslate2 (faster-whisper under WhisperX) scales well up to ~4 intra-op threads per
+# model on CPU; beyond that, extra cores are better spent on another model instance.
+_DEFAULT_THREADS_PER_INSTANCE = 4
+_MAX_BATCH_SIZE = 8
+
+CORE_RTF_TARGETS: dict[str, float] = {
+    "small": 0.5,
+    "medium": 1.5,
+}
+
+
+@dataclass(frozen=True)
+class CpuProfile:
+    cpu_count: int
+    instances: int
+    threads_per_instance: int
+    batch_size: int
+    compute_type: str = "int8"
+    core_groups: tuple[tuple[int, ...], ...] = ()
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "cpu_count": self.cpu_count,
+            "instances": self.instances,
+            "threads_per_instance": self.threads_per_instance,
+            "batch_size": self.batch_size,
+            "compute_type": self.compute_type,
+            "core_groups": [list(g) for g in self.core_groups],
+        }
+
+
+def available_cores() -> list[int]:
+    """Core ids this process may run on (affinity-aware where the OS exposes it)."""
+    getaffinity = getattr(os, "sched_getaffinity", None)
+    if getaffinity is not None:
+        try:
+            cores = sorted(int(c) for c in getaffinity(0))
+            if cores:
+                return cores
+        except OSError:
+            pass
+    return list(range(max(1, int(os.cpu_count() or 1))))
+
+
+def autotune_cpu_profile(
+    *,
+    cpu_count: int = 0,
+    instances: int = 0,
+    threads: int = 0,
+    batch_size: int = 0,
+    compute_type: str = "int8",
+) -> CpuProfile:
+    """Split the available cores into `instances` groups of `threads` cores each.
+
+    Zero means "pick for me": threads defaults to 4 (or an even share when `instances` is
+    given), instances fills the remaining cores, and batch size follows threads. `cpu_count`
+    is clamped to the cores this process may actually run on.
+    """
+    cores = available_cores()
+    if cpu_count > 0:
+        cores = cores[: int(cpu_count)]
+    n = max(1, len(cores))
+
+    k = max(0, min(int(instances or 0), n))
+    t = int(threads or 0)
+    if t <= 0:
+        t = (n // k) if k > 0 else min(_DEFAULT_THREADS_PER_INSTANCE, n)
+    t = max(1, min(t, n))
+    if k <= 0:
+        k = max(1, n // t)
+    if k * t > n:
+        t = max(1, n // k)
+
+    b = int(batch_size or 0)
+    if b <= 0:
+        b = max(1, min(_MAX_BATCH_SIZE, t // 2 or 1))
+
+    groups = tuple(tuple(cores[i * t : (i + 1) * t]) for i in range(k))
+    return CpuProfile(
+        cpu_count=n,
+        instances=k,
+        threads_per_instance=t,
+        batch_size=b,
+        compute_type=str(compute_type or "int8").strip() or "int8",
+        core_groups=groups,
+    )
+
+
+def pin_preexec(cores: tuple[int, ...]) -> Callable[[], None] | None:
+    """Return a Popen preexec_fn that pins the child to `cores`, or None where unsupported (Windows/macOS)."""
+    setaffinity = getattr(os, "sched_setaffinity", None)
+    if setaffinity is None or os.name == "nt" or not cores:
+        return None
+    core_set = set(int(c) for c in cores)
+
+    def _pin() -> None:
+        try:
+            # Never widen or move outside the inherited affinity mask.
+            allowed = core_set & set(os.sched_getaffinity(0))
+            if allowed:
+                setaffinity(0, allowed)
+        except OSError:
+            pass
+
+    return _pin
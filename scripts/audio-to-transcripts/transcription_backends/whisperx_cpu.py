@@ -0,0 +1,168 @@
+"""WhisperX on CPU: int8 model instances, one persistent worker per pinned core group."""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .cpu_profile import CpuProfile, autotune_cpu_profile, pin_preexec
+from .whisperx import WhisperXBackend
+
+_SERVE_SCRIPT = Path(__file__).resolve().parents[1] / "serve_transcripts_whisperx.py"
+_WORKER_START_TIMEOUT_SECONDS = 300
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return int(s.getsockname()[1])
+
+
+def _worker_healthy(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(f"{url}/health", timeout=3) as resp:
+            obj = json.loads(resp.read().decode("utf-8", errors="replace"))
+        return isinstance(obj, dict) and bool(obj.get("ok"))
+    except Exception:
+        return False
+
+
+@dataclass
+class _Slot:
+    index: int
+    cores: tuple[int, ...]
+    url: str
+    proc: subprocess.Popen[Any]
+    client: WhisperXBackend
+
+
+class WhisperXCpuBackend:
+    """WhisperX on CPU with int8 weights. Each core group runs its own warm worker process."""
+
+    def __init__(
+        self,
+        *,
+        model: str = "small",
+        language: str = "en",
+        instances: int = 0,
+        threads: int = 0,
+        batch_size: int = 0,
+        compute_type: str = "int8",
+        extra_args: str = "",
+        python_exe: str = "",
+        host: str = "127.0.0.1",
+    ) -> None:
+        self.model = str(model or "small").strip() or "small"
+        self.language = str(language or "en").strip() or "en"
+        self.profile: CpuProfile = autotune_cpu_profile(
+            instances=int(instances or 0),
+            threads=int(threads or 0),
+            batch_size=int(batch_size or 0),
+            compute_type=str(compute_type or "int8"),
+        )
+        self.extra_args = str(extra_args or "").strip() or "--vad_method silero"
+        self.python_exe = str(python_exe or sys.executable)
+        self.host = str(host or "127.0.0.1")
+        self._slots: list[_Slot] = []
+        self._free: queue.Queue[_Slot] = queue.Queue()
+        self._lock = threading.RLock()
+        self._closed = False
+
+    @property
+    def cores_per_job(self) -> int:
+        return int(self.profile.threads_per_instance)
+
+    def _worker_extra_args(self) -> str:
+        return f"{self.extra_args} --threads {self.profile.threads_per_instance} --batch_size {self.profile.batch_size}"
+
+    def _start_slot(self, index: int, cores: tuple[int, ...]) -> _Slot:
+        port = _free_port(self.host)
+        url = f"http://{self.host}:{port}"
+        env = dict(os.environ)
+        t = str(self.profile.threads_per_instance)
+        env["OMP_NUM_THREADS"] = t
+        env["MKL_NUM_THREADS"] = t
+        cmd = [
+            self.python_exe,
+            str(_SERVE_SCRIPT),
+            "--host", self.host,
+            "--port", str(port),
+            "--model", self.model,
+            "--language", self.language,
+            "--device", "cpu",
+            "--compute-type", self.profile.compute_type,
+            "--extra-args", self._worker_extra_args(),
+            "--warmup",
+        ]
+        proc = subprocess.Popen(cmd, env=env, preexec_fn=pin_preexec(cores))
+        print(f"[cpu] worker {index + 1}/{self.profile.instances} cores={list(cores)} url={url} pid={proc.pid}", flush=True)
+        client = WhisperXBackend(
+            worker_url=url,
+            model=self.model,
+            device="cpu",
+            compute_type=self.profile.compute_type,
+            extra_args=self._worker_extra_args(),
+        )
+        return _Slot(index=index, cores=cores, url=url, proc=proc, client=client)
+
+    def warmup(self) -> None:
+        """Start and wait for all core-group workers (otherwise done lazily on first transcribe)."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("whisperx-cpu backend is closed")
+            if self._slots:
+                return
+            print(f"[cpu] profile {json.dumps(self.profile.to_payload())}", flush=True)
+            slots = [self._start_slot(i, cores) for i, cores in enumerate(self.profile.core_groups)]
+            self._slots = slots
+            atexit.register(self.close)
+            deadline = time.monotonic() + _WORKER_START_TIMEOUT_SECONDS
+            pending = list(slots)
+            while pending:
+                for slot in list(pending):
+                    if slot.proc.poll() is not None:
+                        self.close()
+                        raise RuntimeError(f"cpu worker {slot.index + 1} exited during startup (rc={slot.proc.returncode})")
+                    if _worker_healthy(slot.url):
+                        pending.remove(slot)
+                if pending:
+                    if time.monotonic() > deadline:
+                        self.close()
+                        raise RuntimeError("cpu workers did not become healthy in time")
+                    time.sleep(1.0)
+            for slot in slots:
+                self._free.put(slot)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            slots, self._slots = self._slots, []
+        for slot in slots:
+            if slot.proc.poll() is None:
+                slot.proc.terminate()
+                try:
+                    slot.proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    slot.proc.kill()
+
+    def transcribe(self, audio_path: Path, language: str) -> tuple[str, str]:
+        """Transcribe WAV to (srt, vtt) on the next free core group. Raises if empty."""
+        audio_path = Path(audio_path)
+        if not audio_path.exists():
+            raise FileNotFoundError(f"audio not found: {audio_path}")
+        self.warmup()
+        slot = self._free.get()
+        try:
+            return slot.client.transcribe(audio_path, language)
+        finally:
+            self._free.put(slot)
@@ -29,6 +29,10 @@ if str(_REPO_ROOT) not in sys.path:
 from scripts.feed_manifest import parse_feed_for_manifest
 from scripts.shared import VODCASTS_ROOT, fetch_url
 from scripts.sources import Source, load_sources_config
+from scripts.media_probe import load_media_meta_cache
+from media_dedup import DedupProbe, MediaDedupIndex
+from speech_regions import detect_speech_regions, remap_subtitle_timestamps, wav_seconds, write_trimmed_wav
+from work_planner import plan_summary, plan_work
 from transcription_backends import get_backend
 from transcription_backends.subtitle_utils import SubtitleValidationError, coerce_subtitle_output
 
@@ -42,6 +46,8 @@ _MEDIA_RESOLVE_TIMEOUT_SECONDS = 45
 _EXISTING_VTT_MIN_CHARS = 80
 _EXISTING_VTT_MIN_WORDS = 10
 _TRANSCRIPTION_CONCURRENCY = 2
+# Only send a trimmed WAV when it saves at least 5% of the audio; smaller cuts are not worth the remap.
+_SPEECH_TRIM_MIN_SAVING = 0.95
 max_episodes_per_feed = 12
 # Episodes under this duration (sec) count as "short" and can fill bonus slots up to double the per-feed limit.
 _SHORT_EPISODE_THRESHOLD_SEC = 1500  # 25 min
@@ -246,6 +252,7 @@ class WorkOutcome:
     spotcheck_count: int = 0
     errors: int = 0
     dead_media: bool = False
+    deduped_count: int = 0
 
 
 def _parse_args() -> argparse.Namespace:
@@ -304,6 +311,39 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Prefer shorter known-duration episodes first; episodes without known duration are queued later.",
     )
+    p.add_argument(
+        "--plan",
+        action="store_true",
+        help="Order work by estimated value per compute-hour (feed weight, coverage, recency) instead of feed order.",
+    )
+    p.add_argument(
+        "--budget-hours",
+        type=float,
+        default=0.0,
+        help="With --plan: stop scheduling once estimated compute hours reach this budget (0 = no budget).",
+    )
+    p.add_argument(
+        "--planner-rtf",
+        type=float,
+        default=0.1,
+        help="With --plan: compute seconds per audio second used for cost estimates (default: 0.1; see benchmark_backends.py).",
+    )
+    p.add_argument(
+        "--planner-overhead-seconds",
+        type=float,
+        default=30.0,
+        help="With --plan: fixed per-episode cost for download/decode (default: 30).",
+    )
+    p.add_argument(
+        "--feed-weights",
+        default="",
+        help="With --plan: JSON file of {feed_id: weight} (e.g. popularity); overrides the built-in high-value/weaker weights.",
+    )
+    p.add_argument(
+        "--plan-out",
+        default="",
+        help="With --plan: where to write the scored plan (default: <cache>/transcripts-plan.json).",
+    )
     p.add_argument(
         "--download-provided",
         action="store_true",
@@ -332,6 +372,30 @@ def _parse_args() -> argparse.Namespace:
         help="Actually write files / download / run ffmpeg+whisperx. Without this, prints a dry-run plan.",
     )
     p.add_argument("--refresh", action="store_true", help="Re-download/regenerate even if outputs already exist.")
+    p.add_argument(
+        "--dedup-media",
+        action="store_true",
+        help="Reuse an existing VTT when the same media was already transcribed under another feed/slug (default).",
+    )
+    p.add_argument(
+        "--no-dedup-media",
+        dest="dedup_media",
+        action="store_false",
+        help="Disable the media fingerprint index (always transcribe).",
+    )
+    p.set_defaults(dedup_media=True)
+    p.add_argument(
+        "--speech-trim",
+        action="store_true",
+        help="Cut long music/silence runs (>=20s) out of the audio before ASR and map cue times back (default).",
+    )
+    p.add_argument(
+        "--no-speech-trim",
+        dest="speech_trim",
+        action="store_false",
+        help="Send the full decoded audio to the backend.",
+    )
+    p.set_defaults(speech_trim=True)
     p.add_argument("--timeout-seconds", type=int, default=45, help="Per-download timeout (default: 45).")
     p.add_argument("--user-agent", default="vodcasts-transcripts/1.0", help="HTTP user-agent for downloads.")
 
@@ -363,9 +427,16 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument(
         "--backend",
         default="whisperx",
-        choices=["whisperx", "parakeet", "moonshine"],
-        help="Transcription backend (default: whisperx). parakeet/moonshine run in-process, no worker.",
+        choices=["whisperx", "whisperx-cpu", "parakeet", "moonshine"],
+        help=(
+            "Transcription backend (default: whisperx). parakeet/moonshine run in-process, no worker. "
+            "whisperx-cpu runs int8 WhisperX workers pinned to CPU core groups (no GPU needed)."
+        ),
     )
+    p.add_argument("--cpu-instances", type=int, default=0, help="whisperx-cpu: model instances / core groups (0 = autotune from os.cpu_count()).")
+    p.add_argument("--cpu-threads", type=int, default=0, help="whisperx-cpu: threads per instance (0 = autotune, usually 4).")
+    p.add_argument("--cpu-batch-size", type=int, default=0, help="whisperx-cpu: batch size per instance (0 = autotune from threads).")
+    p.add_argument("--cpu-compute-type", default="int8", help="whisperx-cpu: compute type (default: int8).")
 
     # Failure review clips: kept only when generated transcripts fail sanity / generation.
     p.add_argument("--spot-check-every", type=int, default=0, help="Deprecated compatibility flag; normal runs no longer sample successful spot-check MP3s.")
@@ -919,9 +990,17 @@ def _generate_transcript(
     spot_seconds: int,
     spot_bitrate: str,
     execute: bool,
+    dedup: MediaDedupIndex | None = None,
+    dedup_probe: DedupProbe | None = None,
+    dedup_owner: tuple[str, str] = ("", ""),
+    speech_trim: bool = False,
 ) -> tuple[str, str]:
     """
     Returns (srt_text, vtt_text). Never returns empty; raises if no speech detected.
+
+    With a dedup index, an already-transcribed duplicate (same bytes, or same audio envelope)
+    short-circuits before download/ASR and returns that episode's VTT instead.
+    With speech_trim, long music/silence runs are cut before ASR and cue times mapped back.
     """
     if not execute:
         # dry-run placeholder
@@ -935,6 +1014,19 @@ def _generate_transcript(
         u = media_url.lower()
         resolved_u = media_input.lower()
         should_prefetch = resolved_u.startswith(("http://", "https://")) and ".m3u8" not in resolved_u and _looks_like_direct_media_url(resolved_u)
+        if dedup is not None and dedup_probe is not None and should_prefetch:
+            with _timed("dedup_range_probe"):
+                hit = dedup.match_remote(
+                    dedup_probe,
+                    media_input,
+                    exclude=dedup_owner,
+                    timeout_seconds=int(_MEDIA_PROBE_MAX_TIME_SECONDS),
+                    user_agent="vodcasts-transcripts/1.0",
+                )
+            if hit is not None:
+                dedup_probe.reused_from = hit
+                print(f"[dedup] same media bytes as {hit[0]}/{hit[1]}; reusing its transcript")
+                return "", dedup.vtt_path(hit).read_text(encoding="utf-8", errors="replace")
         if should_prefetch:
             media_path = tmp / "media"
             try:
@@ -1010,6 +1102,14 @@ def _generate_transcript(
                 execute=True,
             )
 
+        if dedup is not None and dedup_probe is not None:
+            with _timed("dedup_audio_fingerprint"):
+                hit = dedup.match_audio(dedup_probe, wav_path, exclude=dedup_owner)
+            if hit is not None:
+                dedup_probe.reused_from = hit
+                print(f"[dedup] same audio as {hit[0]}/{hit[1]}; reusing its transcript")
+                return "", dedup.vtt_path(hit).read_text(encoding="utf-8", errors="replace")
+
         if spot_mp3_path is not None:
             spot_mp3_path.parent.mkdir(parents=True, exist_ok=True)
             _run(
@@ -1033,10 +1133,28 @@ def _generate_transcript(
                 execute=True,
             )
 
+        asr_path = wav_path
+        speech_map = None
+        if speech_trim:
+            with _timed("speech_regions"):
+                regions = detect_speech_regions(wav_path)
+                total_sec = wav_seconds(wav_path)
+            kept_sec = sum(b - a for a, b in regions or [])
+            if regions == []:
+                # Analysis found nothing speech-like; let the backend's own VAD decide.
+                print("[vad] no speech-like regions found; sending full audio")
+            elif regions and kept_sec < total_sec * _SPEECH_TRIM_MIN_SAVING:
+                asr_path = tmp / "speech.wav"
+                speech_map = write_trimmed_wav(wav_path, asr_path, regions)
+                print(f"[vad] regions={len(regions)} kept={kept_sec:.0f}s of {total_sec:.0f}s ({kept_sec / max(1.0, total_sec):.0%})")
+
         with _timed("transcribe"):
-            srt_text, vtt_text = backend.transcribe(wav_path, language)
+            srt_text, vtt_text = backend.transcribe(asr_path, language)
         srt_text, vtt_text = coerce_subtitle_output(srt_text, vtt_text)
         _ensure_non_empty_transcript(srt_text, vtt_text)
+        if speech_map is not None:
+            srt_text = remap_subtitle_timestamps(srt_text, speech_map)
+            vtt_text = remap_subtitle_timestamps(vtt_text, speech_map)
         return srt_text, vtt_text or _srt_to_vtt(srt_text)
 
 
@@ -1058,6 +1176,8 @@ def _process_work_item(
     spot_check_seconds: int,
     spot_check_bitrate: str,
     sanity_failures: set[tuple[str, str]],
+    dedup: MediaDedupIndex | None = None,
+    speech_trim: bool = False,
 ) -> WorkOutcome:
     ep = item.ep
     ep_slug = _norm(ep.get("slug") or "")
@@ -1073,6 +1193,7 @@ def _process_work_item(
     spotcheck_count = 0
     errors = 0
     dead_media = False
+    deduped_count = 0
     spot_mp3: Path | None = None
 
     try:
@@ -1106,13 +1227,14 @@ def _process_work_item(
         elif item.action == "generate":
             if not media_url:
                 raise ValueError("planned generate but missing media url")
-            if require_cuda and not bool(execute):
+            if not bool(execute):
                 chosen = "generated"
             else:
                 if require_cuda:
                     print("[gpu] require_cuda=1 device=cuda (no cpu fallback)")
                 print(f"[gen] {item.src.id}/{ep_slug}: whisperx from media {media_url}")
 
+                probe = DedupProbe(media_url=media_url) if dedup is not None else None
                 srt_text, vtt_text = _generate_transcript(
                     backend=backend,
                     media_url=media_url,
@@ -1122,6 +1244,10 @@ def _process_work_item(
                     spot_seconds=int(spot_check_seconds or 600),
                     spot_bitrate=str(spot_check_bitrate or "96k"),
                     execute=bool(execute),
+                    dedup=dedup,
+                    dedup_probe=probe,
+                    dedup_owner=(item.src.id, ep_slug),
+                    speech_trim=speech_trim,
                 )
 
                 vtt_out = vtt_text or (_srt_to_vtt(srt_text) if srt_text else "")
@@ -1142,8 +1268,14 @@ def _process_work_item(
                     raise GeneratedTranscriptRejected("generated subtitles failed transcript sanity")
                 with _timed("write_vtt"):
                     _write_text(final_vtt, vtt_out, execute=bool(execute))
-                chosen = "generated"
-                generated_count += 1
+                if dedup is not None and probe is not None and bool(execute):
+                    dedup.record((item.src.id, ep_slug), probe)
+                if probe is not None and probe.reused_from is not None:
+                    chosen = "deduped"
+                    deduped_count += 1
+                else:
+                    chosen = "generated"
+                    generated_count += 1
         else:
             raise ValueError(f"unknown action: {item.action}")
 
@@ -1196,12 +1328,13 @@ def _process_work_item(
         if item.action == "download" and bool(generate_missing) and media_url:
             if (item.src.id, ep_slug) in sanity_failures:
                 print(f"[skip] {item.src.id}/{ep_slug}: in transcript-sanity-failures (remove to retry)")
-            elif require_cuda and not bool(execute):
+            elif not bool(execute):
                 pass
             else:
                 why = "rejected" if is_reject else "download failed"
                 print(f"[fallback] {item.src.id}/{ep_slug}: generating because provided transcript {why}")
                 try:
+                    probe = DedupProbe(media_url=media_url) if dedup is not None else None
                     srt_text, vtt_text = _generate_transcript(
                         backend=backend,
                         media_url=media_url,
@@ -1211,6 +1344,10 @@ def _process_work_item(
                         spot_seconds=int(spot_check_seconds or 600),
                         spot_bitrate=str(spot_check_bitrate or "96k"),
                         execute=bool(execute),
+                        dedup=dedup,
+                        dedup_probe=probe,
+                        dedup_owner=(item.src.id, ep_slug),
+                        speech_trim=speech_trim,
                     )
                     vtt_out = vtt_text or (_srt_to_vtt(srt_text) if srt_text else "")
                     vtt_out = _normalize_vtt_timestamp_commas(vtt_out)
@@ -1230,8 +1367,14 @@ def _process_work_item(
                         raise GeneratedTranscriptRejected("fallback generated subtitles failed transcript sanity")
                     with _timed("write_vtt"):
                         _write_text(final_vtt, vtt_out, execute=bool(execute))
-                    chosen = "generated"
-                    generated_count += 1
+                    if dedup is not None and probe is not None and bool(execute):
+                        dedup.record((item.src.id, ep_slug), probe)
+                    if probe is not None and probe.reused_from is not None:
+                        chosen = "deduped"
+                        deduped_count += 1
+                    else:
+                        chosen = "generated"
+                        generated_count += 1
                 except MediaDownloadError as e2:
                     errors += 1
                     chosen = "error"
@@ -1278,6 +1421,7 @@ def _process_work_item(
         spotcheck_count=spotcheck_count,
         errors=errors,
         dead_media=dead_media,
+        deduped_count=deduped_count,
     )
 
 
@@ -1368,7 +1512,8 @@ def main() -> None:
     if only_episode_slug:
         print(f"[plan] filter: episode_slug={only_episode_slug}")
 
-    require_cuda = bool(args.generate_missing)
+    backend_name = str(args.backend or "whisperx").strip().lower()
+    require_cuda = bool(args.generate_missing) and backend_name != "whisperx-cpu"
     whisperx_device = _norm(args.whisperx_device or "cuda").lower()
     if require_cuda and whisperx_device != "cuda":
         raise ValueError("CUDA is required for generation; --whisperx-device must be 'cuda'.")
@@ -1381,7 +1526,6 @@ def main() -> None:
     if sanity_failures:
         print(f"[plan] transcript_sanity_failures={len(sanity_failures)} (skip listed until removed from {_TRANSCRIPT_SANITY_FAILURES_PATH.name})")
 
-    backend_name = str(args.backend or "whisperx").strip().lower()
     if backend_name == "whisperx":
         backend = get_backend(
             "whisperx",
@@ -1392,6 +1536,18 @@ def main() -> None:
             compute_type=str(args.whisperx_compute_type),
             extra_args=str(args.whisperx_extra_args),
         )
+    elif backend_name == "whisperx-cpu":
+        backend = get_backend(
+            "whisperx-cpu",
+            model=str(args.whisperx_model),
+            language=str(args.language),
+            instances=int(args.cpu_instances or 0),
+            threads=int(args.cpu_threads or 0),
+            batch_size=int(args.cpu_batch_size or 0),
+            compute_type=str(args.cpu_compute_type or "int8"),
+            extra_args=str(args.whisperx_extra_args),
+        )
+        print(f"[plan] cpu_profile={json.dumps(backend.profile.to_payload())}")
     elif backend_name == "parakeet":
         backend = get_backend("parakeet", device="cuda", config="balanced")
     elif backend_name == "moonshine":
@@ -1400,6 +1556,15 @@ def main() -> None:
         raise ValueError(f"unknown backend: {backend_name!r}")
     print(f"[plan] backend={backend_name}")
 
+    dedup: MediaDedupIndex | None = None
+    if bool(args.dedup_media) and bool(args.generate_missing):
+        dedup = MediaDedupIndex(
+            cache_dir / "media-fingerprints.json",
+            out_dir=out_dir,
+            is_complete=lambda p: _vtt_file_seems_complete(p, min_chars=_EXISTING_VTT_MIN_CHARS, min_words=_EXISTING_VTT_MIN_WORDS),
+        )
+        print(f"[plan] dedup_media=1 index={dedup.path}")
+
     missing_feed = 0
     skipped_existing = 0
     skipped_sanity_failure = 0
@@ -1408,6 +1573,11 @@ def main() -> None:
     planned_generate = 0
     planned_missed = 0
 
+    use_planner = bool(args.plan) or float(args.budget_hours or 0) > 0
+    # The planner sees every candidate and applies --max-episodes-total after scoring.
+    collect_limit = 0 if use_planner else max_total
+    feed_coverage: dict[str, float] = {}
+
     work: list[WorkItem] = []
     for src in sources:
         feed_path = feeds_cache_dir / f"{src.id}.xml"
@@ -1419,6 +1589,10 @@ def main() -> None:
         _features, channel_title, episodes, _image = parse_feed_for_manifest(xml_text, source_id=src.id, source_title=src.title)
 
         eps = [e for e in (episodes or []) if isinstance(e, dict)]
+        if use_planner:
+            feed_dir = out_dir / src.id
+            have = sum(1 for _ in feed_dir.glob("*.vtt")) if feed_dir.is_dir() else 0
+            feed_coverage[src.id] = min(1.0, have / float(max(1, len(eps))))
         # Prefer more recent entries when a feed's ordering is ambiguous.
         eps.sort(key=lambda e: _norm(e.get("dateText") or ""), reverse=True)
         max_per_feed = int(max_episodes_per_feed or 0)
@@ -1513,12 +1687,52 @@ def main() -> None:
             else:
                 planned_generate += 1
 
-            if max_total and len(work) >= max_total:
+            if collect_limit and len(work) >= collect_limit:
                 break
-        if max_total and len(work) >= max_total:
+        if collect_limit and len(work) >= collect_limit:
             break
 
-    if bool(args.prefer_shorter):
+    if use_planner:
+        feed_weights = {sid: 2.0 for sid in HIGH_VALUE_FEEDS}
+        feed_weights.update({sid: 0.6 for sid in WEAKER_FEEDS})
+        if str(args.feed_weights or "").strip():
+            raw_weights = json.loads(Path(args.feed_weights).read_text(encoding="utf-8"))
+            if not isinstance(raw_weights, dict):
+                raise ValueError(f"--feed-weights must be a JSON object of feed_id -> weight: {args.feed_weights}")
+            feed_weights.update({str(k): float(v) for k, v in raw_weights.items()})
+        selected, entries = plan_work(
+            work,
+            budget_hours=float(args.budget_hours or 0),
+            rtf=float(args.planner_rtf),
+            overhead_seconds=float(args.planner_overhead_seconds),
+            media_meta_doc=load_media_meta_cache(cache_dir),
+            feed_weights=feed_weights,
+            feed_coverage=feed_coverage,
+            max_items=max_total,
+        )
+        summary = plan_summary(
+            entries,
+            budget_hours=float(args.budget_hours or 0),
+            rtf=float(args.planner_rtf),
+            overhead_seconds=float(args.planner_overhead_seconds),
+        )
+        plan_out = Path(args.plan_out) if str(args.plan_out or "").strip() else (cache_dir / "transcripts-plan.json")
+        plan_out.parent.mkdir(parents=True, exist_ok=True)
+        plan_out.write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(
+            "[plan] "
+            + f"planner selected={len(selected)}/{len(work)} est_compute_h={summary['est_compute_hours']} "
+            + f"est_audio_h={summary['est_audio_hours']} budget_h={summary['budget_hours'] or 'none'} out={plan_out}"
+        )
+        work = selected
+        planned_download = sum(1 for w in work if w.action == "download")
+        planned_generate = len(work) - planned_download
+        planned_download_with_media_for_fallback = sum(
+            1
+            for w in work
+            if w.action == "download" and bool(args.generate_missing) and isinstance(w.ep.get("media"), dict) and _norm(w.ep["media"].get("url"))
+        )
+    elif bool(args.prefer_shorter):
         work.sort(
             key=lambda item: (
                 _duration_key(item.ep),
@@ -1536,7 +1750,7 @@ def main() -> None:
     )
 
     # Generation can also happen as a fallback when a provided transcript is rejected.
-    # All backends require CUDA/GPU; no CPU fallback.
+    # GPU backends require CUDA; only the explicit whisperx-cpu backend runs without it.
     if require_cuda and bool(args.execute) and (planned_generate > 0 or planned_download_with_media_for_fallback > 0):
         try:
             import torch  # type: ignore
@@ -1572,6 +1786,7 @@ def main() -> None:
     provided_count = 0
     rejected_provided = 0
     generated_count = 0
+    deduped_count = 0
     spotcheck_count = 0
     errors = 0
 
@@ -1602,6 +1817,9 @@ def main() -> None:
             max_workers = concurrency
         else:
             max_workers = _TRANSCRIPTION_CONCURRENCY if bool(args.execute) and bool(args.generate_missing) else 1
+            if backend_name == "whisperx-cpu" and bool(args.execute) and bool(args.generate_missing):
+                # One in-flight job per pinned core group keeps every instance busy.
+                max_workers = max(1, int(backend.profile.instances))
         pending = list(work)
         active_feeds: set[str] = set()
         future_to_item: dict[Future[WorkOutcome], WorkItem] = {}
@@ -1666,6 +1884,8 @@ def main() -> None:
                         spot_check_seconds=int(args.spot_check_seconds or 600),
                         spot_check_bitrate=str(args.spot_check_bitrate or "96k"),
                         sanity_failures=sanity_failures,
+                        dedup=dedup,
+                        speech_trim=bool(args.speech_trim),
                     )
                     future_to_item[fut] = item
 
@@ -1682,6 +1902,9 @@ def main() -> None:
                     provided_count += int(outcome.provided_count)
                     rejected_provided += int(outcome.rejected_provided)
                     generated_count += int(outcome.generated_count)
+                    deduped_count += int(outcome.deduped_count)
+                    if dedup is not None and bool(args.execute) and (outcome.generated_count or outcome.deduped_count):
+                        dedup.save()
                     spotcheck_count += int(outcome.spotcheck_count)
                     errors += int(outcome.errors)
                     _advance(f"{outcome.action}: {outcome.src_id}/{outcome.ep_slug}")
@@ -1697,6 +1920,8 @@ def main() -> None:
                 progress.stop()
             except Exception:
                 pass
+        if dedup is not None and bool(args.execute):
+            dedup.save()
 
     if bool(args.execute) and out_dir.exists():
         removed = 0
@@ -1712,7 +1937,7 @@ def main() -> None:
 
     print(
         "[done] "
-        + f"processed={processed} provided={provided_count} rejected_provided={rejected_provided} generated={generated_count} "
+        + f"processed={processed} provided={provided_count} rejected_provided={rejected_provided} generated={generated_count} deduped={deduped_count} "
         + f"spotcheck_mp3={spotcheck_count} skipped_dead_media={skipped_dead_media} dead_feeds={len(dead_media_feeds)} "
         + f"skipped_existing={skipped_existing} missing_feed={missing_feed} errors={errors}"
     )
@@ -0,0 +1,177 @@
+"""Cost/value planner for the transcript work list.
+
+Cost is estimated compute seconds: audio seconds (from durationSec, else media bytes from the feed
+enclosure or media-meta.json, else a default) x backend RTF + a fixed per-item overhead for
+download/decode. Provided-transcript downloads cost only the overhead.
+
+Value multiplies feed weight (HIGH_VALUE/WEAKER feeds or a popularity JSON), a coverage boost for
+feeds with few transcripts so far, and recency decay. Items are scheduled greedily by value per
+compute-hour, with diminishing returns for a feed's later episodes, until the budget is spent.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Iterable
+
+from scripts.media_probe import get_cached_meta
+
+# Rough average bitrates used only to turn enclosure bytes into an audio-seconds estimate.
+_AUDIO_BYTES_PER_SEC = 16_000  # ~128 kbps
+_VIDEO_BYTES_PER_SEC = 150_000  # ~1.2 Mbps
+_DEFAULT_AUDIO_SECONDS = 45 * 60  # typical service/sermon when nothing is known
+_DOWNLOAD_ACTION_COST_SECONDS = 5.0
+_RECENCY_HALF_LIFE_DAYS = 120.0
+_FEED_RANK_DECAY = 0.85
+
+
+@dataclass(frozen=True)
+class PlanEntry:
+    src_id: str
+    ep_slug: str
+    action: str
+    audio_seconds: float
+    cost_seconds: float
+    cost_source: str  # duration|bytes|media_meta|default|download
+    feed_weight: float
+    coverage_boost: float
+    recency: float
+    rank_decay: float
+    value: float
+    score: float  # value per compute-hour
+    selected: bool = False
+
+
+def _episode_date(ep: dict[str, Any]) -> date | None:
+    raw = re.sub(r"[^0-9]", "", str(ep.get("dateText") or ""))
+    if len(raw) < 8:
+        return None
+    try:
+        return date(int(raw[:4]), int(raw[4:6]), int(raw[6:8]))
+    except ValueError:
+        return None
+
+
+def estimate_audio_seconds(ep: dict[str, Any], media_meta_doc: dict[str, Any] | None) -> tuple[float, str]:
+    try:
+        dur = int(ep.get("durationSec") or 0)
+    except (TypeError, ValueError):
+        dur = 0
+    if dur > 0:
+        return float(dur), "duration"
+
+    media = ep.get("media") if isinstance(ep.get("media"), dict) else {}
+    url = str(media.get("url") or "").strip()
+    # Stale entries are still fine for a cost estimate.
+    cached = get_cached_meta(media_meta_doc or {}, url, max_age_days=3650) if url else None
+    if cached is not None and cached.duration_sec:
+        return float(cached.duration_sec), "media_meta"
+
+    nbytes = media.get("bytes") if isinstance(media.get("bytes"), int) and media.get("bytes") > 0 else None
+    source = "bytes"
+    if nbytes is None and cached is not None and cached.bytes:
+        nbytes, source = cached.bytes, "media_meta"
+    if nbytes:
+        is_video = bool(media.get("pickedIsVideo")) or str(media.get("type") or "").lower().startswith("video/")
+        rate = _VIDEO_BYTES_PER_SEC if is_video else _AUDIO_BYTES_PER_SEC
+        return float(nbytes) / float(rate), source
+    return float(_DEFAULT_AUDIO_SECONDS), "default"
+
+
+def plan_work(
+    items: Iterable[Any],
+    *,
+    budget_hours: float,
+    rtf: float,
+    overhead_seconds: float,
+    media_meta_doc: dict[str, Any] | None,
+    feed_weights: dict[str, float],
+    feed_coverage: dict[str, float],
+    max_items: int = 0,
+    today: date | None = None,
+) -> tuple[list[Any], list[PlanEntry]]:
+    """
+    Order and trim work items (anything with .src.id, .ep and .action).
+    Returns (selected items in schedule order, plan entries for every item).
+    budget_hours <= 0 / max_items <= 0 mean no limit (everything is scheduled, best value first).
+    """
+    today = today or date.today()
+    scored: list[tuple[Any, PlanEntry]] = []
+    for item in items:
+        ep = item.ep
+        if item.action == "download":
+            audio_seconds, cost_source = 0.0, "download"
+            cost = _DOWNLOAD_ACTION_COST_SECONDS
+        else:
+            audio_seconds, cost_source = estimate_audio_seconds(ep, media_meta_doc)
+            cost = audio_seconds * max(0.0, float(rtf)) + max(0.0, float(overhead_seconds))
+        d = _episode_date(ep)
+        age_days = max(0, (today - d).days) if d else 365 * 2
+        recency = math.pow(0.5, age_days / _RECENCY_HALF_LIFE_DAYS)
+        weight = float(feed_weights.get(item.src.id, 1.0))
+        # A feed with no transcripts yet gets up to 2x; a fully covered feed gets no boost.
+        coverage_boost = 1.0 + (1.0 - max(0.0, min(1.0, float(feed_coverage.get(item.src.id, 0.0)))))
+        value = weight * coverage_boost * (0.25 + 0.75 * recency)
+        scored.append(
+            (
+                item,
+                PlanEntry(
+                    src_id=item.src.id,
+                    ep_slug=str(ep.get("slug") or ""),
+                    action=item.action,
+                    audio_seconds=round(audio_seconds, 1),
+                    cost_seconds=round(cost, 1),
+                    cost_source=cost_source,
+                    feed_weight=weight,
+                    coverage_boost=round(coverage_boost, 3),
+                    recency=round(recency, 3),
+                    rank_decay=1.0,
+                    value=value,
+                    score=0.0,
+                ),
+            )
+        )
+
+    # Diminishing returns within a feed: its k-th best item (by own ratio) is worth decay^k.
+    by_feed: dict[str, list[tuple[Any, PlanEntry]]] = {}
+    for pair in scored:
+        by_feed.setdefault(pair[1].src_id, []).append(pair)
+    ranked: list[tuple[Any, PlanEntry]] = []
+    for pairs in by_feed.values():
+        pairs.sort(key=lambda p: p[1].value / max(1.0, p[1].cost_seconds), reverse=True)
+        for k, (item, ent) in enumerate(pairs):
+            decay = math.pow(_FEED_RANK_DECAY, k)
+            value = ent.value * decay
+            score = value / max(1.0, ent.cost_seconds) * 3600.0
+            ranked.append((item, PlanEntry(**{**asdict(ent), "rank_decay": round(decay, 3), "value": round(value, 4), "score": round(score, 3)})))
+    ranked.sort(key=lambda p: (-p[1].score, p[1].src_id, p[1].ep_slug))
+
+    budget = float(budget_hours) * 3600.0 if float(budget_hours or 0) > 0 else math.inf
+    spent = 0.0
+    selected: list[Any] = []
+    entries: list[PlanEntry] = []
+    for item, ent in ranked:
+        if spent + ent.cost_seconds <= budget and not (max_items > 0 and len(selected) >= max_items):
+            spent += ent.cost_seconds
+            selected.append(item)
+            ent = PlanEntry(**{**asdict(ent), "selected": True})
+        entries.append(ent)
+    return selected, entries
+
+
+def plan_summary(entries: list[PlanEntry], *, budget_hours: float, rtf: float, overhead_seconds: float) -> dict[str, Any]:
+    chosen = [e for e in entries if e.selected]
+    return {
+        "budget_hours": float(budget_hours or 0),
+        "rtf": float(rtf),
+        "overhead_seconds": float(overhead_seconds),
+        "items_total": len(entries),
+        "items_selected": len(chosen),
+        "est_compute_hours": round(sum(e.cost_seconds for e in chosen) / 3600.0, 3),
+        "est_audio_hours": round(sum(e.audio_seconds for e in chosen) / 3600.0, 3),
+        "value_selected": round(sum(e.value for e in chosen), 3),
+        "value_total": round(sum(e.value for e in entries), 3),
+        "items": [asdict(e) for e in entries],
+    }
@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 """Explore podcastindex_feeds.db for video-heavy sectors (non-church).
 Outputs sector suggestions for SECTOR_SUGGESTIONS.md.
+Queries the derived index (scripts/podcastindex_index.py), built once per dump on first run.
 
 Usage:
-  python scripts/explore_podcastindex_sectors.py [--limit N] [--min-pop N]
+  python scripts/candidate-explorer/explore_podcastindex_sectors.py [--limit N] [--min-pop N]
 """
 from __future__ import annotations
 
 import argparse
-import re
-import sqlite3
+import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[1]
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.podcastindex_index import DEFAULT_INDEX_PATH, fts_match, open_index
+
 DB_PATH = ROOT / "podcastindex-feeds" / "podcastindex_feeds.db"
 
 # Exclude church/religion - we already have that
@@ -22,16 +27,6 @@ EXCLUDED_TERMS = [
     "gospel", "faith", "evangel", "baptist", "methodist", "catholic", "orthodox",
 ]
 
-# Video enclosure URL patterns
-VIDEO_PATTERNS = (".mp4", ".m4v", ".webm", ".mov", ".m3u8")
-
-
-def is_video_enclosure(url: str) -> bool:
-    if not url:
-        return False
-    u = url.lower()
-    return any(p in u for p in VIDEO_PATTERNS)
-
 
 def main() -> None:
     parser = argparse.ArgumentParser()
@@ -39,29 +34,26 @@ def main() -> None:
     parser.add_argument("--min-pop", type=int, default=3, help="Min popularityScore")
     args = parser.parse_args()
 
-    if not DB_PATH.exists():
+    if not DB_PATH.exists() and not DEFAULT_INDEX_PATH.exists():
         print(f"DB not found: {DB_PATH}")
         return
 
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
+    conn = open_index(DEFAULT_INDEX_PATH, db_path=DB_PATH)
 
-    base_where = (
-        "dead = 0 and lastHttpStatus = 200 and episodeCount >= 5 "
-        "and contentType like '%xml%' and url <> '' and popularityScore >= ?"
-    )
+    # The index only holds live feeds (dead = 0, HTTP 200, XML, non-empty url).
+    base_where = "f.episode_count >= 5 and f.popularity >= ?"
     params = [args.min_pop]
+    excluded_sql = ",".join(f"'{c}'" for c in sorted(EXCLUDED_CATEGORIES))
 
     # 1. Category distribution (all feeds)
     print("=== Categories by feed count (excluding religion) ===\n")
     cur = conn.execute(
-        """
-        SELECT category1 as cat, count(*) as cnt
-        FROM podcasts
-        WHERE """ + base_where + """
-        AND category1 IS NOT NULL AND trim(category1) != ''
-        AND lower(trim(category1)) NOT IN ('religion', 'spirituality', 'christianity', 'buddhism', 'hinduism')
-        GROUP BY lower(trim(category1))
+        f"""
+        SELECT f.category as cat, count(*) as cnt
+        FROM feeds f
+        WHERE {base_where}
+        AND f.category != '' AND f.category NOT IN ({excluded_sql})
+        GROUP BY f.category
         ORDER BY cnt DESC
         LIMIT 60
         """,
@@ -74,52 +66,25 @@ def main() -> None:
         categories.append((cat, cnt))
         print(f"  {cnt:>6}  {cat}")
 
-    # 2. Video feeds by category (newestEnclosureUrl has video ext)
+    # 2. Video feeds by category (newest enclosure URL is video)
     print("\n=== Video feeds by category (enclosure URL = video) ===\n")
     video_by_cat: dict[str, int] = {}
-    # Use a subquery with limit for performance
     cur = conn.execute(
         f"""
-        SELECT category1, category2, category3
-        FROM (
-            SELECT id, category1, category2, category3, newestEnclosureUrl
-            FROM podcasts
-            WHERE {base_where}
-            AND newestEnclosureUrl IS NOT NULL AND newestEnclosureUrl != ''
-            LIMIT {args.limit}
-        )
-        """,
-        params,
-    )
-    for row in cur.fetchall():
-        url = row[2] if len(row) > 2 else ""  # Actually we need newestEnclosureUrl
-        # Fix: we need to select newestEnclosureUrl
-        pass
-
-    # Re-query with correct columns
-    cur = conn.execute(
-        f"""
-        SELECT category1, category2, category3, newestEnclosureUrl
-        FROM podcasts
-        WHERE {base_where}
-        AND newestEnclosureUrl IS NOT NULL AND newestEnclosureUrl != ''
+        SELECT f.categories
+        FROM feeds f
+        WHERE {base_where} AND f.is_video = 1
         LIMIT {args.limit}
         """,
         params,
     )
     for row in cur.fetchall():
-        c1 = (row[0] or "").strip().lower()
-        c2 = (row[1] or "").strip().lower()
-        c3 = (row[2] or "").strip().lower()
-        url = row[3] or ""
-        if not is_video_enclosure(url):
-            continue
+        cats = [c.strip().lower() for c in (row[0] or "").split("|")[:3] if c.strip()]
         # Skip religion
-        if any(ex in c1 or ex in c2 or ex in c3 for ex in EXCLUDED_CATEGORIES):
+        if any(ex in c for ex in EXCLUDED_CATEGORIES for c in cats):
             continue
-        for c in [c1, c2, c3]:
-            if c:
-                video_by_cat[c] = video_by_cat.get(c, 0) + 1
+        for c in cats:
+            video_by_cat[c] = video_by_cat.get(c, 0) + 1
 
     for cat, cnt in sorted(video_by_cat.items(), key=lambda x: -x[1])[:40]:
         print(f"  {cnt:>5}  {cat}")
@@ -143,48 +108,30 @@ def main() -> None:
 
     sector_samples: dict[str, list[dict]] = {}
     for sector_name, terms in sectors:
-        term_sql = " or ".join(
-            "lower(coalesce(title,'')||' '||coalesce(description,'')||' '||coalesce(category1,'')||coalesce(category2,'')||coalesce(category3,'')) like ?"
-            for _ in terms
-        )
-        term_params = [f"%{t}%" for t in terms] + params
+        # Church terms are excluded in the FTS query itself (title/description/author/categories).
+        match = fts_match(terms, exclude=EXCLUDED_TERMS, columns=("title", "description", "categories"))
         cur = conn.execute(
             f"""
-            SELECT id, url, title, description, episodeCount, popularityScore, category1, category2, category3, newestEnclosureUrl
-            FROM podcasts
+            SELECT f.id, f.url, f.title, f.episode_count, f.popularity, f.categories
+            FROM feeds f
             WHERE {base_where}
-            AND episodeCount >= 20
-            AND ({term_sql})
-            AND newestEnclosureUrl IS NOT NULL AND newestEnclosureUrl != ''
-            ORDER BY popularityScore DESC, episodeCount DESC
-            LIMIT 30
+            AND f.episode_count >= 20
+            AND f.is_video = 1
+            AND f.id IN (SELECT rowid FROM feeds_fts WHERE feeds_fts MATCH ?)
+            ORDER BY f.popularity DESC, f.episode_count DESC
+            LIMIT 15
             """,
-            term_params,
+            params + [match],
         )
-        rows = cur.fetchall()
-        # Filter to video enclosures only
-        video_rows = [r for r in rows if is_video_enclosure(r["newestEnclosureUrl"])]
-        # Exclude church
-        video_rows = [
-            r
-            for r in video_rows
-            if not any(
-                ex in (r["title"] or "").lower()
-                or ex in ((r["description"] or "")[:500]).lower()
-                for ex in EXCLUDED_TERMS
-            )
-        ]
         sector_samples[sector_name] = [
             {
                 "title": r["title"],
                 "url": r["url"],
-                "episodeCount": r["episodeCount"],
-                "popularityScore": r["popularityScore"],
-                "categories": ", ".join(
-                    c for c in [r["category1"], r["category2"], r["category3"]] if c
-                ),
+                "episodeCount": r["episode_count"],
+                "popularityScore": r["popularity"],
+                "categories": ", ".join(c for c in (r["categories"] or "").split("|")[:3] if c),
             }
-            for r in video_rows[:15]
+            for r in cur.fetchall()
         ]
 
     for sector_name, samples in sector_samples.items():
@@ -1,29 +1,37 @@
 #!/usr/bin/env python3
 """Generate sector feed files from podcastindex_feeds.db.
-Video/mixed only (no audio-only). Excludes feeds already in existing feed files.
+Video/mixed only (no audio-only). Excludes feeds already in the primary feed files
+(via the feed registry, scripts/feed_registry.py).
 
 Outputs:
   feeds/leisure.md (~100) - leisure, hobbies, DIY, crafts, how-to, arts, photography, brewing, cooking
   feeds/news_extended.md (~200) - news, politics, business not in news.md
   feeds/education.md, feeds/technology.md, feeds/health.md, feeds/science.md, etc.
 
+Queries the derived index (scripts/podcastindex_index.py), built once per dump on first run.
+
 Usage:
-  python scripts/generate_sector_feeds.py
+  python scripts/candidate-explorer/generate_sector_feeds.py
 """
 from __future__ import annotations
 
 import re
 import sqlite3
+import sys
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[1]
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.feed_registry import canonical_url, load_registry
+from scripts.podcastindex_index import DEFAULT_INDEX_PATH, category_filter, open_index, topic_filter
+
 DB_PATH = ROOT / "podcastindex-feeds" / "podcastindex_feeds.db"
-FEEDS_DIR = ROOT / "feeds"
 CANDIDATES_DIR = ROOT / "feeds" / "candidates"
 
-# Video enclosure URL patterns - must have these (exclude audio-only)
-VIDEO_EXT = ("mp4", "m4v", "webm", "mov", "m3u8")
-EXCLUDE_CAT = ("religion", "spirituality", "christianity", "buddhism", "hinduism")
+EXCLUDE_CAT = ("religion", "spirituality", "christianity")
+EXCLUDE_HOSTS = ("castbox.fm", "ximalaya.com")
 
 
 def slugify(value: str, max_length: int = 80) -> str:
@@ -34,78 +42,55 @@ def slugify(value: str, max_length: int = 80) -> str:
 
 
 def load_existing_urls() -> set[str]:
-    """Normalize URLs from primary feed files (church, news, bonus, tech) for dedup."""
-    primary = {"church.md", "news.md", "bonus.md", "tech.md", "church-audio-only.md", "dev.md"}
-    urls = set()
-    for f in FEEDS_DIR.glob("*.md"):
-        if f.name not in primary or "content-slate-review" in str(f):
-            continue
-        text = f.read_text(encoding="utf-8")
-        for m in re.finditer(r"-\s*url:\s*(.+?)(?:\s*$|\s+#)", text, re.MULTILINE):
-            u = m.group(1).strip().lower()
-            u = re.sub(r"^https?://", "", u)
-            u = re.sub(r"/+$", "", u)
-            u = re.sub(r"\?.*$", "", u)  # strip query for dedup
-            if u and "disabled" not in text[max(0, m.start() - 200) : m.start()]:
-                urls.add(u)
-    return urls
-
-
-def is_video_url(url: str) -> bool:
-    if not url:
-        return False
-    u = url.lower()
-    return any(f".{ext}" in u or f".{ext}?" in u for ext in VIDEO_EXT)
+    """Canonical URLs (plus known redirect targets) of enabled feeds in the primary feed files."""
+    primary = ("church.md", "news.md", "bonus.md", "tech.md", "church-audio-only.md", "dev.md")
+    registry = load_registry()
+    return registry.url_keys(packs={f"feeds/{name}" for name in primary})
 
 
 def fetch_video_feeds(
     conn: sqlite3.Connection,
     exclude_urls: set[str],
-    category_conditions: list[str],
+    categories: list[str],
+    title_terms: list[str],
     limit: int,
     min_episodes: int = 5,
     min_pop: int = 4,
 ) -> list[dict]:
-    """Fetch video feeds matching category conditions."""
-    base = (
-        "dead=0 AND lastHttpStatus=200 AND episodeCount>=? AND popularityScore>=? "
-        "AND contentType LIKE '%xml%' AND url<>'' AND newestEnclosureUrl IS NOT NULL AND newestEnclosureUrl<>'' "
-        "AND (lower(newestEnclosureUrl) LIKE '%.mp4%' OR lower(newestEnclosureUrl) LIKE '%.m4v%' "
-        "OR lower(newestEnclosureUrl) LIKE '%.webm%' OR lower(newestEnclosureUrl) LIKE '%.mov%' "
-        "OR lower(newestEnclosureUrl) LIKE '%.m3u8%') "
-        "AND coalesce(lower(trim(category1)),'') NOT IN ('religion','spirituality','christianity') "
-        "AND coalesce(lower(trim(category2)),'') NOT IN ('religion','spirituality','christianity') "
-        "AND coalesce(lower(trim(category3)),'') NOT IN ('religion','spirituality','christianity') "
-        "AND (lower(host) NOT IN ('castbox.fm','ximalaya.com') OR host IS NULL)"
-    )
-    cat_sql = " OR ".join(f"({c})" for c in category_conditions)
+    """Fetch video feeds in any of `categories` or whose title matches any of `title_terms` (prefix match)."""
+    excluded_cat_sql, excluded_cat_params = category_filter(conn, EXCLUDE_CAT)
+    topic_sql, topic_params = topic_filter(conn, categories=categories, terms=title_terms)
     sql = f"""
-        SELECT url, title, episodeCount, popularityScore, category1, category2, category3
-        FROM podcasts
-        WHERE {base} AND ({cat_sql})
-        ORDER BY popularityScore DESC, episodeCount DESC
+        SELECT f.url, f.title, f.episode_count, f.popularity, f.categories
+        FROM feeds f
+        WHERE f.episode_count >= ? AND f.popularity >= ? AND f.is_video = 1
+        AND NOT {excluded_cat_sql}
+        AND f.host NOT IN ({','.join('?' for _ in EXCLUDE_HOSTS)})
+        AND {topic_sql}
+        ORDER BY f.popularity DESC, f.episode_count DESC
         LIMIT ?
     """
-    cur = conn.execute(sql, [min_episodes, min_pop, limit * 2])
-    rows = cur.fetchall()
+    params = [min_episodes, min_pop, *excluded_cat_params, *EXCLUDE_HOSTS, *topic_params, limit * 2]
+    rows = conn.execute(sql, params).fetchall()
     seen = set()
     out = []
     for r in rows:
         url = (r[0] or "").strip()
-        url_norm = re.sub(r"^https?://", "", url.lower()).split("?")[0].rstrip("/")
+        url_norm = canonical_url(url)
         if url_norm in exclude_urls:
             continue
         if url_norm in seen:
             continue
         seen.add(url_norm)
+        cats = (r[4] or "").split("|") + ["", "", ""]
         out.append({
             "url": url,
             "title": r[1] or "Unknown",
             "episodeCount": int(r[2] or 0),
             "popularityScore": int(r[3] or 0),
-            "category1": r[4] or "",
-            "category2": r[5] or "",
-            "category3": r[6] or "",
+            "category1": cats[0],
+            "category2": cats[1],
+            "category3": cats[2],
         })
         if len(out) >= limit:
             break
@@ -152,38 +137,32 @@ def write_feed_file(
 
 
 def main() -> None:
-    if not DB_PATH.exists():
+    if not DB_PATH.exists() and not DEFAULT_INDEX_PATH.exists():
         print(f"DB not found: {DB_PATH}")
         return
 
     exclude = load_existing_urls()
     print(f"Excluding {len(exclude)} existing feed URLs")
 
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
+    conn = open_index(DEFAULT_INDEX_PATH, db_path=DB_PATH)
 
     used_urls: set[str] = set()
 
-    def norm(u: str) -> str:
-        return re.sub(r"^https?://", "", u.lower()).split("?")[0].rstrip("/")
-
     def add_used(feeds: list[dict]) -> None:
         for f in feeds:
-            used_urls.add(norm(f["url"]))
+            used_urls.add(canonical_url(f["url"]))
 
     def exclude_used(feeds: list[dict]) -> list[dict]:
-        return [f for f in feeds if norm(f["url"]) not in used_urls]
+        return [f for f in feeds if canonical_url(f["url"]) not in used_urls]
 
     # --- LEISURE ---
     # leisure, hobbies, DIY, crafts, how-to, arts, photography, brewing, cooking
-    leisure_conds = [
-        "lower(category1) IN ('leisure','arts') OR lower(category2) IN ('leisure','arts')",
-        "lower(title) LIKE '%photography%' OR lower(title) LIKE '%cooking%' OR lower(title) LIKE '%brew%'",
-        "lower(title) LIKE '%diy%' OR lower(title) LIKE '%craft%' OR lower(title) LIKE '%hobby%'",
-        "lower(title) LIKE '%how-to%' OR lower(title) LIKE '%how to%'",
-        "lower(title) LIKE '%start cooking%' OR lower(title) LIKE '%art of photography%' OR lower(title) LIKE '%behind the shot%'",
+    leisure_cats = ["leisure", "arts"]
+    leisure_terms = [
+        "photography", "cooking", "brew", "diy", "craft", "hobby", "how-to", "how to",
+        "start cooking", "art of photography", "behind the shot",
     ]
-    leisure = fetch_video_feeds(conn, exclude, leisure_conds, 100, min_episodes=10, min_pop=4)
+    leisure = fetch_video_feeds(conn, exclude, leisure_cats, leisure_terms, 100, min_episodes=10, min_pop=4)
     leisure = exclude_used(leisure)
     add_used(leisure[:100])
     write_feed_file(
@@ -196,14 +175,12 @@ def main() -> None:
 
     # --- NEWS_EXTENDED (~200) ---
     # news, politics, business - exclude feeds already in news.md
-    news_conds = [
-        "lower(category1) IN ('news','government','society') OR lower(category2) IN ('news','government','society')",
-        "lower(title) LIKE '%news%' OR lower(title) LIKE '%politics%' OR lower(title) LIKE '%headlines%'",
-        "lower(title) LIKE '%business%' OR lower(title) LIKE '%market%' OR lower(title) LIKE '%economy%'",
-        "lower(title) LIKE '%bbc%' OR lower(title) LIKE '%npr%' OR lower(title) LIKE '%bloomberg%'",
-        "lower(title) LIKE '%fox%' OR lower(title) LIKE '%cnn%' OR lower(title) LIKE '%reuters%'",
+    news_cats = ["news", "government", "society"]
+    news_terms = [
+        "news", "politics", "headlines", "business", "market", "economy",
+        "bbc", "npr", "bloomberg", "fox", "cnn", "reuters",
     ]
-    news_ext = fetch_video_feeds(conn, exclude, news_conds, 200, min_episodes=5, min_pop=3)
+    news_ext = fetch_video_feeds(conn, exclude, news_cats, news_terms, 200, min_episodes=5, min_pop=3)
     news_ext = exclude_used(news_ext)
     add_used(news_ext[:200])
     write_feed_file(
@@ -215,12 +192,8 @@ def main() -> None:
     )
 
     # --- EDUCATION ---
-    edu_conds = [
-        "lower(category1) = 'education' OR lower(category2) = 'education'",
-        "lower(title) LIKE '%lecture%' OR lower(title) LIKE '%course%' OR lower(title) LIKE '%ted%'",
-        "lower(title) LIKE '%learning%' OR lower(title) LIKE '%esl%' OR lower(title) LIKE '%grammar%'",
-    ]
-    edu = fetch_video_feeds(conn, exclude, edu_conds, 80, min_episodes=15, min_pop=4)
+    edu_terms = ["lecture", "course", "ted", "learning", "esl", "grammar"]
+    edu = fetch_video_feeds(conn, exclude, ["education"], edu_terms, 80, min_episodes=15, min_pop=4)
     edu = exclude_used(edu)
     add_used(edu)
     write_feed_file(
@@ -232,11 +205,8 @@ def main() -> None:
     )
 
     # --- TECHNOLOGY (exclude tech.md) ---
-    tech_conds = [
-        "lower(category1) = 'technology' OR lower(category2) = 'technology'",
-        "lower(title) LIKE '%tech%' OR lower(title) LIKE '%software%' OR lower(title) LIKE '%developer%'",
-    ]
-    tech = fetch_video_feeds(conn, exclude, tech_conds, 60, min_episodes=10, min_pop=4)
+    tech_terms = ["tech", "software", "developer"]
+    tech = fetch_video_feeds(conn, exclude, ["technology"], tech_terms, 60, min_episodes=10, min_pop=4)
     tech = exclude_used(tech)
     add_used(tech)
     write_feed_file(
@@ -248,11 +218,8 @@ def main() -> None:
     )
 
     # --- BUSINESS ---
-    biz_conds = [
-        "lower(category1) = 'business' OR lower(category2) = 'business'",
-        "lower(title) LIKE '%real estate%' OR lower(title) LIKE '%trading%' OR lower(title) LIKE '%entrepreneur%'",
-    ]
-    biz = fetch_video_feeds(conn, exclude, biz_conds, 70, min_episodes=10, min_pop=4)
+    biz_terms = ["real estate", "trading", "entrepreneur"]
+    biz = fetch_video_feeds(conn, exclude, ["business"], biz_terms, 70, min_episodes=10, min_pop=4)
     biz = exclude_used(biz)
     add_used(biz)
     write_feed_file(
@@ -264,11 +231,8 @@ def main() -> None:
     )
 
     # --- HEALTH ---
-    health_conds = [
-        "lower(category1) = 'health' OR lower(category2) = 'health'",
-        "lower(title) LIKE '%nutrition%' OR lower(title) LIKE '%fitness%' OR lower(title) LIKE '%wellness%'",
-    ]
-    health = fetch_video_feeds(conn, exclude, health_conds, 25, min_episodes=10, min_pop=4)
+    health_terms = ["nutrition", "fitness", "wellness"]
+    health = fetch_video_feeds(conn, exclude, ["health"], health_terms, 25, min_episodes=10, min_pop=4)
     health = exclude_used(health)
     add_used(health)
     write_feed_file(
@@ -280,11 +244,8 @@ def main() -> None:
     )
 
     # --- SCIENCE ---
-    science_conds = [
-        "lower(category1) = 'science' OR lower(category2) = 'science'",
-        "lower(title) LIKE '%science%' OR lower(title) LIKE '%research%'",
-    ]
-    science = fetch_video_feeds(conn, exclude, science_conds, 25, min_episodes=10, min_pop=4)
+    science_terms = ["science", "research"]
+    science = fetch_video_feeds(conn, exclude, ["science"], science_terms, 25, min_episodes=10, min_pop=4)
     science = exclude_used(science)
     add_used(science)
     write_feed_file(
@@ -296,8 +257,7 @@ def main() -> None:
     )
 
     # --- KIDS & FAMILY ---
-    kids_conds = ["lower(category1) = 'kids' OR lower(category2) = 'kids'"]
-    kids = fetch_video_feeds(conn, exclude, kids_conds, 20, min_episodes=5, min_pop=3)
+    kids = fetch_video_feeds(conn, exclude, ["kids"], [], 20, min_episodes=5, min_pop=3)
     kids = exclude_used(kids)
     add_used(kids)
     write_feed_file(
@@ -309,8 +269,7 @@ def main() -> None:
     )
 
     # --- SPORTS ---
-    sports_conds = ["lower(category1) = 'sports' OR lower(category2) = 'sports'"]
-    sports = fetch_video_feeds(conn, exclude, sports_conds, 15, min_episodes=5, min_pop=3)
+    sports = fetch_video_feeds(conn, exclude, ["sports"], [], 15, min_episodes=5, min_pop=3)
     sports = exclude_used(sports)
     add_used(sports)
     write_feed_file(
@@ -322,8 +281,7 @@ def main() -> None:
     )
 
     # --- COMEDY ---
-    comedy_conds = ["lower(category1) = 'comedy' OR lower(category2) = 'comedy'"]
-    comedy = fetch_video_feeds(conn, exclude, comedy_conds, 15, min_episodes=5, min_pop=3)
+    comedy = fetch_video_feeds(conn, exclude, ["comedy"], [], 15, min_episodes=5, min_pop=3)
     comedy = exclude_used(comedy)
     add_used(comedy)
     write_feed_file(
@@ -335,8 +293,7 @@ def main() -> None:
     )
 
     # --- MUSIC ---
-    music_conds = ["lower(category1) = 'music' OR lower(category2) = 'music'"]
-    music = fetch_video_feeds(conn, exclude, music_conds, 15, min_episodes=5, min_pop=3)
+    music = fetch_video_feeds(conn, exclude, ["music"], [], 15, min_episodes=5, min_pop=3)
     music = exclude_used(music)
     add_used(music)
     write_feed_file(
@@ -348,11 +305,7 @@ def main() -> None:
     )
 
     # --- TV & FILM ---
-    tv_conds = [
-        "lower(category1) IN ('tv','arts') OR lower(category2) IN ('tv','arts')",
-        "lower(title) LIKE '%film%' OR lower(title) LIKE '%movie%'",
-    ]
-    tv = fetch_video_feeds(conn, exclude, tv_conds, 30, min_episodes=10, min_pop=4)
+    tv = fetch_video_feeds(conn, exclude, ["tv", "arts"], ["film", "movie"], 30, min_episodes=10, min_pop=4)
     tv = exclude_used(tv)
     add_used(tv)
     write_feed_file(
@@ -3,6 +3,10 @@
 Generate a bonus feeds config from feeds/complete.md by selecting feeds that are
 not present in other feed configs (by id or URL).
 
+Exclusions come from the feed registry (scripts/feed_registry.py), so `--exclude` packs and their
+includes are matched on canonical URLs (and known redirect targets) without reparsing each pack.
+Packs the registry does not cover (outside feeds/, or .json) are loaded directly instead.
+
 Intended workflow:
 - Keep feeds/church.md + feeds/tech.md + feeds/news.md + feeds/dev.md as primary.
 - Collect "extras" from feeds/complete.md into feeds/bonus.md for later review.
@@ -14,8 +18,9 @@ import argparse
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import urlsplit, urlunsplit
+from typing import Sequence
 
+from scripts.feed_registry import DEFAULT_REGISTRY_PATH, FeedRegistry, canonical_url, load_registry
 from scripts.shared import VODCASTS_ROOT
 from scripts.sources import Source, load_sources_config
 
@@ -35,6 +40,7 @@ def _parse_args() -> argparse.Namespace:
         help="Exclude feeds present in this config (repeatable).",
     )
     p.add_argument("--out", default=str(VODCASTS_ROOT / "feeds" / "bonus.md"), help="Output feeds config (.md).")
+    p.add_argument("--registry", default=str(DEFAULT_REGISTRY_PATH), help="Feed registry JSON (rebuilt incrementally).")
     p.add_argument(
         "--skip-category",
         action="append",
@@ -50,33 +56,23 @@ def _parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
-def _norm_url(url: str) -> str:
-    u = str(url or "").strip()
-    if not u:
-        return ""
-    try:
-        sp = urlsplit(u)
-    except Exception:
-        return u.lower().rstrip("/")
-    scheme = (sp.scheme or "http").lower()
-    netloc = (sp.netloc or "").lower()
-    path = (sp.path or "").rstrip("/")
-    return urlunsplit((scheme, netloc, path, "", ""))
-
-
 @dataclass(frozen=True)
 class BonusSelection:
     selected: list[Source]
     skipped: dict[str, int]
 
 
-def _select_bonus(complete: list[Source], excludes: list[list[Source]], *, skip_categories: set[str], exclude_suffix_2: bool) -> BonusSelection:
-    excluded_ids = set()
-    excluded_urls = set()
-    for group in excludes:
-        for s in group:
-            excluded_ids.add(s.id)
-            excluded_urls.add(_norm_url(s.feed_url))
+def _select_bonus(
+    complete: list[Source],
+    registry: FeedRegistry,
+    exclude_packs: set[str],
+    *,
+    extra_excluded: Sequence[Source] = (),
+    skip_categories: set[str],
+    exclude_suffix_2: bool,
+) -> BonusSelection:
+    excluded_ids = registry.slugs(packs=exclude_packs) | {s.id for s in extra_excluded}
+    excluded_urls = registry.url_keys(packs=exclude_packs) | {canonical_url(s.feed_url) for s in extra_excluded if s.feed_url}
 
     complete_ids = {s.id for s in complete}
 
@@ -95,7 +91,7 @@ def _select_bonus(complete: list[Source], excludes: list[list[Source]], *, skip_
         if s.id in excluded_ids:
             skipped["excluded_by_id"] += 1
             continue
-        nu = _norm_url(s.feed_url)
+        nu = canonical_url(s.feed_url)
         if nu in excluded_urls:
             skipped["excluded_by_url"] += 1
             continue
@@ -156,10 +152,29 @@ def _fmt_md(sources: list[Source]) -> str:
 def main() -> None:
     args = _parse_args()
     complete_cfg = load_sources_config(Path(args.complete))
-    exclude_cfgs = [load_sources_config(Path(p)).sources for p in (args.exclude or [])]
+    registry = load_registry(Path(args.registry))
+    exclude_packs = registry.pack_closure(args.exclude or [])
+    # Packs outside the registry's globs: parse them (with their includes) the old way.
+    extra_excluded: list[Source] = []
+    for key in sorted(exclude_packs - set(registry.packs)):
+        path = registry.root / key
+        if not path.exists():
+            print(f"[warn] exclude config not found: {key}")
+            continue
+        try:
+            extra_excluded.extend(load_sources_config(path).sources)
+        except Exception as e:
+            print(f"[warn] failed to load exclude config {key}: {e}")
     skip_cats = {str(x).strip() for x in (args.skip_category or []) if str(x).strip()}
 
-    sel = _select_bonus(complete_cfg.sources, exclude_cfgs, skip_categories=skip_cats, exclude_suffix_2=bool(args.exclude_suffix_2))
+    sel = _select_bonus(
+        complete_cfg.sources,
+        registry,
+        exclude_packs,
+        extra_excluded=extra_excluded,
+        skip_categories=skip_cats,
+        exclude_suffix_2=bool(args.exclude_suffix_2),
+    )
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     out_path.write_text(_fmt_md(sel.selected), encoding="utf-8")
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 import unicodedata
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterable
 from xml.etree import ElementTree as ET
 
 # Strip HTML tags and truncate for manifest short description.
@@ -217,6 +217,38 @@ def _pick_best_enclosure(cands: list[dict[str, Any]]) -> dict[str, Any] | None:
     return out
 
 
+def _item_enclosures(item: Any, *, is_atom: bool) -> list[dict[str, Any]]:
+    enclosures: list[dict[str, Any]] = []
+    # Some feeds (especially MRSS) nest enclosure-like elements inside groups; scan descendants.
+    it = item.iter() if hasattr(item, "iter") else list(item)
+    if is_atom:
+        for l in it:
+            if _local(l.tag).lower() != "link":
+                continue
+            rel = _attr(l, "rel").lower()
+            if rel and rel != "enclosure":
+                continue
+            href = _attr(l, "href")
+            if href:
+                enclosures.append({"url": href, "type": _attr(l, "type"), "length": _attr(l, "length")})
+    else:
+        for e in it:
+            if _local(e.tag).lower() != "enclosure":
+                continue
+            enclosures.append({"url": _attr(e, "url"), "type": _attr(e, "type"), "length": _attr(e, "length")})
+
+    it2 = item.iter() if hasattr(item, "iter") else list(item)
+    for m in it2:
+        if _local(m.tag).lower() != "content":
+            continue
+        tag0 = str(m.tag).lower()
+        if not (_ns(m.tag) == MEDIA_NS or "mrss" in tag0 or "media" in tag0):
+            continue
+        enclosures.append({"url": _attr(m, "url"), "type": _attr(m, "type"), "length": _attr(m, "fileSize") or _attr(m, "length")})
+
+    return enclosures
+
+
 def parse_feed_for_manifest(
     xml_text: str, *, source_id: str, source_title: str
 ) -> tuple[FeedFeatures, str, list[dict[str, Any]], str | None]:
@@ -340,35 +372,7 @@ def parse_feed_for_manifest(
                         if image_url:
                             break
 
-        # Enclosures
-        enclosures: list[dict[str, Any]] = []
-        # Some feeds (especially MRSS) nest enclosure-like elements inside groups; scan descendants.
-        it = item.iter() if hasattr(item, "iter") else list(item)
-        if is_atom:
-            for l in it:
-                if _local(l.tag).lower() != "link":
-                    continue
-                rel = _attr(l, "rel").lower()
-                if rel and rel != "enclosure":
-                    continue
-                href = _attr(l, "href")
-                if href:
-                    enclosures.append({"url": href, "type": _attr(l, "type"), "length": _attr(l, "length")})
-        else:
-            for e in it:
-                if _local(e.tag).lower() != "enclosure":
-                    continue
-                enclosures.append({"url": _attr(e, "url"), "type": _attr(e, "type"), "length": _attr(e, "length")})
-
-        it2 = item.iter() if hasattr(item, "iter") else list(item)
-        for m in it2:
-            if _local(m.tag).lower() != "content":
-                continue
-            tag0 = str(m.tag).lower()
-            if not (_ns(m.tag) == MEDIA_NS or "mrss" in tag0 or "media" in tag0):
-                continue
-            enclosures.append({"url": _attr(m, "url"), "type": _attr(m, "type"), "length": _attr(m, "fileSize") or _attr(m, "length")})
-
+        enclosures = _item_enclosures(item, is_atom=is_atom)
         media = _pick_best_enclosure(enclosures)
         if media and media.get("hasVideoInFeed"):
             has_video = True
@@ -484,3 +488,67 @@ def parse_feed_for_manifest(
         has_video=bool(has_video),
     )
     return features, channel_title, episodes, (channel_image_url or "").strip() or None
+
+
+class FeedEnclosureScanner:
+    """
+    Incremental form of scan_feed_enclosures for callers that receive the feed in pieces (e.g. an
+    async HTTP body): `feed()` each chunk until it returns True, then read `found`.
+    """
+
+    def __init__(self, *, limit: int) -> None:
+        self.limit = max(1, int(limit))
+        self.found: list[dict[str, Any]] = []
+        self._seen: set[str] = set()
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._is_atom: bool | None = None
+        self._broken = False
+
+    @property
+    def done(self) -> bool:
+        return self._broken or len(self.found) >= self.limit
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse one chunk; True once `limit` enclosures are found. ET.ParseError only if none were found yet."""
+        if self.done:
+            return True
+        try:
+            self._parser.feed(chunk)
+            for event, el in self._parser.read_events():
+                name = _local(el.tag).lower()
+                if event == "start":
+                    if self._is_atom is None:
+                        self._is_atom = name == "feed"
+                    continue
+                if name not in ("item", "entry"):
+                    continue
+                media = _pick_best_enclosure(_item_enclosures(el, is_atom=bool(self._is_atom)))
+                el.clear()
+                url = str((media or {}).get("url") or "")
+                if not url or url in self._seen:
+                    continue
+                self._seen.add(url)
+                self.found.append(media)
+                if self.done:
+                    return True
+        except ET.ParseError:
+            if not self.found:
+                raise
+            # Keep what was found before the XML broke; nothing after it can be trusted.
+            self._broken = True
+            return True
+        return False
+
+
+def scan_feed_enclosures(chunks: Iterable[bytes], *, limit: int) -> list[dict[str, Any]]:
+    """
+    Streaming scan for the first `limit` distinct episode enclosures (picked as in parse_feed_for_manifest).
+    Stops reading `chunks` as soon as enough are found, so huge feeds are not fully parsed.
+    Raises ET.ParseError only when the XML breaks before any enclosure was found.
+    """
+    scanner = FeedEnclosureScanner(limit=limit)
+    for chunk in chunks:
+        if scanner.feed(chunk):
+            break
+    return scanner.found
+
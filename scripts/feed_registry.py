@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+"""
+Feed registry: which feed URLs and slugs already exist, and in which packs.
+
+Every `feeds/*.md` and `feeds/candidates/*.md` pack is reduced to (slug, url, disabled) entries
+plus its `include` list. The result is persisted to `cache/feed-registry.json`. On load, only
+packs whose mtime/size changed are reparsed.
+
+URLs are compared in a canonical form:
+- scheme dropped, lowercased;
+- default ports, fragments, duplicate/trailing slashes and tracking params removed;
+- query params sorted.
+
+Redirect targets recorded by update_feeds (`fetched_url` in `cache/<env>/state.json`) are kept
+as aliases of the configured URL, so a candidate matching either one counts as existing.
+
+Usage:
+  python -m scripts.feed_registry [--check URL ...] [--force]
+"""
+
+import argparse
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from scripts.feeds_md import parse_feeds_markdown
+from scripts.shared import VODCASTS_ROOT
+
+DEFAULT_REGISTRY_PATH = VODCASTS_ROOT / "cache" / "feed-registry.json"
+DEFAULT_PACK_GLOBS = ("feeds/*.md", "feeds/candidates/*.md")
+DEFAULT_STATE_GLOB = "cache/*/state.json"
+REGISTRY_VERSION = 1
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+_HEADING_RE = re.compile(r"^(?P<level>#{1,6})\s+(?P<title>.+?)\s*$")
+_KV_RE = re.compile(r"^[-*+]\s*(?P<key>[A-Za-z0-9_]+)\s*:\s*(?P<val>.*)$")
+_URL_KEYS = {"url", "xmlurl", "xml_url", "feed", "feed_url", "feedurl"}
+
+
+def canonical_url(url: str) -> str:
+    """Scheme-less, lowercased URL key for dedup (`HTTP://Example.com:80/a/?b=2&a=1#x` -> `example.com/a?a=1&b=2`)."""
+    u = str(url or "").strip()
+    if not u:
+        return ""
+    if "://" not in u:
+        u = "http://" + u
+    try:
+        sp = urlsplit(u)
+        port = sp.port
+    except ValueError:
+        return re.sub(r"^[a-z]+://", "", u.lower()).rstrip("/")
+    host = (sp.hostname or "").lower()
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", sp.path or "").rstrip("/")
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(sp.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    out = host + path
+    if query:
+        out += "?" + urlencode(query)
+    return out.lower()
+
+
+def _is_disabled(value) -> bool:
+    return value not in (None, False, "", "false", "False", 0)
+
+
+def _scan_pack_lenient(text: str) -> tuple[list[dict], list[str]]:
+    """Line scan for packs the strict parser rejects (e.g. generated candidates with duplicate slugs)."""
+    feeds: list[dict] = []
+    includes: list[str] = []
+    top = ""
+    current: dict | None = None
+    for raw in text.splitlines():
+        line = raw.split("<!--", 1)[0].strip()
+        m = _HEADING_RE.match(line)
+        if m:
+            title = m.group("title").strip()
+            if title.lower() in ("feeds", "podcasts", "subscriptions"):
+                top, current = "feeds", None
+            elif len(m.group("level")) == 1:
+                top, current = title.lower(), None
+            elif top == "feeds":
+                current = {"slug": title, "url": "", "disabled": False}
+                feeds.append(current)
+            continue
+        km = _KV_RE.match(line)
+        if not km:
+            continue
+        key, val = km.group("key").lower(), km.group("val").strip()
+        if top == "feeds" and current is not None:
+            if key in _URL_KEYS:
+                current["url"] = val
+            elif key == "disabled":
+                current["disabled"] = _is_disabled(val) and val.lower() != "false"
+        elif key == "include":
+            includes = [p.strip() for p in re.split(r"[,;]", val) if p.strip()]
+    return [f for f in feeds if f["url"]], includes
+
+
+def _scan_pack(path: Path) -> tuple[list[dict], list[str]]:
+    text = path.read_text(encoding="utf-8", errors="replace")
+    try:
+        cfg = parse_feeds_markdown(text)
+    except ValueError:
+        return _scan_pack_lenient(text)
+    feeds = [
+        {"slug": str(f.get("slug") or "").strip(), "url": str(f.get("url") or "").strip(), "disabled": _is_disabled(f.get("disabled"))}
+        for f in cfg.get("feeds") or []
+        if isinstance(f, dict) and str(f.get("url") or "").strip()
+    ]
+    include = (cfg.get("defaults") or {}).get("include") or []
+    if isinstance(include, str):
+        include = [include]
+    return feeds, [str(x).strip() for x in include if str(x).strip()]
+
+
+def _scan_state(path: Path) -> dict[str, str]:
+    """canonical configured url -> canonical fetched url, for feeds update_feeds saw redirect."""
+    try:
+        feeds = json.loads(path.read_text(encoding="utf-8")).get("feeds") or {}
+    except Exception:
+        return {}
+    out: dict[str, str] = {}
+    for rec in feeds.values():
+        if not isinstance(rec, dict):
+            continue
+        src, dst = canonical_url(rec.get("url") or ""), canonical_url(rec.get("fetched_url") or "")
+        if src and dst and src != dst:
+            out[src] = dst
+    return out
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    pack: str
+    slug: str
+    url: str
+    disabled: bool
+
+
+class FeedRegistry:
+    def __init__(self, packs: dict[str, dict], redirects: dict[str, dict], *, root: Path = VODCASTS_ROOT) -> None:
+        self.root = root
+        self.packs = packs
+        self.by_url: dict[str, list[FeedEntry]] = {}
+        self.by_slug: dict[str, list[FeedEntry]] = {}
+        for pack, rec in packs.items():
+            for f in rec.get("feeds") or []:
+                entry = FeedEntry(pack=pack, slug=f["slug"], url=f["url"], disabled=bool(f.get("disabled")))
+                self.by_url.setdefault(canonical_url(entry.url), []).append(entry)
+                if entry.slug:
+                    self.by_slug.setdefault(entry.slug, []).append(entry)
+        self.aliases: dict[str, set[str]] = {}
+        for rec in redirects.values():
+            for src, dst in (rec.get("targets") or {}).items():
+                self.aliases.setdefault(src, set()).add(dst)
+                self.aliases.setdefault(dst, set()).add(src)
+
+    def pack_key(self, path: str | Path) -> str:
+        p = Path(path)
+        if not p.is_absolute():
+            p = self.root / p
+        try:
+            return p.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return p.resolve().as_posix()
+
+    def pack_closure(self, packs: Iterable[str | Path]) -> set[str]:
+        """Pack keys for `packs` plus everything they include (transitively)."""
+        out: set[str] = set()
+        todo = [self.pack_key(p) for p in packs]
+        while todo:
+            key = todo.pop()
+            if key in out:
+                continue
+            out.add(key)
+            base = (self.root / key).parent
+            for name in (self.packs.get(key) or {}).get("includes") or []:
+                todo.append(self.pack_key(base / name))
+        return out
+
+    def _entries(self, key: str) -> list[FeedEntry]:
+        found = list(self.by_url.get(key, ()))
+        for alias in self.aliases.get(key, ()):
+            found.extend(self.by_url.get(alias, ()))
+        return found
+
+    @staticmethod
+    def _keep(entry: FeedEntry, packs: set[str] | None, include_disabled: bool) -> bool:
+        return (packs is None or entry.pack in packs) and (include_disabled or not entry.disabled)
+
+    def lookup(self, url: str) -> list[FeedEntry]:
+        """All entries (any pack, including disabled) whose URL or redirect target matches `url`."""
+        return self._entries(canonical_url(url))
+
+    def contains(self, url: str, *, packs: set[str] | None = None, include_disabled: bool = False) -> bool:
+        return any(self._keep(e, packs, include_disabled) for e in self._entries(canonical_url(url)))
+
+    def url_keys(self, *, packs: set[str] | None = None, include_disabled: bool = False) -> set[str]:
+        """Canonical URLs (and their redirect aliases) present in `packs`; test with `canonical_url(u) in keys`."""
+        keys = {
+            key
+            for key, entries in self.by_url.items()
+            if any(self._keep(e, packs, include_disabled) for e in entries)
+        }
+        for key in list(keys):
+            keys.update(self.aliases.get(key, ()))
+        return keys
+
+    def slugs(self, *, packs: set[str] | None = None, include_disabled: bool = False) -> set[str]:
+        return {
+            slug
+            for slug, entries in self.by_slug.items()
+            if any(self._keep(e, packs, include_disabled) for e in entries)
+        }
+
+
+def _stamp(path: Path) -> list[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_registry(
+    path: Path = DEFAULT_REGISTRY_PATH,
+    *,
+    root: Path = VODCASTS_ROOT,
+    pack_globs: Iterable[str] = DEFAULT_PACK_GLOBS,
+    state_glob: str = DEFAULT_STATE_GLOB,
+    force: bool = False,
+    verbose: bool = False,
+) -> FeedRegistry:
+    """Load the persisted registry, rescanning packs and update_feeds state files that changed."""
+    doc: dict = {}
+    if path.exists() and not force:
+        try:
+            doc = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            doc = {}
+    if doc.get("version") != REGISTRY_VERSION:
+        doc = {}
+    old_packs: dict[str, dict] = doc.get("packs") or {}
+    old_redirects: dict[str, dict] = doc.get("redirects") or {}
+
+    changed = False
+    packs: dict[str, dict] = {}
+    for pattern in pack_globs:
+        for p in sorted(root.glob(pattern)):
+            key = p.relative_to(root).as_posix()
+            stamp = _stamp(p)
+            prev = old_packs.get(key)
+            if prev and prev.get("stamp") == stamp:
+                packs[key] = prev
+                continue
+            feeds, includes = _scan_pack(p)
+            packs[key] = {"stamp": stamp, "feeds": feeds, "includes": includes}
+            changed = True
+            if verbose:
+                print(f"[registry] scanned {key} ({len(feeds)} feeds)")
+    redirects: dict[str, dict] = {}
+    for p in sorted(root.glob(state_glob)):
+        key = p.relative_to(root).as_posix()
+        stamp = _stamp(p)
+        prev = old_redirects.get(key)
+        if prev and prev.get("stamp") == stamp:
+            redirects[key] = prev
+            continue
+        redirects[key] = {"stamp": stamp, "targets": _scan_state(p)}
+        changed = True
+    if set(packs) != set(old_packs) or set(redirects) != set(old_redirects):
+        changed = True
+
+    if changed:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"version": REGISTRY_VERSION, "packs": packs, "redirects": redirects}, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+    return FeedRegistry(packs, redirects, root=root)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Build/update the feed registry and check URLs against it.")
+    ap.add_argument("--registry", default=str(DEFAULT_REGISTRY_PATH), help="Registry JSON path.")
+    ap.add_argument("--force", action="store_true", help="Rescan every pack.")
+    ap.add_argument("--check", action="append", default=[], help="URL to look up (repeatable).")
+    args = ap.parse_args()
+
+    reg = load_registry(Path(args.registry), force=bool(args.force), verbose=True)
+    n_entries = sum(len(rec.get("feeds") or []) for rec in reg.packs.values())
+    n_aliases = sum(len(v) for v in reg.aliases.values()) // 2
+    print(f"[registry] packs={len(reg.packs)} entries={n_entries} urls={len(reg.by_url)} redirects={n_aliases}")
+    for url in args.check:
+        hits = reg.lookup(url)
+        print(f"{canonical_url(url)}: " + (", ".join(f"{e.pack}#{e.slug}{' (disabled)' if e.disabled else ''}" for e in hits) or "not found"))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,38 @@ from __future__ import annotations
 import hashlib
 import math
 import json
+import os
 import re
 import shutil
+import struct
 import subprocess
+import sys
+import tempfile
+from array import array
 from datetime import datetime, timezone
 from pathlib import Path
 
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
 _WORK_ROOT = Path(__file__).resolve().parent / ".work"
+_ANALYSIS_ROOT = _WORK_ROOT / "analysis"
 
-_SILENCE_START_RE = re.compile(r"silence_start:\s*([0-9.]+)")
-_SILENCE_END_RE = re.compile(r"silence_end:\s*([0-9.]+)\s*\|\s*silence_duration:\s*([0-9.]+)")
-_FRAME_TIME_RE = re.compile(r"frame:\s*\d+\s+pts:\s*\d+\s+pts_time:\s*([0-9.]+)")
-_SCENE_SCORE_RE = re.compile(r"lavfi\.scene_score=([0-9.]+)")
-_RMS_LEVEL_RE = re.compile(r"lavfi\.astats\.Overall\.RMS_level=([^\s]+)")
+_FRAME_TIME_RE = re.compile(r"frame:\s*\d+\s+pts:\s*-?\d+\s+pts_time:\s*([0-9.]+)")
+
+# Analysis sidecar: header + float32 peak/RMS dB per 10 ms audio frame + (float64 time, float32 score) per video frame.
+_ANALYSIS_MAGIC = b"MVEA"
+_ANALYSIS_VERSION = 2
+_ANALYSIS_HEADER = struct.Struct("<4sHHqqdII")  # magic, version, flags, size, mtime_ns, audio_start_sec, n_audio, n_video
+_ANALYSIS_SAMPLE_RATE = 48000
+_ANALYSIS_FRAME_SAMPLES = 480
+_ANALYSIS_FRAME_SEC = _ANALYSIS_FRAME_SAMPLES / _ANALYSIS_SAMPLE_RATE
+
+# Sampled scene detection: tiny frames for the histogram pass, a modest width for full-rate refinement.
+_SCENE_SAMPLE_SIZE = (64, 36)
+_SCENE_HIST_BINS = 16
+_SCENE_CANDIDATE_FACTOR = 0.6
+_SCENE_STATIC_EPS = 0.002
+_SCENE_REFINE_WIDTH = 320
 
 
 def utc_now_iso() -> str:
@@ -131,103 +148,357 @@ def probe_media(path: Path) -> dict:
     }
 
 
-def detect_silences(path: Path, threshold_db: float, min_silence_sec: float) -> list[tuple[float, float]]:
-    cmd = ["ffmpeg", "-hide_banner", "-i", str(path), "-af", f"silencedetect=n={threshold_db}dB:d={min_silence_sec}", "-f", "null", "-"]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-    if result.returncode not in {0, 255}:
-        stderr = (result.stderr or "").strip()
-        raise RuntimeError(stderr or "ffmpeg silencedetect failed")
+def analysis_sidecar_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:16]
+    return _ANALYSIS_ROOT / f"{safe_slug(Path(path).stem, default='media')}-{digest}.bin"
+
+
+def _read_analysis_sidecar(sidecar: Path, size: int, mtime_ns: int) -> dict | None:
+    try:
+        raw = sidecar.read_bytes()
+        magic, version, flags, cached_size, cached_mtime_ns, audio_start, n_audio, n_video = _ANALYSIS_HEADER.unpack_from(raw, 0)
+    except (OSError, struct.error):
+        return None
+    if magic != _ANALYSIS_MAGIC or version != _ANALYSIS_VERSION or cached_size != size or cached_mtime_ns != mtime_ns:
+        return None
+    offset = _ANALYSIS_HEADER.size
+    series: dict[str, array] = {}
+    for name, typecode, count in (("peak_db", "f", n_audio), ("rms_db", "f", n_audio), ("audio_sec", "d", n_audio), ("scene_sec", "d", n_video), ("scene_score", "f", n_video)):
+        values = array(typecode)
+        end = offset + values.itemsize * count
+        if end > len(raw):
+            return None
+        values.frombytes(raw[offset:end])
+        if sys.byteorder != "little":
+            values.byteswap()
+        series[name] = values
+        offset = end
+    return {"has_audio": bool(flags & 1), "has_scenes": bool(flags & 2), "scenes_requested": bool(flags & 4), "audio_start_sec": audio_start, **series}
+
+
+def _write_analysis_sidecar(sidecar: Path, size: int, mtime_ns: int, analysis: dict) -> None:
+    flags = (1 if analysis["has_audio"] else 0) | (2 if analysis["has_scenes"] else 0) | (4 if analysis.get("scenes_requested") else 0)
+    header = _ANALYSIS_HEADER.pack(_ANALYSIS_MAGIC, _ANALYSIS_VERSION, flags, size, mtime_ns, float(analysis["audio_start_sec"]), len(analysis["peak_db"]), len(analysis["scene_sec"]))
+    chunks = [header]
+    for name in ("peak_db", "rms_db", "audio_sec", "scene_sec", "scene_score"):
+        values = array(analysis[name].typecode, analysis[name])
+        if sys.byteorder != "little":
+            values.byteswap()
+        chunks.append(values.tobytes())
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(b"".join(chunks))
+    os.replace(tmp, sidecar)
+
+
+def _level_db(raw: str) -> float:
+    text = raw.strip().lower()
+    return -120.0 if text in {"-inf", "inf", "nan"} else max(-120.0, _to_float(text, -120.0))
+
+
+def _filter_path(path: Path) -> str:
+    return str(path).replace("\\", "/").replace(":", "\\:")
+
+
+def _read_audio_levels(path: Path, analysis: dict) -> None:
+    """ametadata print blocks -> aligned peak/RMS/pts_time series; a block missing either level is dropped whole."""
+    pending: list = [None, None, None]  # pts_time, peak, rms
+
+    def flush() -> None:
+        if None not in pending:
+            analysis["audio_sec"].append(pending[0])
+            analysis["peak_db"].append(pending[1])
+            analysis["rms_db"].append(pending[2])
+
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            time_match = _FRAME_TIME_RE.search(line)
+            if time_match:
+                flush()
+                pending = [_to_float(time_match.group(1), 0.0), None, None]
+                continue
+            key, sep, value = line.strip().partition("=")
+            if sep and pending[0] is not None:
+                if key == "lavfi.astats.Overall.Peak_level":
+                    pending[1] = _level_db(value)
+                elif key == "lavfi.astats.Overall.RMS_level":
+                    pending[2] = _level_db(value)
+    flush()
+    if analysis["audio_sec"]:
+        analysis["audio_start_sec"] = analysis["audio_sec"][0]
+
+
+def _read_scene_scores(path: Path, analysis: dict) -> None:
+    current_time: float | None = None
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        for line in handle:
+            time_match = _FRAME_TIME_RE.search(line)
+            if time_match:
+                current_time = _to_float(time_match.group(1), 0.0)
+                continue
+            key, sep, value = line.strip().partition("=")
+            if sep and key == "lavfi.scene_score" and current_time is not None:
+                analysis["scene_sec"].append(current_time)
+                analysis["scene_score"].append(_to_float(value, 0.0))
+                current_time = None
+
+
+def _audio_times(analysis: dict) -> list[float]:
+    """Per-sample pts_time of the level series (index-derived only for analyses without audio_sec)."""
+    times = analysis.get("audio_sec")
+    count = len(analysis.get("peak_db") or [])
+    if times is not None and len(times) == count:
+        return list(times)
+    start_sec = float(analysis.get("audio_start_sec") or 0.0)
+    return [start_sec + index * _ANALYSIS_FRAME_SEC for index in range(count)]
+
+
+def analyze_media(path: Path, *, video_scenes: bool = False, media: dict | None = None, refresh: bool = False) -> dict:
+    """
+    One decode for every detector: 10 ms audio peak/RMS levels plus (optionally) per-frame scene scores.
+    Each filter prints its metadata to its own file, and every sample keeps its pts_time.
+
+    The series are cached in a binary sidecar under .work/analysis/ keyed by the file's size and mtime,
+    so re-planning with different thresholds only re-thresholds the cached series.
+    """
+    path = Path(path)
+    st = path.stat()
+    sidecar = analysis_sidecar_path(path)
+    if not refresh:
+        cached = _read_analysis_sidecar(sidecar, st.st_size, st.st_mtime_ns)
+        # has_scenes stays False for audio-only media; scenes_requested says the pass already looked.
+        if cached is not None and (cached["scenes_requested"] or not video_scenes):
+            return cached
+    media = media if media is not None else probe_media(path)
+    has_audio = bool(media.get("has_audio"))
+    with_scenes = bool(video_scenes and media.get("has_video"))
+    analysis = {"has_audio": has_audio, "has_scenes": with_scenes, "scenes_requested": bool(video_scenes), "audio_start_sec": 0.0, "peak_db": array("f"), "rms_db": array("f"), "audio_sec": array("d"), "scene_sec": array("d"), "scene_score": array("f")}
+    if has_audio or with_scenes:
+        # Separate files: two print filters sharing stdout can interleave partial lines.
+        with tempfile.TemporaryDirectory(prefix="mve-analysis-") as tmp:
+            audio_meta = Path(tmp) / "audio.txt"
+            scene_meta = Path(tmp) / "scenes.txt"
+            graph: list[str] = []
+            maps: list[str] = []
+            if has_audio:
+                graph.append(
+                    f"[0:a:0]aresample={_ANALYSIS_SAMPLE_RATE},asetnsamples=n={_ANALYSIS_FRAME_SAMPLES}:pad=1,"
+                    f"astats=metadata=1:reset=1:measure_perchannel=none:measure_overall=Peak_level+RMS_level,ametadata=print:file={_filter_path(audio_meta)}[aout]"
+                )
+                maps.extend(["-map", "[aout]"])
+            if with_scenes:
+                graph.append(f"[0:v:0]select='gte(scene,0)',metadata=print:key=lavfi.scene_score:file={_filter_path(scene_meta)}[vout]")
+                maps.extend(["-map", "[vout]"])
+            cmd = ["ffmpeg", "-hide_banner", "-nostats", "-v", "error", "-i", str(path), "-filter_complex", ";".join(graph), *maps, "-f", "null", "-"]
+            with tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace") as stderr_file:
+                returncode = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=stderr_file).returncode
+                stderr_file.seek(0)
+                stderr = stderr_file.read()
+            if returncode not in {0, 255}:
+                raise RuntimeError(stderr.strip() or "ffmpeg media analysis failed")
+            if has_audio and audio_meta.exists():
+                _read_audio_levels(audio_meta, analysis)
+            if with_scenes and scene_meta.exists():
+                _read_scene_scores(scene_meta, analysis)
+    _write_analysis_sidecar(sidecar, st.st_size, st.st_mtime_ns, analysis)
+    return analysis
+
+
+def silences_from_analysis(analysis: dict, threshold_db: float, min_silence_sec: float) -> list[tuple[float, float]]:
+    """silencedetect semantics on the cached 10 ms peak series: runs below threshold_db lasting min_silence_sec."""
+    times = _audio_times(analysis)
     silences: list[tuple[float, float]] = []
-    current_start: float | None = None
-    for line in (result.stderr or "").splitlines():
-        start_match = _SILENCE_START_RE.search(line)
-        if start_match:
-            current_start = _to_float(start_match.group(1), 0.0)
+    run_start: int | None = None
+    peaks = analysis.get("peak_db") or []
+    for index, peak_db in enumerate([*peaks, math.inf]):
+        if peak_db < threshold_db:
+            if run_start is None:
+                run_start = index
             continue
-        end_match = _SILENCE_END_RE.search(line)
-        if end_match:
-            silence_end = _to_float(end_match.group(1), 0.0)
-            silence_duration = _to_float(end_match.group(2), 0.0)
-            silence_start = current_start
-            if silence_start is None:
-                silence_start = max(0.0, silence_end - silence_duration)
-            if silence_end > silence_start:
+        if run_start is not None:
+            silence_start = times[run_start]
+            # A run reaching the end of the series closes one frame after its last sample.
+            silence_end = times[index] if index < len(times) else times[-1] + _ANALYSIS_FRAME_SEC
+            if silence_end - silence_start >= max(0.0, min_silence_sec):
                 silences.append((silence_start, silence_end))
-            current_start = None
+            run_start = None
     return silences
 
 
-def detect_video_scenes(path: Path, threshold: float, min_gap_sec: float = 2.0) -> list[dict]:
-    cmd = ["ffmpeg", "-hide_banner", "-i", str(path), "-filter:v", f"select='gt(scene,{threshold})',metadata=print:file=-", "-an", "-f", "null", "-"]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-    if result.returncode not in {0, 255}:
-        stderr = (result.stderr or "").strip()
-        raise RuntimeError(stderr or "ffmpeg video scene detect failed")
+def scenes_from_analysis(analysis: dict, threshold: float, min_gap_sec: float = 2.0) -> list[dict]:
     markers: list[dict] = []
-    current_time: float | None = None
     last_time = -1e9
-    output = "\n".join(part for part in (result.stdout or "", result.stderr or "") if part)
-    for line in output.splitlines():
-        time_match = _FRAME_TIME_RE.search(line)
-        if time_match:
-            current_time = _to_float(time_match.group(1), 0.0)
+    for current_time, score in zip(analysis.get("scene_sec") or [], analysis.get("scene_score") or []):
+        if score > threshold and current_time - last_time >= max(0.0, min_gap_sec):
+            markers.append({"kind": "boundary", "source_sec": current_time, "detector": "video_scene", "score": score, "score_unit": "scene_score", "reason": "visual_scene_change"})
+            last_time = current_time
+    return markers
+
+
+def audio_changes_from_analysis(analysis: dict, window_sec: float = 0.5, delta_threshold_db: float = 8.0, min_gap_sec: float = 2.0) -> list[dict]:
+    """Window the cached 10 ms RMS series (energy mean) and mark jumps of delta_threshold_db between windows."""
+    times = _audio_times(analysis)
+    rms = analysis.get("rms_db") or []
+    per_window = max(1, int(round(max(0.05, window_sec) / _ANALYSIS_FRAME_SEC)))
+    markers: list[dict] = []
+    last_level: float | None = None
+    last_marker_time = -1e9
+    for first in range(0, len(rms), per_window):
+        chunk = rms[first : first + per_window]
+        energy = sum(10.0 ** (level / 10.0) for level in chunk) / len(chunk)
+        rms_db = max(-120.0, 10.0 * math.log10(energy)) if energy > 0 else -120.0
+        point_time = times[first]
+        if last_level is None:
+            last_level = rms_db
             continue
-        score_match = _SCENE_SCORE_RE.search(line)
-        if score_match and current_time is not None:
-            score = _to_float(score_match.group(1), 0.0)
-            if current_time - last_time >= max(0.0, min_gap_sec):
-                markers.append({"kind": "boundary", "source_sec": current_time, "detector": "video_scene", "score": score, "score_unit": "scene_score", "reason": "visual_scene_change"})
-                last_time = current_time
-            current_time = None
+        delta_db = abs(rms_db - last_level)
+        if delta_db >= max(0.0, delta_threshold_db) and point_time - last_marker_time >= max(0.0, min_gap_sec):
+            markers.append({"kind": "boundary", "source_sec": point_time, "detector": "audio_change", "score": delta_db, "score_unit": "delta_db", "reason": "audio_program_change"})
+            last_marker_time = point_time
+        last_level = rms_db
     return markers
 
 
-def detect_audio_changes(path: Path, window_sec: float = 0.5, delta_threshold_db: float = 8.0, min_gap_sec: float = 2.0) -> list[dict]:
-    sample_count = max(1024, int(round(max(0.05, window_sec) * 48000)))
+def _scene_scores_in_window(path: Path, start_sec: float, end_sec: float) -> list[tuple[float, float]]:
+    """Full-rate ffmpeg scene scores for a short window (times in source seconds)."""
+    start_sec = max(0.0, start_sec)
     cmd = [
         "ffmpeg",
         "-hide_banner",
+        "-nostats",
+        "-v",
+        "error",
+        "-ss",
+        f"{start_sec:.3f}",
+        "-t",
+        f"{max(0.1, end_sec - start_sec):.3f}",
         "-i",
         str(path),
-        "-af",
-        f"asetnsamples=n={sample_count}:pad=1,astats=metadata=1:reset=1,ametadata=print:file=-",
+        "-filter:v",
+        f"scale={_SCENE_REFINE_WIDTH}:-2,select='gte(scene,0)',metadata=print:key=lavfi.scene_score:file=-",
+        "-an",
         "-f",
         "null",
         "-",
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
     if result.returncode not in {0, 255}:
-        stderr = (result.stderr or "").strip()
-        raise RuntimeError(stderr or "ffmpeg audio change detect failed")
-    points: list[tuple[float, float]] = []
+        raise RuntimeError((result.stderr or "").strip() or "ffmpeg scene refine failed")
+    scores: list[tuple[float, float]] = []
     current_time: float | None = None
-    output = "\n".join(part for part in (result.stdout or "", result.stderr or "") if part)
-    for line in output.splitlines():
+    for line in (result.stdout or "").splitlines():
         time_match = _FRAME_TIME_RE.search(line)
         if time_match:
             current_time = _to_float(time_match.group(1), 0.0)
             continue
-        rms_match = _RMS_LEVEL_RE.search(line)
-        if rms_match and current_time is not None:
-            raw = rms_match.group(1).strip().lower()
-            rms_db = -120.0 if raw in {"-inf", "inf", "nan"} else _to_float(raw, -120.0)
-            points.append((current_time, rms_db))
+        key, sep, value = line.strip().partition("=")
+        if sep and key == "lavfi.scene_score" and current_time is not None:
+            # The first decoded frame has no predecessor in this window; its score is meaningless.
+            if current_time > 0:
+                scores.append((start_sec + current_time, _to_float(value, 0.0)))
             current_time = None
+    return scores
+
+
+def detect_video_scenes_sampled(
+    path: Path,
+    threshold: float,
+    min_gap_sec: float = 2.0,
+    *,
+    sample_fps: float = 2.0,
+    keyframes_only: bool = False,
+    refine: bool = True,
+) -> list[dict]:
+    """
+    Fast scene markers for long sources: decode tiny RGB frames at sample_fps (optionally keyframes only),
+    score consecutive frames by colour-histogram distance with NumPy, then re-score each candidate at
+    full frame rate in a small window so marker times and scores match detect_video_scenes.
+    """
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise RuntimeError("numpy is required for sampled scene detection") from exc
+    sample_fps = max(0.1, float(sample_fps))
+    width, height = _SCENE_SAMPLE_SIZE
+    frame_bytes = width * height * 3
+    cmd = ["ffmpeg", "-hide_banner", "-nostats", "-v", "error"]
+    if keyframes_only:
+        cmd.extend(["-skip_frame", "nokey"])
+    cmd.extend(["-i", str(path), "-an", "-vf", f"fps={sample_fps},scale={width}:{height}:flags=area", "-f", "rawvideo", "-pix_fmt", "rgb24", "-"])
+    stderr_file = tempfile.TemporaryFile(mode="w+b")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+    assert proc.stdout is not None
+    bins = _SCENE_HIST_BINS
+    offsets = np.arange(3, dtype=np.int64) * bins
+    diffs: list[float] = []
+    prev_hist = None
+    batch_frames = 256
+    while True:
+        raw = proc.stdout.read(frame_bytes * batch_frames)
+        n = len(raw) // frame_bytes
+        if n <= 0:
+            break
+        frames = np.frombuffer(raw[: n * frame_bytes], dtype=np.uint8).reshape(n, width * height, 3)
+        # Per-frame 3 x bins histogram via one bincount over (frame, channel, bin) indices.
+        idx = (frames.astype(np.int64) * bins) >> 8
+        idx = idx + offsets + (np.arange(n, dtype=np.int64) * 3 * bins)[:, None, None]
+        hist = np.bincount(idx.ravel(), minlength=n * 3 * bins).reshape(n, 3 * bins).astype(np.float32) / float(width * height * 3)
+        if prev_hist is not None:
+            hist_all = np.vstack([prev_hist[None, :], hist])
+        else:
+            hist_all = hist
+            diffs.append(0.0)
+        diffs.extend((0.5 * np.abs(np.diff(hist_all, axis=0)).sum(axis=1)).clip(0.0, 1.0).tolist())
+        prev_hist = hist[-1]
+    returncode = proc.wait()
+    stderr_file.seek(0)
+    stderr = stderr_file.read().decode("utf-8", errors="replace")
+    stderr_file.close()
+    if returncode not in {0, 255}:
+        raise RuntimeError(stderr.strip() or "ffmpeg sampled scene decode failed")
+
+    step = 1.0 / sample_fps
+    # Sampling misses gradual cuts' peak score, so candidates use a lower bar and refinement decides.
+    candidate_threshold = threshold * (_SCENE_CANDIDATE_FACTOR if refine else 1.0)
     markers: list[dict] = []
-    last_level: float | None = None
-    last_marker_time = -1e9
-    for point_time, rms_db in points:
-        if last_level is None:
-            last_level = rms_db
-            continue
-        delta_db = abs(rms_db - last_level)
-        if delta_db >= max(0.0, delta_threshold_db) and point_time - last_marker_time >= max(0.0, min_gap_sec):
-            markers.append({"kind": "boundary", "source_sec": point_time, "detector": "audio_change", "score": delta_db, "score_unit": "delta_db", "reason": "audio_program_change"})
-            last_marker_time = point_time
-        last_level = rms_db
+    last_time = -1e9
+    last_change_sec = 0.0
+    for index, diff in enumerate(diffs):
+        sample_sec = index * step
+        if diff >= candidate_threshold:
+            # With keyframes only, the cut lies anywhere after the previous keyframe that showed up in the samples.
+            window_start = (last_change_sec if keyframes_only else sample_sec) - step
+            if refine:
+                try:
+                    window = _scene_scores_in_window(path, window_start, sample_sec + step)
+                except (RuntimeError, OSError, subprocess.SubprocessError):
+                    # One failed or timed-out window costs only its own candidate, not every marker.
+                    window = []
+                scored = [item for item in window if item[1] > threshold]
+                best = max(scored, key=lambda item: item[1]) if scored else None
+                marker_sec, score, unit = (best[0], best[1], "scene_score") if best else (None, 0.0, "")
+            else:
+                marker_sec, score, unit = sample_sec, float(diff), "hist_delta"
+            if marker_sec is not None and marker_sec - last_time >= max(0.0, min_gap_sec):
+                markers.append({"kind": "boundary", "source_sec": marker_sec, "detector": "video_scene", "score": score, "score_unit": unit, "reason": "visual_scene_change"})
+                last_time = marker_sec
+        if diff > _SCENE_STATIC_EPS:
+            last_change_sec = sample_sec
     return markers
 
 
+def detect_silences(path: Path, threshold_db: float, min_silence_sec: float, *, refresh: bool = False) -> list[tuple[float, float]]:
+    return silences_from_analysis(analyze_media(path, refresh=refresh), threshold_db, min_silence_sec)
+
+
+def detect_video_scenes(path: Path, threshold: float, min_gap_sec: float = 2.0, *, refresh: bool = False) -> list[dict]:
+    return scenes_from_analysis(analyze_media(path, video_scenes=True, refresh=refresh), threshold, min_gap_sec)
+
+
+def detect_audio_changes(path: Path, window_sec: float = 0.5, delta_threshold_db: float = 8.0, min_gap_sec: float = 2.0, *, refresh: bool = False) -> list[dict]:
+    return audio_changes_from_analysis(analyze_media(path, refresh=refresh), window_sec, delta_threshold_db, min_gap_sec)
+
+
 def normalize_ranges(ranges: list[tuple[float, float]], duration_sec: float | None = None, min_span_sec: float = 0.001) -> list[tuple[float, float]]:
     cleaned: list[tuple[float, float]] = []
     for start, end in ranges:
@@ -10,14 +10,16 @@ if str(_THIS) not in sys.path:
     sys.path.insert(0, str(_THIS))
 
 from _lib import (
+    analyze_media,
+    audio_changes_from_analysis,
     build_actions,
     build_keep_ranges,
-    detect_audio_changes,
-    detect_silences,
-    detect_video_scenes,
+    detect_video_scenes_sampled,
     invert_ranges,
     probe_media,
+    scenes_from_analysis,
     sec_text,
+    silences_from_analysis,
     utc_now_iso,
     write_edit_plan,
 )
@@ -39,10 +41,18 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--detect-video-scenes", action="store_true", help="Add marker sections for early video scene-change candidates.")
     parser.add_argument("--video-scene-threshold", type=float, default=0.35, help="ffmpeg scene score threshold for video scene markers (default: 0.35).")
     parser.add_argument("--video-scene-min-gap-sec", type=float, default=2.0, help="Minimum spacing between video scene markers (default: 2.0).")
+    parser.add_argument(
+        "--video-scene-mode",
+        choices=("full", "sampled", "keyframes"),
+        default="full",
+        help="full: ffmpeg scene score on every frame (cached). sampled/keyframes: NumPy histogram pass on small frames at --video-scene-sample-fps (or keyframes only), refined at full rate around hits; for long sources.",
+    )
+    parser.add_argument("--video-scene-sample-fps", type=float, default=2.0, help="Sample rate for --video-scene-mode sampled/keyframes (default: 2.0).")
     parser.add_argument("--detect-audio-scenes", action="store_true", help="Add marker sections for early audio program-change candidates.")
     parser.add_argument("--audio-scene-window-sec", type=float, default=0.5, help="Window size for audio change analysis (default: 0.5).")
     parser.add_argument("--audio-scene-threshold-db", type=float, default=8.0, help="Minimum RMS delta in dB to mark an audio scene change (default: 8.0).")
     parser.add_argument("--audio-scene-min-gap-sec", type=float, default=2.0, help="Minimum spacing between audio scene markers (default: 2.0).")
+    parser.add_argument("--refresh-analysis", action="store_true", help="Re-decode the source even if a cached analysis sidecar matches its size and mtime.")
     return parser.parse_args()
 
 
@@ -72,11 +82,23 @@ def main() -> None:
         print(f"[analyze_spacetime_plan] no audio stream found in {input_path}", file=sys.stderr)
         sys.exit(4)
 
+    full_scenes = bool(args.detect_video_scenes) and args.video_scene_mode == "full" and bool(media.get("has_video"))
     try:
-        detected_silences = detect_silences(input_path, args.threshold_db, args.min_silence_sec)
+        # One decode (or a cached sidecar) feeds silences and both marker detectors.
+        analysis = analyze_media(input_path, video_scenes=full_scenes, media=media, refresh=bool(args.refresh_analysis))
     except Exception as exc:
-        print(f"[analyze_spacetime_plan] silencedetect failed: {exc}", file=sys.stderr)
-        sys.exit(5)
+        if not full_scenes:
+            print(f"[analyze_spacetime_plan] media analysis failed: {exc}", file=sys.stderr)
+            sys.exit(5)
+        # A broken video stream should not cost the silence plan: retry audio-only, without video markers.
+        print(f"[analyze_spacetime_plan] scene+audio analysis failed ({exc}); retrying audio only", file=sys.stderr)
+        full_scenes = False
+        try:
+            analysis = analyze_media(input_path, video_scenes=False, media=media, refresh=bool(args.refresh_analysis))
+        except Exception as retry_exc:
+            print(f"[analyze_spacetime_plan] media analysis failed: {retry_exc}", file=sys.stderr)
+            sys.exit(5)
+    detected_silences = silences_from_analysis(analysis, args.threshold_db, args.min_silence_sec)
 
     audible_ranges = invert_ranges(detected_silences, duration_sec=duration_sec)
     if not audible_ranges:
@@ -96,29 +118,38 @@ def main() -> None:
     markers: list[dict] = []
 
     if args.detect_video_scenes and media.get("has_video"):
-        try:
-            markers.extend(detect_video_scenes(input_path, threshold=float(args.video_scene_threshold), min_gap_sec=max(0.0, float(args.video_scene_min_gap_sec))))
-        except Exception as exc:
-            print(f"[analyze_spacetime_plan] video scene detect failed: {exc}", file=sys.stderr)
+        if args.video_scene_mode == "full":
+            if full_scenes:
+                markers.extend(scenes_from_analysis(analysis, threshold=float(args.video_scene_threshold), min_gap_sec=max(0.0, float(args.video_scene_min_gap_sec))))
+        else:
+            try:
+                markers.extend(
+                    detect_video_scenes_sampled(
+                        input_path,
+                        threshold=float(args.video_scene_threshold),
+                        min_gap_sec=max(0.0, float(args.video_scene_min_gap_sec)),
+                        sample_fps=max(0.1, float(args.video_scene_sample_fps)),
+                        keyframes_only=args.video_scene_mode == "keyframes",
+                    )
+                )
+            except Exception as exc:
+                print(f"[analyze_spacetime_plan] video scene detect failed: {exc}", file=sys.stderr)
 
     if args.detect_audio_scenes:
-        try:
-            markers.extend(
-                detect_audio_changes(
-                    input_path,
-                    window_sec=max(0.05, float(args.audio_scene_window_sec)),
-                    delta_threshold_db=max(0.0, float(args.audio_scene_threshold_db)),
-                    min_gap_sec=max(0.0, float(args.audio_scene_min_gap_sec)),
-                )
+        markers.extend(
+            audio_changes_from_analysis(
+                analysis,
+                window_sec=max(0.05, float(args.audio_scene_window_sec)),
+                delta_threshold_db=max(0.0, float(args.audio_scene_threshold_db)),
+                min_gap_sec=max(0.0, float(args.audio_scene_min_gap_sec)),
             )
-        except Exception as exc:
-            print(f"[analyze_spacetime_plan] audio scene detect failed: {exc}", file=sys.stderr)
+        )
 
     metadata = {
         "generated_at": utc_now_iso(),
         "source_path": str(input_path),
         "feature": "spacetime-compression",
-        "analysis_method": "silencedetect",
+        "analysis_method": "cached-levels",
         "duration_sec": duration_sec,
         "has_video": bool(media.get("has_video")),
         "has_audio": bool(media.get("has_audio")),
@@ -131,6 +162,7 @@ def main() -> None:
         "detect_video_scenes": bool(args.detect_video_scenes),
         "video_scene_threshold": float(args.video_scene_threshold),
         "video_scene_min_gap_sec": max(0.0, float(args.video_scene_min_gap_sec)),
+        "video_scene_mode": args.video_scene_mode,
         "video_scene_markers": len([marker for marker in markers if marker.get("detector") == "video_scene"]),
         "detect_audio_scenes": bool(args.detect_audio_scenes),
         "audio_scene_window_sec": max(0.05, float(args.audio_scene_window_sec)),
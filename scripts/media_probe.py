@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 import subprocess
 import time
+import urllib.error
+import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from scripts.rate_limit import DomainRateLimiter
+
 
 _MP4_EXT_RE = re.compile(r"\.(mp4|m4v|mov)(\?|$)", re.IGNORECASE)
 _HLS_RE = re.compile(r"\.m3u8(\?|$)", re.IGNORECASE)
+_STATUS_LINE_RE = re.compile(r"^HTTP/\S+\s+(\d{3})")
+
+# Shared by every probe that is not handed its own limiter: no pacing, but a 429/Retry-After from
+# a media host backs later probes of that host off instead of hammering it.
+_DEFAULT_LIMITER = DomainRateLimiter(0.0)
 
 
 @dataclass(frozen=True)
@@ -19,6 +29,25 @@ class MediaMeta:
     duration_sec: int | None = None
 
 
+def _limiter(limiter: DomainRateLimiter | None) -> DomainRateLimiter:
+    return limiter if limiter is not None else _DEFAULT_LIMITER
+
+
+def _note_curl_headers(limiter: DomainRateLimiter, url: str, header_text: str) -> None:
+    """Feed the final status/Retry-After of a curl -D/-I header dump (last block after redirects) to the limiter."""
+    status: int | None = None
+    retry_after: str | None = None
+    for line in header_text.splitlines():
+        m = _STATUS_LINE_RE.match(line)
+        if m:
+            status, retry_after = int(m.group(1)), None
+            continue
+        k, sep, v = line.partition(":")
+        if sep and k.strip().lower() == "retry-after":
+            retry_after = v.strip()
+    limiter.note_response(url, status, retry_after)
+
+
 def _curl_bytes(args: list[str], *, timeout_seconds: int) -> bytes:
     p = subprocess.run(
         ["curl", "-sS", "-L", "--max-time", str(int(timeout_seconds)), *args],
@@ -33,14 +62,17 @@ def _curl_text(args: list[str], *, timeout_seconds: int) -> str:
     return _curl_bytes(args, timeout_seconds=timeout_seconds).decode("utf-8", errors="replace")
 
 
-def head_content_length(url: str, *, timeout_seconds: int, user_agent: str) -> int | None:
+def head_content_length(url: str, *, timeout_seconds: int, user_agent: str, limiter: DomainRateLimiter | None = None) -> int | None:
     """
     Best-effort Content-Length via HEAD. Avoids downloading bodies.
     """
+    limiter = _limiter(limiter)
     try:
+        limiter.wait(url)
         hdrs = _curl_text(["-I", "-A", user_agent, url], timeout_seconds=timeout_seconds)
     except Exception:
         return None
+    _note_curl_headers(limiter, url, hdrs)
     # curl -L -I will print multiple header blocks; take the last content-length.
     clen = None
     for line in hdrs.splitlines():
@@ -55,11 +87,12 @@ def head_content_length(url: str, *, timeout_seconds: int, user_agent: str) -> i
     return clen if (isinstance(clen, int) and clen > 0) else None
 
 
-def _supports_range(url: str, *, timeout_seconds: int, user_agent: str) -> bool:
+def _supports_range(url: str, *, timeout_seconds: int, user_agent: str, limiter: DomainRateLimiter) -> bool:
     """
     Probe for byte-range support with a 1-byte range request.
     """
     try:
+        limiter.wait(url)
         # We only need headers; use -D - with /dev/null output.
         p = subprocess.run(
             [
@@ -83,6 +116,7 @@ def _supports_range(url: str, *, timeout_seconds: int, user_agent: str) -> bool:
         )
         if p.returncode != 0:
             return False
+        _note_curl_headers(limiter, url, p.stdout or "")
         # 206 Partial Content indicates range support.
         return " 206 " in (p.stdout or "") or p.stdout.startswith("HTTP/") and "206" in (p.stdout.splitlines()[0] or "")
     except Exception:
@@ -152,7 +186,14 @@ def _mp4_duration_from_mvhd(blob: bytes) -> int | None:
     return None
 
 
-def mp4_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str, max_probe_bytes: int = 1024 * 1024) -> int | None:
+def mp4_duration_seconds(
+    url: str,
+    *,
+    timeout_seconds: int,
+    user_agent: str,
+    max_probe_bytes: int = 1024 * 1024,
+    limiter: DomainRateLimiter | None = None,
+) -> int | None:
     """
     Best-effort MP4 duration using *bounded* range requests (never full download).
 
@@ -161,10 +202,11 @@ def mp4_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str, max
     """
     if not _MP4_EXT_RE.search(url or ""):
         return None
-    if not _supports_range(url, timeout_seconds=timeout_seconds, user_agent=user_agent):
+    limiter = _limiter(limiter)
+    if not _supports_range(url, timeout_seconds=timeout_seconds, user_agent=user_agent, limiter=limiter):
         return None
 
-    total = head_content_length(url, timeout_seconds=timeout_seconds, user_agent=user_agent)
+    total = head_content_length(url, timeout_seconds=timeout_seconds, user_agent=user_agent, limiter=limiter)
     if not total or total <= 0:
         return None
 
@@ -173,7 +215,9 @@ def mp4_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str, max
     tail_start = max(0, total - n)
 
     try:
+        limiter.wait(url)
         head = _curl_bytes(["-A", user_agent, "-r", f"0-{head_end}", url], timeout_seconds=timeout_seconds)
+        limiter.wait(url)
         tail = _curl_bytes(["-A", user_agent, "-r", f"{tail_start}-{total - 1}", url], timeout_seconds=timeout_seconds)
     except Exception:
         return None
@@ -186,7 +230,80 @@ def mp4_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str, max
     return None
 
 
-def hls_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str) -> int | None:
+@dataclass(frozen=True)
+class RangeFingerprint:
+    final_url: str
+    content_length: int
+    head_sha1: str
+    tail_sha1: str
+
+    def key(self) -> str:
+        return f"{self.content_length}:{self.head_sha1}:{self.tail_sha1}"
+
+
+_CONTENT_RANGE_TOTAL_RE = re.compile(r"/\s*(\d+)\s*$")
+
+
+def _read_range(url: str, start: int, end: int, *, timeout_seconds: int, user_agent: str, limiter: DomainRateLimiter) -> tuple[int, bytes, Any, str]:
+    req = urllib.request.Request(url, headers={"User-Agent": user_agent, "Range": f"bytes={int(start)}-{int(end)}"})
+    limiter.wait(url)
+    try:
+        resp = urllib.request.urlopen(req, timeout=max(1, int(timeout_seconds)))
+    except urllib.error.HTTPError as e:
+        limiter.note_response(url, e.code, e.headers.get("Retry-After") if e.headers else None)
+        raise
+    with resp:
+        # Bounded read: a server that ignores Range must not turn this into a full download.
+        data = resp.read(int(end) - int(start) + 1)
+        return int(resp.status), data, resp.headers, str(resp.geturl() or url)
+
+
+def range_fingerprint(
+    url: str,
+    *,
+    timeout_seconds: int,
+    user_agent: str,
+    probe_bytes: int = 64 * 1024,
+    limiter: DomainRateLimiter | None = None,
+) -> RangeFingerprint | None:
+    """
+    Best-effort content identity: Content-Length + SHA-1 of the first/last `probe_bytes`.
+    ETags are left out on purpose: they differ across hosts/CDNs serving the same file.
+
+    Two bounded range requests against the redirect target; never downloads the body.
+    Returns None when the server does not honor byte ranges.
+    """
+    n = max(4096, int(probe_bytes))
+    limiter = _limiter(limiter)
+    try:
+        status, head, headers, final_url = _read_range(url, 0, n - 1, timeout_seconds=timeout_seconds, user_agent=user_agent, limiter=limiter)
+    except Exception:
+        return None
+    if status != 206 or not head:
+        return None
+    m = _CONTENT_RANGE_TOTAL_RE.search(str(headers.get("Content-Range") or ""))
+    total = int(m.group(1)) if m else 0
+    if total <= 0:
+        return None
+    tail_start = max(0, total - n)
+    if tail_start == 0:
+        tail = head
+    else:
+        try:
+            status, tail, _headers, _url = _read_range(final_url, tail_start, total - 1, timeout_seconds=timeout_seconds, user_agent=user_agent, limiter=limiter)
+        except Exception:
+            return None
+        if status != 206 or not tail:
+            return None
+    return RangeFingerprint(
+        final_url=final_url,
+        content_length=total,
+        head_sha1=hashlib.sha1(head).hexdigest(),
+        tail_sha1=hashlib.sha1(tail).hexdigest(),
+    )
+
+
+def hls_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str, limiter: DomainRateLimiter | None = None) -> int | None:
     """
     Best-effort HLS duration by summing EXTINF in a VOD playlist.
     Only works for VOD (requires EXT-X-ENDLIST).
@@ -194,6 +311,7 @@ def hls_duration_seconds(url: str, *, timeout_seconds: int, user_agent: str) ->
     if not _HLS_RE.search(url or ""):
         return None
     try:
+        _limiter(limiter).wait(url)
         text = _curl_text(["-A", user_agent, url], timeout_seconds=timeout_seconds)
     except Exception:
         return None
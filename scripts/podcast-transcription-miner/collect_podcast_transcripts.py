@@ -14,6 +14,8 @@ from typing import Iterable
 import requests
 from bs4 import BeautifulSoup
 
+from http_cache import CachedResponse, HttpCache, add_cache_args, cache_from_args, requests_sender
+
 
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -159,7 +161,13 @@ class TranscriptRecord:
 
 
 class PodcastTranscriptCollector:
-    def __init__(self, output_root: Path, mel_max_episode: int = 400, limit: int | None = None) -> None:
+    def __init__(
+        self,
+        output_root: Path,
+        mel_max_episode: int = 400,
+        limit: int | None = None,
+        cache: HttpCache | None = None,
+    ) -> None:
         self.output_root = output_root
         self.mel_max_episode = mel_max_episode
         self.limit = limit
@@ -168,20 +176,24 @@ class PodcastTranscriptCollector:
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
         self.timeout = 45
+        self.cache = cache if cache is not None else HttpCache(Path(), enabled=False)
         self.records: list[TranscriptRecord] = []
 
-    def get_json(self, url: str, **kwargs) -> object:
-        response = self.session.get(url, timeout=self.timeout, **kwargs)
-        response.encoding = "utf-8"
-        response.raise_for_status()
-        return response.json()
+    def fetch(self, url: str, params: dict | None = None, *, kind: str = "page", allow_404: bool = False) -> CachedResponse:
+        if params:
+            url = requests.Request("GET", url, params=params).prepare().url
+        response = self.cache.fetch(url, requests_sender(self.session, url, timeout=self.timeout), kind=kind)
+        if response.status >= 400 and not (allow_404 and response.status == 404):
+            raise requests.HTTPError(f"{response.status} Error for url: {url}")
+        return response
+
+    def get_json(self, url: str, params: dict | None = None, *, kind: str = "api") -> object:
+        return json.loads(self.fetch(url, params, kind=kind).body.decode("utf-8"))
 
-    def get_text(self, url: str, allow_404: bool = False, **kwargs) -> str | None:
-        response = self.session.get(url, timeout=self.timeout, **kwargs)
-        response.encoding = "utf-8"
-        if allow_404 and response.status_code == 404:
+    def get_text(self, url: str, allow_404: bool = False, params: dict | None = None, *, kind: str = "page") -> str | None:
+        response = self.fetch(url, params, kind=kind, allow_404=allow_404)
+        if response.status == 404:
             return None
-        response.raise_for_status()
         return response.text
 
     def load_existing_records(self) -> list[TranscriptRecord]:
@@ -282,10 +294,8 @@ class PodcastTranscriptCollector:
             "page": 1,
         }
 
-        first = self.session.get(url, params=params, timeout=self.timeout)
-        first.encoding = "utf-8"
-        first.raise_for_status()
-        total_pages = int(first.headers.get("X-WP-TotalPages", "1"))
+        first = self.fetch(url, params, kind="api")
+        total_pages = int(first.header("X-WP-TotalPages", "1"))
 
         for page in range(1, total_pages + 1):
             params["page"] = page
@@ -352,10 +362,8 @@ class PodcastTranscriptCollector:
             "page": 1,
         }
 
-        first = self.session.get(url, params=params, timeout=self.timeout)
-        first.encoding = "utf-8"
-        first.raise_for_status()
-        total_pages = int(first.headers.get("X-WP-TotalPages", "1"))
+        first = self.fetch(url, params, kind="api")
+        total_pages = int(first.header("X-WP-TotalPages", "1"))
 
         for page in range(1, total_pages + 1):
             params["page"] = page
@@ -402,7 +410,7 @@ class PodcastTranscriptCollector:
 
         for episode_number in range(1, self.mel_max_episode + 1):
             url = f"https://www.melrobbins.com/episode/episode-{episode_number}/"
-            html = self.get_text(url, allow_404=True)
+            html = self.get_text(url, allow_404=True, kind="transcript")
             if html is None:
                 continue
 
@@ -479,7 +487,7 @@ class PodcastTranscriptCollector:
             if page:
                 archive_url = f"{archive_url}?page={page}"
             try:
-                html = self.get_text(archive_url)
+                html = self.get_text(archive_url, kind="catalog")
             except requests.RequestException:
                 break
             if not html:
@@ -499,7 +507,7 @@ class PodcastTranscriptCollector:
             for href in new_links:
                 url = f"https://www.thisamericanlife.org{href}"
                 try:
-                    episode_html = self.get_text(url)
+                    episode_html = self.get_text(url, kind="transcript")
                 except requests.RequestException:
                     print(f"[tal-skip] {url}", flush=True)
                     continue
@@ -578,6 +586,7 @@ def main() -> int:
         default=None,
         help="Optional per-show item limit for smoke tests or partial pulls.",
     )
+    add_cache_args(parser)
     args = parser.parse_args()
 
     selected = {item.strip() for item in args.shows.split(",") if item.strip()}
@@ -593,6 +602,7 @@ def main() -> int:
         Path(args.out_dir),
         mel_max_episode=args.mel_max_episode,
         limit=args.limit,
+        cache=cache_from_args(args),
     )
     new_records: list[TranscriptRecord] = []
     if "lex" in selected:
@@ -615,6 +625,7 @@ def main() -> int:
         f"Collected {len(new_records)} transcripts into {collector.output_root}",
         flush=True,
     )
+    print(f"[http-cache] {collector.cache.summary()}", flush=True)
     return 0
 
 
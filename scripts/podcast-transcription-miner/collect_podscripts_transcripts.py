@@ -2,9 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import concurrent.futures
 import json
+import multiprocessing
+import os
 import re
+import sqlite3
+import sys
 import time
 import threading
 import unicodedata
@@ -17,8 +22,15 @@ from typing import Iterable
 import requests
 from bs4 import BeautifulSoup
 
+from http_cache import HttpCache, add_cache_args, cache_from_args
 
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.async_http import AsyncHttpClient
+from scripts.rate_limit import DomainRateLimiter
+
 DEFAULT_OUT_DIR = ROOT / "podcast-transcripts"
 BASE_URL = "https://podscripts.co"
 USER_AGENT = (
@@ -29,6 +41,8 @@ USER_AGENT = (
 GENERIC_TITLE = "PodScripts.co - Podcast transcripts and discussion"
 CLOCK_RE = re.compile(r"(\d{2}:\d{2}:\d{2})")
 DATE_RE = re.compile(r"Episode Date:\s*(.+)")
+# Episode pages carry the whole transcript inline; anything larger is treated as a failed fetch.
+MAX_PAGE_BYTES = 32 << 20
 
 
 @dataclass
@@ -60,7 +74,20 @@ class ShowSummary:
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Collect timestamped podcast transcripts from podscripts.co.")
     parser.add_argument("--out-dir", default=str(DEFAULT_OUT_DIR), help="Output root for podcast transcript folders.")
-    parser.add_argument("--workers", type=int, default=8, help="Concurrent podcast workers.")
+    parser.add_argument(
+        "--engine",
+        choices=("async", "threads"),
+        default="async",
+        help="async: pooled asyncio crawl with a resumable frontier and a parse process pool; threads: legacy thread pool",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent podcast workers (async engine: shows in flight).")
+    parser.add_argument("--max-per-host", type=int, default=4, help="Async engine: concurrent connections to podscripts.co.")
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=max(1, min(4, (os.cpu_count() or 2) - 1)),
+        help="Async engine: processes used for HTML parsing.",
+    )
     parser.add_argument("--pod-limit", type=int, default=0, help="Limit podcasts processed (0 = all discovered podcasts).")
     parser.add_argument(
         "--episode-limit-per-podcast",
@@ -74,9 +101,10 @@ def parse_args() -> argparse.Namespace:
         "--min-request-interval",
         type=float,
         default=0.35,
-        help="Minimum seconds between HTTP requests across all workers.",
+        help="Minimum seconds between HTTP requests across all workers (async engine: per host).",
     )
     parser.add_argument("--max-retries", type=int, default=5, help="Retries for 429/5xx responses.")
+    add_cache_args(parser)
     return parser.parse_args()
 
 
@@ -166,6 +194,140 @@ def record_key(record: EpisodeRecord) -> str:
     return record.source_url or record.local_path
 
 
+def parse_podcast_page(html: str, show_slug: str, episode_limit: int = 0) -> list[str] | None:
+    """Episode links on a podcast page, or None when the derived slug hit the generic page."""
+    soup = BeautifulSoup(html, "html.parser")
+    title = normalize_space(soup.title.string if soup.title and soup.title.string else "")
+    if title == GENERIC_TITLE or "Episode Date:" not in html:
+        return None
+    prefix = f"/podcasts/{show_slug}/"
+    links: list[str] = []
+    for anchor in soup.find_all("a", href=True):
+        href = anchor["href"].strip()
+        if not href.startswith(prefix):
+            continue
+        if href.rstrip("/") == prefix.rstrip("/"):
+            continue
+        if "facebook.com" in href or "twitter.com" in href:
+            continue
+        if href.rstrip("/").count("/") < 3:
+            continue
+        links.append(href.rstrip("/"))
+    links = unique_strings(links)
+    if episode_limit > 0:
+        links = links[:episode_limit]
+    return links
+
+
+def parse_episode_page(html: str, show_title: str) -> tuple[str, str, list[tuple[int, str]]] | None:
+    """(episode_title, published_date, cues) from an episode page; None without transcript blocks."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    episode_title = extract_title_from_page(soup, show_title)
+    date_text = ""
+    for span in soup.find_all(["span", "p", "div"]):
+        text = normalize_space(span.get_text(" ", strip=True))
+        if text.startswith("Episode Date:"):
+            date_text = text.split("Episode Date:", 1)[1].strip()
+            break
+    published_date = parse_episode_date(date_text)
+
+    transcript = soup.select_one(".podcast-transcript")
+    if transcript is None:
+        return None
+
+    cues: list[tuple[int, str]] = []
+    for block in transcript.select(".single-sentence"):
+        ts_node = block.select_one(".pod_timestamp_indicator")
+        if ts_node is None:
+            continue
+        ts_match = CLOCK_RE.search(ts_node.get_text(" ", strip=True))
+        if ts_match is None:
+            continue
+        parts = [
+            normalize_space(node.get_text(" ", strip=True))
+            for node in block.select(".pod_text")
+        ]
+        text = normalize_space(" ".join(part for part in parts if part))
+        if not text:
+            continue
+        cues.append((parse_clock(ts_match.group(1)), text))
+    if not cues:
+        return None
+    return episode_title, published_date, cues
+
+
+class CrawlFrontier:
+    """
+    Resumable crawl state for the async engine (SQLite next to the manifest).
+
+    `shows` holds each walked podcast page's episode links until the crawl completes, so an
+    interrupted run resumes without re-walking show indexes. `episodes` keeps finished episode
+    records across crawls; their transcripts are not refetched unless --refresh is set.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("pragma journal_mode=wal")
+        self.conn.execute("pragma synchronous=normal")
+        self.conn.executescript(
+            """
+            create table if not exists shows (
+                show_slug text primary key,
+                episode_links text not null,
+                walked_at real not null
+            );
+            create table if not exists episodes (
+                url text primary key,
+                show_slug text not null,
+                status text not null,
+                record text,
+                error text not null default '',
+                updated_at real not null
+            );
+            create index if not exists idx_episodes_show_slug on episodes(show_slug);
+            """
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def show_links(self, show_slug: str) -> list[str] | None:
+        row = self.conn.execute("select episode_links from shows where show_slug = ?", (show_slug,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_show_links(self, show_slug: str, links: list[str]) -> None:
+        self.conn.execute(
+            "insert or replace into shows(show_slug, episode_links, walked_at) values (?, ?, ?)",
+            (show_slug, json.dumps(links), time.time()),
+        )
+        self.conn.commit()
+
+    def episode(self, url: str) -> tuple[str, dict | None] | None:
+        row = self.conn.execute("select status, record from episodes where url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return row[0], (json.loads(row[1]) if row[1] else None)
+
+    def mark_episode(self, url: str, show_slug: str, status: str, record: EpisodeRecord | None = None, error: str = "") -> None:
+        self.conn.execute(
+            "insert or replace into episodes(url, show_slug, status, record, error, updated_at) values (?, ?, ?, ?, ?, ?)",
+            (url, show_slug, status, json.dumps(asdict(record)) if record else None, error[:500], time.time()),
+        )
+        self.conn.commit()
+
+    def finish_shows(self, show_slugs: list[str]) -> None:
+        """Close out a completed crawl: the next run re-walks these shows and retries non-done episodes."""
+        for i in range(0, len(show_slugs), 500):
+            chunk = show_slugs[i:i + 500]
+            marks = ",".join("?" for _ in chunk)
+            self.conn.execute(f"delete from shows where show_slug in ({marks})", chunk)
+            self.conn.execute(f"delete from episodes where status != 'done' and show_slug in ({marks})", chunk)
+        self.conn.commit()
+
+
 class PodscriptsCollector:
     def __init__(
         self,
@@ -178,6 +340,9 @@ class PodscriptsCollector:
         refresh: bool,
         min_request_interval: float,
         max_retries: int,
+        cache: HttpCache | None = None,
+        max_per_host: int = 4,
+        parse_workers: int = 2,
     ) -> None:
         self.out_dir = out_dir.resolve()
         self.workers = max(1, workers)
@@ -188,6 +353,9 @@ class PodscriptsCollector:
         self.timeout = 45
         self.min_request_interval = max(0.0, float(min_request_interval))
         self.max_retries = max(1, int(max_retries))
+        self.max_per_host = max(1, int(max_per_host))
+        self.parse_workers = max(1, int(parse_workers))
+        self._parse_pool: concurrent.futures.Executor | None = None
         self.records: list[EpisodeRecord] = []
         self.show_summaries: list[ShowSummary] = []
         self.catalog: list[dict] = []
@@ -197,9 +365,11 @@ class PodscriptsCollector:
         self.session.headers.update({"User-Agent": USER_AGENT})
         self._rate_lock = threading.Lock()
         self._last_request_started_at = 0.0
+        self.cache = cache if cache is not None else HttpCache(Path(), enabled=False)
         self.manifest_path = self.out_dir / "podscripts-manifest.json"
         self.report_path = self.out_dir / "PODSCRIPTS_REPORT.md"
         self.catalog_path = self.out_dir / "podscripts-catalog.json"
+        self.frontier_path = self.out_dir / "podscripts-frontier.sqlite"
 
     def load_existing_records(self) -> list[EpisodeRecord]:
         merged: dict[str, EpisodeRecord] = {}
@@ -273,38 +443,39 @@ class PodscriptsCollector:
 
         return list(merged.values())
 
-    def get_text(self, url: str) -> str:
+    def send_paced(self, url: str, extra_headers: dict[str, str]) -> tuple[int, bytes, dict[str, str]]:
+        # Pacing applies only to requests that actually go out; cache hits skip the rate lock.
+        with self._rate_lock:
+            now = time.monotonic()
+            wait_for = self.min_request_interval - (now - self._last_request_started_at)
+            if wait_for > 0:
+                time.sleep(wait_for)
+            self._last_request_started_at = time.monotonic()
+        response = self.session.get(url, timeout=self.timeout, headers=extra_headers or None)
+        return response.status_code, response.content, dict(response.headers)
+
+    def get_text(self, url: str, *, kind: str = "page") -> str:
         last_error: Exception | None = None
         for attempt in range(self.max_retries):
-            with self._rate_lock:
-                now = time.monotonic()
-                wait_for = self.min_request_interval - (now - self._last_request_started_at)
-                if wait_for > 0:
-                    time.sleep(wait_for)
-                self._last_request_started_at = time.monotonic()
             try:
-                response = self.session.get(url, timeout=self.timeout)
-                response.encoding = "utf-8"
-                if response.status_code == 429 or 500 <= response.status_code < 600:
-                    response.raise_for_status()
-                response.raise_for_status()
-                return response.text
-            except requests.HTTPError as exc:
-                last_error = exc
-                status_code = exc.response.status_code if exc.response is not None else 0
-                if status_code == 429 or 500 <= status_code < 600:
-                    time.sleep(min(12.0, (2 ** attempt) * 0.75))
-                    continue
-                raise
+                response = self.cache.fetch(url, lambda extra: self.send_paced(url, extra), kind=kind)
             except Exception as exc:
                 last_error = exc
                 time.sleep(min(12.0, (2 ** attempt) * 0.5))
+                continue
+            if response.status == 429 or 500 <= response.status < 600:
+                last_error = requests.HTTPError(f"{response.status} Error for url: {url}")
+                time.sleep(min(12.0, (2 ** attempt) * 0.75))
+                continue
+            if response.status >= 400:
+                raise requests.HTTPError(f"{response.status} Error for url: {url}")
+            return response.text
         if last_error is not None:
             raise last_error
         raise RuntimeError(f"failed to fetch {url}")
 
     def fetch_catalog(self) -> list[dict]:
-        html = self.get_text(f"{BASE_URL}/")
+        html = self.get_text(f"{BASE_URL}/", kind="catalog")
         soup = BeautifulSoup(html, "html.parser")
         podsearch = soup.find("podsearch")
         if podsearch is None:
@@ -326,72 +497,27 @@ class PodscriptsCollector:
             self.catalog = self.catalog[:self.pod_limit]
         return self.catalog
 
-    def is_valid_podcast_page(self, html: str) -> bool:
-        soup = BeautifulSoup(html, "html.parser")
-        title = normalize_space(soup.title.string if soup.title and soup.title.string else "")
-        return title != GENERIC_TITLE and "Episode Date:" in html
-
-    def extract_episode_links(self, html: str, show_slug: str) -> list[str]:
-        soup = BeautifulSoup(html, "html.parser")
-        prefix = f"/podcasts/{show_slug}/"
-        links: list[str] = []
-        for anchor in soup.find_all("a", href=True):
-            href = anchor["href"].strip()
-            if not href.startswith(prefix):
-                continue
-            if href.rstrip("/") == prefix.rstrip("/"):
-                continue
-            if "facebook.com" in href or "twitter.com" in href:
-                continue
-            if href.rstrip("/").count("/") < 3:
-                continue
-            links.append(href.rstrip("/"))
-        links = unique_strings(links)
-        if self.episode_limit_per_podcast > 0:
-            links = links[:self.episode_limit_per_podcast]
-        return links
-
     def episode_filename(self, published_date: str, episode_title: str) -> str:
         date_part = published_date[:10] if published_date else "unknown-date"
         title_part = slugify(episode_title, max_length=110)
         return f"{date_part}-{title_part}-podscripts.vtt"
 
     def parse_episode(self, show_title: str, show_slug: str, episode_url: str, show_dir: Path) -> tuple[EpisodeRecord | None, bool]:
-        html = self.get_text(episode_url)
-        soup = BeautifulSoup(html, "html.parser")
-
-        episode_title = extract_title_from_page(soup, show_title)
-        date_text = ""
-        for span in soup.find_all(["span", "p", "div"]):
-            text = normalize_space(span.get_text(" ", strip=True))
-            if text.startswith("Episode Date:"):
-                date_text = text.split("Episode Date:", 1)[1].strip()
-                break
-        published_date = parse_episode_date(date_text)
-
-        transcript = soup.select_one(".podcast-transcript")
-        if transcript is None:
-            return None, False
-
-        cues: list[tuple[int, str]] = []
-        for block in transcript.select(".single-sentence"):
-            ts_node = block.select_one(".pod_timestamp_indicator")
-            if ts_node is None:
-                continue
-            ts_match = CLOCK_RE.search(ts_node.get_text(" ", strip=True))
-            if ts_match is None:
-                continue
-            parts = [
-                normalize_space(node.get_text(" ", strip=True))
-                for node in block.select(".pod_text")
-            ]
-            text = normalize_space(" ".join(part for part in parts if part))
-            if not text:
-                continue
-            cues.append((parse_clock(ts_match.group(1)), text))
-        if not cues:
+        html = self.get_text(episode_url, kind="transcript")
+        parsed = parse_episode_page(html, show_title)
+        if parsed is None:
             return None, False
+        return self.write_episode(show_title, show_slug, episode_url, show_dir, parsed)
 
+    def write_episode(
+        self,
+        show_title: str,
+        show_slug: str,
+        episode_url: str,
+        show_dir: Path,
+        parsed: tuple[str, str, list[tuple[int, str]]],
+    ) -> tuple[EpisodeRecord, bool]:
+        episode_title, published_date, cues = parsed
         local_filename = self.episode_filename(published_date, episode_title)
         output_path = show_dir / local_filename
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -425,13 +551,13 @@ class PodscriptsCollector:
         show_dir = self.out_dir / show_slug
 
         try:
-            html = self.get_text(podcast_url)
+            html = self.get_text(podcast_url, kind="catalog")
         except Exception as exc:
             return ShowSummary(pod_id, show_title, show_slug, podcast_url, 0, 0, 0, [f"podcast page fetch failed: {exc}"]), []
-        if not self.is_valid_podcast_page(html):
+        episode_links = parse_podcast_page(html, show_slug, self.episode_limit_per_podcast)
+        if episode_links is None:
             return ShowSummary(pod_id, show_title, show_slug, podcast_url, 0, 0, 0, ["podcast page not found for derived slug"]), []
 
-        episode_links = self.extract_episode_links(html, show_slug)
         records: list[EpisodeRecord] = []
         skipped_existing = 0
         for relative_link in episode_links:
@@ -448,6 +574,20 @@ class PodscriptsCollector:
                 skipped_existing += 1
             records.append(record)
 
+        return self.finish_show(pod_id, show_title, show_slug, podcast_url, episode_links, records, skipped_existing, errors)
+
+    def finish_show(
+        self,
+        pod_id: int,
+        show_title: str,
+        show_slug: str,
+        podcast_url: str,
+        episode_links: list[str],
+        records: list[EpisodeRecord],
+        skipped_existing: int,
+        errors: list[str],
+    ) -> tuple[ShowSummary, list[EpisodeRecord]]:
+        show_dir = self.out_dir / show_slug
         if records:
             self.write_show_sidecar(
                 show_dir=show_dir,
@@ -474,6 +614,144 @@ class PodscriptsCollector:
             records,
         )
 
+    async def get_text_async(self, client: AsyncHttpClient, url: str, *, kind: str = "page") -> str:
+        async def send(extra_headers: dict[str, str]) -> tuple[int, bytes, dict[str, str]]:
+            response = await client.get(url, headers=extra_headers, max_bytes=MAX_PAGE_BYTES)
+            if response.truncated:
+                raise RuntimeError(f"page larger than {MAX_PAGE_BYTES} bytes")
+            return response.status, response.body, response.headers
+
+        last_error: Exception | None = None
+        for attempt in range(self.max_retries):
+            try:
+                response = await self.cache.afetch(url, send, kind=kind)
+            except Exception as exc:
+                last_error = exc
+                await asyncio.sleep(min(12.0, (2 ** attempt) * 0.5))
+                continue
+            if response.status == 429 or 500 <= response.status < 600:
+                # The client's limiter already pushed the host back on 429 / Retry-After.
+                last_error = requests.HTTPError(f"{response.status} Error for url: {url}")
+                await asyncio.sleep(min(12.0, (2 ** attempt) * 0.75))
+                continue
+            if response.status >= 400:
+                raise requests.HTTPError(f"{response.status} Error for url: {url}")
+            return response.text
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(f"failed to fetch {url}")
+
+    async def parse_async(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._parse_pool, fn, *args)
+
+    async def collect_episode_async(
+        self,
+        client: AsyncHttpClient,
+        frontier: CrawlFrontier,
+        show_title: str,
+        show_slug: str,
+        episode_url: str,
+    ) -> tuple[EpisodeRecord | None, bool, str]:
+        state = frontier.episode(episode_url)
+        if state is not None and not self.refresh:
+            status, record_data = state
+            if status == "done" and record_data:
+                record = EpisodeRecord(**record_data)
+                if (ROOT / record.local_path).exists():
+                    return record, True, ""
+            elif status == "missing":
+                return None, False, "missing transcript blocks"
+        try:
+            html = await self.get_text_async(client, episode_url, kind="transcript")
+            parsed = await self.parse_async(parse_episode_page, html, show_title)
+            if parsed is None:
+                frontier.mark_episode(episode_url, show_slug, "missing")
+                return None, False, "missing transcript blocks"
+            record, existed_before = self.write_episode(show_title, show_slug, episode_url, self.out_dir / show_slug, parsed)
+        except Exception as exc:
+            frontier.mark_episode(episode_url, show_slug, "error", error=str(exc))
+            return None, False, str(exc)
+        frontier.mark_episode(episode_url, show_slug, "done", record)
+        return record, existed_before, ""
+
+    async def collect_show_async(self, client: AsyncHttpClient, frontier: CrawlFrontier, pod: dict) -> tuple[ShowSummary, list[EpisodeRecord]]:
+        pod_id = int(pod.get("id") or 0)
+        show_title = normalize_space(str(pod.get("podcast_title") or ""))
+        show_slug = slugify(show_title)
+        podcast_url = f"{BASE_URL}/podcasts/{show_slug}/"
+
+        episode_links = frontier.show_links(show_slug)
+        if episode_links is None:
+            try:
+                html = await self.get_text_async(client, podcast_url, kind="catalog")
+                episode_links = await self.parse_async(parse_podcast_page, html, show_slug, self.episode_limit_per_podcast)
+            except Exception as exc:
+                return ShowSummary(pod_id, show_title, show_slug, podcast_url, 0, 0, 0, [f"podcast page fetch failed: {exc}"]), []
+            if episode_links is None:
+                return ShowSummary(pod_id, show_title, show_slug, podcast_url, 0, 0, 0, ["podcast page not found for derived slug"]), []
+            frontier.set_show_links(show_slug, episode_links)
+
+        # Episodes of a show are fetched concurrently; the client's per-host limit and the rate
+        # limiter keep the total request rate polite.
+        results = await asyncio.gather(*(
+            self.collect_episode_async(client, frontier, show_title, show_slug, f"{BASE_URL}{link}")
+            for link in episode_links
+        ))
+        records: list[EpisodeRecord] = []
+        errors: list[str] = []
+        skipped_existing = 0
+        for link, (record, existed_before, error) in zip(episode_links, results):
+            if record is None:
+                errors.append(f"{BASE_URL}{link}: {error}")
+                continue
+            if existed_before and not self.refresh:
+                skipped_existing += 1
+            records.append(record)
+        return self.finish_show(pod_id, show_title, show_slug, podcast_url, episode_links, records, skipped_existing, errors)
+
+    async def crawl_async(self, catalog: list[dict]) -> None:
+        frontier = CrawlFrontier(self.frontier_path)
+        limiter = DomainRateLimiter(self.min_request_interval)
+        show_slots = asyncio.Semaphore(self.workers)
+        completed = 0
+        context = multiprocessing.get_context("spawn")
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=context) as pool:
+                self._parse_pool = pool
+                async with AsyncHttpClient(
+                    user_agent=USER_AGENT,
+                    timeout_seconds=self.timeout,
+                    limiter=limiter,
+                    max_per_host=self.max_per_host,
+                ) as client:
+
+                    async def run_show(pod: dict) -> tuple[ShowSummary, list[EpisodeRecord]]:
+                        async with show_slots:
+                            return await self.collect_show_async(client, frontier, pod)
+
+                    tasks = [asyncio.create_task(run_show(pod)) for pod in catalog]
+                    try:
+                        for future in asyncio.as_completed(tasks):
+                            summary, records = await future
+                            self.show_summaries.append(summary)
+                            self.records.extend(records)
+                            completed += 1
+                            if completed % 25 == 0:
+                                self.save()
+                                print(
+                                    f"[checkpoint] podcasts={completed}/{len(catalog)} "
+                                    f"captured={len(self.records)} "
+                                    f"connections={client.connections_opened} reused={client.connections_reused}"
+                                )
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+            frontier.finish_shows([summary.show_slug for summary in self.show_summaries])
+        finally:
+            self._parse_pool = None
+            frontier.close()
+
     def write_show_sidecar(
         self,
         *,
@@ -611,6 +889,12 @@ class PodscriptsCollector:
             report_lines.append("")
         self.report_path.write_text("\n".join(report_lines).rstrip() + "\n", encoding="utf-8")
 
+    def run_async(self) -> None:
+        catalog = self.fetch_catalog()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        asyncio.run(self.crawl_async(catalog))
+        self.save()
+
     def run(self) -> None:
         catalog = self.fetch_catalog()
         self.out_dir.mkdir(parents=True, exist_ok=True)
@@ -643,13 +927,20 @@ def main() -> None:
         refresh=bool(args.refresh),
         min_request_interval=float(args.min_request_interval),
         max_retries=int(args.max_retries),
+        cache=cache_from_args(args),
+        max_per_host=int(args.max_per_host),
+        parse_workers=int(args.parse_workers),
     )
-    collector.run()
+    if args.engine == "async":
+        collector.run_async()
+    else:
+        collector.run()
     print(
         f"[done] podcasts={len(collector.show_summaries)} "
         f"transcript_files={len(collector.records)} "
         f"out={collector.out_dir}"
     )
+    print(f"[http-cache] {collector.cache.summary()}")
 
 
 if __name__ == "__main__":
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Any
 from xml.etree import ElementTree as ET
 
+from http_cache import HttpCache, add_cache_args, cache_from_args, urllib_sender
+
 
 ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_OUT_DIR = ROOT / "podcast-transcripts"
@@ -72,19 +74,20 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--max-episodes-per-show", type=int, default=0, help="Max episodes to inspect per show (0 = all feed items).")
     p.add_argument("--show-limit", type=int, default=0, help="Limit total shows processed (0 = all).")
     p.add_argument("--refresh", action="store_true", help="Re-download existing files.")
+    add_cache_args(p)
     return p.parse_args()
 
 
-def http_get(url: str) -> bytes:
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json, application/xml, text/xml, text/plain, */*",
-        },
-    )
+def http_get(url: str, *, cache: HttpCache | None = None, kind: str = "page") -> bytes:
+    headers = {
+        "User-Agent": USER_AGENT,
+        "Accept": "application/json, application/xml, text/xml, text/plain, */*",
+    }
     ctx = ssl.create_default_context()
-    return urllib.request.urlopen(req, timeout=40, context=ctx).read()
+    if cache is None:
+        req = urllib.request.Request(url, headers=headers)
+        return urllib.request.urlopen(req, timeout=40, context=ctx).read()
+    return cache.fetch(url, urllib_sender(url, headers=headers, timeout=40, context=ctx), kind=kind).body
 
 
 def slugify(text: str, *, max_len: int = 120) -> str:
@@ -112,27 +115,27 @@ def load_shows(path: Path, show_limit: int) -> list[str]:
     return shows
 
 
-def search_show(query: str) -> dict[str, Any] | None:
+def search_show(query: str, cache: HttpCache | None = None) -> dict[str, Any] | None:
     params = urllib.parse.urlencode({
         "media": "podcast",
         "entity": "podcast",
         "limit": "8",
         "term": query,
     })
-    payload = json.loads(http_get(f"https://itunes.apple.com/search?{params}").decode("utf-8"))
+    payload = json.loads(http_get(f"https://itunes.apple.com/search?{params}", cache=cache, kind="search").decode("utf-8"))
     results = payload.get("results") or []
     if not results:
         return None
     return results[0]
 
 
-def lookup_episodes(collection_id: int, limit: int) -> list[dict[str, Any]]:
+def lookup_episodes(collection_id: int, limit: int, cache: HttpCache | None = None) -> list[dict[str, Any]]:
     params = urllib.parse.urlencode({
         "id": str(collection_id),
         "entity": "podcastEpisode",
         "limit": str(limit),
     })
-    payload = json.loads(http_get(f"https://itunes.apple.com/lookup?{params}").decode("utf-8"))
+    payload = json.loads(http_get(f"https://itunes.apple.com/lookup?{params}", cache=cache, kind="search").decode("utf-8"))
     results = payload.get("results") or []
     return [item for item in results if item.get("wrapperType") == "podcastEpisode"]
 
@@ -373,8 +376,8 @@ def write_show_sidecars(show_dir: Path, report: ShowReport, feed_xml: str) -> No
     (show_dir / "podcast-feed.xml").write_text(feed_xml, encoding="utf-8")
 
 
-def collect_show(query: str, out_dir: Path, max_episodes: int, refresh: bool) -> ShowReport:
-    result = search_show(query)
+def collect_show(query: str, out_dir: Path, max_episodes: int, refresh: bool, cache: HttpCache | None = None) -> ShowReport:
+    result = search_show(query, cache)
     if result is None:
         return ShowReport(
             query=query,
@@ -407,7 +410,7 @@ def collect_show(query: str, out_dir: Path, max_episodes: int, refresh: bool) ->
         return ShowReport(query, collection_name, collection_id, artist_name, feed_url, show_slug, False, 0, 0, 0, errors, files)
 
     try:
-        xml = http_get(feed_url).decode("utf-8", errors="replace")
+        xml = http_get(feed_url, cache=cache, kind="feed").decode("utf-8", errors="replace")
     except Exception as exc:
         errors.append(f"feed fetch failed: {exc}")
         return ShowReport(query, collection_name, collection_id, artist_name, feed_url, show_slug, False, 0, 0, 0, errors, files)
@@ -437,7 +440,7 @@ def collect_show(query: str, out_dir: Path, max_episodes: int, refresh: bool) ->
         episodes = feed_episode_entries(root, 0)
     else:
         try:
-            episodes = lookup_episodes(collection_id, max_episodes)
+            episodes = lookup_episodes(collection_id, max_episodes, cache)
         except Exception as exc:
             errors.append(f"itunes episode lookup failed: {exc}")
             episodes = feed_episode_entries(root, max_episodes)
@@ -471,7 +474,7 @@ def collect_show(query: str, out_dir: Path, max_episodes: int, refresh: bool) ->
         last_error = ""
         for candidate in candidates:
             try:
-                payload = http_get(candidate.url)
+                payload = http_get(candidate.url, cache=cache, kind="transcript")
                 source_type, vtt = normalize_transcript_payload(payload)
                 output_path.write_text(vtt, encoding="utf-8")
                 files.append(EpisodeTranscript(
@@ -513,9 +516,11 @@ def main() -> None:
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
     shows = load_shows(Path(args.shows), int(args.show_limit or 0))
-    reports = [collect_show(show, out_dir, int(args.max_episodes_per_show), bool(args.refresh)) for show in shows]
+    cache = cache_from_args(args)
+    reports = [collect_show(show, out_dir, int(args.max_episodes_per_show), bool(args.refresh), cache) for show in shows]
     write_report(out_dir, reports)
     total = sum(len(report.transcript_files) for report in reports)
+    print(f"[http-cache] {cache.summary()}")
     print(f"[done] shows={len(reports)} transcript_files={total} out={out_dir}")
 
 
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+"""
+Shared on-disk HTTP cache for the transcript collectors.
+
+Each URL gets a small JSON metadata file (status, headers, validators, fetched_at) and a
+gzip-compressed body under `<root>/<hh>/<sha1>`. Each URL class has a TTL (search API, catalog
+pages, feed XML, transcripts):
+- within the TTL the cached body is returned with no request at all;
+- after it, the request is sent with If-None-Match / If-Modified-Since, and a 304 just refreshes
+  fetched_at.
+
+The cache does not know about any HTTP library. Callers pass `send(extra_headers)`, which
+performs the GET and returns `(status, body, headers)`. `afetch` takes an async `send`. Only
+200 responses are stored.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Mapping
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = ROOT / "cache" / "http"
+
+# Seconds a cached response is served without revalidation, per URL class.
+DEFAULT_TTL_SECONDS = {
+    "search": 24 * 3600.0,
+    "api": 24 * 3600.0,
+    "catalog": 6 * 3600.0,
+    "page": 24 * 3600.0,
+    "feed": 6 * 3600.0,
+    "transcript": 30 * 24 * 3600.0,
+}
+_DROP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length", "set-cookie"}
+
+Sender = Callable[[dict[str, str]], "tuple[int, bytes, Mapping[str, str]]"]
+AsyncSender = Callable[[dict[str, str]], "Awaitable[tuple[int, bytes, Mapping[str, str]]]"]
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+    revalidated: bool = False
+
+    def header(self, name: str, default: str = "") -> str:
+        return self.headers.get(name.lower(), default)
+
+    @property
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+class HttpCache:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl_seconds: Mapping[str, float] | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS)
+        if ttl_seconds:
+            self.ttl_seconds.update({k: float(v) for k, v in ttl_seconds.items()})
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "uncached": 0}
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = self.root / digest[:2] / digest
+        return base.with_suffix(".json"), base.with_suffix(".gz")
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _load(self, url: str) -> tuple[dict, Path] | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not body_path.exists():
+            return None
+        return meta, body_path
+
+    def _write(self, url: str, meta: dict, body: bytes | None) -> None:
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        if body is not None:
+            tmp_body = body_path.with_name(body_path.name + suffix)
+            tmp_body.write_bytes(gzip.compress(body, compresslevel=6))
+            os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_name(meta_path.name + suffix)
+        tmp_meta.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+
+    def _begin(self, url: str, kind: str) -> tuple[CachedResponse | None, tuple[dict, Path] | None, dict[str, str]]:
+        """(fresh cached response, stale entry, conditional request headers) for `url`."""
+        cached = self._load(url)
+        if cached is None:
+            return None, None, {}
+        meta, body_path = cached
+        ttl = self.ttl_seconds.get(kind, self.ttl_seconds["page"])
+        if time.time() - float(meta.get("fetched_at", 0)) < ttl:
+            self._count("fresh")
+            return CachedResponse(200, gzip.decompress(body_path.read_bytes()), dict(meta.get("headers") or {}), from_cache=True), cached, {}
+        extra: dict[str, str] = {}
+        cached_headers = meta.get("headers") or {}
+        if cached_headers.get("etag"):
+            extra["If-None-Match"] = cached_headers["etag"]
+        if cached_headers.get("last-modified"):
+            extra["If-Modified-Since"] = cached_headers["last-modified"]
+        return None, cached, extra
+
+    def _finish(
+        self,
+        url: str,
+        kind: str,
+        cached: tuple[dict, Path] | None,
+        status: int,
+        body: bytes,
+        headers: Mapping[str, str],
+    ) -> CachedResponse:
+        now = time.time()
+        headers = {k.lower(): v for k, v in headers.items() if k.lower() not in _DROP_HEADERS}
+        if status == 304 and cached is not None:
+            meta, body_path = cached
+            # A 304 may carry updated validators; keep the cached ones otherwise.
+            meta["headers"] = {**(meta.get("headers") or {}), **{k: v for k, v in headers.items() if k in ("etag", "last-modified", "cache-control", "expires")}}
+            meta["fetched_at"] = now
+            self._write(url, meta, None)
+            self._count("revalidated")
+            return CachedResponse(200, gzip.decompress(body_path.read_bytes()), dict(meta["headers"]), from_cache=True, revalidated=True)
+        if status == 200:
+            self._write(url, {"url": url, "kind": kind, "fetched_at": now, "headers": headers}, body)
+            self._count("fetched")
+        else:
+            self._count("uncached")
+        return CachedResponse(status, body, headers)
+
+    def fetch(self, url: str, send: Sender, *, kind: str = "page") -> CachedResponse:
+        """GET `url` through the cache. Non-200/304 responses are returned as-is and not stored."""
+        if not self.enabled:
+            status, body, headers = send({})
+            self._count("uncached")
+            return CachedResponse(status, body, {k.lower(): v for k, v in headers.items()})
+        fresh, cached, extra = self._begin(url, kind)
+        if fresh is not None:
+            return fresh
+        status, body, headers = send(extra)
+        return self._finish(url, kind, cached, status, body, headers)
+
+    async def afetch(self, url: str, send: AsyncSender, *, kind: str = "page") -> CachedResponse:
+        """`fetch` for asyncio callers; disk reads and writes run in a worker thread."""
+        if not self.enabled:
+            status, body, headers = await send({})
+            self._count("uncached")
+            return CachedResponse(status, body, {k.lower(): v for k, v in headers.items()})
+        fresh, cached, extra = await asyncio.to_thread(self._begin, url, kind)
+        if fresh is not None:
+            return fresh
+        status, body, headers = await send(extra)
+        return await asyncio.to_thread(self._finish, url, kind, cached, status, body, headers)
+
+    def summary(self) -> str:
+        s = self.stats
+        return f"fresh={s['fresh']} revalidated={s['revalidated']} fetched={s['fetched']} uncached={s['uncached']}"
+
+
+def urllib_sender(url: str, *, headers: Mapping[str, str], timeout: float, context=None) -> Sender:
+    """`send` for urllib. HTTP errors other than 304 propagate as urllib.error.HTTPError."""
+
+    def send(extra_headers: dict[str, str]) -> tuple[int, bytes, Mapping[str, str]]:
+        req = urllib.request.Request(url, headers={**headers, **extra_headers})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout, context=context) as resp:
+                return resp.status, resp.read(), dict(resp.headers.items())
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            return 304, b"", dict(e.headers.items())
+
+    return send
+
+
+def add_cache_args(p) -> None:
+    p.add_argument("--http-cache-dir", default=str(DEFAULT_CACHE_DIR), help="On-disk HTTP cache directory.")
+    p.add_argument("--no-http-cache", action="store_true", help="Bypass the HTTP cache (always fetch).")
+
+
+def cache_from_args(args) -> HttpCache:
+    # --refresh means "re-download transcripts": revalidate every transcript instead of serving it within the TTL.
+    ttl = {"transcript": 0.0} if getattr(args, "refresh", False) else None
+    return HttpCache(Path(args.http_cache_dir), ttl_seconds=ttl, enabled=not bool(args.no_http_cache))
+
+
+def requests_sender(session, url: str, *, timeout: float) -> Sender:
+    """`send` for a requests.Session (raises on network errors only)."""
+
+    def send(extra_headers: dict[str, str]) -> tuple[int, bytes, Mapping[str, str]]:
+        response = session.get(url, timeout=timeout, headers=extra_headers or None)
+        return response.status_code, response.content, response.headers
+
+    return send
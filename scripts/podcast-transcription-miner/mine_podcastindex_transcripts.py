@@ -6,9 +6,14 @@ import concurrent.futures
 import datetime as dt
 import json
 import math
+import multiprocessing
+import os
 import sqlite3
+import sys
+import textwrap
 import threading
 import time
+import zlib
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Iterator
@@ -28,12 +33,20 @@ from collect_public_transcripts import (
     slugify,
 )
 
-
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.rate_limit import DomainRateLimiter
+
 DEFAULT_OUT_DIR = ROOT / "podcast-transcripts"
 DEFAULT_DB_PATH = ROOT / "podcastindex-feeds" / "podcastindex_feeds.db"
 DEFAULT_STATE_DB = ROOT / "podcast-transcripts" / "podcastindex-miner-state.sqlite"
 DEFAULT_SELECTION_PROFILE = "curated"
+DEFAULT_SHARD_BY = "host"
+# The full manifest/report rewrite runs once the appended log reaches the size of the last
+# compacted manifest, so rewrite cost stays proportional to the work appended since.
+MIN_COMPACT_RECORDS = 2000
 DEFAULT_CURATED_MIN_POPULARITY = 8
 DEFAULT_EXCLUDED_HOSTS = (
     "castbox.fm",
@@ -80,6 +93,45 @@ DEFAULT_WARNING_TEXT_PATTERNS = (
     "fm",
     "am",
 )
+FEED_CHECK_COLUMNS = (
+    "feed_id, feed_url, show_slug, show_title, host, checked_at, "
+    "transcript_support, episodes_considered, episodes_downloaded, "
+    "skipped_existing, error_text"
+)
+FEED_CHECK_UPSERT_SQL = """
+    on conflict(feed_id) do update set
+        feed_url = excluded.feed_url,
+        show_slug = excluded.show_slug,
+        show_title = excluded.show_title,
+        host = excluded.host,
+        checked_at = excluded.checked_at,
+        transcript_support = excluded.transcript_support,
+        episodes_considered = excluded.episodes_considered,
+        episodes_downloaded = excluded.episodes_downloaded,
+        skipped_existing = excluded.skipped_existing,
+        error_text = excluded.error_text
+"""
+TRANSCRIPT_FILE_COLUMNS = (
+    "local_path, feed_id, feed_url, show_slug, show_title, episode_title, "
+    "episode_guid, published_date, source_url, source_type, language, local_path_shadow"
+)
+TRANSCRIPT_FILE_UPSERT_SQL = """
+    on conflict(local_path) do update set
+        feed_id = excluded.feed_id,
+        feed_url = excluded.feed_url,
+        show_slug = excluded.show_slug,
+        show_title = excluded.show_title,
+        episode_title = excluded.episode_title,
+        episode_guid = excluded.episode_guid,
+        published_date = excluded.published_date,
+        source_url = case
+            when excluded.source_url <> '' then excluded.source_url
+            else transcript_files.source_url
+        end,
+        source_type = excluded.source_type,
+        language = excluded.language,
+        local_path_shadow = excluded.local_path_shadow
+"""
 
 
 def format_bytes(num_bytes: float) -> str:
@@ -112,6 +164,16 @@ def format_duration(seconds: float) -> str:
     return " ".join(parts)
 
 
+def host_shard(host: str, shard_count: int) -> int:
+    # crc32 rather than hash(): it must agree across processes regardless of PYTHONHASHSEED.
+    key = str(host or "").strip().lower().encode("utf-8")
+    return zlib.crc32(key) % max(1, int(shard_count))
+
+
+def shard_sibling_path(path: Path, label: str) -> Path:
+    return path.with_name(f"{path.stem}.{label}{path.suffix}")
+
+
 @dataclass
 class FeedCandidate:
     feed_id: int
@@ -201,6 +263,7 @@ class PodcastIndexMiner:
         *,
         workers: int,
         per_host: int,
+        domain_delay: float = 0.0,
         limit_feeds: int,
         min_popularity: int,
         refresh: bool,
@@ -211,12 +274,17 @@ class PodcastIndexMiner:
         progress_log: Path | None,
         status_json: Path | None,
         selection_profile: str,
+        shard_count: int = 1,
+        shard_index: int = 0,
+        shard_by: str = DEFAULT_SHARD_BY,
+        prior_state_db: Path | None = None,
     ) -> None:
         self.db_path = db_path.resolve()
         self.out_dir = out_dir.resolve()
         self.state_db = state_db.resolve()
         self.workers = max(1, workers)
         self.per_host = max(1, per_host)
+        self.domain_delay = max(0.0, float(domain_delay))
         self.limit_feeds = max(0, limit_feeds)
         self.min_popularity = max(0, min_popularity)
         self.refresh = refresh
@@ -229,13 +297,30 @@ class PodcastIndexMiner:
         self.selection_profile = (selection_profile or DEFAULT_SELECTION_PROFILE).strip().lower()
         if self.selection_profile not in {"curated", "broad"}:
             raise ValueError("selection_profile must be 'curated' or 'broad'")
+        self.shard_count = max(1, int(shard_count))
+        self.shard_index = int(shard_index)
+        if not 0 <= self.shard_index < self.shard_count:
+            raise ValueError("shard_index must be in [0, shard_count)")
+        self.shard_by = (shard_by or DEFAULT_SHARD_BY).strip().lower()
+        if self.shard_by not in {"id", "host"}:
+            raise ValueError("shard_by must be 'id' or 'host'")
+        # Set only inside a shard process: the coordinator's state DB, read for prior crawl state
+        # while this process writes its own outcomes to `state_db` for the final merge.
+        self.prior_state_db = prior_state_db.resolve() if prior_state_db else None
+        self.is_shard = self.prior_state_db is not None
+        self.log_prefix = f"[shard {self.shard_index + 1}/{self.shard_count}] " if self.is_shard else ""
         self.sessions = ThreadLocalSessions()
         self.host_limiter = HostLimiter(self.per_host)
+        # Concurrency is capped by host_limiter; this paces requests per domain and honors Retry-After.
+        self.rate_limiter = DomainRateLimiter(self.domain_delay)
         self.manifest_path = self.out_dir / "podcastindex-manifest.json"
+        self.manifest_log_path = self.out_dir / "podcastindex-manifest.jsonl"
         self.report_path = self.out_dir / "PODCASTINDEX_REPORT.md"
         self.retryable_statuses = {408, 425, 429, 500, 502, 503, 504}
 
     def emit_lines(self, lines: list[str]) -> None:
+        if self.log_prefix:
+            lines = [self.log_prefix + line if line else line for line in lines]
         if self.progress_log:
             self.progress_log.parent.mkdir(parents=True, exist_ok=True)
             with self.progress_log.open("a", encoding="utf-8") as handle:
@@ -363,21 +448,48 @@ class PodcastIndexMiner:
                 params.append(f"%{pattern}%")
         return where_parts, params
 
-    def candidate_subquery_sql(self) -> tuple[str, list[object]]:
+    def shard_filter_sql(self) -> tuple[str, list[object]]:
+        if self.shard_count <= 1:
+            return "", []
+        if self.shard_by == "id":
+            return "id % ? = ?", [self.shard_count, self.shard_index]
+        return "pi_host_shard(host, ?) = ?", [self.shard_count, self.shard_index]
+
+    def candidate_select_sql(self, columns: str) -> tuple[str, list[object]]:
         where_parts, params = self.candidate_where_parts()
+        order_sql = self.candidate_order_sql()
+        shard_sql, shard_params = self.shard_filter_sql()
+        if shard_sql and self.limit_feeds <= 0:
+            where_parts.append(shard_sql)
+            params.extend(shard_params)
+            shard_sql = ""
         limit_clause = f" limit {self.limit_feeds}" if self.limit_feeds > 0 else ""
         sql = (
-            "select id "
+            f"select {columns} "
             "from podcasts "
             f"where {' and '.join(where_parts)} "
-            f"order by {self.candidate_order_sql()} "
+            f"order by {order_sql} "
             f"{limit_clause}"
         )
+        if shard_sql:
+            # --limit-feeds caps the global candidate list, so each shard filters that limited
+            # list instead of taking its own top N.
+            sql = f"select * from ({sql}) where {shard_sql} order by {order_sql}"
+            params.extend(shard_params)
         return sql, params
 
+    def candidate_subquery_sql(self) -> tuple[str, list[object]]:
+        sql, params = self.candidate_select_sql("*")
+        return f"select id from ({sql})", params
+
+    def open_podcastindex(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn.create_function("pi_host_shard", 2, host_shard, deterministic=True)
+        return conn
+
     def count_total_candidates(self) -> int:
         sql, params = self.candidate_subquery_sql()
-        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn = self.open_podcastindex()
         try:
             return int(conn.execute(f"select count(*) from ({sql})", params).fetchone()[0])
         finally:
@@ -385,9 +497,9 @@ class PodcastIndexMiner:
 
     def count_checked_candidates(self, conn: sqlite3.Connection) -> int:
         sql, params = self.candidate_subquery_sql()
-        pi_conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        pi_conn = self.open_podcastindex()
         try:
-            state_db_sql = str(self.state_db).replace("'", "''")
+            state_db_sql = str(self.prior_state_db or self.state_db).replace("'", "''")
             pi_conn.execute(f"attach database '{state_db_sql}' as state")
             return int(
                 pi_conn.execute(
@@ -458,9 +570,53 @@ class PodcastIndexMiner:
             "create index if not exists idx_transcript_files_show_slug on transcript_files(show_slug)"
         )
         self.migrate_transcript_table(conn)
+        conn.execute(
+            "create index if not exists idx_transcript_files_feed_id on transcript_files(feed_id)"
+        )
+        self.init_show_stats(conn)
         conn.commit()
         return conn
 
+    def init_show_stats(self, conn: sqlite3.Connection) -> None:
+        exists = conn.execute(
+            "select 1 from sqlite_master where type = 'table' and name = 'show_stats'"
+        ).fetchone()
+        conn.execute(
+            """
+            create table if not exists show_stats (
+                feed_id integer primary key,
+                show_slug text not null,
+                show_title text not null,
+                feed_url text not null,
+                host text not null,
+                transcript_count integer not null,
+                last_checked integer not null
+            )
+            """
+        )
+        conn.execute(
+            "create index if not exists idx_show_stats_report on show_stats(transcript_count desc, show_slug)"
+        )
+        if not exists:
+            self.refresh_show_stats(conn, "select feed_id from feed_checks", [])
+
+    def refresh_show_stats(self, conn: sqlite3.Connection, feed_ids_sql: str, params: list[object]) -> None:
+        """Recompute the per-feed report aggregates for the feeds selected by `feed_ids_sql`."""
+        conn.execute(f"delete from show_stats where feed_id in ({feed_ids_sql})", params)
+        conn.execute(
+            f"""
+            insert into show_stats (
+                feed_id, show_slug, show_title, feed_url, host, transcript_count, last_checked
+            )
+            select f.feed_id, f.show_slug, f.show_title, f.feed_url, f.host,
+                   (select count(*) from transcript_files t where t.feed_id = f.feed_id),
+                   f.checked_at
+            from feed_checks f
+            where f.transcript_support = 1 and f.feed_id in ({feed_ids_sql})
+            """,
+            params,
+        )
+
     def migrate_transcript_table(self, conn: sqlite3.Connection) -> None:
         columns = {
             row[1]: row
@@ -528,18 +684,10 @@ class PodcastIndexMiner:
         return {int(row[0]) for row in cursor.fetchall()}
 
     def iter_candidates(self) -> Iterator[FeedCandidate]:
-        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn = self.open_podcastindex()
         conn.row_factory = sqlite3.Row
 
-        where_parts, params = self.candidate_where_parts()
-        limit_clause = f" limit {self.limit_feeds}" if self.limit_feeds > 0 else ""
-        sql = (
-            "select * "
-            "from podcasts "
-            f"where {' and '.join(where_parts)} "
-            f"order by {self.candidate_order_sql()} "
-            f"{limit_clause}"
-        )
+        sql, params = self.candidate_select_sql("*")
         cursor = conn.execute(sql, params)
         while True:
             rows = cursor.fetchmany(1000)
@@ -572,8 +720,11 @@ class PodcastIndexMiner:
             session = self.sessions.get()
             last_exc: Exception | None = None
             for attempt in range(4):
+                throttled = 0.0
                 try:
+                    self.rate_limiter.wait(url)
                     response = session.get(url, timeout=timeout)
+                    throttled = self.rate_limiter.note_response(url, response.status_code, response.headers.get("Retry-After"))
                     if response.status_code in self.retryable_statuses:
                         raise requests.HTTPError(
                             f"{response.status_code} {response.reason}",
@@ -590,7 +741,8 @@ class PodcastIndexMiner:
                     last_exc = exc
                     if attempt == 3:
                         raise
-                time.sleep(min(6, 0.75 * (attempt + 1)))
+                if throttled <= 0:
+                    time.sleep(min(6, 0.75 * (attempt + 1)))
             if last_exc is not None:
                 raise last_exc
             raise RuntimeError(f"unreachable fetch failure for {url}")
@@ -750,24 +902,8 @@ class PodcastIndexMiner:
 
     def persist_outcome(self, conn: sqlite3.Connection, outcome: FeedOutcome) -> None:
         conn.execute(
-            """
-            insert into feed_checks (
-                feed_id, feed_url, show_slug, show_title, host, checked_at,
-                transcript_support, episodes_considered, episodes_downloaded,
-                skipped_existing, error_text
-            ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            on conflict(feed_id) do update set
-                feed_url = excluded.feed_url,
-                show_slug = excluded.show_slug,
-                show_title = excluded.show_title,
-                host = excluded.host,
-                checked_at = excluded.checked_at,
-                transcript_support = excluded.transcript_support,
-                episodes_considered = excluded.episodes_considered,
-                episodes_downloaded = excluded.episodes_downloaded,
-                skipped_existing = excluded.skipped_existing,
-                error_text = excluded.error_text
-            """,
+            f"insert into feed_checks ({FEED_CHECK_COLUMNS}) "
+            f"values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) {FEED_CHECK_UPSERT_SQL}",
             (
                 outcome.feed_id,
                 outcome.feed_url,
@@ -784,27 +920,8 @@ class PodcastIndexMiner:
         )
         for record in outcome.transcript_files:
             conn.execute(
-                """
-                insert into transcript_files (
-                    local_path, feed_id, feed_url, show_slug, show_title, episode_title,
-                    episode_guid, published_date, source_url, source_type, language, local_path_shadow
-                ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                on conflict(local_path) do update set
-                    feed_id = excluded.feed_id,
-                    feed_url = excluded.feed_url,
-                    show_slug = excluded.show_slug,
-                    show_title = excluded.show_title,
-                    episode_title = excluded.episode_title,
-                    episode_guid = excluded.episode_guid,
-                    published_date = excluded.published_date,
-                    source_url = case
-                        when excluded.source_url <> '' then excluded.source_url
-                        else transcript_files.source_url
-                    end,
-                    source_type = excluded.source_type,
-                    language = excluded.language,
-                    local_path_shadow = excluded.local_path_shadow
-                """,
+                f"insert into transcript_files ({TRANSCRIPT_FILE_COLUMNS}) "
+                f"values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) {TRANSCRIPT_FILE_UPSERT_SQL}",
                 (
                     record.local_path,
                     record.feed_id,
@@ -820,6 +937,7 @@ class PodcastIndexMiner:
                     record.local_path,
                 ),
             )
+        self.refresh_show_stats(conn, "?", [outcome.feed_id])
         conn.commit()
 
     def write_show_sidecars(self, outcome: FeedOutcome) -> None:
@@ -859,7 +977,23 @@ class PodcastIndexMiner:
         if outcome.feed_xml:
             (show_dir / "podcastindex-feed.xml").write_text(outcome.feed_xml, encoding="utf-8")
 
-    def write_manifest_and_report(self, conn: sqlite3.Connection) -> None:
+    def append_manifest_records(self, outcome: FeedOutcome) -> int:
+        """Append the outcome's transcript records to the JSONL log; returns the number of lines written."""
+        if not outcome.transcript_files:
+            return 0
+        self.manifest_log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.manifest_log_path.open("a", encoding="utf-8") as handle:
+            for record in outcome.transcript_files:
+                handle.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+        return len(outcome.transcript_files)
+
+    def write_manifest_and_report(self, conn: sqlite3.Connection) -> int:
+        """
+        Compaction: rewrite the full manifest and report from the state DB, then truncate the JSONL
+        log they now cover. Between compactions, `podcastindex-manifest.json` plus the lines in
+        `podcastindex-manifest.jsonl` (later lines win per local_path) is the current manifest.
+        Returns the number of manifest rows written.
+        """
         cursor = conn.execute(
             """
             select feed_id, feed_url, show_slug, show_title, episode_title, episode_guid,
@@ -868,52 +1002,58 @@ class PodcastIndexMiner:
             order by show_slug, published_date, episode_title, local_path
             """
         )
-        rows = [
-            {
-                "feed_id": int(row[0]),
-                "feed_url": row[1],
-                "show_slug": row[2],
-                "show_title": row[3],
-                "episode_title": row[4],
-                "episode_guid": row[5],
-                "published_date": row[6],
-                "source_url": row[7],
-                "source_type": row[8],
-                "language": row[9],
-                "local_path": row[10],
-            }
-            for row in cursor.fetchall()
-        ]
-        self.manifest_path.write_text(json.dumps(rows, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        manifest_rows = 0
+        tmp_manifest = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with tmp_manifest.open("w", encoding="utf-8") as handle:
+            handle.write("[")
+            while True:
+                batch = cursor.fetchmany(1000)
+                if not batch:
+                    break
+                for row in batch:
+                    item = {
+                        "feed_id": int(row[0]),
+                        "feed_url": row[1],
+                        "show_slug": row[2],
+                        "show_title": row[3],
+                        "episode_title": row[4],
+                        "episode_guid": row[5],
+                        "published_date": row[6],
+                        "source_url": row[7],
+                        "source_type": row[8],
+                        "language": row[9],
+                        "local_path": row[10],
+                    }
+                    handle.write(",\n" if manifest_rows else "\n")
+                    handle.write(textwrap.indent(json.dumps(item, indent=2, ensure_ascii=False), "  "))
+                    manifest_rows += 1
+            handle.write("\n]\n" if manifest_rows else "]\n")
+        os.replace(tmp_manifest, self.manifest_path)
 
         summary_cursor = conn.execute(
             """
-            select f.show_slug, f.show_title, f.feed_url, f.host,
-                   count(t.local_path) as transcript_count,
-                   max(f.checked_at) as last_checked
-            from feed_checks f
-            left join transcript_files t on t.feed_id = f.feed_id
-            where f.transcript_support = 1
-            group by f.feed_id, f.show_slug, f.show_title, f.feed_url, f.host
-            order by transcript_count desc, f.show_slug asc
+            select show_slug, show_title, feed_url, host, transcript_count, last_checked
+            from show_stats
+            order by transcript_count desc, show_slug asc
             """
         )
-        lines = [
-            "# PodcastIndex Transcript Miner Report",
-            "",
-            f"Generated: {dt.datetime.now(dt.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}",
-            f"Transcript files captured: {len(rows)}",
-            "",
-        ]
-        for row in summary_cursor.fetchall():
-            lines.append(f"## {row[1]}")
-            lines.append(f"- Show slug: `{row[0]}`")
-            lines.append(f"- Feed: {row[2]}")
-            lines.append(f"- Host: {row[3]}")
-            lines.append(f"- Transcript files: {row[4]}")
-            lines.append(f"- Last checked: {row[5]}")
-            lines.append("")
-        self.report_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
+        tmp_report = self.report_path.with_name(self.report_path.name + ".tmp")
+        with tmp_report.open("w", encoding="utf-8") as handle:
+            handle.write("# PodcastIndex Transcript Miner Report\n\n")
+            handle.write(f"Generated: {dt.datetime.now(dt.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}\n")
+            handle.write(f"Transcript files captured: {manifest_rows}\n")
+            for row in summary_cursor:
+                handle.write(
+                    f"\n## {row[1]}\n"
+                    f"- Show slug: `{row[0]}`\n"
+                    f"- Feed: {row[2]}\n"
+                    f"- Host: {row[3]}\n"
+                    f"- Transcript files: {row[4]}\n"
+                    f"- Last checked: {row[5]}\n"
+                )
+        os.replace(tmp_report, self.report_path)
+        self.manifest_log_path.unlink(missing_ok=True)
+        return manifest_rows
 
     def outcome_disk_bytes(self, outcome: FeedOutcome) -> int:
         total_bytes = 0
@@ -1016,29 +1156,41 @@ class PodcastIndexMiner:
             }
         )
 
-    def run(self) -> None:
+    def run(self) -> dict[str, int]:
         self.out_dir.mkdir(parents=True, exist_ok=True)
         start_time = time.time()
         self.emit_initializing("opening state database and loading prior crawl state")
         state_conn = self.init_state_db()
         checked_ids = set() if self.refresh else self.load_checked_ids(state_conn)
+        if self.is_shard and not self.refresh:
+            prior_conn = sqlite3.connect(f"file:{self.prior_state_db}?mode=ro", uri=True)
+            try:
+                checked_ids |= self.load_checked_ids(prior_conn)
+            finally:
+                prior_conn.close()
         self.emit_initializing("counting candidate feeds from PodcastIndex inventory")
         total_candidates = self.count_total_candidates()
         self.emit_initializing("matching already-checked feeds against the current candidate set")
         baseline_checked = 0 if self.refresh else self.count_checked_candidates(state_conn)
-        baseline_transcript_feeds = 0 if self.refresh else int(
+        # Shards report only their own additions; the coordinator holds the global totals.
+        baseline_transcript_feeds = 0 if self.refresh or self.is_shard else int(
             state_conn.execute("select count(*) from feed_checks where transcript_support = 1").fetchone()[0]
         )
-        baseline_transcript_files = 0 if self.refresh else int(
+        baseline_transcript_files = 0 if self.refresh or self.is_shard else int(
             state_conn.execute("select count(*) from transcript_files").fetchone()[0]
         )
-        self.emit_initializing("estimating existing on-disk size for previously downloaded transcript artifacts")
-        baseline_disk_bytes = 0 if self.refresh else self.estimate_existing_bytes(state_conn)
+        if not self.is_shard:
+            self.emit_initializing("estimating existing on-disk size for previously downloaded transcript artifacts")
+        baseline_disk_bytes = 0 if self.refresh or self.is_shard else self.estimate_existing_bytes(state_conn)
         submitted = 0
         completed = 0
         transcript_feeds = 0
         transcript_files = 0
         added_disk_bytes = 0
+        compacted_rows = 0 if self.is_shard else int(
+            state_conn.execute("select count(*) from transcript_files").fetchone()[0]
+        )
+        appended_since_compact = 0
         max_inflight = self.workers
         inflight: set[concurrent.futures.Future[FeedOutcome]] = set()
         candidates = self.iter_candidates()
@@ -1100,8 +1252,11 @@ class PodcastIndexMiner:
                         transcript_feeds += 1
                         transcript_files += len(outcome.transcript_files)
                         added_disk_bytes += self.outcome_disk_bytes(outcome)
-                    if completed % 50 == 0:
-                        self.write_manifest_and_report(state_conn)
+                    if not self.is_shard:
+                        appended_since_compact += 1 + self.append_manifest_records(outcome)
+                        if appended_since_compact >= max(MIN_COMPACT_RECORDS, compacted_rows):
+                            compacted_rows = self.write_manifest_and_report(state_conn)
+                            appended_since_compact = 0
                 now = time.time()
                 if now - last_progress_at >= self.progress_every:
                     self.print_progress(
@@ -1120,7 +1275,8 @@ class PodcastIndexMiner:
                         force=True,
                     )
                     last_progress_at = now
-        self.write_manifest_and_report(state_conn)
+        if not self.is_shard:
+            self.write_manifest_and_report(state_conn)
         self.print_progress(
             start_time=start_time,
             total_candidates=total_candidates,
@@ -1142,6 +1298,136 @@ class PodcastIndexMiner:
             f"transcript_feeds={transcript_feeds} transcript_files={transcript_files} "
             f"out={self.out_dir}"
         ])
+        return {
+            "completed": completed,
+            "submitted": submitted,
+            "transcript_feeds": transcript_feeds,
+            "transcript_files": transcript_files,
+        }
+
+    def shard_state_path(self, index: int) -> Path:
+        return shard_sibling_path(self.state_db, f"shard{index}of{self.shard_count}")
+
+    def leftover_shard_states(self) -> list[Path]:
+        return sorted(self.state_db.parent.glob(f"{self.state_db.stem}.shard*of*{self.state_db.suffix}"))
+
+    def merge_state_shard(self, conn: sqlite3.Connection, shard_path: Path) -> tuple[int, int]:
+        """Upsert a shard's feed_checks/transcript_files into `conn`, then delete the shard DB."""
+        merged = (0, 0)
+        shard_sql = str(shard_path).replace("'", "''")
+        conn.execute(f"attach database '{shard_sql}' as shard")
+        try:
+            tables = {
+                str(row[0])
+                for row in conn.execute("select name from shard.sqlite_master where type = 'table'")
+            }
+            if {"feed_checks", "transcript_files"} <= tables:
+                # `where true` keeps SQLite from parsing the upsert's `on` as a join constraint.
+                feed_cursor = conn.execute(
+                    f"insert into feed_checks ({FEED_CHECK_COLUMNS}) "
+                    f"select {FEED_CHECK_COLUMNS} from shard.feed_checks where true {FEED_CHECK_UPSERT_SQL}"
+                )
+                file_cursor = conn.execute(
+                    f"insert into transcript_files ({TRANSCRIPT_FILE_COLUMNS}) "
+                    f"select {TRANSCRIPT_FILE_COLUMNS} from shard.transcript_files where true "
+                    f"{TRANSCRIPT_FILE_UPSERT_SQL}"
+                )
+                merged = (max(0, feed_cursor.rowcount), max(0, file_cursor.rowcount))
+                self.refresh_show_stats(conn, "select feed_id from shard.feed_checks", [])
+            conn.commit()
+        finally:
+            conn.execute("detach database shard")
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{shard_path}{suffix}").unlink(missing_ok=True)
+        return merged
+
+    def shard_kwargs(self, index: int) -> dict[str, Any]:
+        return {
+            "db_path": self.db_path,
+            "out_dir": self.out_dir,
+            "state_db": self.shard_state_path(index),
+            "workers": self.workers,
+            "per_host": self.per_host,
+            "domain_delay": self.domain_delay,
+            "limit_feeds": self.limit_feeds,
+            "min_popularity": self.min_popularity,
+            "refresh": self.refresh,
+            "hosts": list(self.hosts),
+            "feed_timeout": self.feed_timeout,
+            "transcript_timeout": self.transcript_timeout,
+            "progress_every": self.progress_every,
+            "progress_log": self.progress_log,
+            "status_json": shard_sibling_path(self.status_json, f"shard{index}") if self.status_json else None,
+            "selection_profile": self.selection_profile,
+            "shard_count": self.shard_count,
+            "shard_index": index,
+            "shard_by": self.shard_by,
+            "prior_state_db": self.state_db,
+        }
+
+    def run_sharded(self) -> None:
+        """
+        Run one miner process per shard, each with its own sessions, host limiter and state DB shard,
+        then merge the shards into the main state DB and write the manifest/report once.
+        Shard DBs left behind by an interrupted run are merged before new work starts.
+        """
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        state_conn = self.init_state_db()
+        for shard_path in self.leftover_shard_states():
+            feeds, files = self.merge_state_shard(state_conn, shard_path)
+            self.emit_lines([f"[merge] recovered {shard_path.name}: feeds={feeds:,} transcript_files={files:,}"])
+        state_conn.close()
+
+        self.emit_lines([
+            "[start] "
+            f"shards={self.shard_count} shard_by={self.shard_by} "
+            f"workers_per_shard={self.workers} per_host={self.per_host} "
+            f"profile={self.selection_profile} min_popularity={self.effective_min_popularity()}",
+            "",
+        ])
+        totals = {"completed": 0, "submitted": 0, "transcript_feeds": 0, "transcript_files": 0}
+        failures: list[str] = []
+        # spawn, not fork: children must not inherit the parent's SQLite handles or threads.
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.shard_count, mp_context=context) as executor:
+            futures = {
+                executor.submit(run_miner_shard, self.shard_kwargs(index)): index
+                for index in range(self.shard_count)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                index = futures[future]
+                try:
+                    stats = future.result()
+                except Exception as exc:
+                    failures.append(f"shard {index + 1}: {exc}")
+                    self.emit_lines([f"[error] shard {index + 1}/{self.shard_count} failed: {exc}"])
+                    continue
+                for key in totals:
+                    totals[key] += int(stats.get(key, 0))
+
+        state_conn = self.init_state_db()
+        try:
+            for index in range(self.shard_count):
+                shard_path = self.shard_state_path(index)
+                if not shard_path.exists():
+                    continue
+                feeds, files = self.merge_state_shard(state_conn, shard_path)
+                self.emit_lines([f"[merge] shard {index + 1}/{self.shard_count}: feeds={feeds:,} transcript_files={files:,}"])
+            self.write_manifest_and_report(state_conn)
+        finally:
+            state_conn.close()
+        self.emit_lines([
+            f"[done] shards={self.shard_count} failed={len(failures)} "
+            f"checked={totals['completed']} submitted={totals['submitted']} "
+            f"transcript_feeds={totals['transcript_feeds']} transcript_files={totals['transcript_files']} "
+            f"out={self.out_dir}"
+        ])
+        if failures:
+            raise RuntimeError("; ".join(failures))
+
+
+def run_miner_shard(kwargs: dict[str, Any]) -> dict[str, int]:
+    return PodcastIndexMiner(**kwargs).run()
 
 
 def parse_args() -> argparse.Namespace:
@@ -1149,8 +1435,9 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--db-path", default=str(DEFAULT_DB_PATH), help="Path to the local PodcastIndex SQLite database.")
     parser.add_argument("--out-dir", default=str(DEFAULT_OUT_DIR), help="Transcript output root.")
     parser.add_argument("--state-db", default=str(DEFAULT_STATE_DB), help="Path to miner state SQLite DB.")
-    parser.add_argument("--workers", type=int, default=16, help="Global worker pool size.")
+    parser.add_argument("--workers", type=int, default=16, help="Global worker pool size (per shard process with --shards).")
     parser.add_argument("--per-host", type=int, default=2, help="Max concurrent HTTP requests per host.")
+    parser.add_argument("--domain-delay-sec", type=float, default=0.0, help="Min delay between requests to the same host (default: 0; Retry-After is always honored).")
     parser.add_argument("--limit-feeds", type=int, default=0, help="Limit number of candidate feeds scanned (0 = no limit).")
     parser.add_argument("--min-popularity", type=int, default=0, help="Minimum popularityScore from the PodcastIndex DB. In curated mode the effective minimum defaults to at least 8.")
     parser.add_argument("--selection-profile", choices=["curated", "broad"], default=DEFAULT_SELECTION_PROFILE, help="Curated prioritizes likely real/popular podcasts and excludes obvious junk; broad keeps the old wider scan behavior.")
@@ -1161,6 +1448,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--progress-log", default=str(ROOT / "tmp" / "podcastindex-miner.progress.log"), help="Append human-readable progress lines to this log file.")
     parser.add_argument("--status-json", default=str(ROOT / "tmp" / "podcastindex-miner.status.json"), help="Write the latest progress snapshot to this JSON file.")
     parser.add_argument("--refresh", action="store_true", help="Recheck feeds already present in the miner state DB.")
+    parser.add_argument("--shards", type=int, default=1, help="Split candidates across N worker processes, each with its own state DB shard merged into --state-db at the end (1 = single process).")
+    parser.add_argument("--shard-by", choices=["host", "id"], default=DEFAULT_SHARD_BY, help="Partition by host hash (keeps --per-host a global cap) or by feed id modulo (evener split; --per-host then applies per shard).")
     return parser.parse_args()
 
 
@@ -1172,6 +1461,7 @@ def main() -> None:
         state_db=Path(args.state_db),
         workers=int(args.workers),
         per_host=int(args.per_host),
+        domain_delay=float(args.domain_delay_sec),
         limit_feeds=int(args.limit_feeds),
         min_popularity=int(args.min_popularity),
         refresh=bool(args.refresh),
@@ -1182,8 +1472,13 @@ def main() -> None:
         progress_log=Path(args.progress_log) if args.progress_log else None,
         status_json=Path(args.status_json) if args.status_json else None,
         selection_profile=str(args.selection_profile or DEFAULT_SELECTION_PROFILE),
+        shard_count=int(args.shards),
+        shard_by=str(args.shard_by or DEFAULT_SHARD_BY),
     )
-    miner.run()
+    if miner.shard_count > 1:
+        miner.run_sharded()
+    else:
+        miner.run()
 
 
 if __name__ == "__main__":
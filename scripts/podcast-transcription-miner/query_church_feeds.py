@@ -10,22 +10,21 @@ from __future__ import annotations
 
 import argparse
 import re
-import sqlite3
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.feed_registry import canonical_url, load_registry
+from scripts.podcastindex_index import DEFAULT_INDEX_PATH, fts_match, open_index
+
 DB_PATH = ROOT / "podcastindex-feeds" / "podcastindex_feeds.db"
 DEFAULT_EXCLUDED_HOSTS = ("castbox.fm", "ximalaya.com")
 
-# Church-related search terms (broad match in title, description, categories)
-CHURCH_TERMS = [
-    "sermon", "church", "bible", "christian", "pastor", "ministry", "worship",
-    "gospel", "faith", "evangel", "baptist", "methodist", "presbyterian",
-    "catholic", "orthodox", "pentecostal", "calvary", "reformed", "lutheran",
-    "homily", "teaching", "devotional", "scripture", "theology", "apologetics",
-    "cbn", "700 club", "desiring god", "truth for life", "ligonier",
-    "hillsong", "elevation", "life.church", "james river", "bethel",
-]
+# Church-related search terms, prefix-matched against title, description, author and categories
+CHURCH_TERMS = ["sermon", "church", "bible", "christian", "pastor", "ministry", "gospel", "faith"]
 
 # Excluded patterns (from mine_podcastindex_transcripts)
 EXCLUDED = (
@@ -44,19 +43,9 @@ def slugify(value: str, max_length: int = 120) -> str:
 
 
 def load_existing_urls() -> set[str]:
-    """Normalize URLs from church.md and church-audio-only.md for dedup."""
-    urls = set()
-    for fname in ("feeds/church.md", "feeds/church-audio-only.md"):
-        path = ROOT / fname
-        if not path.exists():
-            continue
-        text = path.read_text(encoding="utf-8")
-        for m in re.finditer(r"- url:\s*(.+?)(?:\s*$|\s+#)", text, re.MULTILINE):
-            u = m.group(1).strip().lower()
-            u = re.sub(r"^https?://", "", u)
-            u = re.sub(r"/+$", "", u)
-            urls.add(u)
-    return urls
+    """Canonical URLs (plus known redirect targets) from church.md and church-audio-only.md, disabled included."""
+    registry = load_registry()
+    return registry.url_keys(packs={"feeds/church.md", "feeds/church-audio-only.md"}, include_disabled=True)
 
 
 def main() -> None:
@@ -67,101 +56,41 @@ def main() -> None:
 
     existing = load_existing_urls()
 
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
-    conn.row_factory = sqlite3.Row
-
-    # Simpler query: filter by category (Religion & Spirituality) or title/desc match
-    # Using fewer LIKE terms for performance; we'll refine in Python
-    text_sql = (
-        "lower("
-        "coalesce(title, '') || ' ' || "
-        "coalesce(description, '') || ' ' || "
-        "coalesce(category1, '') || ' ' || "
-        "coalesce(category2, '') || ' ' || "
-        "coalesce(category3, '')"
-        ")"
-    )
-    # Religion category OR key terms (fewer for speed)
-    key_terms = ["sermon", "church", "bible", "christian", "pastor", "ministry", "gospel", "faith"]
-    term_conditions = " or ".join(f"{text_sql} like ?" for _ in key_terms)
-    term_params = [f"%{t}%" for t in key_terms]
-
-    where = (
-        "dead = 0 and lastHttpStatus = 200 and episodeCount > 0 "
-        "and contentType like '%xml%' and url <> '' "
-        f"and ({term_conditions})"
-    )
-
+    conn = open_index(DEFAULT_INDEX_PATH, db_path=DB_PATH)
+    # The index only holds live feeds (dead = 0, HTTP 200, XML); exclusions are FTS NOT phrases.
     sql = (
-        "select id, url, title, host, episodeCount, popularityScore, "
-        "newestItemPubdate, category1, category2, category3, description "
-        f"from podcasts where {where} "
-        "order by episodeCount desc, popularityScore desc, newestItemPubdate desc"
+        "select f.id, f.url, f.title, f.host, f.episode_count, f.popularity, f.newest_pubdate, f.categories "
+        "from feeds_fts join feeds f on f.id = feeds_fts.rowid "
+        "where feeds_fts match ? and f.episode_count > 0 "
+        "order by f.episode_count desc, f.popularity desc, f.newest_pubdate desc"
     )
-    cursor = conn.execute(sql, term_params)
-    rows = cursor.fetchall()
-
-    # Filter out excluded patterns and expand to all church terms in Python
-    def passes_filter(row) -> bool:
-        combined = " ".join(
-            str(x or "").lower()
-            for x in [
-                row["title"],
-                row["description"],
-                row["category1"],
-                row["category2"],
-                row["category3"],
-            ]
-        )
-        for exc in EXCLUDED:
-            if exc in combined:
-                return False
-        for term in CHURCH_TERMS:
-            if term in combined:
-                return True
-        return False
-
-    rows = [r for r in rows if passes_filter(r)]
+    rows = conn.execute(sql, [fts_match(CHURCH_TERMS, exclude=EXCLUDED)]).fetchall()
     conn.close()
 
-    def url_normalized(row) -> str:
-        u = (row["url"] or "").strip().lower()
-        u = re.sub(r"^https?://", "", u)
-        u = re.sub(r"/+$", "", u)
-        return u
-
-    def is_duplicate(row) -> bool:
-        u = url_normalized(row)
-        for ex in existing:
-            if ex in u or u in ex:
-                return True
-        return False
-
     high = []
     low = []
     seen_urls: set[str] = set()
 
     for row in rows:
-        if is_duplicate(row):
-            continue
-        u = url_normalized(row)
-        if u in seen_urls:
+        u = canonical_url(row["url"] or "")
+        if u in existing or u in seen_urls:
             continue
         if "castbox.fm" in u or "ximalaya.com" in u:
             continue
         seen_urls.add(u)
 
-        ep_count = int(row["episodeCount"] or 0)
+        ep_count = int(row["episode_count"] or 0)
+        cats = (row["categories"] or "").split("|") + ["", "", ""]
         rec = {
             "id": row["id"],
             "url": row["url"],
             "title": row["title"] or "Unknown",
             "host": row["host"] or "",
             "episodeCount": ep_count,
-            "popularityScore": int(row["popularityScore"] or 0),
-            "category1": row["category1"] or "",
-            "category2": row["category2"] or "",
-            "category3": row["category3"] or "",
+            "popularityScore": int(row["popularity"] or 0),
+            "category1": cats[0],
+            "category2": cats[1],
+            "category3": cats[2],
         }
         if ep_count >= 6:
             high.append(rec)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Validate church-podcastindex-candidates.md feeds: fetch each URL, verify it exists,
 has real RSS/XML content (not HTML landing page), and has episodes with enclosures.
+Feeds are stream-parsed while downloading and the download stops after --sniff-items items.
+Results are appended to a JSONL log, so interrupted runs resume where they stopped.
 Output validated feeds split by enclosure type:
   - church-podcastindex-validated-video.md (video enclosures only)
   - church-podcastindex-validated-audio.md (audio enclosures only)
@@ -13,25 +15,40 @@ from __future__ import annotations
 import argparse
 import concurrent.futures
 import json
+import os
 import re
 import sqlite3
+import sys
 import threading
 import time
 from pathlib import Path
+from typing import Iterable
 from xml.etree import ElementTree as ET
 
 import requests
 
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.podcastindex_index import DEFAULT_INDEX_PATH, open_index, url_key
+from scripts.rate_limit import DomainRateLimiter, interleave_by_domain
+
 CANDIDATES_PATH = ROOT / "feeds" / "church-podcastindex-candidates.md"
 DB_PATH = ROOT / "podcastindex-feeds" / "podcastindex_feeds.db"
 OUT_DIR = ROOT / "feeds"
-CACHE_PATH = ROOT / "tmp" / "church-candidates-validation-cache.json"
+CACHE_PATH = ROOT / "tmp" / "church-candidates-validation-cache.jsonl"
+# Pre-JSONL cache (one JSON object rewritten on every save); read once and carried over.
+LEGACY_CACHE_PATH = ROOT / "tmp" / "church-candidates-validation-cache.json"
 USER_AGENT = "actual-plays/vodcasts (+https://github.com/)"
 TIMEOUT = 25
 MAX_WORKERS = 12
 PER_HOST_DELAY = 0.5
 PROGRESS_EVERY = 15
+# Items sniffed per feed before the download stops; quality_score saturates at 250 items.
+SNIFF_ITEMS = 250
+MAX_FEED_BYTES = 32 << 20
+CHUNK_BYTES = 64 * 1024
 
 
 def parse_localname(tag: str) -> str:
@@ -133,29 +150,45 @@ def _item_enclosure_types(item: ET.Element) -> tuple[bool, bool]:
     return has_v, has_a
 
 
-def count_items_and_enclosure_types(xml_bytes: bytes) -> tuple[int, int, bool, bool]:
-    """Return (item_count, enclosure_count, has_video, has_audio)."""
+def count_items_and_enclosure_types(
+    chunks: Iterable[bytes], *, max_items: int = 0
+) -> tuple[int, int, bool, bool, bool]:
+    """
+    Stream-parse feed bytes; return (item_count, enclosure_count, has_video, has_audio, truncated).
+    Stops reading `chunks` once `max_items` RSS items (or Atom entries) were seen (0 = no limit).
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    # RSS <item> wins over Atom <entry> when a document has both, as before.
+    counts = {"item": [0, 0, False, False], "entry": [0, 0, False, False]}
     try:
-        root = ET.fromstring(xml_bytes)
+        for chunk in chunks:
+            parser.feed(chunk)
+            for _event, elem in parser.read_events():
+                tag = elem.tag
+                if tag == "item":
+                    kind = "item"
+                elif tag.endswith("}entry"):
+                    kind = "entry"
+                else:
+                    continue
+                stats = counts[kind]
+                stats[0] += 1
+                v, a = _item_enclosure_types(elem)
+                if v or a:
+                    stats[1] += 1
+                    stats[2] = stats[2] or v
+                    stats[3] = stats[3] or a
+                elem.clear()
+                if max_items and stats[0] >= max_items:
+                    return stats[0], stats[1], stats[2], stats[3], True
+        parser.close()
     except ET.ParseError:
-        return 0, 0, False, False
-    items = root.findall(".//item")
-    if not items:
-        items = root.findall(".//{http://www.w3.org/2005/Atom}entry")
-    if not items:
-        items = root.findall(".//{*}entry")
-    enc_count = 0
-    has_video, has_audio = False, False
-    for it in items:
-        v, a = _item_enclosure_types(it)
-        if v or a:
-            enc_count += 1
-            has_video = has_video or v
-            has_audio = has_audio or a
-    return len(items), enc_count, has_video, has_audio
-
-
-def validate_feed(url: str) -> dict:
+        return 0, 0, False, False, False
+    stats = counts["item"] if counts["item"][0] else counts["entry"]
+    return stats[0], stats[1], stats[2], stats[3], False
+
+
+def validate_feed(url: str, *, sniff_items: int = SNIFF_ITEMS, limiter: DomainRateLimiter | None = None) -> dict:
     """Fetch feed, verify it's real RSS with content. Return validation result."""
     result = {
         "ok": False,
@@ -165,10 +198,13 @@ def validate_feed(url: str) -> dict:
         "enclosure_count": 0,
         "has_video": False,
         "has_audio": False,
+        "truncated": False,
         "reason": "",
     }
+    if limiter is not None:
+        limiter.wait(url)
     try:
-        resp = requests.get(
+        with requests.get(
             url,
             timeout=TIMEOUT,
             headers={
@@ -176,23 +212,43 @@ def validate_feed(url: str) -> dict:
                 "Accept": "application/rss+xml, application/atom+xml, application/xml, text/xml, */*",
             },
             allow_redirects=True,
-        )
-        result["status"] = resp.status_code
-        if resp.status_code != 200:
-            result["reason"] = f"http {resp.status_code}"
-            return result
-        content = resp.content
-        if not content or len(content) < 200:
-            result["reason"] = "empty or tiny response"
-            return result
-        if not looks_like_feed_xml(content):
-            result["reason"] = "not feed xml (likely HTML landing page)"
-            return result
-        items, enc, has_v, has_a = count_items_and_enclosure_types(content)
+            stream=True,
+        ) as resp:
+            result["status"] = resp.status_code
+            if limiter is not None:
+                limiter.note_response(url, resp.status_code, resp.headers.get("Retry-After"))
+            if resp.status_code != 200:
+                result["reason"] = f"http {resp.status_code}"
+                return result
+            stream = resp.iter_content(CHUNK_BYTES)
+            # Sniff the first 64 KiB before parsing so HTML landing pages are rejected cheaply.
+            head = b""
+            for chunk in stream:
+                head += chunk
+                if len(head) >= CHUNK_BYTES:
+                    break
+            if not head or len(head) < 200:
+                result["reason"] = "empty or tiny response"
+                return result
+            if not looks_like_feed_xml(head):
+                result["reason"] = "not feed xml (likely HTML landing page)"
+                return result
+
+            def body_chunks():
+                total = len(head)
+                yield head
+                for chunk in stream:
+                    total += len(chunk)
+                    if total > MAX_FEED_BYTES:
+                        raise RuntimeError(f"feed larger than {MAX_FEED_BYTES >> 20} MiB")
+                    yield chunk
+
+            items, enc, has_v, has_a, truncated = count_items_and_enclosure_types(body_chunks(), max_items=sniff_items)
         result["item_count"] = items
         result["enclosure_count"] = enc
         result["has_video"] = has_v
         result["has_audio"] = has_a
+        result["truncated"] = truncated
         if items == 0:
             result["reason"] = "no items in feed"
             return result
@@ -215,40 +271,76 @@ def _norm_url(u: str) -> str:
     return re.sub(r"^https?://", "", (u or "").lower()).rstrip("/")
 
 
-def load_cache(path: Path) -> dict[str, dict]:
-    """Load validation cache: url -> result dict (ok, item_count, has_video, has_audio, etc)."""
-    if not path.exists():
-        return {}
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return data if isinstance(data, dict) else {}
-    except Exception:
-        return {}
+def load_cache(path: Path, legacy_path: Path | None = LEGACY_CACHE_PATH) -> tuple[dict[str, dict], int]:
+    """
+    Load validation cache: normalized url -> result dict (ok, item_count, has_video, has_audio, etc).
+    Returns (cache, line_count); later JSONL lines win. A legacy JSON cache is merged in underneath.
+    """
+    cache: dict[str, dict] = {}
+    if legacy_path is not None and legacy_path.exists():
+        try:
+            data = json.loads(legacy_path.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                cache.update(data)
+        except Exception:
+            pass
+    lines = 0
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted run
+                if isinstance(rec, dict) and rec.get("key"):
+                    cache[rec.pop("key")] = rec
+                    lines += 1
+    return cache, lines
+
+
+def cache_record(r: dict) -> dict:
+    return {
+        "ok": r.get("ok", False),
+        "item_count": r.get("item_count", 0),
+        "enclosure_count": r.get("enclosure_count", 0),
+        "has_video": r.get("has_video", False),
+        "has_audio": r.get("has_audio", False),
+        "truncated": r.get("truncated", False),
+        "reason": r.get("reason", ""),
+    }
+
 
+def append_cache(f, key: str, rec: dict) -> None:
+    f.write(json.dumps({"key": key, **rec}, ensure_ascii=False) + "\n")
+    f.flush()
 
-def save_cache(path: Path, cache: dict[str, dict]) -> None:
+
+def compact_cache(path: Path, cache: dict[str, dict]) -> None:
+    """Rewrite the JSONL log with one line per url (atomic)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(cache, ensure_ascii=False, indent=0), encoding="utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for key, rec in cache.items():
+            f.write(json.dumps({"key": key, **rec}, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
 
 
 def load_db_metadata(conn: sqlite3.Connection, urls: set[str]) -> dict[str, dict]:
-    """Load itunesId, priority, newestItemPubdate, popularityScore for each URL."""
-    url_to_norm = {_norm_url(u): u for u in urls}
+    """Load itunesId, priority, newestItemPubdate, popularityScore for each URL (indexed url_key lookup)."""
+    key_to_url = {url_key(u): u for u in urls}
+    keys = [k for k in key_to_url if k]
     out = {}
-    cursor = conn.execute(
-        "select url, itunesId, priority, newestItemPubdate, popularityScore, episodeCount "
-        "from podcasts where url <> ''"
-    )
-    for row in cursor.fetchall():
-        u = (row[0] or "").strip()
-        if not u:
-            continue
-        u_norm = _norm_url(u)
-        if u_norm in url_to_norm:
-            orig = url_to_norm[u_norm]
-            out[orig] = {
+    for i in range(0, len(keys), 500):
+        chunk = keys[i : i + 500]
+        cursor = conn.execute(
+            "select url_key, itunes_id, priority, newest_pubdate, popularity, episode_count "
+            f"from feeds where url_key in ({','.join('?' for _ in chunk)})",
+            chunk,
+        )
+        for row in cursor.fetchall():
+            out[key_to_url[row[0]]] = {
                 "itunesId": int(row[1] or 0),
-                "priority": int(row[2] or -1),
+                "priority": int(row[2] if row[2] is not None else -1),
                 "newestItemPubdate": int(row[3] or 0),
                 "popularityScore": int(row[4] or 0),
                 "episodeCount": int(row[5] or 0),
@@ -286,15 +378,17 @@ def main() -> None:
     parser.add_argument("--min-items", type=int, default=3, help="Min verified items to pass")
     parser.add_argument("--no-resume", action="store_true", help="Ignore cache and revalidate all")
     parser.add_argument("--progress-every", type=int, default=PROGRESS_EVERY, help="Print progress every N seconds")
+    parser.add_argument("--sniff-items", type=int, default=SNIFF_ITEMS, help="Stop reading a feed after N items (0 = read whole feed)")
+    parser.add_argument("--domain-delay", type=float, default=PER_HOST_DELAY, help="Min seconds between requests to the same host")
     args = parser.parse_args()
 
     candidates = parse_candidates(Path(args.input))
     if args.limit > 0:
         candidates = candidates[: args.limit]
 
-    cache = {} if args.no_resume else load_cache(CACHE_PATH)
+    cache = {} if args.no_resume else load_cache(CACHE_PATH)[0]
     cache_lock = threading.Lock()
-    to_validate = [c for c in candidates if _norm_url(c["url"]) not in {_norm_url(k) for k in cache}]
+    to_validate = [c for c in candidates if _norm_url(c["url"]) not in cache]
     skipped = len(candidates) - len(to_validate)
 
     if skipped:
@@ -332,8 +426,11 @@ def main() -> None:
     if not to_validate:
         print(f"All {len(candidates)} feeds already cached. Writing output...")
     else:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as ex:
-            futures = {ex.submit(validate_feed, c["url"]): c for c in to_validate}
+        limiter = DomainRateLimiter(min_delay_seconds=args.domain_delay)
+        to_validate = interleave_by_domain(to_validate, lambda c: c["url"])
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with CACHE_PATH.open("a", encoding="utf-8") as cache_log, concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as ex:
+            futures = {ex.submit(validate_feed, c["url"], sniff_items=args.sniff_items, limiter=limiter): c for c in to_validate}
             for fut in concurrent.futures.as_completed(futures):
                 c = futures[fut]
                 try:
@@ -342,15 +439,11 @@ def main() -> None:
                     r = {"ok": False, "url": c["url"], "reason": str(e)[:60]}
                 apply_cached(c, r)
                 completed += 1
+                key = _norm_url(c["url"])
+                rec = cache_record(r)
                 with cache_lock:
-                    cache[_norm_url(c["url"])] = {
-                        "ok": r.get("ok", False),
-                        "item_count": r.get("item_count", 0),
-                        "enclosure_count": r.get("enclosure_count", 0),
-                        "has_video": r.get("has_video", False),
-                        "has_audio": r.get("has_audio", False),
-                        "reason": r.get("reason", ""),
-                    }
+                    cache[key] = rec
+                    append_cache(cache_log, key, rec)
                 now = time.time()
                 if now - last_progress >= args.progress_every:
                     elapsed = now - start
@@ -359,9 +452,12 @@ def main() -> None:
                     eta = remaining / rate if rate > 0 else 0
                     print(f"  {completed}/{len(candidates)} | passed={len(validated)} failed={failed} | {rate:.1f}/s | ETA {eta/60:.1f}m")
                     last_progress = now
-                    save_cache(CACHE_PATH, cache)
 
-        save_cache(CACHE_PATH, cache)
+    # Fold the legacy JSON cache and superseded lines (--no-resume reruns) into one line per url.
+    full_cache, cache_lines = load_cache(CACHE_PATH)
+    if LEGACY_CACHE_PATH.exists() or cache_lines > 2 * len(full_cache):
+        compact_cache(CACHE_PATH, full_cache)
+        LEGACY_CACHE_PATH.unlink(missing_ok=True)
 
     elapsed = time.time() - start
     print(f"Done: {len(validated)} passed, {failed} failed ({elapsed:.1f}s)")
@@ -370,7 +466,7 @@ def main() -> None:
         print("No validated feeds to output.")
         return
 
-    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True) if DB_PATH.exists() else None
+    conn = open_index(DEFAULT_INDEX_PATH, db_path=DB_PATH) if DB_PATH.exists() or DEFAULT_INDEX_PATH.exists() else None
     urls = {v["url"] for v in validated}
     db_meta = load_db_metadata(conn, urls) if conn else {}
     if conn:
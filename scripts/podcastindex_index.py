@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Derived query index over the local PodcastIndex dump (podcastindex_feeds.db).
+
+The dump is several GB, and the explorer scripts were each running LIKE scans over `podcasts`.
+`build_index` makes a one-time compact extract of the fields those scripts use:
+- a `feeds` table with one row per usable feed (live, 200, XML). It holds url/host/title, a
+  category bitmask, popularity, newest pubdate, episode count, medium and a video flag.
+- a contentless FTS5 table over title/description/author/categories.
+
+`open_index` rebuilds it automatically when the dump changes.
+
+Usage:
+  python -m scripts.podcastindex_index [--db-path ...] [--index-path ...] [--force]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+from scripts.shared import VODCASTS_ROOT
+
+DEFAULT_DB_PATH = VODCASTS_ROOT / "podcastindex-feeds" / "podcastindex_feeds.db"
+DEFAULT_INDEX_PATH = VODCASTS_ROOT / "podcastindex-feeds" / "podcastindex_index.db"
+INDEX_VERSION = 1
+
+VIDEO_EXTENSIONS = (".mp4", ".m4v", ".webm", ".mov", ".m3u8")
+# Bits 0..62 keep the mask a positive SQLite integer; rarer categories fall back to text matching.
+MAX_CATEGORY_BITS = 63
+
+_MAX_CATEGORY_COLUMNS = 10
+_FTS_TOKEN_RE = re.compile(r"[^\w\s.-]+", re.UNICODE)
+
+
+def is_video_url(url: str) -> bool:
+    u = (url or "").lower()
+    return any(ext in u for ext in VIDEO_EXTENSIONS)
+
+
+def url_key(url: str) -> str:
+    """Dedup key for feed URLs: lowercase, no scheme, no trailing slash."""
+    return re.sub(r"^https?://", "", (url or "").strip().lower()).rstrip("/")
+
+
+def _source_signature(db_path: Path) -> str:
+    st = db_path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _podcast_columns(conn: sqlite3.Connection) -> set[str]:
+    return {str(row[1]) for row in conn.execute("pragma table_info(podcasts)")}
+
+
+def _col(columns: set[str], name: str, default: str = "''") -> str:
+    return name if name in columns else default
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    conn.executescript(
+        """
+        create table meta (key text primary key, value text not null);
+        create table categories (
+            bit integer primary key,
+            name text not null unique,
+            feed_count integer not null
+        );
+        create table feeds (
+            id integer primary key,
+            url text not null,
+            url_key text not null,
+            host text not null,
+            title text not null,
+            category text not null,
+            categories text not null,
+            cat_mask integer not null default 0,
+            popularity integer not null,
+            newest_pubdate integer not null,
+            episode_count integer not null,
+            itunes_id integer not null,
+            priority integer not null,
+            medium text not null,
+            is_video integer not null
+        );
+        create virtual table feeds_fts using fts5(
+            title, description, author, categories,
+            content='', tokenize='unicode61 remove_diacritics 2'
+        );
+        """
+    )
+
+
+def build_index(db_path: Path = DEFAULT_DB_PATH, index_path: Path = DEFAULT_INDEX_PATH, *, batch_size: int = 5000) -> dict[str, int]:
+    """Build the index next to `index_path` and swap it in atomically. Returns row counts."""
+    db_path = Path(db_path)
+    index_path = Path(index_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"PodcastIndex DB not found: {db_path}")
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    src = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    out = sqlite3.connect(tmp_path)
+    try:
+        out.execute("pragma journal_mode = off")
+        out.execute("pragma synchronous = off")
+        _create_schema(out)
+        columns = _podcast_columns(src)
+        category_cols = [f"category{i}" for i in range(1, _MAX_CATEGORY_COLUMNS + 1) if f"category{i}" in columns]
+        select_sql = (
+            "select id, url, coalesce(host, ''), coalesce(title, ''), "
+            f"coalesce({_col(columns, 'description')}, ''), "
+            f"coalesce({_col(columns, 'itunesAuthor')}, ''), "
+            "coalesce(popularityScore, 0), coalesce(newestItemPubdate, 0), coalesce(episodeCount, 0), "
+            f"coalesce({_col(columns, 'itunesId', '0')}, 0), coalesce({_col(columns, 'priority', '-1')}, -1), "
+            f"coalesce({_col(columns, 'medium')}, ''), coalesce({_col(columns, 'newestEnclosureUrl')}, '')"
+            + "".join(f", coalesce({c}, '')" for c in category_cols)
+            + " from podcasts "
+            "where dead = 0 and lastHttpStatus = 200 and contentType like '%xml%' and url <> ''"
+        )
+        category_counts: Counter[str] = Counter()
+        rows_written = 0
+        cursor = src.execute(select_sql)
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            feed_rows = []
+            fts_rows = []
+            for row in batch:
+                (feed_id, url, host, title, description, author, popularity, newest, episodes,
+                 itunes_id, priority, medium, enclosure) = row[:13]
+                cats: list[str] = []
+                for raw in row[13:]:
+                    name = str(raw).strip()
+                    if name and name.lower() not in (c.lower() for c in cats):
+                        cats.append(name)
+                category_counts.update(c.lower() for c in cats)
+                categories = "|".join(cats)
+                feed_rows.append((
+                    int(feed_id), str(url), url_key(str(url)), str(host).lower(), str(title),
+                    cats[0].lower() if cats else "", categories,
+                    int(popularity or 0), int(newest or 0), int(episodes or 0),
+                    int(itunes_id or 0), int(priority if priority is not None else -1),
+                    str(medium).lower(), 1 if is_video_url(str(enclosure)) else 0,
+                ))
+                fts_rows.append((int(feed_id), str(title), str(description), str(author), categories.replace("|", " ")))
+            out.executemany(
+                "insert or replace into feeds (id, url, url_key, host, title, category, categories, popularity, "
+                "newest_pubdate, episode_count, itunes_id, priority, medium, is_video) "
+                "values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                feed_rows,
+            )
+            out.executemany(
+                "insert into feeds_fts (rowid, title, description, author, categories) values (?, ?, ?, ?, ?)",
+                fts_rows,
+            )
+            rows_written += len(feed_rows)
+
+        bits = {name: bit for bit, (name, _count) in enumerate(category_counts.most_common(MAX_CATEGORY_BITS))}
+        out.executemany(
+            "insert into categories (bit, name, feed_count) values (?, ?, ?)",
+            [(bit, name, category_counts[name]) for name, bit in bits.items()],
+        )
+
+        def category_mask(categories: str) -> int:
+            mask = 0
+            for name in (categories or "").lower().split("|"):
+                bit = bits.get(name)
+                if bit is not None:
+                    mask |= 1 << bit
+            return mask
+
+        out.create_function("category_mask", 1, category_mask, deterministic=True)
+        out.execute("update feeds set cat_mask = category_mask(categories) where categories <> ''")
+        out.execute("create index idx_feeds_url_key on feeds(url_key)")
+        out.execute("create index idx_feeds_category on feeds(category)")
+        out.execute("create index idx_feeds_popularity on feeds(popularity desc, episode_count desc)")
+        out.execute("insert into feeds_fts (feeds_fts) values ('optimize')")
+        out.executemany(
+            "insert into meta (key, value) values (?, ?)",
+            [
+                ("version", str(INDEX_VERSION)),
+                ("source_path", str(db_path.resolve())),
+                ("source_signature", _source_signature(db_path)),
+                ("built_at", str(int(time.time()))),
+            ],
+        )
+        out.commit()
+    finally:
+        src.close()
+        out.close()
+    os.replace(tmp_path, index_path)
+    return {"feeds": rows_written, "categories": len(category_counts)}
+
+
+def index_is_current(db_path: Path = DEFAULT_DB_PATH, index_path: Path = DEFAULT_INDEX_PATH) -> bool:
+    if not Path(index_path).exists():
+        return False
+    if not Path(db_path).exists():
+        return True
+    try:
+        conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("select key, value from meta").fetchall())
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return meta.get("version") == str(INDEX_VERSION) and meta.get("source_signature") == _source_signature(Path(db_path))
+
+
+def open_index(
+    index_path: Path = DEFAULT_INDEX_PATH,
+    *,
+    db_path: Path = DEFAULT_DB_PATH,
+    rebuild: bool = True,
+) -> sqlite3.Connection:
+    """Read-only connection to the index (row_factory=sqlite3.Row), rebuilding it first if the dump changed."""
+    index_path = Path(index_path)
+    if rebuild and not index_is_current(db_path, index_path):
+        print(f"[index] building {index_path} from {db_path} (one-time per dump)", flush=True)
+        t0 = time.time()
+        stats = build_index(db_path, index_path)
+        print(f"[index] {stats['feeds']:,} feeds, {stats['categories']:,} categories in {time.time() - t0:.1f}s", flush=True)
+    if not index_path.exists():
+        raise FileNotFoundError(f"PodcastIndex index not found: {index_path}")
+    conn = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def category_filter(
+    conn: sqlite3.Connection,
+    names: list[str] | tuple[str, ...],
+    *,
+    alias: str = "f",
+) -> tuple[str, list[object]]:
+    """SQL matching `feeds` rows (as `alias`) tagged with any of `names`; mask test plus text fallback."""
+    wanted = [n.strip().lower() for n in names if n and n.strip()]
+    if not wanted:
+        return "0", []
+    bits = dict(
+        conn.execute(
+            f"select name, bit from categories where name in ({','.join('?' for _ in wanted)})",
+            wanted,
+        ).fetchall()
+    )
+    mask = 0
+    parts: list[str] = []
+    params: list[object] = []
+    for name in wanted:
+        if name in bits:
+            mask |= 1 << int(bits[name])
+        else:
+            parts.append(f"instr('|' || lower({alias}.categories) || '|', ?) > 0")
+            params.append(f"|{name}|")
+    if mask:
+        parts.insert(0, f"({alias}.cat_mask & ?) <> 0")
+        params.insert(0, mask)
+    return "(" + " or ".join(parts) + ")", params
+
+
+def fts_terms(terms: list[str] | tuple[str, ...], *, prefix: bool = True) -> str:
+    """FTS5 expression matching any of `terms` (phrases kept whole; prefix match on the last token)."""
+    out = []
+    for term in terms:
+        cleaned = " ".join(_FTS_TOKEN_RE.sub(" ", term or "").split())
+        if cleaned:
+            out.append(f'"{cleaned}"' + ("*" if prefix else ""))
+    return "(" + " OR ".join(out) + ")" if out else ""
+
+
+def fts_match(
+    terms: list[str] | tuple[str, ...],
+    *,
+    exclude: list[str] | tuple[str, ...] = (),
+    columns: tuple[str, ...] = (),
+    prefix: bool = True,
+) -> str:
+    """Build a MATCH string: any of `terms`, none of `exclude`, optionally limited to `columns`."""
+    expr = fts_terms(terms, prefix=prefix)
+    if not expr:
+        return ""
+    if columns:
+        expr = "{" + " ".join(columns) + "} : " + expr
+    excluded = fts_terms(exclude, prefix=prefix)
+    if excluded:
+        expr = f"{expr} NOT {excluded}"
+    return expr
+
+
+def topic_filter(
+    conn: sqlite3.Connection,
+    *,
+    categories: list[str] | tuple[str, ...] = (),
+    terms: list[str] | tuple[str, ...] = (),
+    columns: tuple[str, ...] = ("title",),
+    alias: str = "f",
+) -> tuple[str, list[object]]:
+    """SQL matching `feeds` rows in any of `categories` or with any of `terms` in the FTS `columns`."""
+    parts: list[str] = []
+    params: list[object] = []
+    if categories:
+        sql, cat_params = category_filter(conn, categories, alias=alias)
+        parts.append(sql)
+        params.extend(cat_params)
+    match = fts_match(terms, columns=columns)
+    if match:
+        parts.append(f"{alias}.id in (select rowid from feeds_fts where feeds_fts match ?)")
+        params.append(match)
+    return ("(" + " or ".join(parts) + ")" if parts else "1"), params
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Build the derived PodcastIndex query index.")
+    p.add_argument("--db-path", default=str(DEFAULT_DB_PATH), help="Source PodcastIndex SQLite dump.")
+    p.add_argument("--index-path", default=str(DEFAULT_INDEX_PATH), help="Output index SQLite path.")
+    p.add_argument("--force", action="store_true", help="Rebuild even if the index matches the dump.")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    db_path = Path(args.db_path)
+    index_path = Path(args.index_path)
+    if not args.force and index_is_current(db_path, index_path):
+        print(f"[index] up to date: {index_path}")
+        return
+    t0 = time.time()
+    stats = build_index(db_path, index_path)
+    print(f"[index] wrote {index_path}: {stats['feeds']:,} feeds, {stats['categories']:,} categories in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+"""
+Per-domain request pacing shared by the feed/media crawlers.
+
+Each domain has its own next-free slot. `wait()` reserves the slot under a short lock and sleeps
+*outside* it, so a slow or rate-limited host never stalls workers talking to other hosts. Callers on
+the same domain queue up in reservation order. `Retry-After` (seconds or HTTP-date) pushes a domain's
+next slot out. `interleave_by_domain` orders work round-robin across hosts, so a pool is not filled
+with tasks all waiting on one domain.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+# Cap on a single Retry-After so one misbehaving server cannot park a run for hours.
+MAX_RETRY_AFTER_SECONDS = 300.0
+# Statuses that back a domain off even without a Retry-After header (503 alone is too often a real outage).
+THROTTLE_STATUSES = frozenset({429})
+
+
+def url_domain(url: str) -> str:
+    try:
+        return (urlparse(url).netloc or "").lower()
+    except Exception:
+        return ""
+
+
+def parse_retry_after(value: str | None, *, now: float | None = None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date); None when absent/invalid."""
+    raw = (value or "").strip()
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(raw).timestamp()
+    except Exception:
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+class DomainRateLimiter:
+    """Scheduled per-domain slots spaced `min_delay_seconds` apart; waits never hold the shared lock."""
+
+    def __init__(
+        self,
+        min_delay_seconds: float,
+        *,
+        default_backoff_seconds: float = 30.0,
+        max_retry_after_seconds: float = MAX_RETRY_AFTER_SECONDS,
+    ) -> None:
+        self._min_delay = max(0.0, float(min_delay_seconds))
+        self._default_backoff = max(0.0, float(default_backoff_seconds))
+        self._max_retry_after = max(0.0, float(max_retry_after_seconds))
+        self._next_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url: str) -> float:
+        """Claim the domain's next slot; returns seconds until it (0 = go now)."""
+        dom = url_domain(url)
+        if not dom:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_at.get(dom, 0.0))
+            self._next_at[dom] = slot + self._min_delay
+        return slot - now
+
+    def wait(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def ready_in(self, url: str) -> float:
+        """Seconds until the domain's next slot, without reserving it."""
+        dom = url_domain(url)
+        with self._lock:
+            return max(0.0, self._next_at.get(dom, 0.0) - time.monotonic()) if dom else 0.0
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Push the domain's next slot to at least `seconds` from now."""
+        dom = url_domain(url)
+        if not dom or seconds <= 0:
+            return
+        until = time.monotonic() + min(float(seconds), self._max_retry_after)
+        with self._lock:
+            if until > self._next_at.get(dom, 0.0):
+                self._next_at[dom] = until
+
+    def note_response(self, url: str, status: int | None, retry_after: str | None = None) -> float:
+        """Back the domain off after a throttling response; returns the applied delay."""
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            if status not in THROTTLE_STATUSES:
+                return 0.0
+            delay = self._default_backoff
+        delay = min(delay, self._max_retry_after)
+        self.defer(url, delay)
+        return delay
+
+
+def interleave_by_domain(items: Iterable[T], url_of: Callable[[T], str]) -> list[T]:
+    """Round-robin `items` across their domains (stable within a domain)."""
+    buckets: OrderedDict[str, list[T]] = OrderedDict()
+    for item in items:
+        buckets.setdefault(url_domain(url_of(item)), []).append(item)
+    out: list[T] = []
+    queues = [list(reversed(b)) for b in buckets.values()]
+    while queues:
+        nxt = []
+        for q in queues:
+            out.append(q.pop())
+            if q:
+                nxt.append(q)
+        queues = nxt
+    return out
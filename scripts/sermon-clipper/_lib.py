@@ -6,8 +6,13 @@ import json
 import os
 import re
 import shutil
+import subprocess
 import sys
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable
 
 # Add repo root for imports
 _REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -30,6 +35,35 @@ def safe_slug(value: str, default: str = "item", max_len: int = 64) -> str:
     return (s[:max_len] or default).strip("-") or default
 
 
+def _query_cache_path(cache_dir: Path, q: str, limit: int, candidates: int, include_noncontent: bool) -> Path:
+    key = hashlib.sha256(
+        f"{q}|{limit}|{candidates}|{include_noncontent}".encode("utf-8")
+    ).hexdigest()[:16]
+    return cache_dir / "sermon-clipper" / "query-cache" / f"{_slugify_query(q)}-{key}.json"
+
+
+def _read_query_cache(cache_path: Path) -> dict | None:
+    if not cache_path.exists():
+        return None
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+def _write_query_cache(cache_path: Path, payload: dict) -> None:
+    if payload.get("error"):
+        return
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        cache_path.write_text(
+            json.dumps(payload, ensure_ascii=False, indent=0),
+            encoding="utf-8",
+        )
+    except Exception:
+        pass
+
+
 def search_segments_cached(
     cache_dir: Path,
     db_path: Path,
@@ -42,19 +76,11 @@ def search_segments_cached(
     """Call search_segments, caching the raw payload by theme to avoid repeated queries."""
     from answer_engine_lib import search_segments
 
-    key = hashlib.sha256(
-        f"{q}|{limit}|{candidates}|{include_noncontent}".encode("utf-8")
-    ).hexdigest()[:16]
-    slug = _slugify_query(q)
-    cache_subdir = cache_dir / "sermon-clipper" / "query-cache"
-    cache_path = cache_subdir / f"{slug}-{key}.json"
-
-    if not no_cache and cache_path.exists():
-        try:
-            data = json.loads(cache_path.read_text(encoding="utf-8"))
+    cache_path = _query_cache_path(cache_dir, q, limit, candidates, include_noncontent)
+    if not no_cache:
+        data = _read_query_cache(cache_path)
+        if data is not None:
             return data
-        except Exception:
-            pass
 
     payload = search_segments(
         db_path=db_path,
@@ -63,18 +89,42 @@ def search_segments_cached(
         candidates=candidates,
         include_noncontent=include_noncontent,
     )
+    _write_query_cache(cache_path, payload)
+    return payload
 
-    if not payload.get("error"):
-        cache_subdir.mkdir(parents=True, exist_ok=True)
-        try:
-            cache_path.write_text(
-                json.dumps(payload, ensure_ascii=False, indent=0),
-                encoding="utf-8",
-            )
-        except Exception:
-            pass
 
-    return payload
+def search_segments_many_cached(
+    cache_dir: Path,
+    db_path: Path,
+    queries: list[str],
+    limit: int = 400,
+    candidates: int = 400,
+    include_noncontent: bool = False,
+    no_cache: bool = False,
+) -> dict[str, dict]:
+    """search_segments_cached for several themes; cache misses share one answer-engine DB connection."""
+    from answer_engine_lib import search_segments_many
+
+    out: dict[str, dict] = {}
+    misses: list[str] = []
+    for q in dict.fromkeys(queries):
+        data = None if no_cache else _read_query_cache(_query_cache_path(cache_dir, q, limit, candidates, include_noncontent))
+        if data is None:
+            misses.append(q)
+        else:
+            out[q] = data
+    if misses:
+        fresh = search_segments_many(
+            db_path=db_path,
+            queries=misses,
+            limit=limit,
+            candidates=candidates,
+            include_noncontent=include_noncontent,
+        )
+        for q, payload in fresh.items():
+            _write_query_cache(_query_cache_path(cache_dir, q, limit, candidates, include_noncontent), payload)
+            out[q] = payload
+    return out
 
 
 def default_env() -> str:
@@ -141,6 +191,286 @@ def get_source_path(content_cache: Path, feed: str, episode_slug: str) -> Path:
     return content_cache / f"{feed}_{safe}.mp4"
 
 
+# ffmpeg/x264 threads assumed per clip job when sizing the render pool; beyond ~4 threads a
+# 1080p encode gains little, so spare cores are better spent on another clip.
+_RENDER_THREADS_PER_JOB = 4
+
+
+def render_pool_size(jobs: int, enc_threads: int, n_jobs: int) -> tuple[int, int]:
+    """
+    (workers, ffmpeg threads per job) for rendering independent clips concurrently.
+    jobs/enc_threads of 0 mean auto: split the cores into groups of enc_threads (or 4), and cap
+    ffmpeg threads so concurrent encoders do not oversubscribe. Threads 0 = let ffmpeg decide.
+    """
+    cores = max(1, int(os.cpu_count() or 1))
+    per_job = int(enc_threads) if int(enc_threads) > 0 else _RENDER_THREADS_PER_JOB
+    workers = int(jobs) if int(jobs) > 0 else max(1, cores // per_job)
+    workers = max(1, min(workers, max(1, int(n_jobs))))
+    if int(enc_threads) > 0:
+        return workers, int(enc_threads)
+    return workers, (max(1, cores // workers) if workers > 1 else 0)
+
+
+_CLIP_SOURCE_INDEX_LOCK = threading.Lock()
+
+# Seconds fetched either side of a clip when pulling only a range of the episode; covers keyframe
+# alignment of the stream copy plus later trim/silence adjustments.
+CLIP_SOURCE_PAD_SECONDS = 20.0
+
+
+def get_clip_source_dir(content_cache: Path, feed: str, episode_slug: str) -> Path:
+    """Directory of partial (time-range) source pieces for one episode."""
+    return content_cache / "ranges" / get_source_path(content_cache, feed, episode_slug).stem
+
+
+def clip_source_range(start: float, end: float, pad: float = CLIP_SOURCE_PAD_SECONDS) -> tuple[float, float]:
+    """Padded [start, end] to fetch for a clip."""
+    return max(0.0, float(start) - pad), float(end) + pad
+
+
+def clip_source_piece_path(content_cache: Path, feed: str, episode_slug: str, piece_start: float, piece_end: float) -> Path:
+    return get_clip_source_dir(content_cache, feed, episode_slug) / f"{int(piece_start * 1000)}-{int(piece_end * 1000)}.mp4"
+
+
+def _load_clip_source_index(piece_dir: Path) -> list[dict]:
+    path = piece_dir / "index.json"
+    if not path.exists():
+        return []
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return []
+    pieces = data.get("pieces") if isinstance(data, dict) else None
+    return [p for p in pieces if isinstance(p, dict)] if isinstance(pieces, list) else []
+
+
+def find_clip_source(content_cache: Path, feed: str, episode_slug: str, start: float, end: float) -> tuple[Path, float] | None:
+    """
+    Local media covering [start, end] of an episode, as (path, offset_sec). Subtract offset_sec from
+    episode times to get times in the file. A full cached download wins; otherwise any fetched piece
+    that covers the range is reused.
+    """
+    full = get_source_path(content_cache, feed, episode_slug)
+    if full.exists():
+        return full, 0.0
+    piece_dir = get_clip_source_dir(content_cache, feed, episode_slug)
+    for piece in _load_clip_source_index(piece_dir):
+        try:
+            p_start = float(piece.get("start_sec") or 0.0)
+            p_end = float(piece.get("end_sec") or 0.0)
+        except (TypeError, ValueError):
+            continue
+        path = piece_dir / str(piece.get("file") or "")
+        if p_start <= start and p_end >= end and path.is_file() and path.stat().st_size > 0:
+            return path, p_start
+    return None
+
+
+def record_clip_source(
+    content_cache: Path,
+    feed: str,
+    episode_slug: str,
+    piece_path: Path,
+    piece_start: float,
+    piece_end: float,
+    url: str,
+) -> None:
+    """Add a fetched piece to the episode's range index so later clips/renders can reuse it."""
+    piece_dir = get_clip_source_dir(content_cache, feed, episode_slug)
+    with _CLIP_SOURCE_INDEX_LOCK:
+        pieces = [p for p in _load_clip_source_index(piece_dir) if p.get("file") != piece_path.name]
+        pieces.append(
+            {
+                "file": piece_path.name,
+                "start_sec": round(float(piece_start), 3),
+                "end_sec": round(float(piece_end), 3),
+                "url": url,
+                "bytes": piece_path.stat().st_size if piece_path.exists() else 0,
+                "fetched_at_unix": int(time.time()),
+            }
+        )
+        pieces.sort(key=lambda p: float(p.get("start_sec") or 0.0))
+        piece_dir.mkdir(parents=True, exist_ok=True)
+        tmp = piece_dir / "index.json.tmp"
+        tmp.write_text(json.dumps({"pieces": pieces}, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(piece_dir / "index.json")
+
+
+# (cmd, timeout_seconds, label) -> None, raising on failure; each renderer passes its own logged ffmpeg runner.
+MediaCommandRunner = Callable[[list[str], int, str], None]
+
+
+def run_media_command(cmd: list[str], timeout: int, label: str) -> None:
+    """Default MediaCommandRunner: quiet ffmpeg, last stderr lines in the raised error."""
+    if cmd and cmd[0] == "ffmpeg" and "-loglevel" not in cmd:
+        cmd = [cmd[0], "-hide_banner", "-loglevel", "error", "-nostats", *cmd[1:]]
+    result = subprocess.run(cmd, capture_output=True, text=True, errors="replace", timeout=timeout)
+    if result.returncode != 0:
+        detail = " | ".join((result.stderr or "").strip().splitlines()[-3:])
+        raise RuntimeError(f"{label}: {detail or f'exit {result.returncode}'}")
+
+
+_MEDIA_PATH_LOCKS: dict[str, threading.Lock] = {}
+_MEDIA_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _media_path_lock(path: Path) -> threading.Lock:
+    """One lock per cached media path, so parallel jobs needing the same file fetch it once."""
+    with _MEDIA_PATH_LOCKS_GUARD:
+        return _MEDIA_PATH_LOCKS.setdefault(str(path), threading.Lock())
+
+
+def _part_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.part{path.suffix}")
+
+
+def fetch_clip_source(
+    url: str,
+    content_cache: Path,
+    feed: str,
+    episode: str,
+    start: float,
+    end: float,
+    *,
+    run: MediaCommandRunner = run_media_command,
+    log_tag: str = "render",
+) -> tuple[Path, float] | None:
+    """
+    Fetch only the padded clip range. ffmpeg input seeking uses HTTP range requests on MP4 (via the
+    moov index) and reads only the covering HLS segments. The piece is written to a temp path and
+    renamed into place under a per-path lock, so concurrent jobs never read a partial MP4.
+    """
+    piece_start, piece_end = clip_source_range(start, end)
+    out_path = clip_source_piece_path(content_cache, feed, episode, piece_start, piece_end)
+    with _media_path_lock(out_path):
+        cached = find_clip_source(content_cache, feed, episode, start, end)
+        if cached is not None:
+            return cached
+        return _fetch_clip_piece(url, content_cache, feed, episode, piece_start, piece_end, out_path, run=run, log_tag=log_tag)
+
+
+def _first_packet_time(src: str, stream: str, *, seek: float | None = None, timeout: int = 60) -> float | None:
+    """pts_time of the first `stream` packet (at the keyframe ffprobe seeks to for `seek`), relative to the file's start_time."""
+    cmd = ["ffprobe", "-v", "error", "-read_intervals", f"{seek:.3f}%+#1" if seek is not None else "%+#1"]
+    cmd += ["-select_streams", stream, "-show_entries", "packet=pts_time:format=start_time", "-of", "json", src]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, errors="replace", timeout=timeout)
+        data = json.loads(result.stdout or "{}")
+        packets = data.get("packets") or []
+        pts = float(packets[0]["pts_time"])
+        start_time = float((data.get("format") or {}).get("start_time") or 0.0)
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, IndexError, TypeError):
+        return None
+    return pts - start_time
+
+
+def clip_piece_offset(url: str, piece_path: Path, piece_start: float) -> float | None:
+    """
+    Episode time of piece time 0 for a `-ss piece_start -c copy` cut. Stream copy starts at the
+    keyframe K at or before piece_start; depending on the muxer that preroll is either kept at
+    negative pts (edit list) or the timestamps are shifted so K lands on 0. Either way the
+    episode time of piece time t is K - p0 + t, where p0 is the piece's first packet time.
+    """
+    for stream in ("v:0", "a:0"):
+        p0 = _first_packet_time(str(piece_path), stream, timeout=30)
+        if p0 is None:
+            continue
+        keyframe = _first_packet_time(url, stream, seek=piece_start)
+        if keyframe is None:
+            return None
+        return keyframe - p0
+    return None
+
+
+def _fetch_clip_piece(
+    url: str,
+    content_cache: Path,
+    feed: str,
+    episode: str,
+    piece_start: float,
+    piece_end: float,
+    out_path: Path,
+    *,
+    run: MediaCommandRunner,
+    log_tag: str,
+) -> tuple[Path, float] | None:
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _part_path(out_path)
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-ss",
+        f"{piece_start:.3f}",
+        "-i",
+        url,
+        "-t",
+        f"{piece_end - piece_start:.3f}",
+        "-map",
+        "0:v:0?",
+        "-map",
+        "0:a:0?",
+        "-c",
+        "copy",
+        "-movflags",
+        "+faststart",
+        str(tmp_path),
+    ]
+    try:
+        run(cmd, 300, "ffmpeg range fetch failed")
+    except Exception as exc:
+        print(f"[{log_tag}] range fetch failed for {feed}/{episode}: {exc}", file=sys.stderr)
+        remove_path(tmp_path)
+        return None
+    if not tmp_path.is_file() or tmp_path.stat().st_size <= 0:
+        remove_path(tmp_path)
+        return None
+    offset = clip_piece_offset(url, tmp_path, piece_start)
+    # Stream copy only ever starts early (at a keyframe, GOPs are well under a minute), never late;
+    # anything else is a bad probe. Callers fall back to the full episode download on None.
+    if offset is None or not (piece_start - 60.0 <= offset <= piece_start + 0.05):
+        print(f"[{log_tag}] could not verify piece start for {feed}/{episode} (probe={offset}); dropping piece", file=sys.stderr)
+        remove_path(tmp_path)
+        return None
+    os.replace(tmp_path, out_path)
+    record_clip_source(content_cache, feed, episode, out_path, offset, piece_end, url)
+    print(f"[{log_tag}] fetched {feed}/{episode} {offset:.2f}-{piece_end:.1f}s ({out_path.stat().st_size} bytes)", file=sys.stderr)
+    return out_path, offset
+
+
+def download_episode_source(
+    url: str,
+    content_cache: Path,
+    feed: str,
+    episode: str,
+    *,
+    run: MediaCommandRunner = run_media_command,
+    log_tag: str = "render",
+) -> Path | None:
+    """
+    Download the whole episode to get_source_path() (ffmpeg handles MP4, HLS, etc.). Clips of the
+    same episode rendering in parallel share one download, and the file is written to a temp path and
+    renamed into place, so find_clip_source never sees a partial file.
+    """
+    out_path = get_source_path(content_cache, feed, episode)
+    with _media_path_lock(out_path):
+        if out_path.is_file() and out_path.stat().st_size > 0:
+            return out_path
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = _part_path(out_path)
+        cmd = ["ffmpeg", "-y", "-i", url, "-c", "copy", "-movflags", "+faststart", str(tmp_path)]
+        try:
+            run(cmd, 600, "ffmpeg download failed")
+        except Exception as exc:
+            print(f"[{log_tag}] download failed for {feed}/{episode}: {exc}", file=sys.stderr)
+            remove_path(tmp_path)
+            return None
+        if not tmp_path.is_file() or tmp_path.stat().st_size <= 0:
+            remove_path(tmp_path)
+            return None
+        os.replace(tmp_path, out_path)
+    return out_path
+
+
 def default_db_path(cache_dir: Path) -> Path:
     return cache_dir / "answer-engine" / "answer_engine.sqlite"
 
@@ -158,29 +488,41 @@ def get_episode_media_url(cache_dir: Path, feed_slug: str, episode_slug: str) ->
 def get_episode_media_info(cache_dir: Path, feed_slug: str, episode_slug: str) -> dict | None:
     """Resolve media URL and video flag from cached feed XML. Use pickedIsVideo to skip audio-only."""
     feed_path = cache_dir / "feeds" / f"{feed_slug}.xml"
-    if not feed_path.exists():
+    try:
+        st = feed_path.stat()
+    except OSError:
         return None
+    info = _feed_media_index(str(feed_path), st.st_mtime_ns, st.st_size).get(episode_slug)
+    return dict(info) if info else None
+
+
+@lru_cache(maxsize=256)
+def _feed_media_index(feed_path: str, _mtime_ns: int, _size: int) -> dict[str, dict | None]:
+    """episode slug -> media info for one cached feed XML; keyed on mtime/size so each feed is parsed once per change."""
+    out: dict[str, dict | None] = {}
     try:
-        xml_text = feed_path.read_text(encoding="utf-8", errors="replace")
+        xml_text = Path(feed_path).read_text(encoding="utf-8", errors="replace")
+        feed_slug = Path(feed_path).stem
         _feat, _ch, episodes, _img = parse_feed_for_manifest(
             xml_text, source_id=feed_slug, source_title=feed_slug
         )
-        for ep in episodes or []:
-            if not isinstance(ep, dict):
-                continue
-            slug = str(ep.get("slug") or "").strip()
-            if slug != episode_slug:
-                continue
-            media = ep.get("media")
-            if isinstance(media, dict) and media.get("url"):
-                return {
-                    "url": str(media["url"]).strip(),
-                    "pickedIsVideo": bool(media.get("pickedIsVideo")),
-                }
-            return None
     except Exception:
-        pass
-    return None
+        return out
+    for ep in episodes or []:
+        if not isinstance(ep, dict):
+            continue
+        slug = str(ep.get("slug") or "").strip()
+        if not slug or slug in out:
+            continue
+        media = ep.get("media")
+        if isinstance(media, dict) and media.get("url"):
+            out[slug] = {
+                "url": str(media["url"]).strip(),
+                "pickedIsVideo": bool(media.get("pickedIsVideo")),
+            }
+        else:
+            out[slug] = None
+    return out
 
 
 def clip_has_render_requirements(
@@ -233,6 +575,32 @@ def load_used_clips(registry_path: Path) -> set[str]:
 
 def save_used_clips(registry_path: Path, clip_ids: set[str], video_title: str = "") -> None:
     """Append clip_ids to the used-clips registry."""
+    save_used_videos(registry_path, [(video_title, set(clip_ids))])
+
+
+def rendered_clips_path(video_path: Path) -> Path:
+    """Sidecar next to a rendered video listing the clips that actually made it in."""
+    return video_path.with_name(f"{video_path.stem}.rendered.json")
+
+
+def write_rendered_clips(video_path: Path, title: str, clip_ids: list[str]) -> None:
+    path = rendered_clips_path(video_path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"title": title, "clip_ids": clip_ids}, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_rendered_clips(video_path: Path) -> tuple[str, list[str]] | None:
+    """(title, clip_ids) from the sidecar written by render_video, or None if missing/unreadable."""
+    try:
+        data = json.loads(rendered_clips_path(video_path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    return str(data.get("title") or video_path.stem), [str(x) for x in data.get("clip_ids") or []]
+
+
+def save_used_videos(registry_path: Path, videos_clips: list[tuple[str, set[str]]]) -> None:
+    """Append several videos' clip_ids to the used-clips registry in one rewrite."""
     existing_data = {}
     if registry_path.exists():
         try:
@@ -240,10 +608,11 @@ def save_used_clips(registry_path: Path, clip_ids: set[str], video_title: str =
         except Exception:
             pass
     existing = set(existing_data.get("clip_ids") or [])
-    existing.update(clip_ids)
     videos = list(existing_data.get("videos") or [])
-    if video_title:
-        videos.append({"title": video_title, "clips": list(clip_ids)})
+    for video_title, clip_ids in videos_clips:
+        existing.update(clip_ids)
+        if video_title:
+            videos.append({"title": video_title, "clips": list(clip_ids)})
     registry_path.parent.mkdir(parents=True, exist_ok=True)
     registry_path.write_text(
         json.dumps({"clip_ids": sorted(existing), "videos": videos}, ensure_ascii=False, indent=2),
@@ -371,6 +740,19 @@ def parse_key_value_block(text: str) -> dict[str, str]:
     return data
 
 
+def parse_script_title(text: str) -> str:
+    """Title from the script's `# Video: ...` heading (empty if there is none)."""
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if line.startswith("# "):
+            title = line[2:].strip()
+            head, sep, rest = title.partition(":")
+            return rest.strip() if sep and head.strip().lower() in {"video", "short"} else title
+        if line.startswith("## "):
+            break
+    return ""
+
+
 def parse_long_form_script(script_path: Path) -> dict:
     """Parse a long-form sermon clipper script."""
     text = script_path.read_text(encoding="utf-8", errors="replace")
@@ -421,7 +803,7 @@ def parse_long_form_script(script_path: Path) -> dict:
                     "feed_title": kv.get("feed_title") or "",
                 }
             )
-    return {"metadata": metadata, "items": items}
+    return {"title": parse_script_title(text), "metadata": metadata, "items": items}
 
 
 def parse_short_script(script_path: Path) -> dict:
@@ -479,13 +861,18 @@ def _sec_to_vtt(sec: float) -> str:
 def get_feed_title(env: str, feed_slug: str) -> str:
     """Resolve human-readable feed title from config."""
     cfg_path = _REPO_ROOT / "feeds" / f"{env}.md"
-    if not cfg_path.exists():
+    try:
+        st = cfg_path.stat()
+    except OSError:
         return feed_slug
+    return _feed_titles(str(cfg_path), st.st_mtime_ns, st.st_size).get(feed_slug) or feed_slug
+
+
+@lru_cache(maxsize=16)
+def _feed_titles(cfg_path: str, _mtime_ns: int, _size: int) -> dict[str, str]:
+    """feed slug -> title for one feeds config; keyed on mtime/size so each script resolves titles from one load."""
     try:
-        cfg = load_sources_config(cfg_path)
-        for s in cfg.sources or []:
-            if str(s.id) == feed_slug:
-                return str(s.title or feed_slug)
+        cfg = load_sources_config(Path(cfg_path))
     except Exception:
-        pass
-    return feed_slug
+        return {}
+    return {str(s.id): str(s.title or s.id) for s in cfg.sources or []}
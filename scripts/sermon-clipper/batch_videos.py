@@ -0,0 +1,365 @@
+"""Plan (and optionally render) several long-form videos from one retrieval pass.
+
+All themes are searched over a single answer-engine DB connection, clips are assigned across themes so
+no clip lands in two videos, and one clips JSON + render sheet is written per theme. With --render the
+source ranges every video needs are fetched once through a shared download queue, then each video is
+rendered from the warm content cache.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+_THIS = Path(__file__).resolve().parent
+_REPO_ROOT = _THIS.parents[1]
+_AE_ROOT = _REPO_ROOT / "scripts" / "answer-engine"
+for p in (_REPO_ROOT, _AE_ROOT, _THIS):
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+
+from _lib import (
+    CLIP_SOURCE_PAD_SECONDS,
+    clip_has_render_requirements,
+    clip_id,
+    default_cache_dir,
+    default_content_cache_dir,
+    default_env,
+    default_transcripts_root,
+    fetch_clip_source,
+    find_clip_source,
+    get_episode_media_info,
+    load_used_clips,
+    read_rendered_clips,
+    safe_slug,
+    save_used_videos,
+    search_segments_many_cached,
+)
+from write_script import build_script_markdown
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Plan several themed long-form videos at once, without reusing clips across them.")
+    p.add_argument("--theme", action="append", default=[], help="Theme to plan a video for (repeatable).")
+    p.add_argument("--themes-file", default="", help="Text file with one theme per line (# comments allowed).")
+    p.add_argument("--output-dir", "-o", required=True, help="Directory for <theme>-clips.json, <theme>.md and batch-plan.json.")
+    p.add_argument("--env", default="", help="Cache env (default: from .vodcasts-env).")
+    p.add_argument("--limit", type=int, default=6, help="Max clips per video (default: 6).")
+    p.add_argument("--candidates", type=int, default=400, help="FTS candidates per theme (default: 400).")
+    p.add_argument("--include-noncontent", action="store_true", help="Allow intro/ad/outro segments.")
+    p.add_argument("--exclude-used", default="", help="Path to used-clips.json to exclude already-used clips.")
+    p.add_argument("--max-duration", type=float, default=120.0, help="Favor clips under this seconds (default: 120).")
+    p.add_argument("--min-duration", type=float, default=15.0, help="Minimum clip length in seconds (default: 15).")
+    p.add_argument("--target-duration", type=float, default=900.0, help="Target total duration per video in seconds (default: 900).")
+    p.add_argument("--allow-audio", action="store_true", help="Allow audio-only enclosures.")
+    p.add_argument("--allow-missing-transcript", action="store_true", help="Allow clips without local transcript files.")
+    p.add_argument("--no-cache", action="store_true", help="Bypass the query cache; run fresh searches.")
+    p.add_argument("--render", action="store_true", help="Also make title cards and render every planned video.")
+    p.add_argument("--content-cache", default="", help="Shared source video cache (default: cache/<env>/sermon-clipper/content).")
+    p.add_argument("--download-jobs", type=int, default=4, help="Concurrent source range fetches in the shared download queue (default: 4).")
+    p.add_argument("--register", default="", help="Path to used-clips.json to register rendered clips.")
+    p.add_argument("--render-arg", action="append", default=[], help="Extra argument passed to every render_video.py call (repeatable, e.g. --render-arg=--trim-silence).")
+    return p.parse_args()
+
+
+def _read_themes(args: argparse.Namespace) -> list[str]:
+    themes = [str(t).strip() for t in args.theme]
+    if args.themes_file:
+        for line in Path(args.themes_file).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                themes.append(line)
+    return [t for t in dict.fromkeys(themes) if t]
+
+
+def _theme_candidates(
+    payload: dict,
+    *,
+    used_ids: set[str],
+    min_dur: float,
+    renderable,
+) -> tuple[list[dict], dict[str, int]]:
+    """Eligible clips for one theme in score order, each with `norm` = score / best score for the theme."""
+    rejected = {"used_clip": 0, "too_short": 0, "not_renderable": 0}
+    out: list[dict] = []
+    for r in payload.get("results") or []:
+        feed = r.get("feed")
+        ep_slug = r.get("episode_slug")
+        start = float(r.get("start_sec") or 0)
+        end = float(r.get("end_sec") or start)
+        dur = end - start
+        if clip_id(feed, ep_slug, start) in used_ids:
+            rejected["used_clip"] += 1
+            continue
+        if dur < min_dur:
+            rejected["too_short"] += 1
+            continue
+        if not renderable(str(feed or ""), str(ep_slug or "")):
+            rejected["not_renderable"] += 1
+            continue
+        out.append(
+            {
+                "feed": feed,
+                "episode_slug": ep_slug,
+                "episode_title": r.get("episode_title"),
+                "episode_date": r.get("episode_date"),
+                "start_sec": start,
+                "end_sec": end,
+                "duration_sec": dur,
+                "snippet": r.get("snippet"),
+                "score": float(r.get("score") or 0),
+                "share_path": r.get("share_path"),
+            }
+        )
+    best = max((c["score"] for c in out), default=0.0)
+    for c in out:
+        c["norm"] = c["score"] / best if best > 0 else 0.0
+    return out, rejected
+
+
+def assign_clips(
+    candidates: dict[str, list[dict]],
+    *,
+    limit: int,
+    max_dur: float,
+    target_dur: float,
+) -> tuple[dict[str, list[dict]], dict[str, dict[str, int]]]:
+    """
+    Greedy global assignment: every (theme, clip) pair is visited by normalized score, so a clip that
+    matches several themes goes to the one it ranks highest for. Per video the search_clips rules hold:
+    one clip per feed, at most `limit` clips, stop at the target duration, and long clips only early on.
+    """
+    pairs = [
+        (-c["norm"], ti, rank, theme, c)
+        for ti, (theme, items) in enumerate(candidates.items())
+        for rank, c in enumerate(items)
+    ]
+    pairs.sort(key=lambda x: x[:3])
+    taken: set[str] = set()
+    plans: dict[str, list[dict]] = {theme: [] for theme in candidates}
+    feeds: dict[str, set] = {theme: set() for theme in candidates}
+    totals: dict[str, float] = {theme: 0.0 for theme in candidates}
+    rejected = {theme: {"taken_by_other_theme": 0, "duplicate_feed": 0, "too_long": 0} for theme in candidates}
+    for _neg, _ti, _rank, theme, c in pairs:
+        clips = plans[theme]
+        if len(clips) >= limit or totals[theme] >= target_dur:
+            continue
+        cid = clip_id(c["feed"], c["episode_slug"], c["start_sec"])
+        if cid in taken:
+            rejected[theme]["taken_by_other_theme"] += 1
+            continue
+        if c["feed"] in feeds[theme]:
+            rejected[theme]["duplicate_feed"] += 1
+            continue
+        over_max = c["duration_sec"] > max_dur
+        if over_max and (totals[theme] >= target_dur * 0.8 or len(clips) >= 3):
+            rejected[theme]["too_long"] += 1
+            continue
+        taken.add(cid)
+        feeds[theme].add(c["feed"])
+        totals[theme] += c["duration_sec"]
+        clips.append({k: v for k, v in c.items() if k != "norm"})
+    return plans, rejected
+
+
+def _prefetch_sources(plans: dict[str, list[dict]], *, cache_dir: Path, content_cache: Path, jobs: int) -> None:
+    """Fetch each episode range the batch needs once; overlapping padded ranges are merged into one fetch."""
+    by_episode: dict[tuple[str, str], list[tuple[float, float]]] = {}
+    for clips in plans.values():
+        for c in clips:
+            feed, ep = str(c["feed"]), str(c["episode_slug"])
+            start, end = float(c["start_sec"]), float(c["end_sec"])
+            if find_clip_source(content_cache, feed, ep, start, end) is None:
+                by_episode.setdefault((feed, ep), []).append((start, end))
+
+    fetches: list[tuple[str, str, str, float, float]] = []
+    clip_count = 0
+    for (feed, ep), ranges in sorted(by_episode.items()):
+        info = get_episode_media_info(cache_dir, feed, ep)
+        if not info or not info.get("url"):
+            continue
+        ranges = sorted(set(ranges))
+        clip_count += len(ranges)
+        cur_start, cur_end = ranges[0]
+        for start, end in ranges[1:]:
+            # Padded pieces overlap: one fetch covers both.
+            if start - cur_end <= 2 * CLIP_SOURCE_PAD_SECONDS:
+                cur_end = max(cur_end, end)
+                continue
+            fetches.append((str(info["url"]), feed, ep, cur_start, cur_end))
+            cur_start, cur_end = start, end
+        fetches.append((str(info["url"]), feed, ep, cur_start, cur_end))
+
+    if not fetches:
+        print("[batch] all planned clip sources already cached", file=sys.stderr)
+        return
+    print(f"[batch] fetching {len(fetches)} source ranges for {clip_count} uncached clips", file=sys.stderr)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, int(jobs))) as pool:
+        results = list(pool.map(lambda f: fetch_clip_source(f[0], content_cache, f[1], f[2], f[3], f[4], log_tag="batch"), fetches))
+    ok = sum(1 for r in results if r is not None)
+    print(f"[batch] fetched {ok}/{len(fetches)} ranges in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+def _render_all(written: list[dict], args: argparse.Namespace, env: str) -> list[dict]:
+    failures: list[dict] = []
+    for entry in written:
+        script = Path(entry["script"])
+        cards = script.with_name(f"{script.stem}-title-cards")
+        video = script.with_suffix(".mp4")
+        steps = [
+            [sys.executable, str(_THIS / "make_title_cards.py"), "--script", str(script), "--output", str(cards)],
+            [sys.executable, str(_THIS / "render_video.py"), "--script", str(script), "--output", str(video), "--title-cards", str(cards), "--env", env]
+            + (["--content-cache", args.content_cache] if args.content_cache else [])
+            + [str(a) for a in args.render_arg],
+        ]
+        for cmd in steps:
+            print(f"[batch] {entry['theme']}: {Path(cmd[1]).name}", file=sys.stderr)
+            rc = subprocess.run(cmd).returncode
+            if rc != 0:
+                failures.append({"theme": entry["theme"], "step": Path(cmd[1]).name, "returncode": rc})
+                break
+        else:
+            entry["video"] = str(video)
+    return failures
+
+
+def main() -> None:
+    args = _parse_args()
+    themes = _read_themes(args)
+    if not themes:
+        print("[batch] No themes given (use --theme or --themes-file).", file=sys.stderr)
+        sys.exit(1)
+    env = (args.env or "").strip() or default_env()
+    cache_dir = default_cache_dir(env)
+    db_path = cache_dir / "answer-engine" / "answer_engine.sqlite"
+    transcripts_root = default_transcripts_root()
+    if not db_path.exists():
+        print(f"[batch] DB not found: {db_path}. Run: ae.sh analyze && ae.sh index", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    payloads = search_segments_many_cached(
+        cache_dir=cache_dir,
+        db_path=db_path,
+        queries=themes,
+        limit=int(args.candidates),
+        candidates=int(args.candidates),
+        include_noncontent=bool(args.include_noncontent),
+        no_cache=bool(args.no_cache),
+    )
+    print(f"[batch] searched {len(themes)} themes in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    used_ids = load_used_clips(Path(args.exclude_used)) if args.exclude_used else set()
+    require_video = not bool(args.allow_audio)
+    require_transcript = not bool(args.allow_missing_transcript)
+    renderable_memo: dict[tuple[str, str], bool] = {}
+
+    def _renderable(feed: str, episode: str) -> bool:
+        key = (feed, episode)
+        if key not in renderable_memo:
+            renderable_memo[key] = clip_has_render_requirements(
+                cache_dir=cache_dir,
+                transcripts_root=transcripts_root,
+                feed_slug=feed,
+                episode_slug=episode,
+                require_video=require_video,
+                require_transcript=require_transcript,
+            )
+        return renderable_memo[key]
+
+    candidates: dict[str, list[dict]] = {}
+    rejected: dict[str, dict[str, int]] = {}
+    for theme in themes:
+        payload = payloads.get(theme) or {}
+        if payload.get("error"):
+            print(f"[batch] {theme}: {payload['error']}", file=sys.stderr)
+            candidates[theme], rejected[theme] = [], {}
+            continue
+        candidates[theme], rejected[theme] = _theme_candidates(
+            payload, used_ids=used_ids, min_dur=float(args.min_duration), renderable=_renderable
+        )
+
+    plans, assign_rejected = assign_clips(
+        candidates,
+        limit=max(1, int(args.limit)),
+        max_dur=float(args.max_duration),
+        target_dur=float(args.target_duration),
+    )
+
+    out_dir = Path(args.output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written: list[dict] = []
+    slugs: set[str] = set()
+    for theme in themes:
+        clips = plans[theme]
+        base_slug = safe_slug(theme, default="theme")
+        slug, n = base_slug, 1
+        while slug in slugs:
+            n += 1
+            slug = f"{base_slug}-{n}"
+        slugs.add(slug)
+        if not clips:
+            print(f"[batch] {theme}: no clips left to assign", file=sys.stderr)
+            continue
+        total_dur = sum(float(c["duration_sec"]) for c in clips)
+        clips_path = out_dir / f"{slug}-clips.json"
+        clips_doc = {
+            "query": theme,
+            "clips": clips,
+            "total_duration_sec": total_dur,
+            "filters": {
+                "require_video": require_video,
+                "require_transcript": require_transcript,
+                "min_duration": float(args.min_duration),
+                "max_duration": float(args.max_duration),
+                "target_duration": float(args.target_duration),
+            },
+            "rejected_counts": {**rejected[theme], **assign_rejected[theme]},
+        }
+        clips_path.write_text(json.dumps(clips_doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        script_path = out_dir / f"{slug}.md"
+        script_path.write_text(
+            build_script_markdown(theme, clips, env, target_minutes=max(1, round(float(args.target_duration) / 60))),
+            encoding="utf-8",
+        )
+        written.append({"theme": theme, "clips": str(clips_path), "script": str(script_path), "clip_count": len(clips), "total_duration_sec": total_dur})
+        print(f"[batch] {theme}: {len(clips)} clips, {total_dur:.0f}s -> {script_path}", file=sys.stderr)
+
+    failures: list[dict] = []
+    if args.render and written:
+        content_cache = Path(args.content_cache).resolve() if args.content_cache else default_content_cache_dir(env)
+        content_cache.mkdir(parents=True, exist_ok=True)
+        if "--full-download" not in args.render_arg and "--no-download" not in args.render_arg:
+            _prefetch_sources({e["theme"]: plans[e["theme"]] for e in written}, cache_dir=cache_dir, content_cache=content_cache, jobs=int(args.download_jobs))
+        failures = _render_all(written, args, env)
+        if args.register:
+            # One registry rewrite for the whole batch; render_video runs without --register and
+            # reports the clips it actually used (skipped ones stay available) in a sidecar.
+            rendered: list[tuple[str, set[str]]] = []
+            for e in written:
+                report = read_rendered_clips(Path(e["video"])) if e.get("video") else None
+                if report is None:
+                    if e.get("video"):
+                        print(f"[batch] {e['theme']}: no rendered-clips report next to {e['video']}; not registering", file=sys.stderr)
+                    continue
+                title, ids = report
+                if ids:
+                    rendered.append((title, set(ids)))
+            if rendered:
+                save_used_videos(Path(args.register), rendered)
+                print(f"[batch] registered {sum(len(ids) for _, ids in rendered)} clips from {len(rendered)} videos in {args.register}", file=sys.stderr)
+
+    plan_path = out_dir / "batch-plan.json"
+    plan_path.write_text(json.dumps({"env": env, "videos": written, "render_failures": failures}, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[batch] wrote {len(written)}/{len(themes)} video plans to {plan_path}", file=sys.stderr)
+    if failures:
+        sys.exit(4)
+
+
+if __name__ == "__main__":
+    main()
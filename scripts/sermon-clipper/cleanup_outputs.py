@@ -7,7 +7,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from _lib import default_work_root, remove_path
+from _lib import default_content_cache_dir, default_env, default_work_root, remove_path
+from render_cache import RenderCache, default_render_cache_dir
 
 
 def _parse_args() -> argparse.Namespace:
@@ -19,6 +20,14 @@ def _parse_args() -> argparse.Namespace:
         help="Output directory to clean work*/concat_list leftovers from. Repeat as needed.",
     )
     p.add_argument("--keep-internal-work", action="store_true", help="Do not remove scripts/sermon-clipper/.work.")
+    p.add_argument(
+        "--trim-render-cache-gb",
+        type=float,
+        default=-1.0,
+        help="Evict least-recently-used cached clip renders until the render cache fits this size (0 = empty it). Default: leave it alone.",
+    )
+    p.add_argument("--env", default="", help="Cache env for --trim-render-cache-gb.")
+    p.add_argument("--content-cache", default="", help="Shared content cache (default: cache/<env>/sermon-clipper/content).")
     return p.parse_args()
 
 
@@ -57,6 +66,13 @@ def main() -> None:
     for raw_target in args.path:
         removed.extend(_clean_target_dir(Path(raw_target).resolve()))
 
+    if args.trim_render_cache_gb >= 0:
+        env = (args.env or "").strip() or default_env()
+        content_cache = Path(args.content_cache).resolve() if args.content_cache else default_content_cache_dir(env)
+        cache = RenderCache(default_render_cache_dir(content_cache))
+        freed = cache.evict(int(args.trim_render_cache_gb * 1024**3))
+        print(f"[cleanup] render cache {cache.root}: freed {freed / 1024**2:.1f} MiB", file=sys.stderr)
+
     print(f"[cleanup] removed {len(removed)} path(s)", file=sys.stderr)
     for path in removed:
         print(str(path), file=sys.stderr)
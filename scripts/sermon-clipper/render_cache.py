@@ -0,0 +1,138 @@
+"""Content-addressed cache for rendered intermediate clips (normalized MP4 + JSON metadata).
+
+Keys hash everything that determines the output bytes: source media identity (URL or file hash),
+cut times, filter/encoder settings and tool versions. Entries live under
+cache/<env>/sermon-clipper/content/render-cache/ and are evicted least-recently-used once the
+cache grows past its size limit, so re-rendering after a script edit only encodes changed items.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+# Bump when a renderer changes its filter graph or encode settings in a way the key does not capture.
+RENDER_CACHE_SCHEMA = 2
+DEFAULT_RENDER_CACHE_GB = 20.0
+
+
+def default_render_cache_dir(content_cache: Path) -> Path:
+    return content_cache / "render-cache"
+
+
+@lru_cache(maxsize=None)
+def tool_version(exe: str) -> str:
+    """First line of `<exe> -version` (e.g. ffmpeg build string); empty if the tool is missing."""
+    try:
+        r = subprocess.run([exe, "-version"], capture_output=True, timeout=10)
+        return (r.stdout or b"").decode("utf-8", errors="replace").splitlines()[0].strip() if r.returncode == 0 else ""
+    except Exception:
+        return ""
+
+
+def file_digest(path: Path | None) -> str:
+    """SHA-256 of a small input file (title card, clipped VTT); empty when absent."""
+    if path is None or not Path(path).is_file():
+        return ""
+    h = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def render_key(**parts: Any) -> str:
+    payload = json.dumps({"schema": RENDER_CACHE_SCHEMA, **parts}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU store of rendered files. Safe to share between render worker threads."""
+
+    def __init__(self, root: Path, *, max_gb: float = DEFAULT_RENDER_CACHE_GB) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max(0.0, float(max_gb)) * 1024**3)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        base = self.root / key[:2] / key
+        return base.with_suffix(".mp4"), base.with_suffix(".json")
+
+    def fetch(self, key: str, out: Path) -> dict[str, Any] | None:
+        """Copy a cached render to `out` and return its metadata, or None on a miss."""
+        media, meta = self._paths(key)
+        try:
+            data = json.loads(meta.read_text(encoding="utf-8")) if meta.exists() else None
+        except Exception:
+            data = None
+        if not isinstance(data, dict) or not media.is_file():
+            with self._lock:
+                self.misses += 1
+            return None
+        out.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(media, out)
+        now = time.time()
+        for p in (media, meta):
+            try:
+                os.utime(p, (now, now))
+            except OSError:
+                pass
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def store(self, key: str, produced: Path, meta: dict[str, Any] | None = None) -> None:
+        """Copy a freshly rendered file into the cache (the caller keeps `produced`), then evict."""
+        if self.max_bytes <= 0 or not produced.is_file():
+            return
+        media, meta_path = self._paths(key)
+        media.parent.mkdir(parents=True, exist_ok=True)
+        tmp = media.with_name(f"{media.name}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(produced, tmp)
+            os.replace(tmp, media)
+            meta_path.write_text(json.dumps(meta or {}, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError:
+            for p in (tmp, media, meta_path):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            return
+        self.evict()
+
+    def evict(self, max_bytes: int | None = None) -> int:
+        """Drop least-recently-used entries until the cache fits. Returns bytes removed."""
+        limit = self.max_bytes if max_bytes is None else int(max_bytes)
+        with self._lock:
+            entries: list[tuple[float, int, Path]] = []
+            total = 0
+            for media in self.root.glob("*/*.mp4"):
+                try:
+                    st = media.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, media))
+                total += st.st_size
+            removed = 0
+            entries.sort()
+            for _mtime, size, media in entries:
+                if total <= limit:
+                    break
+                for p in (media, media.with_suffix(".json")):
+                    try:
+                        p.unlink()
+                    except OSError:
+                        pass
+                total -= size
+                removed += size
+            return removed
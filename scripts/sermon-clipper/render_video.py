@@ -5,6 +5,10 @@ import argparse
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -18,16 +22,21 @@ from _lib import (
     default_content_cache_dir,
     default_env,
     default_transcripts_root,
+    download_episode_source,
+    fetch_clip_source,
+    find_clip_source,
     get_episode_media_info,
     get_feed_title,
-    get_source_path,
     get_transcript_path,
     parse_long_form_script,
     remove_path,
+    render_pool_size,
     resolve_work_dir,
     reset_directory,
     save_used_clips,
+    write_rendered_clips,
 )
+from render_cache import DEFAULT_RENDER_CACHE_GB, RenderCache, default_render_cache_dir, file_digest, render_key, tool_version
 
 
 def _parse_args() -> argparse.Namespace:
@@ -40,6 +49,9 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--content-cache", default="", help="Shared source video cache (default: cache/<env>/sermon-clipper/content).")
     p.add_argument("--card-duration", type=float, default=4.0, help="Seconds per title card (default: 4).")
     p.add_argument("--no-download", action="store_true", help="Skip downloads and use only files already present in the shared content cache.")
+    p.add_argument("--render-cache-gb", type=float, default=DEFAULT_RENDER_CACHE_GB, help="Size limit for cached clip/title-card renders under the content cache (default: 20).")
+    p.add_argument("--no-render-cache", action="store_true", help="Always re-encode every clip and title card.")
+    p.add_argument("--full-download", action="store_true", help="Download whole episodes instead of fetching only the time range around each clip.")
     p.add_argument("--trim-silence", action="store_true", help="Trim leading/trailing silence from clips (ffmpeg silenceremove).")
     p.add_argument("--transition-duration", type=float, default=3.0, help="Seconds per transition card (default: 3).")
     p.add_argument("--register", default="", help="Path to used-clips.json to register clips after render.")
@@ -51,33 +63,12 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--fps", type=int, default=30, help="Output fps (default: 30).")
     p.add_argument("--preset", default="fast", help="x264 preset (default: fast).")
     p.add_argument("--threads", type=int, default=0, help="ffmpeg encoder threads override (default: auto).")
+    p.add_argument("--jobs", type=int, default=0, help="Clips/title cards rendered concurrently (default: auto from cores and --threads).")
     p.add_argument("--min-clips", type=int, default=2, help="Require at least this many rendered clips before publishing output (default: 2).")
     p.add_argument("--keep-work", action="store_true", help="Keep scratch work directory after a successful render.")
     return p.parse_args()
 
 
-def _download_url(url: str, out_path: Path) -> bool:
-    """Download media URL using ffmpeg (handles MP4, HLS, etc.)."""
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        url,
-        "-c",
-        "copy",
-        "-movflags",
-        "+faststart",
-        str(out_path),
-    ]
-    try:
-        _run_media_command(cmd, timeout=600, label="ffmpeg download failed")
-        return True
-    except Exception as exc:
-        print(f"[render] ffmpeg download failed: {exc}", file=sys.stderr)
-        return False
-
-
 def _source_has_audio(path: Path) -> bool:
     """Probe media file for audio stream. Concat requires all segments to have audio."""
     try:
@@ -390,7 +381,16 @@ def main() -> None:
     items = parsed.get("items") or []
     clip_files: list[Path] = []
     rendered_clip_ids: list[str] = []
+    phase_totals: defaultdict[str, float] = defaultdict(float)
+    phase_lock = threading.Lock()
+
+    def _add_phase(name: str, started: float) -> None:
+        with phase_lock:
+            phase_totals[name] += time.perf_counter() - started
+
+    render_cache = None if args.no_render_cache else RenderCache(default_render_cache_dir(content_cache), max_gb=float(args.render_cache_gb))
 
+    # Fail fast on missing title cards before any encode starts.
     for index, item in enumerate(items):
         if item["type"] == "title_card":
             card_id = item.get("id") or f"card_{index}"
@@ -398,14 +398,33 @@ def main() -> None:
             if not img_path.exists():
                 print(f"[render] Title card not found: {img_path}. Run make_title_cards first.", file=sys.stderr)
                 sys.exit(2)
+
+    def _render_item(index: int, item: dict) -> tuple[Path, str] | None:
+        """Render one script item to its own file. Returns (path, clip id or "") or None if skipped."""
+        if item["type"] == "title_card":
+            card_id = item.get("id") or f"card_{index}"
+            img_path = title_cards_dir / f"{card_id}.png"
             video_path = work_dir / f"card_{index:02d}.mp4"
             duration = args.transition_duration if card_id.startswith("transition_") else args.card_duration
-            if _ffmpeg_image_to_video(img_path, duration, video_path):
-                clip_files.append(video_path)
-            continue
+            key = render_key(
+                kind="long-form-card",
+                image=file_digest(img_path),
+                duration=duration,
+                fps=_OUT_FPS,
+                preset=_ENC_PRESET,
+                ffmpeg=tool_version("ffmpeg"),
+            )
+            if render_cache is not None and render_cache.fetch(key, video_path) is not None:
+                return video_path, ""
+            started = time.perf_counter()
+            ok = _ffmpeg_image_to_video(img_path, duration, video_path)
+            _add_phase("title_card", started)
+            if ok and render_cache is not None:
+                render_cache.store(key, video_path, {"kind": "long-form-card", "card_id": card_id})
+            return (video_path, "") if ok else None
 
         if item["type"] != "clip":
-            continue
+            return None
 
         feed = item.get("feed")
         episode = item.get("episode")
@@ -417,23 +436,15 @@ def main() -> None:
         if episode_title:
             overlay = f"{feed_title} - {episode_title}" if feed_title else episode_title
         if not feed or not episode or end <= start:
-            continue
+            return None
 
         media_info = get_episode_media_info(cache_dir, feed, episode)
         if not media_info or not media_info.get("url"):
             print(f"[render] No media URL for {feed}/{episode}", file=sys.stderr)
-            continue
+            return None
         if not media_info.get("pickedIsVideo"):
             print(f"[render] Skipping {feed}/{episode}: audio-only enclosure (video required)", file=sys.stderr)
-            continue
-
-        src_path = get_source_path(content_cache, feed, episode)
-        if not src_path.exists():
-            if args.no_download:
-                print(f"[render] Missing cached source for {feed}/{episode}", file=sys.stderr)
-                continue
-            if not _download_url(str(media_info["url"]), src_path):
-                continue
+            return None
 
         subs_path: Path | None = None
         if embed_subs:
@@ -446,19 +457,74 @@ def main() -> None:
                 print(f"[render] No transcript for {feed}/{episode}", file=sys.stderr)
 
         clip_path = work_dir / f"clip_{index:02d}.mp4"
-        has_audio = _source_has_audio(src_path)
-        if _ffmpeg_extract_clip(
-            src=src_path,
+        overlay_text = None if args.no_overlay else overlay[:96]
+        key = render_key(
+            kind="long-form-clip",
+            url=str(media_info["url"]),
             start=start,
             end=end,
+            trim_silence=bool(args.trim_silence),
+            overlay=overlay_text,
+            subtitles=file_digest(subs_path),
+            size=[_OUT_W, _OUT_H],
+            fps=_OUT_FPS,
+            preset=_ENC_PRESET,
+            ffmpeg=tool_version("ffmpeg"),
+        )
+        if render_cache is not None and render_cache.fetch(key, clip_path) is not None:
+            return clip_path, clip_id(feed, episode, start)
+
+        source = find_clip_source(content_cache, feed, episode, start, end)
+        if source is None:
+            if args.no_download:
+                print(f"[render] Missing cached source for {feed}/{episode}", file=sys.stderr)
+                return None
+            started = time.perf_counter()
+            if not args.full_download:
+                source = fetch_clip_source(
+                    str(media_info["url"]), content_cache, feed, episode, start, end, run=_run_media_command
+                )
+            if source is None:
+                full_path = download_episode_source(
+                    str(media_info["url"]), content_cache, feed, episode, run=_run_media_command
+                )
+                if full_path is None:
+                    return None
+                source = (full_path, 0.0)
+            _add_phase("download", started)
+        src_path, src_offset = source
+
+        has_audio = _source_has_audio(src_path)
+        started = time.perf_counter()
+        ok = _ffmpeg_extract_clip(
+            src=src_path,
+            start=start - src_offset,
+            end=end - src_offset,
             out=clip_path,
             trim_silence=bool(args.trim_silence),
-            overlay_text=None if args.no_overlay else overlay[:96],
+            overlay_text=overlay_text,
             subtitles_path=subs_path,
             has_audio=has_audio,
-        ):
-            clip_files.append(clip_path)
-            rendered_clip_ids.append(clip_id(feed, episode, start))
+        )
+        _add_phase("extract", started)
+        if ok and render_cache is not None:
+            render_cache.store(key, clip_path, {"kind": "long-form-clip", "feed": feed, "episode": episode, "start": start, "end": end})
+        return (clip_path, clip_id(feed, episode, start)) if ok else None
+
+    workers, _ENC_THREADS = render_pool_size(int(args.jobs), _ENC_THREADS, len(items))
+    print(f"[render] items={len(items)} workers={workers} ffmpeg_threads={_ENC_THREADS or 'auto'}", file=sys.stderr)
+    render_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Results are collected in script order so the concat list never depends on finish order.
+        futures = [pool.submit(_render_item, index, item) for index, item in enumerate(items)]
+        for fut in futures:
+            result = fut.result()
+            if result is None:
+                continue
+            clip_files.append(result[0])
+            if result[1]:
+                rendered_clip_ids.append(result[1])
+    phase_totals["render_items"] = time.perf_counter() - render_started
 
     rendered_only = [path for path in clip_files if path.name.startswith("clip_")]
     if len(rendered_only) < max(1, int(args.min_clips)):
@@ -470,14 +536,25 @@ def main() -> None:
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     concat_list = work_dir / "concat_list.txt"
+    concat_started = time.perf_counter()
     ok = _ffmpeg_concat(clip_files, out_path, concat_list)
+    phase_totals["concat"] += time.perf_counter() - concat_started
     if not ok:
         sys.exit(4)
+    if render_cache is not None:
+        print(f"[render] render cache hits={render_cache.hits} misses={render_cache.misses} dir={render_cache.root}", file=sys.stderr)
+    summary_order = ["download", "extract", "title_card", "render_items", "concat"]
+    summary_bits = [f"{name}={phase_totals[name]:.1f}s" for name in summary_order if phase_totals.get(name)]
+    if summary_bits:
+        print("[render] phase totals " + " | ".join(summary_bits), file=sys.stderr)
 
     print(f"[render] wrote {out_path}", file=sys.stderr)
+    video_title = str(parsed.get("title") or "") or out_path.stem
+    # batch_videos registers from this sidecar, so skipped clips never reach the used-clips registry.
+    write_rendered_clips(out_path, video_title, rendered_clip_ids)
     if args.register and rendered_clip_ids:
         reg_path = Path(args.register)
-        save_used_clips(reg_path, set(rendered_clip_ids), video_title=out_path.stem)
+        save_used_clips(reg_path, set(rendered_clip_ids), video_title=video_title)
         print(f"[render] registered {len(rendered_clip_ids)} clips in {reg_path}", file=sys.stderr)
 
     remove_path(concat_list)
@@ -41,6 +41,7 @@ function Run-Python {
 switch ($Cmd) {
   "search" { Run-Python -ScriptName "search_clips.py" -Rest $Args }
   "write"  { Run-Python -ScriptName "write_script.py" -Rest $Args }
+  "batch"  { Run-Python -ScriptName "batch_videos.py" -Rest $Args }
   "cards"  { Run-Python -ScriptName "make_title_cards.py" -Rest $Args }
   "render" { Run-Python -ScriptName "render_video.py" -Rest $Args }
   "clean"  { Run-Python -ScriptName "cleanup_outputs.py" -Rest $Args -UseAeVenv $false }
@@ -53,9 +54,10 @@ Usage:
   powershell -ExecutionPolicy Bypass -File scripts/sermon-clipper/sc.ps1 write --theme forgiveness --output out/video.md
   powershell -ExecutionPolicy Bypass -File scripts/sermon-clipper/sc.ps1 cards --script out/video.md --output out/title-cards
   powershell -ExecutionPolicy Bypass -File scripts/sermon-clipper/sc.ps1 render --script out/video.md --output out/video.mp4 --title-cards out/title-cards
+  powershell -ExecutionPolicy Bypass -File scripts/sermon-clipper/sc.ps1 batch --theme forgiveness --theme prayer --theme anxiety --output-dir out/batch --render
   powershell -ExecutionPolicy Bypass -File scripts/sermon-clipper/sc.ps1 clean --path out/sermon-clips-examples
 
-Commands: search, write, cards, render, clean
+Commands: search, write, batch, cards, render, clean
 "@
     exit 0
   }
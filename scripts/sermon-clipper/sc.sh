@@ -13,6 +13,7 @@ shift || true
 case "$cmd" in
   search) exec "$PY" "$ROOT/search_clips.py" "$@" ;;
   write)  exec "$PY" "$ROOT/write_script.py" "$@" ;;
+  batch)  exec "$PY" "$ROOT/batch_videos.py" "$@" ;;
   cards)  python "$ROOT/make_title_cards.py" "$@" ;;
   render) python "$ROOT/render_video.py" "$@" ;;
   clean)  python "$ROOT/cleanup_outputs.py" "$@" ;;
@@ -20,13 +21,14 @@ case "$cmd" in
     echo "Sermon Clipper - generate video essays from church feed clips."
     echo ""
     echo "Usage: bash scripts/sermon-clipper/sc.sh <cmd> [args...]"
-    echo "Commands: search, write, cards, render, clean"
+    echo "Commands: search, write, batch, cards, render, clean"
     echo ""
     echo "Examples:"
     echo "  bash scripts/sermon-clipper/sc.sh search --theme forgiveness --output out/clips.json"
     echo "  bash scripts/sermon-clipper/sc.sh write --theme forgiveness --clips out/clips.json --output out/video.md"
     echo "  bash scripts/sermon-clipper/sc.sh cards --script out/video.md --output out/title-cards"
     echo "  bash scripts/sermon-clipper/sc.sh render --script out/video.md --output out/video.mp4 --title-cards out/title-cards"
+    echo "  bash scripts/sermon-clipper/sc.sh batch --theme forgiveness --theme prayer --theme anxiety --output-dir out/batch --render"
     echo "  bash scripts/sermon-clipper/sc.sh clean --path out/sermon-clips-examples"
     exit 0
     ;;
@@ -1,4 +1,8 @@
-"""Run AutoCrop-Vertical's scene/content logic with a short-clip-safe fallback."""
+"""Run AutoCrop-Vertical's scene/content logic with a short-clip-safe fallback.
+
+Used as a one-shot CLI per clip, or imported by serve_render_worker.py, which keeps the upstream
+module and its YOLO model loaded across clips.
+"""
 from __future__ import annotations
 
 import argparse
@@ -39,7 +43,7 @@ def _parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _load_upstream(repo_dir: Path):
+def load_upstream(repo_dir: Path):
     main_py = repo_dir / "main.py"
     if not main_py.exists():
         raise RuntimeError(f"AutoCrop-Vertical not found at {main_py}")
@@ -84,24 +88,25 @@ def _mux_audio(input_video: Path, temp_video: Path, output_video: Path) -> None:
     subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
 
 
-def main() -> None:
-    args = _parse_args()
+def prepare_upstream(repo_dir: Path):
+    """Load AutoCrop-Vertical and pin its YOLO model to CPU (the slow part of a cold start)."""
     os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
-    repo_dir = Path(args.repo_dir).resolve()
-    input_video = Path(args.input).resolve()
-    output_video = Path(args.output).resolve()
-    upstream = _load_upstream(repo_dir)
-    upstream.ASPECT_RATIO = _parse_ratio(args.ratio)
-
-    import cv2  # type: ignore
-    import numpy as np  # type: ignore
-    from tqdm import tqdm  # type: ignore
-
+    upstream = load_upstream(Path(repo_dir).resolve())
     try:
         upstream.get_yolo_model().to("cpu")
     except Exception:
         pass
+    return upstream
+
 
+def run_autocrop(upstream, input_video: Path, output_video: Path, *, ratio: str = "9:16", quality: str = "balanced", progress: bool = True) -> None:
+    import cv2  # type: ignore
+    import numpy as np  # type: ignore
+    from tqdm import tqdm  # type: ignore
+
+    input_video = Path(input_video).resolve()
+    output_video = Path(output_video).resolve()
+    upstream.ASPECT_RATIO = _parse_ratio(ratio)
     original_width, original_height, fps = upstream.get_video_properties(str(input_video))
     output_height = original_height if original_height % 2 == 0 else original_height + 1
     output_width = int(output_height * upstream.ASPECT_RATIO)
@@ -131,7 +136,7 @@ def main() -> None:
             }
         )
 
-    encoder_args = upstream.build_encoder_args("libx264", str(args.quality))
+    encoder_args = upstream.build_encoder_args("libx264", str(quality))
     with tempfile.TemporaryDirectory(prefix="autocrop-vertical-") as tmp_dir_raw:
         tmp_dir = Path(tmp_dir_raw)
         temp_video_output = tmp_dir / "vertical-video.mp4"
@@ -174,7 +179,7 @@ def main() -> None:
         current_scene_index = 0
         last_output_frame = None
 
-        with tqdm(total=total_frames, desc="AutoCrop-Vertical", unit="fr", dynamic_ncols=True) as pbar:
+        with tqdm(total=total_frames, desc="AutoCrop-Vertical", unit="fr", dynamic_ncols=True, disable=not progress) as pbar:
             while cap.isOpened():
                 ret, frame = cap.read()
                 if not ret:
@@ -227,5 +232,11 @@ def main() -> None:
             os.replace(temp_video_output, output_video)
 
 
+def main() -> None:
+    args = _parse_args()
+    upstream = prepare_upstream(Path(args.repo_dir))
+    run_autocrop(upstream, Path(args.input), Path(args.output), ratio=str(args.ratio), quality=str(args.quality))
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+// Warm Remotion renderer: bundles the SermonShort entry once, keeps one headless browser open,
+// and renders queued jobs over local HTTP. Started by serve_render_worker.py; one job at a time.
+import http from 'node:http';
+import path from 'node:path';
+import {fileURLToPath} from 'node:url';
+import {bundle} from '@remotion/bundler';
+import {openBrowser, renderMedia, selectComposition} from '@remotion/renderer';
+
+const here = path.dirname(fileURLToPath(import.meta.url));
+const repoRoot = path.resolve(here, '..', '..', '..', '..');
+
+function argValue(name, fallback) {
+  const i = process.argv.indexOf(name);
+  return i >= 0 && i + 1 < process.argv.length ? process.argv[i + 1] : fallback;
+}
+
+const host = argValue('--host', '127.0.0.1');
+const port = Number(argValue('--port', '8788'));
+const entryPoint = path.resolve(argValue('--entry', path.join(here, 'index.jsx')));
+const publicDir = path.resolve(argValue('--public-dir', path.join(repoRoot, 'public')));
+
+const log = (msg) => process.stderr.write(`[remotion-server] ${msg}\n`);
+
+let serveUrl = null;
+let browser = null;
+let queue = Promise.resolve();
+let processed = 0;
+let pending = 0;
+
+async function warm() {
+  if (!serveUrl) {
+    const t0 = Date.now();
+    serveUrl = await bundle({entryPoint, publicDir});
+    log(`bundled ${entryPoint} in ${((Date.now() - t0) / 1000).toFixed(1)}s`);
+  }
+  if (!browser) {
+    browser = await openBrowser('chrome');
+  }
+}
+
+async function render(job) {
+  await warm();
+  const inputProps = job.props || {};
+  const composition = await selectComposition({
+    serveUrl,
+    id: job.composition || 'SermonShort',
+    inputProps,
+    puppeteerInstance: browser,
+  });
+  const t0 = Date.now();
+  await renderMedia({
+    composition,
+    serveUrl,
+    codec: 'h264',
+    outputLocation: job.output,
+    inputProps,
+    puppeteerInstance: browser,
+    concurrency: job.concurrency || null,
+  });
+  return {ok: true, output: job.output, elapsed_sec: (Date.now() - t0) / 1000};
+}
+
+function readJson(req) {
+  return new Promise((resolve, reject) => {
+    const chunks = [];
+    req.on('data', (c) => chunks.push(c));
+    req.on('end', () => {
+      try {
+        resolve(JSON.parse(Buffer.concat(chunks).toString('utf8') || '{}'));
+      } catch (err) {
+        reject(err);
+      }
+    });
+    req.on('error', reject);
+  });
+}
+
+function send(res, code, payload) {
+  const raw = Buffer.from(JSON.stringify(payload), 'utf8');
+  res.writeHead(code, {'Content-Type': 'application/json; charset=utf-8', 'Content-Length': raw.length});
+  res.end(raw);
+}
+
+const server = http.createServer(async (req, res) => {
+  if (req.method === 'GET' && req.url === '/health') {
+    send(res, 200, {ok: true, bundled: Boolean(serveUrl), browser: Boolean(browser), pending, processed});
+    return;
+  }
+  if (req.method !== 'POST' || req.url !== '/render') {
+    send(res, 404, {ok: false, error: 'not_found'});
+    return;
+  }
+  let job;
+  try {
+    job = await readJson(req);
+  } catch (err) {
+    send(res, 400, {ok: false, error: `invalid_json: ${err}`});
+    return;
+  }
+  if (!job.output) {
+    send(res, 400, {ok: false, error: 'output is required'});
+    return;
+  }
+  pending += 1;
+  // Serialize renders: each one already fans out across the browser's tabs via `concurrency`.
+  const result = queue.then(() => render(job));
+  queue = result.catch(() => {});
+  try {
+    send(res, 200, await result);
+  } catch (err) {
+    send(res, 500, {ok: false, error: String((err && err.stack) || err)});
+  } finally {
+    pending -= 1;
+    processed += 1;
+  }
+});
+
+warm()
+  .then(() => {
+    server.listen(port, host, () => log(`listening on http://${host}:${port}`));
+  })
+  .catch((err) => {
+    log(`startup failed: ${(err && err.stack) || err}`);
+    process.exit(1);
+  });
+
+const shutdown = async () => {
+  server.close();
+  if (browser) {
+    await browser.close({silent: true}).catch(() => {});
+  }
+  process.exit(0);
+};
+process.on('SIGINT', shutdown);
+process.on('SIGTERM', shutdown);
@@ -9,9 +9,15 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import atexit
+import socket
+import threading
 import time
+import urllib.error
+import urllib.request
 import uuid
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 _REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -22,6 +28,8 @@ _REMOTION_PUBLIC = _REPO_ROOT / "public"
 _REMOTION_COMPOSITION = "SermonShort"
 _MVE_LIB_PATH = _REPO_ROOT / "scripts" / "markdown-video-editor" / "_lib.py"
 _AUTOCROP_RUNNER = _THIS / "autocrop_vertical_runner.py"
+_RENDER_WORKER_SCRIPT = _THIS / "serve_render_worker.py"
+_RENDER_WORKER_START_TIMEOUT_SECONDS = 120
 sys.path.insert(0, str(_REPO_ROOT))
 sys.path.insert(0, str(_PARENT))
 
@@ -32,15 +40,19 @@ from _lib import (
     default_content_cache_dir,
     default_env,
     default_transcripts_root,
+    download_episode_source,
+    fetch_clip_source,
+    find_clip_source,
     get_episode_media_info,
-    get_source_path,
     get_transcript_path,
     parse_short_script,
     remove_path,
     resolve_work_dir,
+    render_pool_size,
     reset_directory,
     save_used_clips,
 )
+from render_cache import DEFAULT_RENDER_CACHE_GB, RenderCache, default_render_cache_dir, file_digest, render_key, tool_version
 
 
 def _load_mve_lib():
@@ -61,6 +73,7 @@ _ENC_PRESET = "medium"
 _ENC_THREADS = 0
 _AUTOCROP_REPO_URL = "https://github.com/kamilstanuch/Autocrop-vertical.git"
 _AUTOCROP_REPO_DIR: Path | None = None
+_RENDER_WORKER_URL = ""
 _SILENCE_LEAD_RE = re.compile(r"silence_start:\s*([0-9.]+)")
 _SILENCE_END_RE = re.compile(r"silence_end:\s*([0-9.]+)")
 _NAME_SPLIT_RE = re.compile(r"\s*(?:\||//|-)\s*")
@@ -144,6 +157,10 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--work-dir", default="", help="Working directory override. Default is auto scratch under scripts/sermon-clipper/.work/.")
     p.add_argument("--content-cache", default="", help="Shared source video cache (default: cache/<env>/sermon-clipper/content).")
     p.add_argument("--no-download", action="store_true", help="Skip downloads and use only files already present in the shared content cache.")
+    p.add_argument("--jobs", type=int, default=0, help="Clips prepared concurrently (default: auto from cores and --threads).")
+    p.add_argument("--render-cache-gb", type=float, default=DEFAULT_RENDER_CACHE_GB, help="Size limit for cached prepared clips under the content cache (default: 20).")
+    p.add_argument("--no-render-cache", action="store_true", help="Always re-run extract/autocrop/compress/normalize for every clip.")
+    p.add_argument("--full-download", action="store_true", help="Download whole episodes instead of fetching only the time range around each clip.")
     p.add_argument("--transcripts", default="", help="Transcripts root.")
     p.add_argument("--no-subs", action="store_true", help="Skip subtitle extraction and subtitle-track muxing.")
     p.add_argument("--trim-silence", action="store_true", help="Trim leading/trailing silence from clips.")
@@ -154,6 +171,8 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--preset", default="medium", help="ffmpeg preset for prepared clips (default: medium).")
     p.add_argument("--threads", type=int, default=0, help="ffmpeg thread override; also used as Remotion concurrency when set.")
     p.add_argument("--no-autocrop", action="store_true", help="Disable AutoCrop-Vertical and fall back to the legacy static crop.")
+    p.add_argument("--render-worker-url", default="", help="Send AutoCrop/Remotion jobs to a running serve_render_worker.py (e.g. http://127.0.0.1:8787).")
+    p.add_argument("--render-worker", action="store_true", help="Start a private warm render worker for this run instead of one subprocess per job.")
     p.add_argument("--allow-duplicate-feeds", action="store_true", help="Allow multiple clips from the same feed in one short. Default is to reject duplicate feeds.")
     p.add_argument("--register", default="", help="Path to used-clips.json to register.")
     p.add_argument("--min-clips", type=int, default=8, help="Require at least this many rendered clips before publishing output (default: 8).")
@@ -164,17 +183,6 @@ def _parse_args() -> argparse.Namespace:
     return p.parse_args()
 
 
-def _download_url(url: str, out_path: Path) -> bool:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    cmd = ["ffmpeg", "-y", "-i", url, "-c", "copy", "-movflags", "+faststart", str(out_path)]
-    try:
-        _run_logged_command(cmd, timeout=600, label="download failed")
-        return True
-    except Exception as exc:
-        print(f"[render_short] download failed: {exc}", file=sys.stderr)
-        return False
-
-
 def _source_has_video(path: Path) -> bool:
     try:
         r = subprocess.run(
@@ -351,7 +359,9 @@ def _build_keep_filter_complex(
     has_audio: bool,
     *,
     apply_static_crop: bool,
+    audio_filter: str = "",
 ) -> str:
+    """One graph per clip: keep-range trims + concat, optional static crop/scale, optional loudness filter."""
     parts: list[str] = []
     for index, (start, end) in enumerate(keep_ranges):
         parts.append(f"[0:v]trim=start={start:.6f}:end={end:.6f},setpts=PTS-STARTPTS[v{index}]")
@@ -360,45 +370,123 @@ def _build_keep_filter_complex(
     if has_audio:
         concat_inputs = "".join(f"[v{index}][a{index}]" for index in range(len(keep_ranges)))
         parts.append(f"{concat_inputs}concat=n={len(keep_ranges)}:v=1:a=1[vcat][acat]")
-        if apply_static_crop:
-            parts.append(f"[vcat]{_crop_filter()}[vout]")
+        parts.append(f"[acat]{audio_filter or 'anull'}[aout]")
     else:
         concat_inputs = "".join(f"[v{index}]" for index in range(len(keep_ranges)))
         parts.append(f"{concat_inputs}concat=n={len(keep_ranges)}:v=1:a=0[vcat]")
-        if apply_static_crop:
-            parts.append(f"[vcat]{_crop_filter()}[vout]")
-    if not apply_static_crop:
-        parts.append("[vcat]null[vout]")
+    parts.append(f"[vcat]{_crop_filter() if apply_static_crop else 'null'}[vout]")
     return ";\n".join(parts) + "\n"
 
 
-def _apply_keep_ranges(
+def _build_keep_audio_filter_complex(keep_ranges: list[tuple[float, float]], audio_filter: str) -> str:
+    parts = [
+        f"[0:a]atrim=start={start:.6f}:end={end:.6f},asetpts=PTS-STARTPTS[a{index}]"
+        for index, (start, end) in enumerate(keep_ranges)
+    ]
+    concat_inputs = "".join(f"[a{index}]" for index in range(len(keep_ranges)))
+    parts.append(f"{concat_inputs}concat=n={len(keep_ranges)}:v=0:a=1[acat]")
+    parts.append(f"[acat]{audio_filter}[aout]")
+    return ";\n".join(parts) + "\n"
+
+
+def _window_input_args(src: Path, window: tuple[float, float] | None) -> list[str]:
+    """Input args for src, accurately seeked to the window when one is given (times are then window-relative)."""
+    if window is None:
+        return ["-i", str(src)]
+    start, end = window
+    return ["-ss", f"{start:.6f}", "-t", f"{max(0.0, end - start):.6f}", "-i", str(src)]
+
+
+def _measure_loudnorm(
     src: Path,
+    window: tuple[float, float] | None,
+    keep_ranges: list[tuple[float, float]],
+    *,
+    target_lufs: float,
+    target_peak: float,
+) -> dict[str, str] | None:
+    """Audio-only loudnorm analysis pass over exactly the audio the final encode will keep."""
+    base = f"loudnorm=I={target_lufs}:LRA=7:TP={target_peak}:print_format=json"
+    filter_script = src.parent / f".{src.stem}.{uuid.uuid4().hex[:8]}.loudnorm.txt"
+    filter_script.write_text(_build_keep_audio_filter_complex(keep_ranges, base), encoding="utf-8")
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        *_window_input_args(src, window),
+        "-filter_complex_script",
+        str(filter_script),
+        "-map",
+        "[aout]",
+        "-f",
+        "null",
+        "-",
+    ]
+    try:
+        duration_sec = sum(end - start for start, end in keep_ranges)
+        probe = subprocess.run(cmd, capture_output=True, text=True, timeout=max(60, int(duration_sec * 4)), check=False)
+    except Exception:
+        return None
+    finally:
+        remove_path(filter_script)
+    text = probe.stderr or ""
+    start_idx = text.rfind("{")
+    end_idx = text.rfind("}")
+    if probe.returncode != 0 or start_idx < 0 or end_idx <= start_idx:
+        return None
+    try:
+        measured = json.loads(text[start_idx : end_idx + 1])
+    except ValueError:
+        return None
+    keys = ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
+    if not all(k in measured for k in keys):
+        return None
+    # Silent clips measure -inf; let the single-pass filter handle those.
+    if any(str(measured[k]).strip().lower() in {"-inf", "inf", "nan"} for k in keys):
+        return None
+    return {k: str(measured[k]) for k in keys}
+
+
+def _loudnorm_filter(measured: dict[str, str] | None, *, target_lufs: float, target_peak: float) -> str:
+    base = f"loudnorm=I={target_lufs}:LRA=7:TP={target_peak}"
+    if measured is None:
+        return f"{base}:linear=true"
+    return (
+        f"{base}:measured_I={measured['input_i']}:measured_TP={measured['input_tp']}"
+        f":measured_LRA={measured['input_lra']}:measured_thresh={measured['input_thresh']}"
+        f":offset={measured['target_offset']}:linear=true"
+    )
+
+
+def _render_clip_single_pass(
+    src: Path,
+    window: tuple[float, float] | None,
     keep_ranges: list[tuple[float, float]],
     out: Path,
     has_audio: bool,
     *,
     apply_static_crop: bool,
+    audio_filter: str = "",
 ) -> bool:
+    """Trim + keep-range concat + optional static crop + loudness gain, encoded once."""
     if not keep_ranges:
         return False
     filter_script = out.with_suffix(".filter.txt")
     filter_script.write_text(
-        _build_keep_filter_complex(keep_ranges, has_audio, apply_static_crop=apply_static_crop),
+        _build_keep_filter_complex(keep_ranges, has_audio, apply_static_crop=apply_static_crop, audio_filter=audio_filter),
         encoding="utf-8",
     )
     cmd = [
         "ffmpeg",
         "-y",
-        "-i",
-        str(src),
+        *_window_input_args(src, window),
         "-filter_complex_script",
         str(filter_script),
         "-map",
         "[vout]",
     ]
     if has_audio:
-        cmd.extend(["-map", "[acat]", "-c:a", "aac", "-ar", "48000", "-ac", "2"])
+        cmd.extend(["-map", "[aout]", "-c:a", "aac", "-ar", "48000", "-ac", "2"])
     else:
         cmd.append("-an")
     video_crf = "18"
@@ -416,83 +504,16 @@ def _apply_keep_ranges(
         ]
     )
     try:
-        _run_logged_command(cmd, timeout=300, label="clip compression failed")
+        duration_sec = max(1.0, sum(end - start for start, end in keep_ranges))
+        _run_logged_command(cmd, timeout=max(300, int(duration_sec * 30)), label="clip render failed")
         return True
     except Exception as exc:
-        print(f"[render_short] clip compression failed: {exc}", file=sys.stderr)
+        print(f"[render_short] clip render failed: {exc}", file=sys.stderr)
         return False
     finally:
         remove_path(filter_script)
 
 
-def _apply_static_vertical_crop(src: Path, out: Path, has_audio: bool) -> bool:
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(src),
-        "-vf",
-        _crop_filter(),
-        "-c:v",
-        "libx264",
-        "-preset",
-        _ENC_PRESET,
-        "-crf",
-        "18",
-    ]
-    if has_audio:
-        cmd.extend(["-c:a", "copy"])
-    else:
-        cmd.append("-an")
-    cmd.extend(["-movflags", "+faststart", str(out)])
-    try:
-        duration_sec = max(1.0, _media_duration_sec(src))
-        _run_logged_command(cmd, timeout=max(180, int(duration_sec * 30)), label="static crop fallback failed")
-        return True
-    except Exception as exc:
-        print(f"[render_short] static crop fallback failed: {exc}", file=sys.stderr)
-        return False
-
-
-def _normalize_clip_audio(path: Path, *, target_lufs: float, target_peak: float) -> bool:
-    if not _source_has_audio(path):
-        return True
-    normalized_path = path.with_name(f"{path.stem}.normalized{path.suffix}")
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(path),
-        "-map",
-        "0:v:0",
-        "-map",
-        "0:a:0",
-        "-c:v",
-        "copy",
-        "-af",
-        f"loudnorm=I={target_lufs}:LRA=7:TP={target_peak}:linear=true",
-        "-c:a",
-        "aac",
-        "-ar",
-        "48000",
-        "-ac",
-        "2",
-        "-movflags",
-        "+faststart",
-        str(normalized_path),
-    ]
-    try:
-        duration_sec = max(1.0, _media_duration_sec(path))
-        _run_logged_command(cmd, timeout=max(180, int(duration_sec * 30)), label="audio normalization failed")
-        remove_path(path)
-        normalized_path.replace(path)
-        return True
-    except Exception as exc:
-        remove_path(normalized_path)
-        print(f"[render_short] audio normalization failed for {path.name}: {exc}", file=sys.stderr)
-        return False
-
-
 def _parse_vtt_timestamp(raw: str) -> float:
     parts = raw.strip().replace(",", ".").split(":")
     if len(parts) != 3:
@@ -636,11 +657,84 @@ def _media_duration_sec(path: Path) -> float:
         return 0.0
 
 
+def _render_worker_post(path: str, payload: dict, *, timeout: float) -> dict:
+    """POST a job to the warm render worker. Connection problems raise URLError; job failures RuntimeError."""
+    raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    req = urllib.request.Request(f"{_RENDER_WORKER_URL}{path}", data=raw, headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            obj = json.loads(resp.read().decode("utf-8", errors="replace"))
+    except urllib.error.HTTPError as exc:
+        try:
+            obj = json.loads(exc.read().decode("utf-8", errors="replace"))
+        except Exception:
+            obj = {"ok": False, "error": str(exc)}
+    if not isinstance(obj, dict) or not obj.get("ok"):
+        raise RuntimeError(str((obj or {}).get("error") or "render worker job failed"))
+    return obj
+
+
+def _render_worker_healthy(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(f"{url}/health", timeout=3) as resp:
+            obj = json.loads(resp.read().decode("utf-8", errors="replace"))
+        return isinstance(obj, dict) and bool(obj.get("ok"))
+    except Exception:
+        return False
+
+
+def _start_private_render_worker() -> str:
+    """Start serve_render_worker.py for this run (stopped at exit) and return its URL."""
+    host = "127.0.0.1"
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        port = int(sock.getsockname()[1])
+    url = f"http://{host}:{port}"
+    proc = subprocess.Popen([sys.executable, str(_RENDER_WORKER_SCRIPT), "--host", host, "--port", str(port)])
+
+    def _stop() -> None:
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    atexit.register(_stop)
+    deadline = time.monotonic() + _RENDER_WORKER_START_TIMEOUT_SECONDS
+    while not _render_worker_healthy(url):
+        if proc.poll() is not None:
+            raise RuntimeError(f"render worker exited during startup (rc={proc.returncode})")
+        if time.monotonic() > deadline:
+            _stop()
+            raise RuntimeError("render worker did not become healthy in time")
+        time.sleep(0.5)
+    return url
+
+
 def _run_autocrop_vertical(src: Path, out: Path, *, log_path: Path | None = None, clip_label: str = "") -> bool:
     try:
         autocrop_repo = _ensure_autocrop_repo()
         quality = _autocrop_quality_from_preset(_ENC_PRESET)
         duration_sec = max(1.0, _media_duration_sec(src))
+        if _RENDER_WORKER_URL:
+            try:
+                _render_worker_post(
+                    "/autocrop",
+                    {"repo_dir": str(autocrop_repo), "input": str(src), "output": str(out), "ratio": "9:16", "quality": quality},
+                    timeout=max(900, int(duration_sec * 90)),
+                )
+                return True
+            except urllib.error.URLError as exc:
+                print(f"[render_short] render worker unreachable ({exc.reason}); running AutoCrop-Vertical directly.", file=sys.stderr)
+            except Exception as exc:
+                label = clip_label or src.name
+                if log_path is not None:
+                    log_path.parent.mkdir(parents=True, exist_ok=True)
+                    log_path.write_text(str(exc), encoding="utf-8")
+                detail = " | ".join(line.strip() for line in str(exc).splitlines()[-12:] if line.strip())[:1500]
+                print(f"[render_short] AutoCrop-Vertical failed for {label}: {detail}", file=sys.stderr)
+                return False
         cmd = [
             sys.executable,
             str(_AUTOCROP_RUNNER),
@@ -709,10 +803,29 @@ def _remotion_bin() -> list[str]:
 
 
 def _render_with_remotion(manifest: dict, out_path: Path) -> None:
+    total_duration = sum(float(clip.get("duration_sec") or 0) for clip in manifest.get("clips") or [])
+    timeout = max(900, int(max(30.0, total_duration) * 40))
+    if _RENDER_WORKER_URL:
+        try:
+            _render_worker_post(
+                "/remotion",
+                {
+                    "composition": _REMOTION_COMPOSITION,
+                    "props": {"manifest": manifest},
+                    "output": str(out_path.resolve()),
+                    "concurrency": _ENC_THREADS or None,
+                    "timeout_sec": timeout,
+                },
+                timeout=timeout + 60,
+            )
+            return
+        except urllib.error.URLError as exc:
+            print(f"[render_short] render worker unreachable ({exc.reason}); using the Remotion CLI.", file=sys.stderr)
+        except RuntimeError as exc:
+            raise RuntimeError(f"Remotion render failed: {str(exc)[-1000:]}") from exc
     with tempfile.NamedTemporaryFile(prefix="sermon-clipper-props-", suffix=".json", delete=False, mode="w", encoding="utf-8") as handle:
         props_path = Path(handle.name)
         json.dump({"manifest": manifest}, handle, ensure_ascii=False, separators=(",", ":"))
-    total_duration = sum(float(clip.get("duration_sec") or 0) for clip in manifest.get("clips") or [])
     try:
         cmd = _remotion_bin() + [
             "render",
@@ -723,7 +836,7 @@ def _render_with_remotion(manifest: dict, out_path: Path) -> None:
         ]
         _run_logged_command(
             _maybe_add_threads(cmd),
-            timeout=max(900, int(max(30.0, total_duration) * 40)),
+            timeout=timeout,
             label="Remotion render failed",
         )
     finally:
@@ -783,19 +896,65 @@ def _speaker_label(episode_title: str, feed_title: str) -> str:
     return ""
 
 
+def _autocrop_version() -> str:
+    """Runner source plus the checked-out AutoCrop commit, for render cache keys."""
+    parts = [file_digest(_AUTOCROP_RUNNER)]
+    git_dir = _AUTOCROP_REPO_DIR / ".git" if _AUTOCROP_REPO_DIR else None
+    if git_dir is not None and (git_dir / "HEAD").exists():
+        ref = (git_dir / "HEAD").read_text(encoding="utf-8", errors="replace").strip()
+        if ref.startswith("ref: ") and (git_dir / ref[5:]).exists():
+            ref = (git_dir / ref[5:]).read_text(encoding="utf-8", errors="replace").strip()
+        parts.append(ref)
+    return ":".join(parts)
+
+
+def _detect_window_silences(src: Path, window: tuple[float, float] | None) -> list[tuple[float, float]]:
+    """Audio-only silencedetect, limited to the clip window when reading straight from the episode source."""
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostats",
+        *_window_input_args(src, window),
+        "-vn",
+        "-af",
+        "silencedetect=n=-34.0dB:d=0.22",
+        "-f",
+        "null",
+        "-",
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+    if result.returncode not in {0, 255}:
+        raise RuntimeError((result.stderr or "").strip() or "ffmpeg silencedetect failed")
+    silences: list[tuple[float, float]] = []
+    current_start: float | None = None
+    for line in (result.stderr or "").splitlines():
+        m_start = _SILENCE_LEAD_RE.search(line)
+        if m_start:
+            current_start = float(m_start.group(1))
+            continue
+        m_end = _SILENCE_END_RE.search(line)
+        if m_end:
+            silence_end = float(m_end.group(1))
+            if current_start is not None and silence_end > current_start:
+                silences.append((current_start, silence_end))
+            current_start = None
+    return silences
+
+
 def _build_keep_ranges_for_clip(
     clip_path: Path,
     *,
+    window: tuple[float, float] | None = None,
+    has_audio: bool,
     trim_edges: bool,
     compress: bool,
 ) -> list[tuple[float, float]]:
-    media = _MVE.probe_media(clip_path)
-    duration_sec = float(media.get("duration_sec") or 0.0)
+    duration_sec = (window[1] - window[0]) if window is not None else _media_duration_sec(clip_path)
     if duration_sec <= 0:
         return []
-    if not media.get("has_audio"):
+    if not has_audio:
         return [(0.0, duration_sec)]
-    silences = _MVE.detect_silences(clip_path, threshold_db=-34.0, min_silence_sec=0.22)
+    silences = _detect_window_silences(clip_path, window)
     audible_ranges = _MVE.invert_ranges(silences, duration_sec=duration_sec)
     if not audible_ranges:
         audible_ranges = [(0.0, duration_sec)]
@@ -813,7 +972,7 @@ def _build_keep_ranges_for_clip(
 def main() -> None:
     run_started = time.perf_counter()
     args = _parse_args()
-    global _SHORT_W, _SHORT_H, _OUT_FPS, _ENC_PRESET, _ENC_THREADS, _AUTOCROP_REPO_DIR
+    global _SHORT_W, _SHORT_H, _OUT_FPS, _ENC_PRESET, _ENC_THREADS, _AUTOCROP_REPO_DIR, _RENDER_WORKER_URL
     script_path = Path(args.script)
     if not script_path.exists():
         print(f"[render_short] Script not found: {script_path}", file=sys.stderr)
@@ -830,6 +989,13 @@ def main() -> None:
     _ENC_THREADS = max(0, int(args.threads))
     cache_dir = default_cache_dir(env)
     _AUTOCROP_REPO_DIR = cache_dir / "sermon-clipper" / "tools" / "autocrop-vertical"
+    _RENDER_WORKER_URL = str(args.render_worker_url or "").strip().rstrip("/")
+    if not _RENDER_WORKER_URL and args.render_worker:
+        try:
+            _RENDER_WORKER_URL = _start_private_render_worker()
+            print(f"[render_short] render worker ready at {_RENDER_WORKER_URL}")
+        except Exception as exc:
+            print(f"[render_short] render worker unavailable ({exc}); rendering with one subprocess per job.", file=sys.stderr)
     content_cache = Path(args.content_cache).resolve() if args.content_cache else default_content_cache_dir(env)
     content_cache.mkdir(parents=True, exist_ok=True)
     transcripts_root = Path(args.transcripts).resolve() if args.transcripts else default_transcripts_root()
@@ -891,199 +1057,333 @@ def main() -> None:
     _log_timing(
         f"start render output={out_path.name} clips={len(clip_items)} size={_SHORT_W}x{_SHORT_H} fps={_OUT_FPS} preset={_ENC_PRESET}"
     )
-    try:
-        for index, item in enumerate(clip_items, start=1):
-            clip_started = time.perf_counter()
-            feed = item.get("feed")
-            episode = item.get("episode")
-            start = float(item.get("start_sec") or 0)
-            end = float(item.get("end_sec") or start)
-            if not feed or not episode or end <= start:
-                continue
-            clip_label = f"[{index}/{len(clip_items)}] {feed}/{episode}"
-            _log_timing(f"{clip_label} start source={start:.3f}-{end:.3f}s")
-
-            clip_phase_times: dict[str, float] = {}
-
-            media_info = get_episode_media_info(cache_dir, feed, episode)
-            if not media_info or not media_info.get("url"):
-                print(f"[render_short] No media for {feed}/{episode}", file=sys.stderr)
-                continue
-            if not media_info.get("pickedIsVideo"):
-                print(f"[render_short] Skipping {feed}/{episode}: audio-only enclosure", file=sys.stderr)
-                continue
-
-            src_path = get_source_path(content_cache, feed, episode)
-            if not src_path.exists():
-                if args.no_download:
-                    print(f"[render_short] Missing cached source for {feed}/{episode}", file=sys.stderr)
-                    continue
-                t0 = time.perf_counter()
-                if not _download_url(str(media_info["url"]), src_path):
-                    continue
-                clip_phase_times["download"] = time.perf_counter() - t0
-                phase_totals["download"] += clip_phase_times["download"]
-            if not _source_has_video(src_path):
-                print(f"[render_short] Skipping {feed}/{episode}: no video stream", file=sys.stderr)
-                continue
-
-            has_audio = _source_has_audio(src_path)
-            trim_start = start
-            trim_end = end
-            raw_duration = max(0.0, trim_end - trim_start)
-            if raw_duration <= 0.0:
-                continue
+    phase_lock = threading.Lock()
+    render_cache = None if args.no_render_cache else RenderCache(default_render_cache_dir(content_cache), max_gb=float(args.render_cache_gb))
+
+    def _add_phase_total(name: str, seconds: float) -> None:
+        with phase_lock:
+            phase_totals[name] += seconds
+
+    def _clip_cues(
+        index: int,
+        feed: str,
+        episode: str,
+        start: float,
+        end: float,
+        keep_ranges: list[tuple[float, float]],
+        clip_phase_times: dict[str, float],
+    ) -> list[dict[str, float | str]]:
+        cues: list[dict[str, float | str]] = []
+        if not args.no_subs:
+            transcript_path = get_transcript_path(transcripts_root, feed, episode)
+            if transcript_path:
+                clip_vtt_path = work_dir / f"clip_{index:02d}.vtt"
+                subtitle_started = time.perf_counter()
+                if clip_transcript_to_vtt(transcript_path, start, end, clip_vtt_path):
+                    cues = _load_vtt_cues(clip_vtt_path)
+                clip_phase_times["subtitle_extract"] = time.perf_counter() - subtitle_started
+                _add_phase_total("subtitle_extract", clip_phase_times["subtitle_extract"])
+            else:
+                print(f"[render_short] No transcript for {feed}/{episode}", file=sys.stderr)
+        return _remap_cues_to_keep_ranges(cues, keep_ranges) if cues else []
+
+    def _prepare_clip(index: int, item: dict) -> dict | None:
+        """Download/extract/crop/compress/normalize one clip into the Remotion job dir. None if skipped."""
+        nonlocal used_static_crop_fallback
+        clip_started = time.perf_counter()
+        feed = item.get("feed")
+        episode = item.get("episode")
+        start = float(item.get("start_sec") or 0)
+        end = float(item.get("end_sec") or start)
+        if not feed or not episode or end <= start:
+            return None
+        clip_label = f"[{index}/{len(clip_items)}] {feed}/{episode}"
+        _log_timing(f"{clip_label} start source={start:.3f}-{end:.3f}s")
+
+        clip_phase_times: dict[str, float] = {}
+
+        media_info = get_episode_media_info(cache_dir, feed, episode)
+        if not media_info or not media_info.get("url"):
+            print(f"[render_short] No media for {feed}/{episode}", file=sys.stderr)
+            return None
+        if not media_info.get("pickedIsVideo"):
+            print(f"[render_short] Skipping {feed}/{episode}: audio-only enclosure", file=sys.stderr)
+            return None
+
+        prepared_path = public_job_dir / f"clip_{index:02d}.mp4"
+        cache_key = render_key(
+            kind="short-clip",
+            url=str(media_info["url"]),
+            start=start,
+            end=end,
+            autocrop="" if args.no_autocrop else _autocrop_version(),
+            keep_ranges=file_digest(_MVE_LIB_PATH),
+            trim_silence=bool(args.trim_silence),
+            compress=not bool(args.no_compress),
+            normalize=None if args.no_audio_normalize else [float(args.audio_target_lufs), float(args.audio_target_peak)],
+            size=[_SHORT_W, _SHORT_H],
+            fps=_OUT_FPS,
+            preset=_ENC_PRESET,
+            ffmpeg=tool_version("ffmpeg"),
+        )
+        cached = render_cache.fetch(cache_key, prepared_path) if render_cache is not None else None
+        if cached is not None:
+            keep_ranges = [(float(a), float(b)) for a, b in cached.get("keep_ranges") or []]
+            return {
+                "clip_elapsed": time.perf_counter() - clip_started,
+                "clip_label": clip_label,
+                "clip_phase_times": clip_phase_times,
+                "raw_duration": float(cached.get("raw_duration") or 0.0),
+                "compressed_duration": float(cached.get("compressed_duration") or 0.0),
+                "crop_mode": f"{cached.get('crop_mode') or 'raw'} (cached)",
+                "prepared_path": prepared_path,
+                "remapped_cues": _clip_cues(index, feed, episode, start, end, keep_ranges, clip_phase_times),
+            }
 
+        source = find_clip_source(content_cache, feed, episode, start, end)
+        if source is None:
+            if args.no_download:
+                print(f"[render_short] Missing cached source for {feed}/{episode}", file=sys.stderr)
+                return None
+            t0 = time.perf_counter()
+            if not args.full_download:
+                source = fetch_clip_source(
+                    str(media_info["url"]),
+                    content_cache,
+                    feed,
+                    episode,
+                    start,
+                    end,
+                    run=_run_logged_command,
+                    log_tag="render_short",
+                )
+            if source is None:
+                full_path = download_episode_source(
+                    str(media_info["url"]), content_cache, feed, episode, run=_run_logged_command, log_tag="render_short"
+                )
+                if full_path is None:
+                    return None
+                source = (full_path, 0.0)
+            clip_phase_times["download"] = time.perf_counter() - t0
+            _add_phase_total("download", clip_phase_times["download"])
+        src_path, src_offset = source
+        if not _source_has_video(src_path):
+            print(f"[render_short] Skipping {feed}/{episode}: no video stream", file=sys.stderr)
+            return None
+
+        has_audio = _source_has_audio(src_path)
+        trim_start = start - src_offset
+        trim_end = end - src_offset
+        raw_duration = max(0.0, trim_end - trim_start)
+        if raw_duration <= 0.0:
+            return None
+
+        # One encode per clip: the keep-range concat, static crop and loudness gain share a single
+        # filter graph. With --no-autocrop it reads the episode window directly (no raw extract);
+        # AutoCrop is an external tool, so it still gets its own raw clip and output file.
+        render_source_path = src_path
+        render_window: tuple[float, float] | None = (trim_start, trim_end)
+        apply_static_crop = True
+        crop_mode = "static-only"
+        if not args.no_autocrop:
             raw_clip_path = work_dir / f"clip_{index:02d}_raw.mp4"
             extract_started = time.perf_counter()
             if not _ffmpeg_extract_raw_clip(src_path, trim_start, trim_end, raw_clip_path):
-                continue
+                return None
             clip_phase_times["extract_raw"] = time.perf_counter() - extract_started
-            phase_totals["extract_raw"] += clip_phase_times["extract_raw"]
-
-            timeline_source_path = raw_clip_path
-            crop_mode = "raw"
-            if args.no_autocrop:
-                crop_mode = "static-only"
+            _add_phase_total("extract_raw", clip_phase_times["extract_raw"])
+            render_source_path = raw_clip_path
+            render_window = None
+
+            autocrop_log_path = failure_log_dir / f"clip_{index:02d}.log"
+            autocrop_source_path = work_dir / f"clip_{index:02d}_autocropped.mp4"
+            crop_started = time.perf_counter()
+            used_autocrop = _run_autocrop_vertical(
+                raw_clip_path,
+                autocrop_source_path,
+                log_path=autocrop_log_path,
+                clip_label=f"clip_{index:02d} {feed}/{episode}",
+            )
+            clip_phase_times["autocrop"] = time.perf_counter() - crop_started
+            _add_phase_total("autocrop", clip_phase_times["autocrop"])
+            clip_phase_times["crop"] = clip_phase_times["autocrop"]
+            if used_autocrop:
+                render_source_path = autocrop_source_path
+                apply_static_crop = False
+                crop_mode = "autocrop"
             else:
-                autocrop_log_path = failure_log_dir / f"clip_{index:02d}.log"
-                autocrop_source_path = work_dir / f"clip_{index:02d}_autocropped.mp4"
-                crop_started = time.perf_counter()
-                used_autocrop = _run_autocrop_vertical(
-                    raw_clip_path,
-                    autocrop_source_path,
-                    log_path=autocrop_log_path,
-                    clip_label=f"clip_{index:02d} {feed}/{episode}",
+                used_static_crop_fallback = True
+                print(
+                    f"[render_short] Falling back to static crop for clip_{index:02d} {feed}/{episode}.",
+                    file=sys.stderr,
                 )
-                clip_phase_times["autocrop"] = time.perf_counter() - crop_started
-                phase_totals["autocrop"] += clip_phase_times["autocrop"]
-                if used_autocrop:
-                    timeline_source_path = autocrop_source_path
-                    crop_mode = "autocrop"
-                else:
-                    used_static_crop_fallback = True
-                    print(
-                        f"[render_short] Falling back to static crop for clip_{index:02d} {feed}/{episode}.",
-                        file=sys.stderr,
-                    )
-                    fallback_started = time.perf_counter()
-                    if not _apply_static_vertical_crop(raw_clip_path, autocrop_source_path, has_audio=has_audio):
-                        continue
-                    clip_phase_times["static_crop_fallback"] = time.perf_counter() - fallback_started
-                    phase_totals["static_crop_fallback"] += clip_phase_times["static_crop_fallback"]
-                    timeline_source_path = autocrop_source_path
-                    crop_mode = "static-fallback"
-                clip_phase_times["crop"] = clip_phase_times.get("autocrop", 0.0) + clip_phase_times.get("static_crop_fallback", 0.0)
-                phase_totals["crop"] += clip_phase_times.get("static_crop_fallback", 0.0)
-
-            compress_analysis_started = time.perf_counter()
-            keep_ranges = _build_keep_ranges_for_clip(
-                timeline_source_path,
-                trim_edges=bool(args.trim_silence),
-                compress=not bool(args.no_compress),
+                crop_mode = "static-fallback"
+
+        compress_analysis_started = time.perf_counter()
+        keep_ranges = _build_keep_ranges_for_clip(
+            render_source_path,
+            window=render_window,
+            has_audio=has_audio,
+            trim_edges=bool(args.trim_silence),
+            compress=not bool(args.no_compress),
+        )
+        clip_phase_times["compress_analysis"] = time.perf_counter() - compress_analysis_started
+        _add_phase_total("compress_analysis", clip_phase_times["compress_analysis"])
+        compressed_duration = sum(end_sec - start_sec for start_sec, end_sec in keep_ranges)
+        if compressed_duration <= 0.0:
+            return None
+
+        audio_filter = ""
+        if has_audio and not args.no_audio_normalize:
+            # Audio-only measurement pass, then the measured values drive a linear gain in the encode.
+            normalize_started = time.perf_counter()
+            measured = _measure_loudnorm(
+                render_source_path,
+                render_window,
+                keep_ranges,
+                target_lufs=float(args.audio_target_lufs),
+                target_peak=float(args.audio_target_peak),
             )
-            clip_phase_times["compress_analysis"] = time.perf_counter() - compress_analysis_started
-            phase_totals["compress_analysis"] += clip_phase_times["compress_analysis"]
-            compressed_duration = sum(end_sec - start_sec for start_sec, end_sec in keep_ranges)
-            if compressed_duration <= 0.0:
-                continue
-
-            cues: list[dict[str, float | str]] = []
-            if not args.no_subs:
-                transcript_path = get_transcript_path(transcripts_root, feed, episode)
-                if transcript_path:
-                    clip_vtt_path = work_dir / f"clip_{index:02d}.vtt"
-                    subtitle_started = time.perf_counter()
-                    if clip_transcript_to_vtt(transcript_path, start, end, clip_vtt_path):
-                        cues = _load_vtt_cues(clip_vtt_path)
-                    clip_phase_times["subtitle_extract"] = time.perf_counter() - subtitle_started
-                    phase_totals["subtitle_extract"] += clip_phase_times["subtitle_extract"]
-                else:
-                    print(f"[render_short] No transcript for {feed}/{episode}", file=sys.stderr)
-            remapped_cues = _remap_cues_to_keep_ranges(cues, keep_ranges) if cues else []
-
-            prepared_path = public_job_dir / f"clip_{index:02d}.mp4"
-            compress_started = time.perf_counter()
-            if not _apply_keep_ranges(
-                timeline_source_path,
+            audio_filter = _loudnorm_filter(
+                measured,
+                target_lufs=float(args.audio_target_lufs),
+                target_peak=float(args.audio_target_peak),
+            )
+            clip_phase_times["audio_normalize"] = time.perf_counter() - normalize_started
+            _add_phase_total("audio_normalize", clip_phase_times["audio_normalize"])
+
+        compress_started = time.perf_counter()
+        normalized = True
+        rendered = _render_clip_single_pass(
+            render_source_path,
+            render_window,
+            keep_ranges,
+            prepared_path,
+            has_audio,
+            apply_static_crop=apply_static_crop,
+            audio_filter=audio_filter,
+        )
+        if not rendered and audio_filter:
+            normalized = False
+            print(f"[render_short] Continuing without normalized audio for {clip_label}.", file=sys.stderr)
+            rendered = _render_clip_single_pass(
+                render_source_path,
+                render_window,
                 keep_ranges,
                 prepared_path,
-                has_audio=has_audio,
-                apply_static_crop=bool(args.no_autocrop),
-            ):
-                continue
-            clip_phase_times["compress_render"] = time.perf_counter() - compress_started
-            phase_totals["compress_render"] += clip_phase_times["compress_render"]
-            if args.no_autocrop:
-                clip_phase_times["crop"] = clip_phase_times.get("crop", 0.0)
-            if has_audio and not args.no_audio_normalize:
-                normalize_started = time.perf_counter()
-                normalized = _normalize_clip_audio(
-                    prepared_path,
-                    target_lufs=float(args.audio_target_lufs),
-                    target_peak=float(args.audio_target_peak),
-                )
-                clip_phase_times["audio_normalize"] = time.perf_counter() - normalize_started
-                phase_totals["audio_normalize"] += clip_phase_times["audio_normalize"]
-                if not normalized:
-                    print(f"[render_short] Continuing without normalized audio for {clip_label}.", file=sys.stderr)
-
-            episode_title = str(item.get("episode_title") or episode).strip()
-            feed_title = str(item.get("feed_title") or feed).strip()
-            speaker_label = _speaker_label(episode_title, feed_title)
-            manifest_clips.append(
+                has_audio,
+                apply_static_crop=apply_static_crop,
+            )
+        if not rendered:
+            return None
+        clip_phase_times["compress_render"] = time.perf_counter() - compress_started
+        _add_phase_total("compress_render", clip_phase_times["compress_render"])
+        # A static-crop fallback means AutoCrop failed this time; do not pin that result in the cache.
+        if render_cache is not None and crop_mode != "static-fallback" and normalized:
+            render_cache.store(
+                cache_key,
+                prepared_path,
                 {
-                    "path": _public_rel(prepared_path),
-                    "duration_sec": round(compressed_duration, 3),
-                    "quote": str(item.get("quote") or "").strip(),
-                    "context": str(item.get("context") or "").strip(),
-                    "decorators": str(item.get("decorators") or "").strip(),
-                    "feed_title": feed_title,
-                    "episode_title": episode_title,
-                    "speaker_label": speaker_label,
-                }
+                    "kind": "short-clip",
+                    "feed": feed,
+                    "episode": episode,
+                    "raw_duration": raw_duration,
+                    "compressed_duration": compressed_duration,
+                    "crop_mode": crop_mode,
+                    "keep_ranges": [[a, b] for a, b in keep_ranges],
+                },
             )
-            for cue in remapped_cues:
-                final_subtitle_cues.append(
+        return {
+            "clip_elapsed": time.perf_counter() - clip_started,
+            "clip_label": clip_label,
+            "clip_phase_times": clip_phase_times,
+            "raw_duration": raw_duration,
+            "compressed_duration": compressed_duration,
+            "crop_mode": crop_mode,
+            "prepared_path": prepared_path,
+            "remapped_cues": _clip_cues(index, feed, episode, start, end, keep_ranges, clip_phase_times),
+        }
+
+    try:
+        # Per-clip ffmpeg threads are capped while clips run side by side; Remotion gets --threads back afterwards.
+        requested_threads = _ENC_THREADS
+        workers, _ENC_THREADS = render_pool_size(int(args.jobs), requested_threads, len(clip_items))
+        _log_timing(f"clip pool workers={workers} ffmpeg_threads={_ENC_THREADS or 'auto'}")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_prepare_clip, index, item) for index, item in enumerate(clip_items, start=1)]
+            # Assemble in script order: manifest, subtitle offsets and clip ids never depend on finish order.
+            for index, (item, fut) in enumerate(zip(clip_items, futures), start=1):
+                prepared = fut.result()
+                if prepared is None:
+                    continue
+                feed = item.get("feed")
+                episode = item.get("episode")
+                start = float(item.get("start_sec") or 0)
+                clip_elapsed = float(prepared["clip_elapsed"])
+                clip_label = str(prepared["clip_label"])
+                clip_phase_times = prepared["clip_phase_times"]
+                raw_duration = float(prepared["raw_duration"])
+                compressed_duration = float(prepared["compressed_duration"])
+                crop_mode = str(prepared["crop_mode"])
+                prepared_path = prepared["prepared_path"]
+                remapped_cues = prepared["remapped_cues"]
+
+                episode_title = str(item.get("episode_title") or episode).strip()
+                feed_title = str(item.get("feed_title") or feed).strip()
+                speaker_label = _speaker_label(episode_title, feed_title)
+                manifest_clips.append(
                     {
-                        "start_sec": output_cursor + float(cue["start_sec"]),
-                        "end_sec": output_cursor + float(cue["end_sec"]),
-                        "text": str(cue["text"]),
+                        "path": _public_rel(prepared_path),
+                        "duration_sec": round(compressed_duration, 3),
+                        "quote": str(item.get("quote") or "").strip(),
+                        "context": str(item.get("context") or "").strip(),
+                        "decorators": str(item.get("decorators") or "").strip(),
+                        "feed_title": feed_title,
+                        "episode_title": episode_title,
+                        "speaker_label": speaker_label,
                     }
                 )
-            output_cursor += compressed_duration
-            if index < len(clip_items):
-                output_cursor += transition_sec
-            rendered_clip_ids.append(clip_id(feed, episode, start))
-            clip_elapsed = time.perf_counter() - clip_started
-            phase_totals["clip_total"] += clip_elapsed
-            clip_summary = {
-                "label": clip_label,
-                "elapsed": clip_elapsed,
-                "raw_duration": raw_duration,
-                "final_duration": compressed_duration,
-                "crop_mode": crop_mode,
-                "phases": clip_phase_times,
-            }
-            clip_summaries.append(clip_summary)
-            phase_bits = []
-            for phase_name in (
-                "download",
-                "trim_detect",
-                "extract_raw",
-                "compress_analysis",
-                "subtitle_extract",
-                "compress_render",
-                "autocrop",
-                "static_crop_fallback",
-                "audio_normalize",
-            ):
-                if clip_phase_times.get(phase_name):
-                    phase_bits.append(f"{phase_name}={_fmt_elapsed(clip_phase_times[phase_name])}")
-            _log_timing(
-                f"{clip_label} done total={_fmt_elapsed(clip_elapsed)} raw={raw_duration:.2f}s final={compressed_duration:.2f}s crop={crop_mode}"
-                + (f" | {'; '.join(phase_bits)}" if phase_bits else "")
-            )
+                for cue in remapped_cues:
+                    final_subtitle_cues.append(
+                        {
+                            "start_sec": output_cursor + float(cue["start_sec"]),
+                            "end_sec": output_cursor + float(cue["end_sec"]),
+                            "text": str(cue["text"]),
+                        }
+                    )
+                output_cursor += compressed_duration
+                if index < len(clip_items):
+                    output_cursor += transition_sec
+                rendered_clip_ids.append(clip_id(feed, episode, start))
+                phase_totals["clip_total"] += clip_elapsed
+                clip_summary = {
+                    "label": clip_label,
+                    "elapsed": clip_elapsed,
+                    "raw_duration": raw_duration,
+                    "final_duration": compressed_duration,
+                    "crop_mode": crop_mode,
+                    "phases": clip_phase_times,
+                }
+                clip_summaries.append(clip_summary)
+                phase_bits = []
+                for phase_name in (
+                    "download",
+                    "trim_detect",
+                    "extract_raw",
+                    "compress_analysis",
+                    "subtitle_extract",
+                    "compress_render",
+                    "autocrop",
+                    "audio_normalize",
+                ):
+                    if clip_phase_times.get(phase_name):
+                        phase_bits.append(f"{phase_name}={_fmt_elapsed(clip_phase_times[phase_name])}")
+                _log_timing(
+                    f"{clip_label} done total={_fmt_elapsed(clip_elapsed)} raw={raw_duration:.2f}s final={compressed_duration:.2f}s crop={crop_mode}"
+                    + (f" | {'; '.join(phase_bits)}" if phase_bits else "")
+                )
+
+        _ENC_THREADS = requested_threads
 
         if len(manifest_clips) < max(2, int(args.min_clips)):
             print(
@@ -1141,7 +1441,6 @@ def main() -> None:
         "subtitle_extract",
         "compress_render",
         "autocrop",
-        "static_crop_fallback",
         "audio_normalize",
         "remotion_render",
         "subtitle_write",
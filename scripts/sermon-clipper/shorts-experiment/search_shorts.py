@@ -2,11 +2,15 @@
 from __future__ import annotations
 
 import argparse
+import bisect
+import hashlib
 import json
+import os
 import re
 import sqlite3
 import sys
 from collections import Counter, defaultdict
+from dataclasses import dataclass
 from pathlib import Path
 
 _REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -273,6 +277,89 @@ def _read_cues(transcript_path: Path) -> list[dict]:
     return cues
 
 
+_CUE_WORD_RE = re.compile(r"[a-z0-9']+")
+_CUE_END_PUNCT_RE = re.compile(r"[.!?][\"']?$")
+_CUE_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class _TranscriptCues:
+    """Parsed cues of one transcript, sorted by start, with the per-cue facts snippet building needs."""
+
+    starts: list[float]
+    ends: list[float]
+    texts: list[str]
+    word_counts: list[int]
+    end_punct: list[bool]
+    max_cue_sec: float
+
+    @classmethod
+    def from_cues(cls, cues: list[dict]) -> "_TranscriptCues":
+        ordered = sorted(cues, key=lambda cue: cue["start"])
+        texts = [cue["text"] for cue in ordered]
+        return cls(
+            starts=[cue["start"] for cue in ordered],
+            ends=[cue["end"] for cue in ordered],
+            texts=texts,
+            word_counts=[len(_CUE_WORD_RE.findall(text.lower())) for text in texts],
+            end_punct=[bool(_CUE_END_PUNCT_RE.search(text.strip())) for text in texts],
+            max_cue_sec=max((cue["end"] - cue["start"] for cue in ordered), default=0.0),
+        )
+
+    def overlapping(self, start: float, end: float) -> range:
+        """Indices of cues with end > start and start < end (bisect on starts, bounded by the longest cue)."""
+        lo = bisect.bisect_right(self.starts, start - self.max_cue_sec)
+        hi = bisect.bisect_left(self.starts, end)
+        while lo < hi and self.ends[lo] <= start:
+            lo += 1
+        return range(lo, hi)
+
+
+class _CueIndex:
+    """Per-run memo of parsed transcripts, optionally persisted as JSON keyed by transcript size and mtime."""
+
+    def __init__(self, persist_dir: Path | None = None) -> None:
+        self.persist_dir = persist_dir
+        self._memo: dict[Path, _TranscriptCues] = {}
+
+    def _persist_path(self, transcript_path: Path) -> Path | None:
+        if self.persist_dir is None:
+            return None
+        digest = hashlib.sha1(str(transcript_path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.persist_dir / f"{transcript_path.stem[:48]}-{digest}.json"
+
+    def get(self, transcript_path: Path) -> _TranscriptCues:
+        cached = self._memo.get(transcript_path)
+        if cached is not None:
+            return cached
+        try:
+            st = transcript_path.stat()
+            stamp = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stamp = None
+        persist_path = self._persist_path(transcript_path)
+        entry = None
+        if persist_path is not None and stamp is not None and persist_path.exists():
+            try:
+                data = json.loads(persist_path.read_text(encoding="utf-8"))
+                if data.get("version") == _CUE_INDEX_VERSION and data.get("stamp") == stamp:
+                    entry = _TranscriptCues(**{k: data[k] for k in _TranscriptCues.__dataclass_fields__})
+            except Exception:
+                entry = None
+        if entry is None:
+            entry = _TranscriptCues.from_cues(_read_cues(transcript_path))
+            if persist_path is not None and stamp is not None and entry.starts:
+                try:
+                    persist_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = persist_path.with_suffix(f".{os.getpid()}.tmp")
+                    tmp.write_text(json.dumps({"version": _CUE_INDEX_VERSION, "stamp": stamp, **entry.__dict__}, ensure_ascii=False), encoding="utf-8")
+                    os.replace(tmp, persist_path)
+                except OSError:
+                    pass
+        self._memo[transcript_path] = entry
+        return entry
+
+
 def _question_score(text: str) -> float:
     lowered = (text or "").strip().lower()
     if not lowered:
@@ -346,8 +433,14 @@ def _motif_candidates_from_text(text: str, theme_terms: set[str]) -> set[str]:
 
 
 def _motif_popularity(db_path: Path, motif: str) -> tuple[int, int]:
+    from answer_engine_lib import term_df_lookup
+
     pattern = f"%{motif.lower()}%"
     with sqlite3.connect(db_path) as conn:
+        # Indexed lookup in the analyze-time term DF table; LIKE scan only for databases analyzed before it existed.
+        indexed = term_df_lookup(conn, motif)
+        if indexed is not None:
+            return indexed
         mentions, feeds = conn.execute(
             """
             select count(*), count(distinct feed)
@@ -524,11 +617,11 @@ def _window_to_snippets(
     base_score: float,
     min_duration: float,
     max_duration: float,
+    cue_index: _CueIndex | None = None,
 ) -> list[dict]:
-    cues = _read_cues(transcript_path)
-    if not cues:
+    cues = (cue_index or _CueIndex()).get(transcript_path)
+    if not cues.starts:
         return []
-    overlapping = [cue for cue in cues if cue["end"] > start and cue["start"] < end]
     snippets: list[dict] = []
     bucket: list[dict] = []
     bucket_words = 0
@@ -554,13 +647,16 @@ def _window_to_snippets(
         bucket = []
         bucket_words = 0
 
-    for cue in overlapping:
+    for i in cues.overlapping(start, end):
+        if cues.ends[i] <= start:
+            continue
+        cue = {"start": cues.starts[i], "end": cues.ends[i], "text": cues.texts[i]}
         if bucket and cue["start"] - bucket[-1]["end"] > 0.85:
             flush()
         bucket.append(cue)
-        bucket_words += len(re.findall(r"[a-z0-9']+", cue["text"].lower()))
+        bucket_words += cues.word_counts[i]
         bucket_dur = bucket[-1]["end"] - bucket[0]["start"]
-        end_punct = bool(re.search(r"[.!?][\"']?$", cue["text"].strip()))
+        end_punct = cues.end_punct[i]
         if bucket_dur >= max_duration or bucket_words >= 18 or (end_punct and bucket_dur >= min_duration) or (bucket_dur >= min_duration and bucket_words >= 14):
             flush()
 
@@ -681,6 +777,7 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--allow-audio", action="store_true", help="Allow audio-only enclosures in search results.")
     p.add_argument("--allow-missing-transcript", action="store_true", help="Allow clips without local transcript files.")
     p.add_argument("--no-cache", action="store_true", help="Bypass query cache; run fresh search.")
+    p.add_argument("--no-cue-cache", action="store_true", help="Parse transcripts in memory only; do not read or write the persistent cue index.")
     return p.parse_args()
 
 
@@ -739,6 +836,7 @@ def main() -> None:
         "not_renderable": 0,
         "no_snippets": 0,
     }
+    cue_index = _CueIndex(None if args.no_cue_cache else cache_dir / "sermon-clipper" / "cue-index")
     renderability_cache: dict[tuple[str, str], bool] = {}
     transcript_cache: dict[tuple[str, str], Path | None] = {}
     for result in results:
@@ -782,6 +880,7 @@ def main() -> None:
             base_score=float(result.get("score") or 0.0),
             min_duration=min_dur,
             max_duration=max_dur,
+            cue_index=cue_index,
         )
         if not snippets:
             rejected["no_snippets"] += 1
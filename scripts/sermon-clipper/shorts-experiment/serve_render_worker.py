@@ -0,0 +1,309 @@
+"""Persistent local render worker for shorts: warm AutoCrop-Vertical models and a warm Remotion renderer.
+
+AutoCrop jobs run in-process on a small slot pool, reusing the loaded upstream module and YOLO model.
+Remotion jobs are forwarded to remotion/render_server.mjs, which bundles the composition once and keeps a
+headless browser open. render_short.py talks to this over HTTP (--render-worker / --render-worker-url).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+_THIS = Path(__file__).resolve().parent
+_REPO_ROOT = _THIS.parents[2]
+_REMOTION_SERVER = _THIS / "remotion" / "render_server.mjs"
+_REMOTION_START_TIMEOUT_SECONDS = 300
+sys.path.insert(0, str(_THIS))
+
+from autocrop_vertical_runner import prepare_upstream, run_autocrop
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Run a persistent local AutoCrop/Remotion render worker for shorts.")
+    p.add_argument("--host", default="127.0.0.1", help="Bind host (default: 127.0.0.1).")
+    p.add_argument("--port", type=int, default=8787, help="Bind port (default: 8787).")
+    p.add_argument("--autocrop-slots", type=int, default=1, help="AutoCrop jobs run at once; they share one loaded model (default: 1).")
+    p.add_argument("--autocrop-repo", default="", help="AutoCrop-Vertical checkout to load at warmup (jobs may name their own).")
+    p.add_argument("--no-remotion", action="store_true", help="Do not start the warm Remotion renderer.")
+    p.add_argument("--warmup", action="store_true", help="Load AutoCrop and bundle Remotion before accepting requests.")
+    return p.parse_args()
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((host, 0))
+        return int(s.getsockname()[1])
+
+
+def _get_json(url: str, timeout: float = 3.0) -> dict[str, Any] | None:
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            obj = json.loads(resp.read().decode("utf-8", errors="replace"))
+        return obj if isinstance(obj, dict) else None
+    except Exception:
+        return None
+
+
+@dataclass
+class Job:
+    payload: dict[str, Any]
+    done: threading.Event
+    result: dict[str, Any] | None = None
+    error: str = ""
+
+
+def _stop_process_group(proc: subprocess.Popen[Any], *, timeout: float) -> None:
+    """SIGTERM the process group led by `proc` (SIGKILL after `timeout`); plain terminate/kill on Windows."""
+    if os.name == "nt":
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        return
+    # Signal the group even if the leader already exited: its children may still be alive.
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+class RenderService:
+    def __init__(self, *, host: str, autocrop_slots: int, remotion: bool) -> None:
+        self.host = host
+        self.remotion_enabled = remotion
+        self._upstreams: dict[str, Any] = {}
+        self._upstream_lock = threading.Lock()
+        self._remotion_lock = threading.Lock()
+        self._remotion_proc: subprocess.Popen[Any] | None = None
+        self._remotion_url = ""
+        self._jobs: queue.Queue[Job | None] = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._active_jobs = 0
+        self._processed = {"autocrop": 0, "remotion": 0}
+        self._workers = [
+            threading.Thread(target=self._run_loop, name=f"autocrop-worker-{i + 1}", daemon=True)
+            for i in range(max(1, int(autocrop_slots)))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def shutdown(self) -> None:
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5.0)
+        proc = self._remotion_proc
+        if proc is not None:
+            _stop_process_group(proc, timeout=10.0)
+
+    def info(self) -> dict[str, Any]:
+        with self._stats_lock:
+            active, processed = self._active_jobs, dict(self._processed)
+        return {
+            "autocrop_loaded": sorted(self._upstreams),
+            "autocrop_slots": len(self._workers),
+            "queue_size": self._jobs.qsize(),
+            "active_jobs": active,
+            "processed": processed,
+            "remotion": bool(self._remotion_url),
+        }
+
+    def _upstream(self, repo_dir: str) -> Any:
+        key = str(Path(repo_dir).resolve())
+        with self._upstream_lock:
+            if key not in self._upstreams:
+                started = time.perf_counter()
+                self._upstreams[key] = prepare_upstream(Path(key))
+                print(f"[render-worker] loaded AutoCrop-Vertical from {key} in {time.perf_counter() - started:.1f}s", flush=True)
+            return self._upstreams[key]
+
+    def _run_loop(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            with self._stats_lock:
+                self._active_jobs += 1
+            try:
+                job.result = self._autocrop(job.payload)
+            except Exception:
+                job.error = traceback.format_exc(limit=8)
+            finally:
+                with self._stats_lock:
+                    self._active_jobs = max(0, self._active_jobs - 1)
+                    self._processed["autocrop"] += 1
+                job.done.set()
+
+    def _autocrop(self, payload: dict[str, Any]) -> dict[str, Any]:
+        repo_dir = str(payload.get("repo_dir") or "").strip()
+        src = str(payload.get("input") or "").strip()
+        out = str(payload.get("output") or "").strip()
+        if not repo_dir or not src or not out:
+            raise ValueError("repo_dir, input and output are required")
+        upstream = self._upstream(repo_dir)
+        started = time.perf_counter()
+        run_autocrop(
+            upstream,
+            Path(src),
+            Path(out),
+            ratio=str(payload.get("ratio") or "9:16"),
+            quality=str(payload.get("quality") or "balanced"),
+            progress=False,
+        )
+        return {"ok": True, "output": out, "elapsed_sec": round(time.perf_counter() - started, 3)}
+
+    def submit_autocrop(self, payload: dict[str, Any]) -> dict[str, Any]:
+        job = Job(payload=payload, done=threading.Event())
+        self._jobs.put(job)
+        job.done.wait()
+        if job.error:
+            raise RuntimeError(job.error)
+        return job.result or {}
+
+    def _ensure_remotion(self) -> str:
+        with self._remotion_lock:
+            if self._remotion_url and self._remotion_proc is not None and self._remotion_proc.poll() is None:
+                return self._remotion_url
+            node = shutil.which("node")
+            if not node:
+                raise RuntimeError("node not found on PATH")
+            port = _free_port(self.host)
+            url = f"http://{self.host}:{port}"
+            cmd = [node, str(_REMOTION_SERVER), "--host", self.host, "--port", str(port)]
+            # Own session, so shutdown can take node's headless Chrome children down with it.
+            proc = subprocess.Popen(cmd, cwd=str(_REPO_ROOT), start_new_session=True)
+            deadline = time.monotonic() + _REMOTION_START_TIMEOUT_SECONDS
+            while _get_json(f"{url}/health") is None:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"Remotion render server exited during startup (rc={proc.returncode})")
+                if time.monotonic() > deadline:
+                    _stop_process_group(proc, timeout=10.0)
+                    raise RuntimeError("Remotion render server did not become healthy in time")
+                time.sleep(1.0)
+            self._remotion_proc, self._remotion_url = proc, url
+            print(f"[render-worker] Remotion render server ready at {url} pid={proc.pid}", flush=True)
+            return url
+
+    def remotion(self, payload: dict[str, Any]) -> dict[str, Any]:
+        if not self.remotion_enabled:
+            raise RuntimeError("Remotion renderer disabled (--no-remotion)")
+        if not str(payload.get("output") or "").strip():
+            raise ValueError("output is required")
+        url = self._ensure_remotion()
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        req = urllib.request.Request(f"{url}/render", data=raw, headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=float(payload.get("timeout_sec") or 3600)) as resp:
+                result = json.loads(resp.read().decode("utf-8", errors="replace"))
+        except urllib.error.HTTPError as exc:
+            raise RuntimeError(exc.read().decode("utf-8", errors="replace")[-1500:]) from exc
+        finally:
+            with self._stats_lock:
+                self._processed["remotion"] += 1
+        return result if isinstance(result, dict) else {"ok": False}
+
+    def warmup(self, autocrop_repo: str) -> None:
+        if autocrop_repo:
+            self._upstream(autocrop_repo)
+        if self.remotion_enabled:
+            self._ensure_remotion()
+
+
+def main() -> None:
+    args = _parse_args()
+    os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+    service = RenderService(host=str(args.host), autocrop_slots=int(args.autocrop_slots), remotion=not bool(args.no_remotion))
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "vodcasts-render-worker/1"
+
+        def _send_json(self, code: int, payload: dict[str, Any]) -> None:
+            raw = json.dumps(payload, ensure_ascii=True).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _read_json(self) -> dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or "0")
+            raw = self.rfile.read(length) if length > 0 else b"{}"
+            body = json.loads(raw.decode("utf-8", errors="replace"))
+            return body if isinstance(body, dict) else {}
+
+        def log_message(self, fmt: str, *args: Any) -> None:
+            sys.stderr.write("[render-worker] " + (fmt % args) + "\n")
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self._send_json(200, {"ok": True, **service.info()})
+                return
+            self._send_json(404, {"ok": False, "error": "not_found"})
+
+        def do_POST(self) -> None:
+            handlers = {"/autocrop": service.submit_autocrop, "/remotion": service.remotion}
+            handler = handlers.get(self.path)
+            if handler is None:
+                self._send_json(404, {"ok": False, "error": "not_found"})
+                return
+            try:
+                body = self._read_json()
+            except Exception as exc:
+                self._send_json(400, {"ok": False, "error": f"invalid_json: {exc}"})
+                return
+            try:
+                self._send_json(200, handler(body))
+            except Exception as exc:
+                self._send_json(500, {"ok": False, "error": str(exc)})
+
+    if args.warmup:
+        service.warmup(str(args.autocrop_repo or ""))
+        print(f"[render-worker] warmed {json.dumps(service.info())}", flush=True)
+
+    def _on_sigterm(signum: int, frame: Any) -> None:
+        raise SystemExit(0)
+
+    # render_short stops the worker with terminate(); unwind serve_forever so shutdown() runs.
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+    server = ThreadingHTTPServer((str(args.host), int(args.port)), Handler)
+    server.daemon_threads = True
+    print(f"[render-worker] listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        print("[render-worker] shutting down", flush=True)
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
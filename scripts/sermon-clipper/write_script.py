@@ -305,26 +305,29 @@ def _load_or_search_clips(args: argparse.Namespace, env: str) -> list[dict]:
     return clips
 
 
-def main() -> None:
-    args = _parse_args()
-    env = (args.env or "").strip() or default_env()
-    clips = _load_or_search_clips(args, env)
-    if not clips:
-        print("[write_script] No clips available to write script.", file=sys.stderr)
-        sys.exit(3)
-
-    keywords = _focus_terms(args.theme, clips)
-    title = args.title or _build_title(args.theme, keywords)
-    intro = args.intro or _build_intro(args.theme, keywords)
-    outro = args.outro or _build_outro(args.theme, keywords)
-    title_card_intro = _build_title_card_intro(args.theme, keywords)
+def build_script_markdown(
+    theme: str,
+    clips: list[dict],
+    env: str,
+    *,
+    title: str = "",
+    intro: str = "",
+    outro: str = "",
+    target_minutes: int = 15,
+) -> str:
+    """Long-form render sheet markdown for an ordered clip list (as written by main)."""
+    keywords = _focus_terms(theme, clips)
+    title = title or _build_title(theme, keywords)
+    intro = intro or _build_intro(theme, keywords)
+    outro = outro or _build_outro(theme, keywords)
+    title_card_intro = _build_title_card_intro(theme, keywords)
 
     lines = [
         f"# Video: {title}",
         "",
         "## metadata",
-        f"theme: {args.theme}",
-        f"target_duration_minutes: {args.target_minutes}",
+        f"theme: {theme}",
+        f"target_duration_minutes: {target_minutes}",
         "",
         "## intro",
         intro,
@@ -357,7 +360,7 @@ def main() -> None:
             lines.extend(
                 [
                     "## transition",
-                    _build_transition(args.theme, clip, clips[i + 1]),
+                    _build_transition(theme, clip, clips[i + 1]),
                     "",
                 ]
             )
@@ -373,10 +376,30 @@ def main() -> None:
             "",
         ]
     )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    args = _parse_args()
+    env = (args.env or "").strip() or default_env()
+    clips = _load_or_search_clips(args, env)
+    if not clips:
+        print("[write_script] No clips available to write script.", file=sys.stderr)
+        sys.exit(3)
+
+    markdown = build_script_markdown(
+        args.theme,
+        clips,
+        env,
+        title=args.title,
+        intro=args.intro,
+        outro=args.outro,
+        target_minutes=int(args.target_minutes),
+    )
 
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+    out_path.write_text(markdown, encoding="utf-8")
     print(f"[write_script] wrote {out_path} ({len(clips)} clips)", file=sys.stderr)
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import html
 import json
 import os
@@ -15,6 +16,12 @@ from scripts.feeds_md import parse_feeds_markdown
 VODCASTS_ROOT = Path(__file__).resolve().parents[1]
 REPO_ROOT = VODCASTS_ROOT.parent
 
+FEEDS_COMPILED_DIR = VODCASTS_ROOT / "cache" / "feeds-compiled"
+_FEEDS_COMPILED_VERSION = 1
+_FEEDS_PARSER_SOURCE = Path(__file__).resolve().with_name("feeds_md.py")
+# resolved pack path -> (dependency records, merged config)
+_feeds_config_memo: dict[str, tuple[list[dict[str, Any]], dict[str, Any]]] = {}
+
 
 def read_json(path: Path) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
@@ -25,7 +32,35 @@ def write_json(path: Path, data: Any) -> None:
     path.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
 
-def _read_feeds_config_impl(path: Path, _seen: set[str] | None = None) -> dict[str, Any]:
+def _dep_record(path: Path) -> tuple[dict[str, Any], bytes]:
+    # Stat before reading: an edit racing the read leaves a stale stamp, which forces a hash check.
+    st = path.stat()
+    data = path.read_bytes()
+    rec = {"path": str(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha1": hashlib.sha1(data).hexdigest()}
+    return rec, data
+
+
+def _deps_current(deps: list[dict[str, Any]]) -> tuple[bool, bool]:
+    """(all dependencies unchanged, some stamps were refreshed) — a touched file with identical content still counts as unchanged."""
+    touched = False
+    for d in deps:
+        p = Path(d["path"])
+        try:
+            st = p.stat()
+            if st.st_mtime_ns == d["mtime_ns"] and st.st_size == d["size"]:
+                continue
+            if st.st_size != d["size"] or hashlib.sha1(p.read_bytes()).hexdigest() != d["sha1"]:
+                return False, touched
+        except OSError:
+            return False, touched
+        d["mtime_ns"] = st.st_mtime_ns
+        touched = True
+    return True, touched
+
+
+def _read_feeds_config_impl(
+    path: Path, _seen: set[str] | None = None, _deps: list[dict[str, Any]] | None = None
+) -> dict[str, Any]:
     path = path.resolve()
     if not path.exists():
         raise ValueError(f"Feeds config not found: {path}")
@@ -37,7 +72,10 @@ def _read_feeds_config_impl(path: Path, _seen: set[str] | None = None) -> dict[s
         raise ValueError(f"Circular include in feeds config: {path}")
     seen.add(key)
 
-    text = path.read_text(encoding="utf-8", errors="replace")
+    rec, data = _dep_record(path)
+    if _deps is not None:
+        _deps.append(rec)
+    text = data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
     cfg = parse_feeds_markdown(text)
     if not isinstance(cfg, dict):
         raise ValueError(f"Invalid markdown feeds config: {path}")
@@ -56,7 +94,7 @@ def _read_feeds_config_impl(path: Path, _seen: set[str] | None = None) -> dict[s
             if not name:
                 continue
             inc_path = (base_dir / name).resolve()
-            inc_cfg = _read_feeds_config_impl(inc_path, seen)
+            inc_cfg = _read_feeds_config_impl(inc_path, seen, _deps)
             for f in inc_cfg.get("feeds") or []:
                 if not isinstance(f, dict):
                     continue
@@ -69,8 +107,57 @@ def _read_feeds_config_impl(path: Path, _seen: set[str] | None = None) -> dict[s
     return cfg
 
 
+def _compiled_feeds_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+    return FEEDS_COMPILED_DIR / f"{path.stem}-{digest}.json"
+
+
+def _write_compiled_feeds(out: Path, doc: dict[str, Any]) -> None:
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, out)
+    except OSError:
+        pass  # read-only checkout: the in-process memo still applies
+
+
 def read_feeds_config(path: Path) -> dict[str, Any]:
-    return _read_feeds_config_impl(path)
+    """
+    Parsed feeds config with includes merged.
+
+    Memoized per process and persisted to cache/feeds-compiled/. Both are keyed on the
+    mtime/size (falling back to sha1) of the pack, every file it includes and feeds_md.py.
+    The returned dict is shared between callers: treat it as read-only.
+    """
+    path = path.resolve()
+    key = str(path)
+    memo = _feeds_config_memo.get(key)
+    if memo is not None and _deps_current(memo[0])[0]:
+        return memo[1]
+
+    out = _compiled_feeds_path(path)
+    try:
+        doc = json.loads(out.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        doc = None
+    if isinstance(doc, dict) and doc.get("version") == _FEEDS_COMPILED_VERSION and doc.get("path") == key:
+        ok, touched = _deps_current(doc.get("deps") or [])
+        if ok and isinstance(doc.get("config"), dict):
+            if touched:
+                _write_compiled_feeds(out, doc)
+            _feeds_config_memo[key] = (doc["deps"], doc["config"])
+            return doc["config"]
+
+    deps: list[dict[str, Any]] = []
+    cfg = _read_feeds_config_impl(path, _deps=deps)
+    if _FEEDS_PARSER_SOURCE.exists():
+        deps.append(_dep_record(_FEEDS_PARSER_SOURCE)[0])
+    # Round-trip so memoized and compiled loads hand out identical JSON types.
+    cfg = json.loads(json.dumps(cfg, ensure_ascii=False))
+    _write_compiled_feeds(out, {"version": _FEEDS_COMPILED_VERSION, "path": key, "deps": deps, "config": cfg})
+    _feeds_config_memo[key] = (deps, cfg)
+    return cfg
 
 
 def normalize_ws(text: str) -> str:
@@ -90,6 +177,7 @@ class FetchResult:
     content: bytes | None
     etag: str | None
     last_modified: str | None
+    retry_after: str | None = None
 
 
 def fetch_url(
@@ -169,6 +257,7 @@ def fetch_url(
         # Parse a few headers we care about.
         etag = None
         last_modified = None
+        retry_after = None
         try:
             for raw in headers_path.read_text(encoding="utf-8", errors="replace").splitlines():
                 if ":" not in raw:
@@ -180,13 +269,17 @@ def fetch_url(
                     etag = v
                 if k == "last-modified" and v:
                     last_modified = v
+                if k == "retry-after" and v:
+                    retry_after = v
         except Exception:
             pass
 
         if status == 304:
-            return FetchResult(status=304, url=effective, content=None, etag=etag, last_modified=last_modified)
+            return FetchResult(status=304, url=effective, content=None, etag=etag, last_modified=last_modified, retry_after=retry_after)
         content = body_path.read_bytes()
-        return FetchResult(status=status, url=effective, content=content, etag=etag, last_modified=last_modified)
+        return FetchResult(
+            status=status, url=effective, content=content, etag=etag, last_modified=last_modified, retry_after=retry_after
+        )
     finally:
         try:
             headers_path.unlink(missing_ok=True)
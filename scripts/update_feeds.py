@@ -7,6 +7,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict
 from pathlib import Path
 
+from scripts.rate_limit import DomainRateLimiter, interleave_by_domain
 from scripts.shared import VODCASTS_ROOT, fetch_url, write_json
 from scripts.sources import load_sources_config
 
@@ -17,6 +18,7 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--cache", default=str(VODCASTS_ROOT / "cache" / "dev"), help="Cache directory.")
     p.add_argument("--force", action="store_true", help="Ignore cooldown and refetch all feeds.")
     p.add_argument("--concurrency", type=int, default=5, help="Number of feeds to fetch concurrently (default: 5).")
+    p.add_argument("--domain-delay-sec", type=float, default=0.0, help="Min delay between requests to the same host (default: 0; Retry-After is always honored).")
     p.add_argument("--quiet", action="store_true", help="Less logging (still prints errors).")
     return p.parse_args()
 
@@ -75,6 +77,7 @@ def main() -> None:
     state = _read_state(state_path)
     feeds_state = state.setdefault("feeds", {})
     now = int(time.time())
+    limiter = DomainRateLimiter(min_delay_seconds=float(args.domain_delay_sec))
 
     def work(source):
         sid = source.id
@@ -91,6 +94,7 @@ def main() -> None:
         etag = prev.get("etag")
         last_mod = prev.get("last_modified")
         try:
+            limiter.wait(url)
             res = fetch_url(
                 url,
                 timeout_seconds=timeout_seconds,
@@ -98,10 +102,12 @@ def main() -> None:
                 if_none_match=etag,
                 if_modified_since=last_mod,
             )
+            limiter.note_response(url, res.status, res.retry_after)
             if res.status == 304:
                 return sid, {
                     "status": "not_modified",
                     "url": url,
+                    "fetched_url": res.url or prev.get("fetched_url"),
                     "last_checked_unix": now,
                     "etag": etag,
                     "last_modified": last_mod,
@@ -140,7 +146,7 @@ def main() -> None:
 
     results = {}
     with ThreadPoolExecutor(max_workers=max(1, int(args.concurrency))) as ex:
-        futs = [ex.submit(work, s) for s in cfg.sources]
+        futs = [ex.submit(work, s) for s in interleave_by_domain(cfg.sources, lambda s: s.feed_url or "")]
         for fut in as_completed(futs):
             sid, r = fut.result()
             results[sid] = r
@@ -5,10 +5,13 @@ Dev-only helper: verify that a feed's enclosure URLs actually serve playable med
 
 This is intentionally *not* used by the build (it may hit many media URLs and can be slow).
 It samples a few enclosure URLs per feed, downloads a small byte-range to confirm bytes exist,
-and writes `- disabled: <reason>` into the feeds markdown for failures.
+and writes `- disabled: <reason>` into the feeds markdown for failures. The default async engine
+stream-scans only the first few enclosures, probes a feed's samples concurrently over pooled
+connections and stops at the first playable one.
 """
 
 import argparse
+import asyncio
 import json
 import re
 import subprocess
@@ -17,10 +20,12 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
+from xml.etree import ElementTree as ET
 
-from scripts.feed_manifest import parse_feed_for_manifest
+from scripts.async_http import AsyncHttpClient
+from scripts.feed_manifest import FeedEnclosureScanner, parse_feed_for_manifest, scan_feed_enclosures
 from scripts.feeds_md import parse_feeds_markdown
+from scripts.rate_limit import DomainRateLimiter, interleave_by_domain
 from scripts.shared import fetch_url
 
 
@@ -39,40 +44,6 @@ def _day_stamp() -> str:
     return time.strftime("%Y-%m-%d", time.gmtime())
 
 
-def _domain(url: str) -> str:
-    try:
-        return (urlparse(url).netloc or "").lower()
-    except Exception:
-        return ""
-
-
-class DomainThrottle:
-    def __init__(self, min_delay_seconds: float):
-        self._min_delay = float(min_delay_seconds)
-        self._next_at: dict[str, float] = {}
-        self._lock = None
-
-        try:
-            import threading
-
-            self._lock = threading.Lock()
-        except Exception:
-            self._lock = None
-
-    def wait(self, url: str) -> None:
-        dom = _domain(url)
-        if not dom or self._min_delay <= 0:
-            return
-        if self._lock is None:
-            return
-        with self._lock:
-            t = _now()
-            nxt = self._next_at.get(dom, 0.0)
-            if t < nxt:
-                time.sleep(max(0.0, nxt - t))
-            self._next_at[dom] = _now() + self._min_delay
-
-
 @dataclass(frozen=True)
 class FeedDef:
     file: Path
@@ -155,9 +126,11 @@ def _curl_headers(
     timeout_seconds: int,
     use_head: bool,
     limit_rate_kbps: int = 0,
+    throttle: DomainRateLimiter | None = None,
 ) -> tuple[int | None, str | None, str | None, str | None]:
     """
-    Return (status, content_type, content_length, effective_url)
+    Return (status, content_type, content_length, effective_url). A 429 or a Retry-After header
+    backs the URL's domain off in `throttle`.
     """
     args = [
         "curl",
@@ -201,16 +174,22 @@ def _curl_headers(
     eff = out_lines[-1].strip() or None
 
     clen = None
-    # Parse headers to find Content-Length (best-effort).
+    retry_after = None
+    # Parse headers to find Content-Length / Retry-After (best-effort).
     try:
         for line in out_lines[:-4]:
             if ":" not in line:
                 continue
             k, v = line.split(":", 1)
-            if k.strip().lower() == "content-length":
+            k = k.strip().lower()
+            if k == "content-length":
                 clen = v.strip()
+            elif k == "retry-after":
+                retry_after = v.strip()
     except Exception:
         pass
+    if throttle is not None:
+        throttle.note_response(url, status, retry_after)
 
     return status, content_type, clen or size_dl, eff
 
@@ -246,7 +225,7 @@ def probe_media_url(
     *,
     user_agent: str,
     timeout_seconds: int,
-    throttle: DomainThrottle,
+    throttle: DomainRateLimiter,
     probe_bytes: int,
     limit_rate_kbps: int,
 ) -> tuple[bool, str]:
@@ -268,6 +247,7 @@ def probe_media_url(
         timeout_seconds=timeout_seconds,
         use_head=True,
         limit_rate_kbps=int(limit_rate_kbps),
+        throttle=throttle,
     )
     need_range = False
     ct0 = (ctype or "").lower()
@@ -294,6 +274,7 @@ def probe_media_url(
             timeout_seconds=timeout_seconds,
             use_head=False,
             limit_rate_kbps=int(limit_rate_kbps),
+            throttle=throttle,
         )
 
     if status is None:
@@ -362,7 +343,7 @@ def probe_media_url(
     return True, "ok"
 
 
-def load_feed_xml(feed: FeedDef, *, cache_dir: Path | None, throttle: DomainThrottle) -> tuple[str | None, str]:
+def load_feed_xml(feed: FeedDef, *, cache_dir: Path | None, throttle: DomainRateLimiter) -> tuple[str | None, str]:
     """
     Return (xml_text, reason). Uses cached XML when present; otherwise fetches the feed URL.
     """
@@ -379,6 +360,7 @@ def load_feed_xml(feed: FeedDef, *, cache_dir: Path | None, throttle: DomainThro
         r = fetch_url(feed.url, timeout_seconds=feed.timeout_seconds, user_agent=feed.user_agent)
     except Exception as e:
         return None, f"feed fetch failed: {_norm_ws(str(e))}"
+    throttle.note_response(feed.url, r.status, r.retry_after)
     if r.status != 200 or not r.content:
         return None, f"feed http {r.status}"
     try:
@@ -391,7 +373,7 @@ def probe_feed(
     feed: FeedDef,
     *,
     cache_dir: Path | None,
-    throttle: DomainThrottle,
+    throttle: DomainRateLimiter,
     media_timeout_seconds: int,
     sample_episodes: int,
     probe_bytes: int,
@@ -447,6 +429,218 @@ def probe_feed(
     return ProbeResult(ok=False, reason=f"media_probe: enclosure probe failed ({len(samples)} sampled) ({how})")
 
 
+# Most of a live feed read by the async engine; the scan usually stops far earlier.
+_FEED_MAX_BYTES = 32 * 1024 * 1024
+_FEED_SCAN_CHUNK_BYTES = 256 * 1024
+
+
+def classify_media_response(url: str, status: int | None, ctype: str | None, body: bytes) -> tuple[bool, str]:
+    """Same verdicts as probe_media_url, from one ranged GET (status, content-type, first bytes)."""
+    if status is None:
+        return False, "fetch failed"
+    if status < 200 or status >= 400:
+        return False, f"http {status}"
+    ct = (ctype or "").split(";", 1)[0].strip().lower()
+    if ct.startswith("text/html") or ct.startswith("application/xhtml"):
+        return False, f"unexpected content-type {ctype or 'text/html'}"
+    if "mpegurl" in ct or url.lower().endswith(".m3u8") or ".m3u8?" in url.lower():
+        if b"#EXTM3U" not in body[:2048]:
+            return False, "not an m3u8 playlist"
+        return True, "ok"
+    if not (
+        ct.startswith("audio/")
+        or ct.startswith("video/")
+        or ct in ("application/mp4", "application/x-mp4", "application/x-m4v", "application/x-m4a")
+        or ct in ("application/octet-stream", "binary/octet-stream", "")
+    ):
+        return False, f"unexpected content-type {ctype or '(none)'}"
+    if not body:
+        return False, "no bytes"
+    head = body[:512].lstrip().lower()
+    if head.startswith(b"<!doctype html") or head.startswith(b"<html"):
+        return False, "html body"
+    return True, "ok"
+
+
+async def probe_media_url_async(
+    client: AsyncHttpClient, url: str, *, user_agent: str, timeout_seconds: int, probe_bytes: int
+) -> tuple[bool, str]:
+    """One ranged GET instead of HEAD + range GET(s); the connection is dropped if the host ignores Range."""
+    if not url:
+        return False, "empty media url"
+    n = int(max(2048, min(64 * 1024, int(probe_bytes) if int(probe_bytes) > 0 else 4096)))
+    for attempt in range(2):
+        try:
+            resp = await client.get(
+                url,
+                headers={"User-Agent": user_agent, "Range": f"bytes=0-{n - 1}"},
+                max_bytes=n,
+                timeout_seconds=timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            return False, "timeout"
+        except Exception as e:
+            return False, f"fetch failed: {_norm_ws(str(e))[:120]}"
+        # A 429 is the host pacing us, not a broken enclosure: the limiter has deferred the
+        # domain per Retry-After, so one more attempt waits for that slot.
+        if resp.status != 429 or attempt:
+            break
+    return classify_media_response(url, resp.status, resp.header("content-type"), resp.body)
+
+
+def _scan_cached_enclosures(path: Path, limit: int) -> list[dict[str, Any]]:
+    def chunks():
+        with path.open("rb") as fh:
+            while True:
+                block = fh.read(_FEED_SCAN_CHUNK_BYTES)
+                if not block:
+                    return
+                yield block
+
+    return scan_feed_enclosures(chunks(), limit=limit)
+
+
+def _enclosures_from_xml(xml_bytes: bytes, slug: str, limit: int) -> list[dict[str, Any]]:
+    try:
+        found = scan_feed_enclosures([xml_bytes], limit=limit)
+    except Exception:
+        found = []
+    if found:
+        return found
+    # Broken XML: the manifest parser recovers (lxml) where the streaming scan cannot.
+    try:
+        _f, _t, episodes, _img = parse_feed_for_manifest(xml_bytes.decode("utf-8", errors="replace"), source_id=slug, source_title=slug)
+    except Exception:
+        return []
+    out: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for ep in episodes or []:
+        media = ep.get("media") if isinstance(ep, dict) else None
+        url = str((media or {}).get("url") or "").strip() if isinstance(media, dict) else ""
+        if url and url not in seen:
+            seen.add(url)
+            out.append(media)
+            if len(out) >= limit:
+                break
+    return out
+
+
+async def load_feed_enclosures_async(
+    feed: FeedDef, *, cache_dir: Path | None, client: AsyncHttpClient, limit: int
+) -> tuple[list[dict[str, Any]] | None, str]:
+    """(first `limit` distinct enclosures, how). None means the feed itself could not be loaded."""
+    if cache_dir:
+        p = cache_dir / "feeds" / f"{feed.slug}.xml"
+        if p.exists() and p.stat().st_size > 200:
+            try:
+                found = await asyncio.to_thread(_scan_cached_enclosures, p, limit)
+            except Exception:
+                found = await asyncio.to_thread(lambda: _enclosures_from_xml(p.read_bytes(), feed.slug, limit))
+            return found, "cache"
+
+    # Chunks are scanned as they arrive and the connection is dropped once `limit` enclosures are
+    # found. Raw bytes are kept only while nothing was found, for the lxml recovery on broken XML.
+    scanner = FeedEnclosureScanner(limit=limit)
+    raw: list[bytes] | None = []
+    scan_failed = False
+    total = 0
+    try:
+        async with client.stream("GET", feed.url, headers={"User-Agent": feed.user_agent}, timeout_seconds=feed.timeout_seconds) as r:
+            status = r.status
+            if status == 200:
+                async for chunk in r.iter_body(_FEED_SCAN_CHUNK_BYTES):
+                    total += len(chunk)
+                    if raw is not None:
+                        raw.append(chunk)
+                    if not scan_failed:
+                        try:
+                            if await asyncio.to_thread(scanner.feed, chunk):
+                                break
+                        except ET.ParseError:
+                            scan_failed = True
+                        if scanner.found:
+                            raw = None
+                    if total >= _FEED_MAX_BYTES:
+                        break
+    except asyncio.TimeoutError:
+        return None, "feed fetch failed: timeout"
+    except Exception as e:
+        return None, f"feed fetch failed: {_norm_ws(str(e))}"
+    if status != 200 or not total:
+        return None, f"feed http {status}"
+    if scanner.found or raw is None:
+        return scanner.found, "fetched"
+    return await asyncio.to_thread(_enclosures_from_xml, b"".join(raw), feed.slug, limit), "fetched"
+
+
+async def probe_feed_async(
+    feed: FeedDef,
+    *,
+    cache_dir: Path | None,
+    client: AsyncHttpClient,
+    media_timeout_seconds: int,
+    sample_episodes: int,
+    probe_bytes: int,
+) -> ProbeResult:
+    """probe_feed, but samples are probed concurrently and the rest are cancelled on the first success."""
+    samples, how = await load_feed_enclosures_async(feed, cache_dir=cache_dir, client=client, limit=max(1, int(sample_episodes)))
+    if samples is None:
+        return ProbeResult(ok=False, reason=f"media_probe: {how}")
+    if not samples:
+        return ProbeResult(ok=False, reason=f"media_probe: no enclosures found in feed ({how})")
+
+    async def one(url: str) -> tuple[str, bool]:
+        ok, _msg = await probe_media_url_async(
+            client, url, user_agent=feed.user_agent, timeout_seconds=media_timeout_seconds, probe_bytes=probe_bytes
+        )
+        return url, ok
+
+    tasks = [asyncio.create_task(one(str(m.get("url") or ""))) for m in samples]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            url, ok = await fut
+            if ok:
+                return ProbeResult(ok=True, reason="ok", sample_url=url)
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return ProbeResult(ok=False, reason=f"media_probe: enclosure probe failed ({len(samples)} sampled) ({how})")
+
+
+async def probe_feeds_async(
+    feeds: list[FeedDef],
+    *,
+    cache_dir: Path | None,
+    throttle: DomainRateLimiter,
+    max_concurrent: int,
+    media_timeout_seconds: int,
+    sample_episodes: int,
+    probe_bytes: int,
+    on_result,
+) -> None:
+    sem = asyncio.Semaphore(max(1, int(max_concurrent)))
+    async with AsyncHttpClient(user_agent="actual-plays/vodcasts", limiter=throttle, timeout_seconds=media_timeout_seconds) as client:
+
+        async def run(fd: FeedDef) -> None:
+            async with sem:
+                try:
+                    res = await probe_feed_async(
+                        fd,
+                        cache_dir=cache_dir,
+                        client=client,
+                        media_timeout_seconds=media_timeout_seconds,
+                        sample_episodes=sample_episodes,
+                        probe_bytes=probe_bytes,
+                    )
+                except Exception as e:
+                    res = ProbeResult(ok=False, reason=f"media_probe: exception: {_norm_ws(str(e))}")
+            on_result(fd, res)
+
+        await asyncio.gather(*(run(fd) for fd in interleave_by_domain(feeds, lambda f: f.url)))
+        print(f"[media] connections opened={client.connections_opened} reused={client.connections_reused}")
+
+
 def set_disabled_in_md(md_text: str, *, slug: str, disabled_reason: str) -> str:
     lines = md_text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
     # Locate the Feeds section.
@@ -496,7 +690,8 @@ def main() -> int:
     ap.add_argument("--cache", default=None, help="Cache dir (expects <cache>/feeds/<slug>.xml). Default: cache/<feeds-stem>")
     ap.add_argument("--media-cache", default="cache/media-validate.json", help="Where to store probe results (24h skip)")
     ap.add_argument("--max-age-hours", type=int, default=24, help="Skip retesting feeds checked within this window")
-    ap.add_argument("--max-workers", type=int, default=10, help="Concurrent feed probes")
+    ap.add_argument("--engine", choices=("async", "curl"), default="async", help="async: pooled asyncio HTTP, concurrent samples with early exit; curl: legacy curl subprocesses")
+    ap.add_argument("--max-workers", type=int, default=10, help="Concurrent feed probes (async engine: feeds in flight)")
     ap.add_argument("--domain-delay-sec", type=float, default=1.4, help="Min delay between requests to the same domain")
     ap.add_argument("--media-timeout-sec", type=int, default=20, help="Per-media request timeout")
     ap.add_argument(
@@ -509,7 +704,7 @@ def main() -> int:
         "--limit-rate-kbps",
         type=int,
         default=300,
-        help="Rate limit for media probes (helps prevent huge accidental downloads if a server ignores Range)",
+        help="Rate limit for media probes with --engine curl (helps prevent huge accidental downloads if a server ignores Range); the async engine stops reading at --probe-bytes",
     )
     ap.add_argument("--sample-episodes", type=int, default=3, help="How many enclosure URLs to sample per feed")
     ap.add_argument("--max-feeds", type=int, default=0, help="Limit probes to N feeds (0 = no limit)")
@@ -573,7 +768,7 @@ def main() -> int:
     cache_doc.setdefault("version", 1)
     cache_doc.setdefault("by_feed", {})
 
-    throttle = DomainThrottle(min_delay_seconds=float(args.domain_delay_sec))
+    throttle = DomainRateLimiter(min_delay_seconds=float(args.domain_delay_sec))
 
     # Decide which feeds to test (skip disabled + recently checked).
     candidates: list[FeedDef] = []
@@ -607,35 +802,54 @@ def main() -> int:
     if cache_dir and not cache_dir.exists():
         cache_dir = None
 
-    print(f"[media] probing {len(candidates)} feeds (workers={args.max_workers}, domain_delay={args.domain_delay_sec:.1f}s)")
+    print(f"[media] probing {len(candidates)} feeds (engine={args.engine}, workers={args.max_workers}, domain_delay={args.domain_delay_sec:.1f}s)")
 
     results: dict[tuple[Path, str], ProbeResult] = {}
-    with ThreadPoolExecutor(max_workers=max(1, int(args.max_workers))) as ex:
-        futs = {}
-        for fd in candidates:
-            fut = ex.submit(
-                probe_feed,
-                fd,
+
+    def record(fd: FeedDef, res: ProbeResult) -> None:
+        results[(fd.file, fd.slug)] = res
+        mark_checked(cache_doc, cache_key(fd), res)
+        if res.ok:
+            print(f"[media] ok  {fd.slug} ({fd.file.name})")
+        else:
+            print(f"[media] BAD {fd.slug} ({fd.file.name}) — {res.reason}")
+
+    if args.engine == "async":
+        asyncio.run(
+            probe_feeds_async(
+                candidates,
                 cache_dir=cache_dir,
                 throttle=throttle,
+                max_concurrent=int(args.max_workers),
                 media_timeout_seconds=int(args.media_timeout_sec),
                 sample_episodes=int(args.sample_episodes),
                 probe_bytes=int(args.probe_bytes),
-                limit_rate_kbps=int(args.limit_rate_kbps),
+                on_result=record,
             )
-            futs[fut] = fd
-        for fut in as_completed(futs):
-            fd = futs[fut]
-            try:
-                res = fut.result()
-            except Exception as e:
-                res = ProbeResult(ok=False, reason=f"media_probe: exception: {_norm_ws(str(e))}")
-            results[(fd.file, fd.slug)] = res
-            mark_checked(cache_doc, cache_key(fd), res)
-            if res.ok:
-                print(f"[media] ok  {fd.slug} ({fd.file.name})")
-            else:
-                print(f"[media] BAD {fd.slug} ({fd.file.name}) — {res.reason}")
+        )
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, int(args.max_workers))) as ex:
+            futs = {}
+            # Round-robin hosts so workers are not all parked behind one domain's delay.
+            for fd in interleave_by_domain(candidates, lambda f: f.url):
+                fut = ex.submit(
+                    probe_feed,
+                    fd,
+                    cache_dir=cache_dir,
+                    throttle=throttle,
+                    media_timeout_seconds=int(args.media_timeout_sec),
+                    sample_episodes=int(args.sample_episodes),
+                    probe_bytes=int(args.probe_bytes),
+                    limit_rate_kbps=int(args.limit_rate_kbps),
+                )
+                futs[fut] = fd
+            for fut in as_completed(futs):
+                fd = futs[fut]
+                try:
+                    res = fut.result()
+                except Exception as e:
+                    res = ProbeResult(ok=False, reason=f"media_probe: exception: {_norm_ws(str(e))}")
+                record(fd, res)
 
     save_json(Path(args.media_cache), cache_doc)
 